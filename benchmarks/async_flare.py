@@ -0,0 +1,81 @@
+"""
+Benchmark FlareProvider against AsyncFlareProvider on a local JSON-RPC stub.
+
+For each request count N, runs N balance checks and N transaction builds:
+
+- through the blocking FlareProvider, one after another (what a request
+  handler calling it on the event loop gets), and
+- through AsyncFlareProvider, all N concurrently over the pooled session.
+
+Reports wall time, RPC round trips and TCP connections opened.
+
+Usage:
+    uv run python -m benchmarks.async_flare [--rpc-latency-ms 20] [--counts 1 10 50 100]
+"""
+
+import argparse
+import asyncio
+import time
+
+from flare_ai_defai.blockchain import AsyncFlareProvider, FlareProvider
+from tests.rpc_stub import RPCStub
+
+RECIPIENT = "0x000000000000000000000000000000000000dEaD"
+
+
+def bench_sync(url: str, count: int) -> tuple[float, float]:
+    provider = FlareProvider(url)
+    provider.generate_account()
+    start = time.perf_counter()
+    for _ in range(count):
+        provider.check_balance()
+    balances = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(count):
+        provider.create_send_flr_tx(RECIPIENT, 1.0)
+    return balances, time.perf_counter() - start
+
+
+async def bench_async(url: str, count: int) -> tuple[float, float]:
+    provider = AsyncFlareProvider(url)
+    provider.generate_account()
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(provider.check_balance() for _ in range(count)))
+        balances = time.perf_counter() - start
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(provider.create_send_flr_tx(RECIPIENT, 1.0) for _ in range(count))
+        )
+        return balances, time.perf_counter() - start
+    finally:
+        await provider.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rpc-latency-ms", type=float, default=20.0)
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 10, 50, 100])
+    args = parser.parse_args()
+    latency = args.rpc_latency_ms / 1000
+
+    print(
+        f"{'N':>5} {'provider':>8} {'balances':>10} {'tx builds':>10}"
+        f" {'round trips':>12} {'connections':>12}"
+    )
+    for count in args.counts:
+        for name in ("sync", "async"):
+            stub = RPCStub(latency=latency)
+            with stub.running_in_thread() as url:
+                if name == "sync":
+                    balances, builds = bench_sync(url, count)
+                else:
+                    balances, builds = asyncio.run(bench_async(url, count))
+            print(
+                f"{count:>5} {name:>8} {balances:>9.3f}s {builds:>9.3f}s"
+                f" {stub.round_trips:>12} {len(stub.peers):>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Load test batch attestation through a local teeserver stand-in.
+
+`--clients` concurrent clients each attest `--nonces` nonces, a share of
+them (`--repeat`) asked for again by another client, against a Unix-socket
+teeserver stub answering each request after `--latency` seconds. Compares
+one `aget_token` per nonce with `AttestationBatcher`, reporting teeserver
+requests and wall time.
+
+Usage:
+    uv run python -m benchmarks.attestation_batch [--clients 50] [--nonces 20]
+        [--repeat 0.25] [--latency 0.005]
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import structlog
+
+from flare_ai_defai.attestation import AttestationBatcher, Vtpm
+from tests.teeserver_stub import TeeServerStub
+
+
+async def per_nonce(vtpm: Vtpm, nonces: list[str]) -> object:
+    return await asyncio.gather(*(vtpm.aget_token([nonce]) for nonce in nonces))
+
+
+async def run(
+    attest: Callable[[Vtpm], Callable[[list[str]], Awaitable[object]]],
+    workload: list[list[str]],
+    latency: float,
+) -> tuple[int, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        stub = TeeServerStub(str(Path(tmp) / "tee.sock"), latency=latency)
+        await stub.start()
+        vtpm = Vtpm(unix_socket_path=stub.unix_path)  # pyright: ignore [reportArgumentType]
+        client = attest(vtpm)
+        try:
+            start = time.perf_counter()
+            await asyncio.gather(*(client(nonces) for nonces in workload))
+            elapsed = time.perf_counter() - start
+        finally:
+            await vtpm.close()
+            await stub.close()
+    return stub.round_trips, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--nonces", type=int, default=20)
+    parser.add_argument("--repeat", type=float, default=0.25)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+
+    rng = random.Random(0)  # noqa: S311
+    workload = [
+        [f"client-{c:04d}-nonce-{n:04d}" for n in range(args.nonces)]
+        for c in range(args.clients)
+    ]
+    # Some nonces are asked for again by another client
+    for nonces in workload:
+        other = rng.choice(workload)
+        nonces.extend(rng.sample(other[: args.nonces], int(args.nonces * args.repeat)))
+    total = sum(len(nonces) for nonces in workload)
+
+    print(f"{args.clients} clients, {total} nonces requested")
+    print(f"{'client':>18} {'requests':>9} {'wall':>9}")
+    for name, attest in (
+        ("token per nonce", lambda vtpm: lambda nonces: per_nonce(vtpm, nonces)),
+        ("AttestationBatcher", lambda vtpm: AttestationBatcher(vtpm).issue),
+    ):
+        requests, elapsed = asyncio.run(run(attest, workload, args.latency))
+        print(f"{name:>18} {requests:>9} {elapsed * 1000:>7.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark per-turn latency of long conversations with history compaction.
+
+Sends `--turns` messages through one session with the HistoryManager's default
+budget and with compaction disabled. The LLM is a stub whose latency grows
+with the tokens it is sent: `--base-latency-ms` plus `--ms-per-1k-tokens` for
+every thousand context tokens, as prefill does. Summaries are computed in the
+background with the same stub. Reports the mean latency of the first and last
+ten turns and the context tokens sent with the last message.
+
+Usage:
+    uv run python -m benchmarks.chat_history [--turns 200] [--ms-per-1k-tokens 40]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, override
+
+import structlog
+
+from flare_ai_defai.ai import (
+    BaseAIProvider,
+    ModelResponse,
+    entry_text,
+    estimate_tokens,
+)
+from flare_ai_defai.prompts import PromptService
+from flare_ai_defai.session import HistoryManager, Session
+
+MESSAGE = "How do FTSO delegation rewards work, and when are they paid out? " * 3
+REPLY = "Delegators earn a share of the rewards of the providers they back. " * 6
+WINDOW = 10
+
+
+class StubLLM(BaseAIProvider):
+    """Answers after a delay proportional to the tokens it is sent."""
+
+    def __init__(self, base_latency: float, latency_per_token: float) -> None:
+        super().__init__(api_key="", model="stub")
+        self.base_latency = base_latency
+        self.latency_per_token = latency_per_token
+
+    async def _respond(self, text: str, reply: str) -> ModelResponse:
+        tokens = estimate_tokens(text)
+        await asyncio.sleep(self.base_latency + tokens * self.latency_per_token)
+        return ModelResponse(text=reply, raw_response=None, metadata={})
+
+    @override
+    def reset(self) -> None:
+        self.chat_history = []
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        raise NotImplementedError
+
+    @override
+    async def agenerate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        return await self._respond(prompt, REPLY)
+
+    @override
+    def send_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        raise NotImplementedError
+
+    @override
+    async def asend_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        history = [] if chat_history is None else chat_history
+        context = "".join(entry_text(entry) for entry in history) + msg
+        response = await self._respond(context, REPLY)
+        history.append({"parts": [msg], "role": "user"})
+        history.append({"parts": [response.text], "role": "model"})
+        return response
+
+
+async def run(
+    turns: int, token_budget: int, base_latency: float, latency_per_token: float
+) -> tuple[float, float, int]:
+    ai = StubLLM(base_latency, latency_per_token)
+    history = HistoryManager(ai, PromptService(), token_budget=token_budget)
+    session = Session("bench")
+    latencies: list[float] = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        context = history.context(session)
+        await ai.asend_message(MESSAGE, context)
+        history.record(session, context)
+        latencies.append(time.perf_counter() - start)
+    await history.join()
+    context_tokens = history.tokens(session).total
+    first = sum(latencies[:WINDOW]) / len(latencies[:WINDOW])
+    last = sum(latencies[-WINDOW:]) / len(latencies[-WINDOW:])
+    return first, last, context_tokens
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--token-budget", type=int, default=4000)
+    parser.add_argument("--base-latency-ms", type=float, default=20)
+    parser.add_argument("--ms-per-1k-tokens", type=float, default=40)
+    args = parser.parse_args()
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+
+    print(f"{'history':>10} {'first turns':>12} {'last turns':>12} {'tokens':>8}")
+    for name, budget in (("full", 2**62), ("compacted", args.token_budget)):
+        first, last, tokens = asyncio.run(
+            run(
+                args.turns,
+                budget,
+                args.base_latency_ms / 1000,
+                args.ms_per_1k_tokens / 1e6,
+            )
+        )
+        print(f"{name:>10} {first * 1000:>10.1f}ms {last * 1000:>10.1f}ms {tokens:>8}")
+
+
+if __name__ == "__main__":
+    main()
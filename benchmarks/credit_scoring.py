@@ -0,0 +1,92 @@
+"""
+Benchmark vectorized credit scoring against a per-transaction Python loop.
+
+Scores synthetic transaction histories of N transactions three ways:
+
+- a pure-Python loop accumulating monthly inflow, outflow, income and
+  overdrafts per transaction, the way the features would be computed
+  without NumPy,
+- TransactionArrays.from_transactions, the one-off conversion to columns,
+  and
+- CreditScorer.score on the prebuilt arrays, the vectorized feature pass.
+
+Usage:
+    uv run python -m benchmarks.credit_scoring [--counts 1000 10000 100000]
+"""
+
+import argparse
+import statistics
+import time
+from collections import defaultdict
+from typing import Any
+
+from flare_ai_defai.banking import CreditScorer, TransactionArrays
+from flare_ai_defai.banking.scoring import (
+    INCOME_MARKERS,
+    INCOME_MIN_AMOUNT,
+    OVERDRAFT_MARKERS,
+    TRANSFER_MARKERS,
+    transaction_category,
+)
+from tests.plaid_stub import synthetic_history
+
+
+def loop_features(transactions: list[dict[str, Any]]) -> dict[str, float]:
+    inflow: dict[str, float] = defaultdict(float)
+    outflow: dict[str, float] = defaultdict(float)
+    income: dict[str, float] = defaultdict(float)
+    overdrafts = 0
+    for tx in transactions:
+        month = tx["date"][:7]
+        amount = tx["amount"]
+        category = transaction_category(tx)
+        if amount < 0:
+            inflow[month] += -amount
+            if any(m in category for m in INCOME_MARKERS) or (
+                -amount >= INCOME_MIN_AMOUNT
+                and not any(m in category for m in TRANSFER_MARKERS)
+            ):
+                income[month] += -amount
+        else:
+            outflow[month] += amount
+        if any(m in category for m in OVERDRAFT_MARKERS):
+            overdrafts += 1
+    months = sorted(set(inflow) | set(outflow))
+    net = [inflow[m] - outflow[m] for m in months]
+    incomes = [income[m] for m in months]
+    return {
+        "monthly_inflow": statistics.fmean(inflow[m] for m in months),
+        "volatility": statistics.pstdev(net),
+        "income_stdev": statistics.pstdev(incomes),
+        "overdrafts": overdrafts / len(months),
+    }
+
+
+def timed(fn: Any, *args: Any) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    scorer = CreditScorer()
+    print(f"{'N':>7} {'python loop':>12} {'to arrays':>10} {'vectorized':>11}")
+    for count in args.counts:
+        history = synthetic_history(count, seed=0, overdraft_rate=0.01)
+        loop = timed(loop_features, history)
+        start = time.perf_counter()
+        arrays = TransactionArrays.from_transactions(history)
+        convert = time.perf_counter() - start
+        vectorized = timed(scorer.score, arrays, 0.3)
+        print(
+            f"{count:>7} {loop * 1000:>10.1f}ms {convert * 1000:>8.1f}ms"
+            f" {vectorized * 1000:>9.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
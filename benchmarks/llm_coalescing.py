@@ -0,0 +1,115 @@
+"""
+Benchmark bursts of identical LLM requests with and without coalescing.
+
+Sends `--burst` concurrent semantic router requests for each of `--phrasings`
+user inputs, `--rounds` times, to a stub LLM answering after
+`--llm-latency-ms`. Compares the provider used directly with a
+CoalescingProvider, with and without the deterministic response cache.
+Reports upstream calls and the mean latency of a burst.
+
+Usage:
+    uv run python -m benchmarks.llm_coalescing [--burst 50] [--phrasings 5]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, override
+
+import structlog
+
+from flare_ai_defai.ai import BaseAIProvider, CoalescingProvider, ModelResponse
+from flare_ai_defai.prompts import PromptService
+
+
+class StubLLM(BaseAIProvider):
+    """Answers every prompt after a fixed delay and counts the calls."""
+
+    def __init__(self, latency: float) -> None:
+        super().__init__(api_key="", model="stub")
+        self.latency = latency
+        self.calls = 0
+
+    @override
+    def reset(self) -> None:
+        self.chat_history = []
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        raise NotImplementedError
+
+    @override
+    async def agenerate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return ModelResponse(text="Conversational", raw_response=None, metadata={})
+
+    @override
+    def send_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        raise NotImplementedError
+
+
+async def run(
+    mode: str, burst: int, phrasings: int, rounds: int, latency: float
+) -> tuple[int, float]:
+    stub = StubLLM(latency)
+    prompts = PromptService()
+    ai: BaseAIProvider = stub
+    if mode != "direct":
+        ai = CoalescingProvider(
+            stub,
+            cache_ttl=60.0 if mode == "coalesce+cache" else 0.0,
+            cacheable=prompts.is_deterministic,
+        )
+    requests = [
+        prompts.get_formatted_prompt("semantic_router", user_input=f"hello {i}")
+        for i in range(phrasings)
+    ]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(
+            *(ai.agenerate(*request) for request in requests for _ in range(burst))
+        )
+    return stub.calls, (time.perf_counter() - start) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--burst", type=int, default=50)
+    parser.add_argument("--phrasings", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--llm-latency-ms", type=float, default=200)
+    args = parser.parse_args()
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+
+    print(f"{'provider':>15} {'upstream calls':>15} {'burst latency':>14}")
+    for mode in ("direct", "coalesce", "coalesce+cache"):
+        calls, latency = asyncio.run(
+            run(
+                mode,
+                args.burst,
+                args.phrasings,
+                args.rounds,
+                args.llm_latency_ms / 1000,
+            )
+        )
+        print(f"{mode:>15} {calls:>15} {latency * 1000:>12.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Load-test sending many transfers from one account on a local dev chain.
+
+Runs N transfers from a single account against the JSON-RPC stub with
+simulated latency, three ways:
+
+- node-serial: ask the node for the nonce before every send, one at a time
+  (the only collision-free option without local nonce tracking),
+- node-concurrent: the same, but all N at once, so sends collide on nonces,
+- managed: AsyncFlareProvider with its NonceManager, all N at once.
+
+Reports wall time, accepted and rejected sends, and RPC round trips.
+
+Usage:
+    uv run python -m benchmarks.nonce_pipeline [--rpc-latency-ms 20] [--sends 200]
+"""
+
+import argparse
+import asyncio
+import time
+
+from eth_account import Account
+from web3.exceptions import Web3RPCError
+
+from flare_ai_defai.blockchain import AsyncFlareProvider
+from tests.rpc_stub import CHAIN_ID, GAS_PRICE, PRIORITY_FEE, RPCStub
+
+TRANSFER = {
+    "to": "0x000000000000000000000000000000000000dEaD",
+    "value": 1,
+    "gas": 21000,
+    "maxFeePerGas": GAS_PRICE,
+    "maxPriorityFeePerGas": PRIORITY_FEE,
+    "chainId": CHAIN_ID,
+    "type": 2,
+}
+
+
+async def send_with_node_nonce(provider: AsyncFlareProvider) -> bool:
+    address = provider.wallet.address or ""
+    nonce = await provider.w3.eth.get_transaction_count(address, "pending")
+    signed = Account.sign_transaction(
+        {**TRANSFER, "nonce": nonce}, provider.private_key
+    )
+    try:
+        await provider.w3.eth.send_raw_transaction(signed.raw_transaction)
+    except Web3RPCError:
+        return False
+    return True
+
+
+async def node_serial(provider: AsyncFlareProvider, sends: int) -> list[bool]:
+    return [await send_with_node_nonce(provider) for _ in range(sends)]
+
+
+async def node_concurrent(provider: AsyncFlareProvider, sends: int) -> list[bool]:
+    return await asyncio.gather(*(send_with_node_nonce(provider) for _ in range(sends)))
+
+
+async def managed(provider: AsyncFlareProvider, sends: int) -> list[bool]:
+    async def send() -> bool:
+        try:
+            await provider.sign_and_send_transaction(TRANSFER)  # pyright: ignore [reportArgumentType]
+        except Web3RPCError:
+            return False
+        return True
+
+    return await asyncio.gather(*(send() for _ in range(sends)))
+
+
+async def run(latency: float, sends: int) -> None:
+    print(
+        f"{'strategy':>16} {'seconds':>8} {'tx/s':>8} {'accepted':>9}"
+        f" {'rejected':>9} {'round trips':>12}"
+    )
+    strategies = (
+        ("node-serial", node_serial),
+        ("node-concurrent", node_concurrent),
+        ("managed", managed),
+    )
+    for name, strategy in strategies:
+        stub = RPCStub(latency=latency)
+        provider = AsyncFlareProvider(await stub.start())
+        provider.generate_account()
+        await provider._ensure_session()  # noqa: SLF001
+        try:
+            start = time.perf_counter()
+            results = await strategy(provider, sends)
+            elapsed = time.perf_counter() - start
+        finally:
+            await provider.close()
+            await stub.close()
+        accepted = sum(results)
+        print(
+            f"{name:>16} {elapsed:>8.2f} {accepted / elapsed:>8.1f} {accepted:>9}"
+            f" {sends - accepted:>9} {stub.round_trips:>12}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rpc-latency-ms", type=float, default=20.0)
+    parser.add_argument("--sends", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.rpc_latency_ms / 1000, args.sends))
+
+
+if __name__ == "__main__":
+    main()
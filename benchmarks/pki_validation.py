@@ -0,0 +1,64 @@
+"""
+Benchmark validating PKI attestation tokens from one enclave.
+
+Validates N tokens carrying the same x5c certificate chain against a local
+issuer stand-in, with the verified-chain cache disabled (every token decodes
+the certificates and verifies the chain) and enabled (only the first token
+does). The root certificate is served from the well-known cache in both
+cases, so the difference is the certificate work alone.
+
+Usage:
+    uv run python -m benchmarks.pki_validation [--count 500]
+"""
+
+import argparse
+import logging
+import time
+
+import structlog
+
+from flare_ai_defai.attestation import VtpmValidation, WellKnownCache
+from tests.attestation_stub import IssuerStub, fingerprint
+
+
+def validations_per_second(
+    url: str, root_fingerprint: str, tokens: list[str], chain_cache_size: int
+) -> float:
+    validator = VtpmValidation(
+        expected_issuer=url,
+        well_known_cache=WellKnownCache(),
+        root_fingerprint=root_fingerprint,
+        chain_cache_size=chain_cache_size,
+    )
+    # Warm the well-known cache so neither run pays for the network
+    validator.validate_token(tokens[0])
+    start = time.perf_counter()
+    for token in tokens:
+        validator.validate_token(token)
+    return len(tokens) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=500)
+    args = parser.parse_args()
+    # The validator logs every token header; keep that out of the timings
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+
+    stub = IssuerStub()
+    with stub.running_in_thread() as url:
+        tokens = [stub.sign_pki(sub=f"token-{i}") for i in range(args.count)]
+        root_fingerprint = fingerprint(stub.root)
+        before = validations_per_second(url, root_fingerprint, tokens, 0)
+        after = validations_per_second(url, root_fingerprint, tokens, 1024)
+
+    print(f"{'chain cache':>12} {'validations/s':>14}")
+    print(f"{'disabled':>12} {before:>14.0f}")
+    print(f"{'enabled':>12} {after:>14.0f}")
+    print(f"speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark per-request Plaid clients against the pooled client registry.
+
+Runs N `/transactions/sync` calls against a local Plaid stand-in, with an
+empty change log so that model deserialization does not drown out the
+connection cost:
+
+- building a new Configuration, ApiClient and PlaidApi for every call, as
+  the router used to, and
+- fetching the client from PlaidClientRegistry, which keeps its urllib3
+  connection pool alive between calls.
+
+The stand-in serves plain HTTP, so the TCP + TLS setup a new connection to
+Plaid costs is simulated by delaying the first request on each connection by
+`--handshake-ms`. Reports time per call and connections opened.
+
+Usage:
+    uv run python -m benchmarks.plaid_clients [--latency-ms 5] [--handshake-ms 30]
+        [--counts 10 100]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+import plaid
+from plaid.api import plaid_api
+from plaid.model.transactions_sync_request import TransactionsSyncRequest
+
+from flare_ai_defai.banking import PlaidClientRegistry
+from tests.plaid_stub import ACCESS_TOKEN, CLIENT_ID, SECRET, PlaidStub
+
+
+def fresh_client(url: str) -> Callable[[], plaid_api.PlaidApi]:
+    def build() -> plaid_api.PlaidApi:
+        configuration = plaid.Configuration(
+            host=url, api_key={"clientId": CLIENT_ID, "secret": SECRET}
+        )
+        return plaid_api.PlaidApi(plaid.ApiClient(configuration))
+
+    return build
+
+
+def pooled_client(url: str) -> Callable[[], plaid_api.PlaidApi]:
+    registry = PlaidClientRegistry(default_environment=url)
+    return lambda: registry.get(CLIENT_ID, SECRET)
+
+
+def run(get_client: Callable[[], plaid_api.PlaidApi], count: int) -> float:
+    request = TransactionsSyncRequest(access_token=ACCESS_TOKEN, cursor="", count=100)
+    start = time.perf_counter()
+    for _ in range(count):
+        get_client().transactions_sync(request)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--handshake-ms", type=float, default=30.0)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100])
+    args = parser.parse_args()
+
+    print(f"{'N':>5} {'clients':>12} {'total':>9} {'per call':>10} {'connections':>12}")
+    for count in args.counts:
+        for name, factory in (
+            ("per-request", fresh_client),
+            ("registry", pooled_client),
+        ):
+            stub = PlaidStub(
+                latency=args.latency_ms / 1000,
+                handshake_latency=args.handshake_ms / 1000,
+            )
+            with stub.running_in_thread() as url:
+                elapsed = run(factory(url), count)
+            print(
+                f"{count:>5} {name:>12} {elapsed:>8.3f}s"
+                f" {elapsed / count * 1000:>8.1f}ms {len(stub.peers):>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
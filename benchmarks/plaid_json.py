@@ -0,0 +1,111 @@
+"""
+Benchmark encoding a large Plaid response for the HTTP reply.
+
+Encodes one `transactions/sync` response model holding N transactions two
+ways:
+
+- the previous path: `response.to_dict()`, FastAPI's `jsonable_encoder`,
+  then `JSONResponse.render` (stdlib json), and
+- PlaidJSONResponse.render, which hands the model straight to orjson.
+
+Reports CPU time (best of `--repeat`) and peak traced memory for each.
+Deserializing Plaid models is slow, so `--unique` transactions are parsed
+once and repeated to reach N.
+
+Usage:
+    uv run python -m benchmarks.plaid_json [--count 10000] [--unique 1000]
+        [--repeat 5]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import plaid
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from plaid.model.transactions_sync_response import TransactionsSyncResponse
+
+from flare_ai_defai.api.responses import PlaidJSONResponse
+from tests.plaid_stub import synthetic_history
+
+
+class RawResponse:
+    """Minimal urllib3-like response for ApiClient.deserialize."""
+
+    def __init__(self, data: str) -> None:
+        self.data = data
+
+    def getheader(self, _name: str, _default: str | None = None) -> str:
+        return "application/json"
+
+
+def sync_response(count: int, unique: int) -> TransactionsSyncResponse:
+    body = {
+        "added": synthetic_history(unique, seed=0),
+        "modified": [],
+        "removed": [],
+        "accounts": [],
+        "next_cursor": "cursor",
+        "has_more": False,
+        "transactions_update_status": "HISTORICAL_UPDATE_COMPLETE",
+        "request_id": "benchmark",
+    }
+    client = plaid.ApiClient(plaid.Configuration())
+    response = client.deserialize(
+        RawResponse(json.dumps(body)), (TransactionsSyncResponse,), _check_type=True
+    )
+    added = response.added
+    response._data_store["added"] = (added * (count // len(added) + 1))[:count]  # noqa: SLF001
+    return response
+
+
+def previous_path(response: TransactionsSyncResponse) -> bytes:
+    return JSONResponse(jsonable_encoder(response.to_dict())).body
+
+
+def orjson_path(response: TransactionsSyncResponse) -> bytes:
+    return PlaidJSONResponse(response).body
+
+
+def measure(
+    encode: Callable[[Any], bytes], response: Any, repeat: int
+) -> tuple[float, float, int]:
+    cpu = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        body = encode(response)
+        cpu = min(cpu, time.process_time() - start)
+    tracemalloc.start()
+    encode(response)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu, peak / 2**20, len(body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--unique", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    response = sync_response(args.count, min(args.unique, args.count))
+    if json.loads(previous_path(response)) != json.loads(orjson_path(response)):
+        msg = "Both paths must produce the same JSON"
+        raise SystemExit(msg)
+
+    print(f"{'path':>22} {'cpu':>9} {'peak memory':>12} {'bytes':>10}")
+    for name, encode in (
+        ("to_dict + jsonable", previous_path),
+        ("PlaidJSONResponse", orjson_path),
+    ):
+        cpu, peak_mb, size = measure(encode, response, args.repeat)
+        print(f"{name:>22} {cpu * 1000:>7.1f}ms {peak_mb:>10.1f}MB {size:>10}")
+
+
+if __name__ == "__main__":
+    main()
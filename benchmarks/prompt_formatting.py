@@ -0,0 +1,76 @@
+"""
+Benchmark the prompt formatting that runs on every chat message.
+
+Formats the `semantic_router` prompt through `PromptService.get_formatted_prompt`
+`--count` times, and compares it with the previous path, which built a new
+`string.Template` on each call. Also times building a `PromptService` the way
+each router used to (a fresh `PromptLibrary`) against the shared library.
+
+Reports the best of `--repeat` runs in microseconds per call.
+
+Usage:
+    uv run python -m benchmarks.prompt_formatting [--count 100000] [--repeat 5]
+"""
+
+import argparse
+import logging
+import time
+from collections.abc import Callable
+from string import Template
+
+import structlog
+
+from flare_ai_defai.prompts import PromptLibrary, PromptService
+
+USER_INPUT = "Send 10 FLR to 0x000000000000000000000000000000000000dEaD please"
+
+
+def best_of(call: Callable[[], object], count: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            call()
+        best = min(best, time.perf_counter() - start)
+    return best / count * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+
+    service = PromptService()
+    prompt = service.library.get_prompt("semantic_router")
+
+    def previous_format() -> str:
+        return Template(prompt.template).safe_substitute(user_input=USER_INPUT)
+
+    def get_formatted_prompt() -> object:
+        return service.get_formatted_prompt("semantic_router", user_input=USER_INPUT)
+
+    print(f"{'path':>28} {'us/call':>9}")
+    for name, call, count in (
+        ("Template per call", previous_format, args.count),
+        (
+            "precompiled Prompt.format",
+            lambda: prompt.format(user_input=USER_INPUT),
+            args.count,
+        ),
+        ("get_formatted_prompt", get_formatted_prompt, args.count),
+        (
+            "PromptLibrary per service",
+            lambda: PromptService(PromptLibrary()),
+            args.count // 100,
+        ),
+        ("shared library", PromptService, args.count // 100),
+    ):
+        print(f"{name:>28} {best_of(call, max(count, 1), args.repeat):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
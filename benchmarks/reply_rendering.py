@@ -0,0 +1,101 @@
+"""
+Benchmark template-rendered replies against LLM-phrased ones.
+
+Produces `--count` replies for each deterministic route (transaction
+confirmation, new account, token send follow-up, attestation request) with
+ReplyRenderer in LLM mode and in template mode. The LLM is a stub answering
+after `--llm-latency-ms`. Reports mean latency per reply and LLM calls.
+
+Usage:
+    uv run python -m benchmarks.reply_rendering [--count 20] [--llm-latency-ms 400]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, override
+
+import structlog
+
+from flare_ai_defai.ai import BaseAIProvider, ModelResponse
+from flare_ai_defai.prompts import PromptService, ReplyMode, ReplyRenderer
+
+ROUTES: dict[str, dict[str, str]] = {
+    "tx_confirmation": {
+        "tx_hash": "0x" + "ab" * 32,
+        "block_explorer": "https://coston2-explorer.flare.network",
+    },
+    "generate_account": {"address": "0x000000000000000000000000000000000000dEaD"},
+    "follow_up_token_send": {},
+    "request_attestation": {},
+}
+
+
+class StubLLM(BaseAIProvider):
+    """Answers every prompt after a fixed delay."""
+
+    def __init__(self, latency: float) -> None:
+        super().__init__(api_key="", model="stub")
+        self.latency = latency
+
+    @override
+    def reset(self) -> None:
+        self.chat_history = []
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        raise NotImplementedError
+
+    @override
+    async def agenerate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        await asyncio.sleep(self.latency)
+        return ModelResponse(text=prompt, raw_response=None, metadata={})
+
+    @override
+    def send_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        raise NotImplementedError
+
+
+async def run(
+    mode: ReplyMode, route: str, count: int, latency: float
+) -> tuple[float, int]:
+    replies = ReplyRenderer(StubLLM(latency), PromptService(), mode=mode)
+    start = time.perf_counter()
+    for _ in range(count):
+        await replies.render(route, **ROUTES[route])
+    return (time.perf_counter() - start) / count, replies.llm_calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--llm-latency-ms", type=float, default=400)
+    args = parser.parse_args()
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+
+    print(f"{'route':>22} {'mode':>9} {'latency':>11} {'LLM calls':>10}")
+    for route in ROUTES:
+        for mode in ReplyMode:
+            latency, calls = asyncio.run(
+                run(mode, route, args.count, args.llm_latency_ms / 1000)
+            )
+            print(f"{route:>22} {mode.value:>9} {latency * 1000:>9.3f}ms {calls:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark the semantic route resolver against LLM-only routing.
+
+Runs the labelled routing corpus through:
+
+- the LLM-only path (every message costs one semantic router call), and
+- the SemanticRouteResolver (cache + rule classifier, LLM only when unsure),
+
+using a stub LLM that answers with the true label after a simulated latency.
+Reports total latency, LLM calls, per-path hit rates and accuracy.
+
+Usage:
+    uv run python -m benchmarks.semantic_router [--llm-latency-ms 400] [--passes 3]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, override
+
+from flare_ai_defai.ai import BaseAIProvider, ModelResponse
+from flare_ai_defai.prompts import PromptService, SemanticRouterResponse
+from flare_ai_defai.routing import LABELLED_EXAMPLES, SemanticRouteResolver
+
+
+class StubRouterLLM(BaseAIProvider):
+    """Returns the labelled route for the prompt after a fixed delay."""
+
+    def __init__(self, latency: float) -> None:
+        super().__init__(api_key="", model="stub")
+        self.latency = latency
+        self.labels = dict(LABELLED_EXAMPLES)
+
+    @override
+    def reset(self) -> None:
+        self.chat_history = []
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        raise NotImplementedError
+
+    @override
+    async def agenerate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        await asyncio.sleep(self.latency)
+        route = next(
+            (r for text, r in self.labels.items() if f"Input: {text}\n" in prompt),
+            SemanticRouterResponse.CONVERSATIONAL,
+        )
+        return ModelResponse(text=route.value, raw_response=None, metadata={})
+
+    @override
+    def send_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        raise NotImplementedError
+
+
+async def run(latency: float, passes: int) -> None:
+    prompts = PromptService()
+    corpus = list(LABELLED_EXAMPLES) * passes
+
+    llm = StubRouterLLM(latency)
+    start = time.perf_counter()
+    for text, _ in corpus:
+        prompt, mime_type, schema = prompts.get_formatted_prompt(
+            "semantic_router", user_input=text
+        )
+        await llm.agenerate(prompt, mime_type, schema)
+    baseline = time.perf_counter() - start
+
+    resolver = SemanticRouteResolver(StubRouterLLM(latency), prompts)
+    correct = 0
+    start = time.perf_counter()
+    for text, label in corpus:
+        correct += await resolver.resolve(text) == label
+    resolved = time.perf_counter() - start
+
+    metrics = resolver.metrics
+    print(f"messages:           {len(corpus)} ({passes} passes)")
+    print(f"LLM-only:           {baseline:.3f}s, {len(corpus)} LLM calls")
+    print(f"resolver:           {resolved:.3f}s, {metrics.llm_calls} LLM calls")
+    print(f"latency saved:      {(1 - resolved / baseline) * 100:.1f}%")
+    print(f"accuracy retained:  {correct / len(corpus) * 100:.1f}%")
+    rates = ", ".join(f"{k}={v:.2f}" for k, v in metrics.hit_rates().items())
+    print(f"hit rates:          {rates}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--llm-latency-ms", type=float, default=400.0)
+    parser.add_argument("--passes", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.llm_latency_ms / 1000, args.passes))
+
+
+if __name__ == "__main__":
+    main()
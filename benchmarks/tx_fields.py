@@ -0,0 +1,69 @@
+"""
+Micro-benchmark the RPC round trips needed to build an FLR transfer.
+
+Compares, against a local JSON-RPC stub with simulated latency:
+
+- sequential: the four separate lookups (nonce, gas price, priority fee,
+  chain id) create_send_flr_tx used to make,
+- batched: AsyncFlareProvider.create_send_flr_tx, whose first build sends one
+  batch with all four fields and later builds only ask for the nonce while
+  the chain id and fee caches are warm.
+
+Usage:
+    uv run python -m benchmarks.tx_fields [--rpc-latency-ms 50] [--builds 20]
+"""
+
+import argparse
+import asyncio
+import time
+
+from flare_ai_defai.blockchain import AsyncFlareProvider
+from tests.rpc_stub import RPCStub
+
+RECIPIENT = "0x000000000000000000000000000000000000dEaD"
+
+
+async def sequential(provider: AsyncFlareProvider, builds: int) -> None:
+    await provider._ensure_session()  # noqa: SLF001
+    address = provider.generate_account()
+    for _ in range(builds):
+        await provider.w3.eth.get_transaction_count(address)
+        await provider.w3.eth.gas_price
+        await provider.w3.eth.max_priority_fee
+        await provider.w3.eth.chain_id
+
+
+async def batched(provider: AsyncFlareProvider, builds: int) -> None:
+    for _ in range(builds):
+        await provider.create_send_flr_tx(RECIPIENT, 1.0)
+
+
+async def run(latency: float, builds: int) -> None:
+    print(f"{'strategy':>10} {'round trips':>12} {'per build':>10} {'ms/build':>9}")
+    for name, bench in (("sequential", sequential), ("batched", batched)):
+        stub = RPCStub(latency=latency)
+        provider = AsyncFlareProvider(await stub.start())
+        provider.generate_account()
+        try:
+            start = time.perf_counter()
+            await bench(provider, builds)
+            elapsed = time.perf_counter() - start
+        finally:
+            await provider.close()
+            await stub.close()
+        print(
+            f"{name:>10} {stub.round_trips:>12} {stub.round_trips / builds:>10.2f}"
+            f" {elapsed / builds * 1000:>9.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rpc-latency-ms", type=float, default=50.0)
+    parser.add_argument("--builds", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.rpc_latency_ms / 1000, args.builds))
+
+
+if __name__ == "__main__":
+    main()
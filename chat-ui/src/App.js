@@ -3,7 +3,32 @@ import { Send } from 'lucide-react';
 import ReactMarkdown from 'react-markdown';
 import './index.css';
 
-const BACKEND_ROUTE = 'api/routes/chat/'
+const BACKEND_ROUTE = 'api/routes/chat/stream'
+
+// Parse a Server-Sent Events response body, calling onEvent(event, data) for
+// every complete event. Event data is JSON encoded by the backend.
+const readEventStream = async (response, onEvent) => {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      let event = 'message';
+      let data = '';
+      for (const line of block.split('\n')) {
+        if (line.startsWith('event: ')) event = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      }
+      onEvent(event, data ? JSON.parse(data) : null);
+    }
+  }
+};
 
 const ChatInterface = () => {
   const [messages, setMessages] = useState([
@@ -26,6 +51,26 @@ const ChatInterface = () => {
     scrollToBottom();
   }, [messages]);
 
+  // Show a partial bot reply, updating the message that is still streaming
+  const showPartialReply = (text) => {
+    setMessages(prev => {
+      const last = prev[prev.length - 1];
+      if (last?.streaming) {
+        return [...prev.slice(0, -1), { ...last, text }];
+      }
+      return [...prev, { text, type: 'bot', streaming: true }];
+    });
+  };
+
+  // Replace the streaming message (if any) with the final bot reply
+  const showFinalReply = (text) => {
+    setMessages(prev => {
+      const last = prev[prev.length - 1];
+      const rest = last?.streaming ? prev.slice(0, -1) : prev;
+      return [...rest, { text, type: 'bot' }];
+    });
+  };
+
   const handleSendMessage = async (text) => {
     try {
       const response = await fetch(BACKEND_ROUTE, {
@@ -40,15 +85,23 @@ const ChatInterface = () => {
         throw new Error('Network response was not ok');
       }
 
-      const data = await response.json();
+      let reply = '';
+      await readEventStream(response, (event, data) => {
+        if (event === 'token') {
+          reply += data;
+          showPartialReply(reply);
+        } else if (event === 'error') {
+          throw new Error(data);
+        }
+      });
       
       // Check if response contains a transaction preview
-      if (data.response.includes('Transaction Preview:')) {
+      if (reply.includes('Transaction Preview:')) {
         setAwaitingConfirmation(true);
         setPendingTransaction(text);
       }
       
-      return data.response;
+      return reply;
     } catch (error) {
       console.error('Error:', error);
       return 'Sorry, there was an error processing your request. Please try again.';
@@ -69,7 +122,7 @@ const ChatInterface = () => {
       if (messageText.toUpperCase() === 'CONFIRM') {
         setAwaitingConfirmation(false);
         const response = await handleSendMessage(pendingTransaction);
-        setMessages(prev => [...prev, { text: response, type: 'bot' }]);
+        showFinalReply(response);
       } else {
         setAwaitingConfirmation(false);
         setPendingTransaction(null);
@@ -80,7 +133,7 @@ const ChatInterface = () => {
       }
     } else {
       const response = await handleSendMessage(messageText);
-      setMessages(prev => [...prev, { text: response, type: 'bot' }]);
+      showFinalReply(response);
     }
 
     setIsLoading(false);
@@ -146,7 +199,7 @@ const ChatInterface = () => {
               )}
             </div>
           ))}
-          {isLoading && (
+          {isLoading && !messages[messages.length - 1]?.streaming && (
             <div className="flex justify-start">
               <div className="w-8 h-8 rounded-full bg-pink-600 flex items-center justify-center text-white font-bold mr-2">
                 A
@@ -1,13 +1,14 @@
 from flare_ai_defai.ai import GeminiProvider
 from flare_ai_defai.api import ChatRouter, router, PlaidRouter
 from flare_ai_defai.attestation import Vtpm
-from flare_ai_defai.blockchain import FlareProvider
+from flare_ai_defai.blockchain import AsyncFlareProvider, FlareProvider
 from flare_ai_defai.prompts import (
     PromptService,
     SemanticRouterResponse,
 )
 
 __all__ = [
+    "AsyncFlareProvider",
     "PlaidRouter",
     "ChatRouter",
     "FlareProvider",
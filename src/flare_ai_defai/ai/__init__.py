@@ -4,17 +4,37 @@ from .base import (
     CompletionRequest,
     GenerationConfig,
     ModelResponse,
+    entry_text,
+    estimate_tokens,
 )
+from .coalesce import CoalescingProvider
 from .gemini import GeminiProvider
-from .openrouter import AsyncOpenRouterProvider, OpenRouterProvider
+from .metered import MeteredProvider
+from .openrouter import (
+    AsyncOpenRouterProvider,
+    OpenRouterChatProvider,
+    OpenRouterProvider,
+    create_http_client,
+)
+from .pool import BreakerState, CircuitBreaker, PoolMember, ProviderPool
 
 __all__ = [
     "AsyncOpenRouterProvider",
     "BaseAIProvider",
+    "BreakerState",
     "ChatRequest",
+    "CircuitBreaker",
+    "CoalescingProvider",
     "CompletionRequest",
     "GeminiProvider",
     "GenerationConfig",
+    "MeteredProvider",
     "ModelResponse",
+    "OpenRouterChatProvider",
     "OpenRouterProvider",
+    "PoolMember",
+    "ProviderPool",
+    "create_http_client",
+    "entry_text",
+    "estimate_tokens",
 ]
@@ -1,6 +1,9 @@
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Literal, Protocol, TypedDict, runtime_checkable
+from typing import Any, ClassVar, Literal, Protocol, TypedDict, runtime_checkable
 
 import httpx
 import requests
@@ -15,6 +18,32 @@ class ModelResponse:
     metadata: dict[str, Any]
 
 
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+
+    Uses the common rule of thumb of about four characters per token, which
+    is close enough for budgeting without a model-specific tokenizer.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        int: Estimated token count
+    """
+    return (len(text) + 3) // 4
+
+
+def entry_text(entry: dict[str, Any]) -> str:
+    """Text of a chat history entry, in Gemini or OpenAI message format."""
+    if "content" in entry:
+        return str(entry["content"])
+    return "".join(
+        part.get("text", "") if isinstance(part, dict) else str(part)
+        for part in entry.get("parts", [])
+    )
+
+
 @runtime_checkable
 class GenerationConfig(Protocol):
     """Protocol for generation configuration options"""
@@ -24,7 +53,18 @@ class GenerationConfig(Protocol):
 
 
 class BaseAIProvider(ABC):
-    """Abstract base class for AI providers"""
+    """Abstract base class for AI providers
+
+    Providers only need to implement the blocking ``generate`` and
+    ``send_message`` methods. The async variants default to running those in a
+    bounded thread pool shared by all sync-only providers, so they never block
+    the event loop. Providers with a native async client should override
+    ``agenerate`` and ``asend_message`` instead.
+    """
+
+    # Upper bound on threads used to run sync-only providers off the event loop
+    executor_max_workers: ClassVar[int] = 16
+    _executor: ClassVar[ThreadPoolExecutor | None] = None
 
     @abstractmethod
     def __init__(self, api_key: str, model: str, **kwargs: str) -> None:
@@ -63,15 +103,92 @@ class BaseAIProvider(ABC):
         """
 
     @abstractmethod
-    def send_message(self, msg: str) -> ModelResponse:
+    def send_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
         """Send a message in a conversational context
 
         Args:
             msg: Input message text
+            chat_history: Conversation to continue. When given, the provider's
+                own history is left untouched and the new turn is appended to
+                this list instead.
+
+        Returns:
+            ModelResponse containing the response text and metadata
+        """
+
+    async def agenerate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        """Async variant of `generate`
+
+        Falls back to running `generate` in the shared bounded executor.
+
+        Args:
+            prompt: Input text prompt
+            response_mime_type: Expected response format
+            response_schema: Expected response structure schema
+
+        Returns:
+            ModelResponse containing the generated text and metadata
+        """
+        return await self._run_in_executor(
+            self.generate, prompt, response_mime_type, response_schema
+        )
+
+    async def asend_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        """Async variant of `send_message`
+
+        Falls back to running `send_message` in the shared bounded executor.
+
+        Args:
+            msg: Input message text
+            chat_history: Conversation to continue, as for `send_message`
 
         Returns:
             ModelResponse containing the response text and metadata
         """
+        return await self._run_in_executor(self.send_message, msg, chat_history)
+
+    async def astream_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> AsyncIterator[str]:
+        """Send a message in a conversational context, streaming the reply
+
+        Providers without native streaming yield the whole reply as one chunk.
+
+        Args:
+            msg: Input message text
+            chat_history: Conversation to continue, as for `send_message`
+
+        Yields:
+            Successive chunks of the response text
+        """
+        response = await self.asend_message(msg, chat_history)
+        yield response.text
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        """Return the thread pool shared by every sync-only provider"""
+        if BaseAIProvider._executor is None:
+            BaseAIProvider._executor = ThreadPoolExecutor(
+                max_workers=cls.executor_max_workers,
+                thread_name_prefix="ai-provider",
+            )
+        return BaseAIProvider._executor
+
+    async def _run_in_executor(
+        self, func: Callable[..., ModelResponse], *args: Any
+    ) -> ModelResponse:
+        """Run a blocking provider call without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), func, *args)
 
 
 class CompletionRequest(TypedDict):
@@ -0,0 +1,225 @@
+"""
+AI Request Coalescing Module
+
+Bursts of identical requests are common: many users type the same popular
+phrasings, which the semantic router classifies with the same prompt, and a
+re-linked Plaid item asks for the same narrative again. This module wraps an
+AI provider so that concurrent identical generate calls share one upstream
+call, and so that responses to deterministic prompts are reused for a short
+time after they arrive.
+
+Chat messages are never coalesced: each one continues its own conversation.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable, Hashable
+from typing import Any, override
+
+import structlog
+
+from flare_ai_defai.ai.base import BaseAIProvider, ModelResponse
+from flare_ai_defai.cache import TTLCache
+from flare_ai_defai.metrics import LLM_COALESCED_REQUESTS
+
+logger = structlog.get_logger(__name__)
+
+RequestKey = tuple[str, str, str | None, Hashable]
+
+
+class CoalescingProvider(BaseAIProvider):
+    """
+    AI provider sharing identical concurrent generate calls.
+
+    Requests are identified by model, prompt, response MIME type and response
+    schema. While a request is in flight, identical requests wait for its
+    response instead of being sent upstream; every caller gets the same
+    ModelResponse, or the same exception. A caller that is cancelled does not
+    cancel the upstream call the others are waiting for.
+
+    With `cache_ttl` set, responses to prompts accepted by `cacheable` are
+    also kept for that many seconds, in a cache bounded to `cache_size`
+    entries. Failures are never cached.
+
+    Issued and coalesced requests are also counted in the
+    `llm_coalesced_requests_total` metric, labelled with `name`.
+
+    Attributes:
+        provider (BaseAIProvider): Provider the requests are sent to
+        name (str): Label of the provider's metrics
+        cache_ttl (float): Seconds a cacheable response is reused, 0 disables
+        cacheable (Callable[[str], bool]): Whether a prompt's responses may be
+            cached
+        cache (TTLCache[RequestKey, ModelResponse]): Cached responses, with
+            their hit and miss counts
+        issued (int): Requests sent upstream
+        coalesced (int): Requests that shared an in-flight upstream call
+        logger (BoundLogger): Structured logger for the provider
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        provider: BaseAIProvider,
+        *,
+        name: str = "default",
+        cache_ttl: float = 0.0,
+        cacheable: Callable[[str], bool] | None = None,
+        cache_size: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the coalescing provider.
+
+        Args:
+            provider (BaseAIProvider): Provider the requests are sent to
+            name (str): Label of the provider's metrics, e.g. the router
+                using it
+            cache_ttl (float): Seconds a cacheable response is reused, 0 to
+                only coalesce concurrent requests
+            cacheable (Callable[[str], bool] | None): Whether a prompt's
+                responses may be cached, defaults to none of them
+            cache_size (int): Maximum number of cached responses
+            clock (Callable[[], float]): Monotonic time source
+        """
+        super().__init__("", provider.model)
+        self.provider = provider
+        self.name = name
+        self.cache_ttl = cache_ttl
+        self.cacheable = cacheable or (lambda _: False)
+        self.cache: TTLCache[RequestKey, ModelResponse] = TTLCache(
+            cache_ttl, cache_size, clock
+        )
+        self.issued = 0
+        self.coalesced = 0
+        self._issued_total = LLM_COALESCED_REQUESTS.labels(name, "issued")
+        self._coalesced_total = LLM_COALESCED_REQUESTS.labels(name, "coalesced")
+        self._in_flight: dict[RequestKey, asyncio.Task[ModelResponse]] = {}
+        self.logger = logger.bind(service="ai_coalesce", model=provider.model)
+
+    @override
+    def reset(self) -> None:
+        """Clear the provider's history and the response cache."""
+        self.chat_history = []
+        self.cache.clear()
+        self.provider.reset()
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        """
+        Generate a response, reusing a cached one if there is one.
+
+        Blocking calls are not coalesced.
+
+        Args:
+            prompt (str): Input prompt for content generation
+            response_mime_type (str | None): Expected MIME type for the response
+            response_schema (Any | None): Schema defining the response structure
+
+        Returns:
+            ModelResponse: The cached or newly generated response
+        """
+        key = self._key(prompt, response_mime_type, response_schema)
+        cached = self._cached(key, prompt)
+        if cached is not None:
+            return cached
+        self.issued += 1
+        self._issued_total.inc()
+        response = self.provider.generate(prompt, response_mime_type, response_schema)
+        self._store(key, prompt, response)
+        return response
+
+    @override
+    async def agenerate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        """
+        Generate a response, sharing an identical in-flight request if any.
+
+        Args:
+            prompt (str): Input prompt for content generation
+            response_mime_type (str | None): Expected MIME type for the response
+            response_schema (Any | None): Schema defining the response structure
+
+        Returns:
+            ModelResponse: The cached, shared or newly generated response
+        """
+        key = self._key(prompt, response_mime_type, response_schema)
+        cached = self._cached(key, prompt)
+        if cached is not None:
+            return cached
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            self._coalesced_total.inc()
+            self.logger.debug("generate_coalesced", waiting=self.coalesced)
+            return await asyncio.shield(task)
+        self.issued += 1
+        self._issued_total.inc()
+        task = asyncio.create_task(
+            self.provider.agenerate(prompt, response_mime_type, response_schema)
+        )
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._settle(key, prompt, done))
+        return await asyncio.shield(task)
+
+    @override
+    def send_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        """Send a message in a conversational context, never coalesced."""
+        return self.provider.send_message(msg, chat_history)
+
+    @override
+    async def asend_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        """Async variant of `send_message`, never coalesced."""
+        return await self.provider.asend_message(msg, chat_history)
+
+    @override
+    async def astream_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> AsyncIterator[str]:
+        """Stream a reply in a conversational context, never coalesced."""
+        async for chunk in self.provider.astream_message(msg, chat_history):
+            yield chunk
+
+    def _key(
+        self, prompt: str, response_mime_type: str | None, response_schema: Any
+    ) -> RequestKey:
+        """Identify a generate request."""
+        schema = (
+            response_schema
+            if isinstance(response_schema, Hashable)
+            else repr(response_schema)
+        )
+        return (self.model, prompt, response_mime_type, schema)
+
+    def _cached(self, key: RequestKey, prompt: str) -> ModelResponse | None:
+        """Return the cached response for a request, if it may be cached."""
+        if self.cache_ttl <= 0 or not self.cacheable(prompt):
+            return None
+        return self.cache.get(key)
+
+    def _store(self, key: RequestKey, prompt: str, response: ModelResponse) -> None:
+        """Cache a response if its prompt allows it."""
+        if self.cache_ttl > 0 and self.cacheable(prompt):
+            self.cache.set(key, response)
+
+    def _settle(
+        self, key: RequestKey, prompt: str, task: asyncio.Task[ModelResponse]
+    ) -> None:
+        """Retire a finished upstream call and cache its response."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._store(key, prompt, task.result())
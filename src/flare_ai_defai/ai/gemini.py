@@ -6,6 +6,7 @@ with Google's Generative AI service. It handles chat sessions, content generatio
 and message management while maintaining a consistent AI personality.
 """
 
+from collections.abc import AsyncIterator
 from typing import Any, override
 
 import google.generativeai as genai
@@ -16,6 +17,7 @@ from flare_ai_defai.ai.base import BaseAIProvider, ModelResponse
 
 logger = structlog.get_logger(__name__)
 
+EMBEDDING_MODEL = "models/text-embedding-004"
 
 SYSTEM_INSTRUCTION = """
 You are Artemis, an AI assistant specialized in helping users navigate
@@ -72,6 +74,7 @@ class GeminiProvider(BaseAIProvider):
             model (str): Gemini model identifier to use
             **kwargs (str): Additional configuration parameters including:
                 - system_instruction: Custom system prompt for the AI personality
+                - embedding_model: Model used by `aembed`
         """
         genai.configure(api_key=api_key)  # pyright: ignore [reportPrivateImportUsage]
         self.chat: genai.ChatSession | None = None  # pyright: ignore [reportPrivateImportUsage]
@@ -82,6 +85,7 @@ class GeminiProvider(BaseAIProvider):
         self.chat_history: list[ContentDict] = [
             ContentDict(parts=["Hi, I'm Artemis"], role="model")
         ]
+        self.embedding_model = kwargs.get("embedding_model", EMBEDDING_MODEL)
         self.logger = logger.bind(service="gemini")
 
     @override
@@ -119,6 +123,7 @@ class GeminiProvider(BaseAIProvider):
                 - metadata: Additional response information including:
                     - candidate_count: Number of generated candidates
                     - prompt_feedback: Feedback on the input prompt
+                    - usage: Prompt and completion token counts
         """
         response = self.model.generate_content(
             prompt,
@@ -127,27 +132,52 @@ class GeminiProvider(BaseAIProvider):
             ),
         )
         self.logger.debug("generate", prompt=prompt, response_text=response.text)
-        return ModelResponse(
-            text=response.text,
-            raw_response=response,
-            metadata={
-                "candidate_count": len(response.candidates),
-                "prompt_feedback": response.prompt_feedback,
-            },
+        return self._to_model_response(response)
+
+    @override
+    async def agenerate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        """
+        Generate content using Gemini's native async client.
+
+        Args:
+            prompt (str): Input prompt for content generation
+            response_mime_type (str | None): Expected MIME type for the response
+            response_schema (Any | None): Schema defining the response structure
+
+        Returns:
+            ModelResponse: Generated content with metadata, as for `generate`
+        """
+        response = await self.model.generate_content_async(
+            prompt,
+            generation_config=genai.GenerationConfig(  # pyright: ignore [reportPrivateImportUsage]
+                response_mime_type=response_mime_type, response_schema=response_schema
+            ),
         )
+        self.logger.debug("agenerate", prompt=prompt, response_text=response.text)
+        return self._to_model_response(response)
 
     @override
     def send_message(
         self,
         msg: str,
+        chat_history: list[ContentDict] | None = None,
     ) -> ModelResponse:
         """
         Send a message in a chat session and get the response.
 
         Initializes a new chat session if none exists, using the current chat history.
+        When `chat_history` is given, a short-lived chat session is started from it
+        instead and the new user/model turn is appended to that list, so one
+        provider can serve many independent conversations.
 
         Args:
             msg (str): Message to send to the chat session
+            chat_history (list[ContentDict] | None): Conversation to continue
 
         Returns:
             ModelResponse: Response from the chat session including:
@@ -157,15 +187,112 @@ class GeminiProvider(BaseAIProvider):
                     - candidate_count: Number of generated candidates
                     - prompt_feedback: Feedback on the input message
         """
+        chat = self._get_chat(chat_history)
+        response = chat.send_message(msg)
+        self.logger.debug("send_message", msg=msg, response_text=response.text)
+        self._record_turn(chat_history, msg, response.text)
+        return self._to_model_response(response)
+
+    @override
+    async def asend_message(
+        self,
+        msg: str,
+        chat_history: list[ContentDict] | None = None,
+    ) -> ModelResponse:
+        """
+        Send a message in a chat session using Gemini's native async client.
+
+        Args:
+            msg (str): Message to send to the chat session
+            chat_history (list[ContentDict] | None): Conversation to continue
+
+        Returns:
+            ModelResponse: Response from the chat session, as for `send_message`
+        """
+        chat = self._get_chat(chat_history)
+        response = await chat.send_message_async(msg)
+        self.logger.debug("asend_message", msg=msg, response_text=response.text)
+        self._record_turn(chat_history, msg, response.text)
+        return self._to_model_response(response)
+
+    @override
+    async def astream_message(
+        self,
+        msg: str,
+        chat_history: list[ContentDict] | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Send a message in a chat session, streaming the reply as it is generated.
+
+        Uses `send_message_async(stream=True)`; the completed turn is recorded in
+        `chat_history` once the stream has been fully consumed.
+
+        Args:
+            msg (str): Message to send to the chat session
+            chat_history (list[ContentDict] | None): Conversation to continue
+
+        Yields:
+            str: Successive chunks of the response text
+        """
+        chat = self._get_chat(chat_history)
+        response = await chat.send_message_async(msg, stream=True)
+        chunks: list[str] = []
+        async for chunk in response:
+            chunks.append(chunk.text)
+            yield chunk.text
+        response_text = "".join(chunks)
+        self.logger.debug("astream_message", msg=msg, response_text=response_text)
+        self._record_turn(chat_history, msg, response_text)
+
+    async def aembed(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed a batch of texts with Gemini's embedding model.
+
+        Args:
+            texts (list[str]): Texts to embed
+
+        Returns:
+            list[list[float]]: One embedding vector per text
+        """
+        result = await genai.embed_content_async(  # pyright: ignore [reportPrivateImportUsage]
+            model=self.embedding_model, content=texts
+        )
+        return result["embedding"]
+
+    def _get_chat(self, chat_history: list[ContentDict] | None) -> genai.ChatSession:  # pyright: ignore [reportPrivateImportUsage]
+        """Return the chat session to send on, per-call if history is given."""
+        if chat_history is not None:
+            return self.model.start_chat(history=chat_history)
         if not self.chat:
             self.chat = self.model.start_chat(history=self.chat_history)
-        response = self.chat.send_message(msg)
-        self.logger.debug("send_message", msg=msg, response_text=response.text)
+        return self.chat
+
+    @staticmethod
+    def _record_turn(
+        chat_history: list[ContentDict] | None, msg: str, response_text: str
+    ) -> None:
+        """Append a completed turn to a caller-owned chat history."""
+        if chat_history is None:
+            return
+        chat_history.append(ContentDict(parts=[msg], role="user"))
+        chat_history.append(ContentDict(parts=[response_text], role="model"))
+
+    @staticmethod
+    def _to_model_response(response: Any) -> ModelResponse:
+        """Wrap a Gemini response in the provider-agnostic ModelResponse."""
+        usage = getattr(response, "usage_metadata", None)
         return ModelResponse(
             text=response.text,
             raw_response=response,
             metadata={
                 "candidate_count": len(response.candidates),
                 "prompt_feedback": response.prompt_feedback,
+                # Same shape as OpenRouter's usage, for token metrics
+                "usage": None
+                if usage is None
+                else {
+                    "prompt_tokens": usage.prompt_token_count,
+                    "completion_tokens": usage.candidates_token_count,
+                },
             },
         )
@@ -0,0 +1,185 @@
+"""
+AI Provider Metrics Module
+
+This module wraps an AI provider to record, for every call that reaches it,
+how long the provider took to answer and how many tokens were sent and
+received, labelled by the name of the prompt the call was made with.
+"""
+
+from collections.abc import AsyncIterator, Callable
+from itertools import islice
+from typing import Any, override
+
+from flare_ai_defai.ai.base import (
+    BaseAIProvider,
+    ModelResponse,
+    entry_text,
+    estimate_tokens,
+)
+from flare_ai_defai.metrics import (
+    LLM_REQUEST_SECONDS,
+    LLM_REQUESTS_IN_FLIGHT,
+    LLM_TOKENS,
+)
+
+# Prompt label of conversational messages, which are not built from a prompt
+CHAT_PROMPT = "chat"
+UNKNOWN_PROMPT = "other"
+
+
+class MeteredProvider(BaseAIProvider):
+    """
+    AI provider recording latency and token metrics of another provider.
+
+    Token counts come from the usage the provider reports, or are estimated
+    from the text when it reports none. Conversational messages are labelled
+    "chat", and generate calls with the name `identify` gives their prompt.
+
+    Attributes:
+        provider (BaseAIProvider): Provider the calls are sent to
+        identify (Callable[[str], str | None]): Name of the prompt a formatted
+            prompt was built from, None if unknown
+    """
+
+    def __init__(
+        self,
+        provider: BaseAIProvider,
+        identify: Callable[[str], str | None] | None = None,
+    ) -> None:
+        """
+        Initialize the metered provider.
+
+        Args:
+            provider (BaseAIProvider): Provider the calls are sent to
+            identify (Callable[[str], str | None] | None): Name of the prompt
+                a formatted prompt was built from, defaults to labelling every
+                generate call "other"
+        """
+        super().__init__("", provider.model)
+        self.provider = provider
+        self.identify = identify or (lambda _: None)
+        self._in_flight = LLM_REQUESTS_IN_FLIGHT.labels()
+
+    @override
+    def reset(self) -> None:
+        """Clear the provider's history."""
+        self.chat_history = []
+        self.provider.reset()
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        """Generate a response, recording its latency and tokens."""
+        name = self._prompt_name(prompt)
+        with (
+            self._in_flight.track_inprogress(),
+            LLM_REQUEST_SECONDS.labels(name, "generate").time(),
+        ):
+            response = self.provider.generate(
+                prompt, response_mime_type, response_schema
+            )
+        self._count(name, lambda: prompt, response.text, response.metadata)
+        return response
+
+    @override
+    async def agenerate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        """Async variant of `generate`, recording latency and tokens."""
+        name = self._prompt_name(prompt)
+        with (
+            self._in_flight.track_inprogress(),
+            LLM_REQUEST_SECONDS.labels(name, "generate").time(),
+        ):
+            response = await self.provider.agenerate(
+                prompt, response_mime_type, response_schema
+            )
+        self._count(name, lambda: prompt, response.text, response.metadata)
+        return response
+
+    @override
+    def send_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        """Send a conversational message, recording its latency and tokens."""
+        sent = self._context(msg, chat_history)
+        with (
+            self._in_flight.track_inprogress(),
+            LLM_REQUEST_SECONDS.labels(CHAT_PROMPT, "send").time(),
+        ):
+            response = self.provider.send_message(msg, chat_history)
+        self._count(CHAT_PROMPT, sent, response.text, response.metadata)
+        return response
+
+    @override
+    async def asend_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        """Async variant of `send_message`, recording latency and tokens."""
+        sent = self._context(msg, chat_history)
+        with (
+            self._in_flight.track_inprogress(),
+            LLM_REQUEST_SECONDS.labels(CHAT_PROMPT, "send").time(),
+        ):
+            response = await self.provider.asend_message(msg, chat_history)
+        self._count(CHAT_PROMPT, sent, response.text, response.metadata)
+        return response
+
+    @override
+    async def astream_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a conversational reply, recording latency and tokens.
+
+        The latency recorded is the time until the stream ends.
+        """
+        sent = self._context(msg, chat_history)
+        chunks: list[str] = []
+        with (
+            self._in_flight.track_inprogress(),
+            LLM_REQUEST_SECONDS.labels(CHAT_PROMPT, "stream").time(),
+        ):
+            async for chunk in self.provider.astream_message(msg, chat_history):
+                chunks.append(chunk)
+                yield chunk
+        self._count(CHAT_PROMPT, sent, "".join(chunks), {})
+
+    def _prompt_name(self, prompt: str) -> str:
+        return self.identify(prompt) or UNKNOWN_PROMPT
+
+    @staticmethod
+    def _context(msg: str, chat_history: list[Any] | None) -> Callable[[], str]:
+        """
+        Text sent with a conversational message, history included.
+
+        Returns a callable so the history is only joined when tokens must be
+        estimated. Providers append the new turn to the history, so only the
+        entries present before the call are read.
+        """
+        history = chat_history or []
+        turns = len(history)
+        return lambda: "".join(map(entry_text, islice(history, turns))) + msg
+
+    @staticmethod
+    def _count(
+        name: str, sent: Callable[[], str], received: str, metadata: dict[str, Any]
+    ) -> None:
+        usage = metadata.get("usage") or {}
+        prompt_tokens = usage.get("prompt_tokens")
+        completion_tokens = usage.get("completion_tokens")
+        LLM_TOKENS.labels(name, "prompt").inc(
+            estimate_tokens(sent()) if prompt_tokens is None else prompt_tokens
+        )
+        LLM_TOKENS.labels(name, "completion").inc(
+            estimate_tokens(received)
+            if completion_tokens is None
+            else completion_tokens
+        )
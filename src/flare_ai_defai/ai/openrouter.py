@@ -1,9 +1,133 @@
+import json
+from collections.abc import AsyncIterator
+from functools import cache
+from importlib.util import find_spec
+from typing import Any, override
+
+import httpx
+import structlog
+from pydantic import TypeAdapter
+
 from flare_ai_defai.ai.base import (
     AsyncBaseRouter,
+    BaseAIProvider,
     BaseRouter,
     ChatRequest,
     CompletionRequest,
+    Message,
+    ModelResponse,
 )
+from flare_ai_defai.ai.gemini import SYSTEM_INSTRUCTION
+from flare_ai_defai.exceptions import AIProviderError
+
+logger = structlog.get_logger(__name__)
+
+OPENROUTER_URL = "https://openrouter.ai/api/v1"
+
+# httpx only speaks HTTP/2 with the optional h2 package installed
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+# JSON schemas must describe an object, so enum answers are wrapped in one
+ENUM_KEY = "value"
+
+
+def create_http_client(
+    timeout: float = 30.0,
+    max_connections: int = 100,
+    keepalive_expiry: float = 30.0,
+) -> httpx.AsyncClient:
+    """
+    Build a keep-alive HTTP client to share between LLM providers.
+
+    Connections are kept open between requests and multiplexed over HTTP/2
+    when the h2 package is installed, so a chat message does not pay for a
+    TCP and TLS handshake.
+
+    :param timeout: Seconds to wait for a response
+    :param max_connections: Most connections open at once
+    :param keepalive_expiry: Seconds an idle connection is kept for reuse
+    :return: The shared client, to be closed by the caller
+    """
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        timeout=timeout,
+        headers={"accept": "application/json"},
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+    )
+
+
+@cache
+def _json_schema(response_schema: Any) -> dict[str, Any]:
+    """
+    JSON schema of an enum or TypedDict, without its docstring.
+
+    :param response_schema: Enum or TypedDict
+    :return: The schema, shared between calls and not to be modified
+    """
+    schema = TypeAdapter(response_schema).json_schema()
+    schema.pop("description", None)
+    return schema
+
+
+def response_format(
+    response_mime_type: str | None, response_schema: Any | None
+) -> dict[str, Any] | None:
+    """
+    Translate Gemini's structured output options to a chat completions
+    `response_format`.
+
+    A schema is sent as a strict JSON schema; an enum ("text/x.enum") is asked
+    for as an object holding the enum value under `ENUM_KEY`. Without a schema,
+    "application/json" only asks for some JSON object.
+
+    :param response_mime_type: Expected MIME type of the response
+    :param response_schema: Enum or TypedDict the response must follow
+    :return: The response format, or None for free text
+    """
+    if response_schema is None:
+        if response_mime_type == "application/json":
+            return {"type": "json_object"}
+        return None
+    schema = _json_schema(response_schema)
+    name = schema.get("title", "response")
+    if response_mime_type == "text/x.enum":
+        schema = {
+            "type": "object",
+            "properties": {ENUM_KEY: schema},
+            "required": [ENUM_KEY],
+        }
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "strict": True,
+            "schema": {**schema, "additionalProperties": False},
+        },
+    }
+
+
+def to_message(entry: dict[str, Any]) -> Message:
+    """
+    Convert a chat history entry to an OpenAI-style chat message.
+
+    Session histories hold Gemini `ContentDict` entries (`parts` and a `user`
+    or `model` role), so conversations can move between providers.
+
+    :param entry: Chat history entry
+    :return: Chat completions message
+    """
+    if "content" in entry:
+        return Message(role=entry["role"], content=entry["content"])
+    content = "".join(
+        part.get("text", "") if isinstance(part, dict) else str(part)
+        for part in entry.get("parts", [])
+    )
+    role = "assistant" if entry.get("role") == "model" else entry.get("role", "user")
+    return Message(role=role, content=content)
 
 
 class OpenRouterProvider(BaseRouter):
@@ -110,3 +234,335 @@ class AsyncOpenRouterProvider(AsyncBaseRouter):
         """
         endpoint = "/chat/completions"
         return await self._post(endpoint, payload)
+
+
+class OpenRouterChatProvider(BaseAIProvider):
+    """
+    AI provider backed by the OpenRouter chat completions API.
+
+    Implements the async `BaseAIProvider` interface natively over a shared
+    keep-alive `httpx.AsyncClient`, and reads and records chat history in the
+    same format as `GeminiProvider`, so either can continue a conversation.
+    The blocking methods use a separate lazily created client.
+
+    Attributes:
+        base_url (str): URL of the OpenRouter API
+        client (httpx.AsyncClient): HTTP client for async requests
+        chat_history (list[dict[str, Any]]): History used when none is passed
+        logger (BoundLogger): Structured logger for the provider
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        api_key: str,
+        model: str,
+        *,
+        base_url: str = OPENROUTER_URL,
+        client: httpx.AsyncClient | None = None,
+        system_instruction: str = SYSTEM_INSTRUCTION,
+        timeout: float = 30.0,
+    ) -> None:
+        """
+        Initialize the OpenRouter provider.
+
+        Args:
+            api_key (str): OpenRouter API key
+            model (str): Model identifier, e.g. "openai/gpt-4o-mini"
+            base_url (str): URL of the OpenRouter API
+            client (httpx.AsyncClient | None): Shared client from
+                `create_http_client`; the provider creates and owns one if None
+            system_instruction (str): System prompt for the AI personality
+            timeout (float): Seconds to wait for a response
+        """
+        super().__init__(api_key, model)
+        self.base_url = base_url.rstrip("/")
+        self.system_instruction = system_instruction
+        self.timeout = timeout
+        self.client = create_http_client(timeout) if client is None else client
+        self._owns_client = client is None
+        self._sync_client: httpx.Client | None = None
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.chat_history: list[dict[str, Any]] = [
+            {"parts": ["Hi, I'm Artemis"], "role": "model"}
+        ]
+        self.logger = logger.bind(service="openrouter")
+
+    @override
+    def reset(self) -> None:
+        """Clear the provider's own chat history."""
+        self.chat_history = []
+        self.logger.debug("reset_openrouter")
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        """
+        Generate a response without conversation context.
+
+        Args:
+            prompt (str): Input prompt for content generation
+            response_mime_type (str | None): Expected MIME type, as for Gemini
+            response_schema (Any | None): Enum or TypedDict the response must
+                follow, sent as a JSON schema; enum answers are returned as
+                the bare value, as Gemini returns them
+
+        Returns:
+            ModelResponse: Generated text, with the model, finish reason and
+                token usage as metadata
+        """
+        payload = self._payload(
+            [Message(role="user", content=prompt)], response_mime_type, response_schema
+        )
+        response = self._to_model_response(self._post_sync(payload))
+        if response_mime_type == "text/x.enum" and response_schema is not None:
+            response = self._unwrap_enum(response)
+        self.logger.debug("generate", prompt=prompt, response_text=response.text)
+        return response
+
+    @override
+    async def agenerate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        """
+        Generate a response without conversation context, asynchronously.
+
+        Args:
+            prompt (str): Input prompt for content generation
+            response_mime_type (str | None): As for `generate`
+            response_schema (Any | None): As for `generate`
+
+        Returns:
+            ModelResponse: Generated text and metadata, as for `generate`
+        """
+        payload = self._payload(
+            [Message(role="user", content=prompt)], response_mime_type, response_schema
+        )
+        response = self._to_model_response(await self._post(payload))
+        if response_mime_type == "text/x.enum" and response_schema is not None:
+            response = self._unwrap_enum(response)
+        self.logger.debug("agenerate", prompt=prompt, response_text=response.text)
+        return response
+
+    @override
+    def send_message(
+        self, msg: str, chat_history: list[dict[str, Any]] | None = None
+    ) -> ModelResponse:
+        """
+        Send a message in a conversational context.
+
+        Args:
+            msg (str): Message to send
+            chat_history (list[dict[str, Any]] | None): Conversation to
+                continue, the provider's own history if None
+
+        Returns:
+            ModelResponse: Reply and metadata, as for `generate`
+        """
+        history = self.chat_history if chat_history is None else chat_history
+        payload = self._payload(self._messages(msg, history))
+        response = self._to_model_response(self._post_sync(payload))
+        self.logger.debug("send_message", msg=msg, response_text=response.text)
+        self._record_turn(history, msg, response.text)
+        return response
+
+    @override
+    async def asend_message(
+        self, msg: str, chat_history: list[dict[str, Any]] | None = None
+    ) -> ModelResponse:
+        """
+        Send a message in a conversational context, asynchronously.
+
+        Args:
+            msg (str): Message to send
+            chat_history (list[dict[str, Any]] | None): Conversation to
+                continue, the provider's own history if None
+
+        Returns:
+            ModelResponse: Reply and metadata, as for `generate`
+        """
+        history = self.chat_history if chat_history is None else chat_history
+        payload = self._payload(self._messages(msg, history))
+        response = self._to_model_response(await self._post(payload))
+        self.logger.debug("asend_message", msg=msg, response_text=response.text)
+        self._record_turn(history, msg, response.text)
+        return response
+
+    @override
+    async def astream_message(
+        self, msg: str, chat_history: list[dict[str, Any]] | None = None
+    ) -> AsyncIterator[str]:
+        """
+        Send a message in a conversational context, streaming the reply.
+
+        Reads the server-sent events of a `stream: true` completion; the turn
+        is recorded once the stream has been fully consumed.
+
+        Args:
+            msg (str): Message to send
+            chat_history (list[dict[str, Any]] | None): Conversation to
+                continue, the provider's own history if None
+
+        Yields:
+            str: Successive chunks of the response text
+
+        Raises:
+            AIProviderError: If the request fails or the stream is malformed
+        """
+        history = self.chat_history if chat_history is None else chat_history
+        payload = {**self._payload(self._messages(msg, history)), "stream": True}
+        chunks: list[str] = []
+        try:
+            async with self.client.stream(
+                "POST", self._url, json=payload, headers=self.headers
+            ) as response:
+                if response.status_code != httpx.codes.OK:
+                    await response.aread()
+                    self._check(response)
+                async for line in response.aiter_lines():
+                    # Other lines are blank separators or keep-alive comments
+                    if not line.startswith("data:"):
+                        continue
+                    data = line.removeprefix("data:").strip()
+                    if data == "[DONE]":
+                        break
+                    text = self._delta_text(data)
+                    if text:
+                        chunks.append(text)
+                        yield text
+        except httpx.HTTPError as e:
+            msg = f"OpenRouter request failed: {e!r}"
+            raise AIProviderError(msg) from e
+        response_text = "".join(chunks)
+        self.logger.debug("astream_message", msg=msg, response_text=response_text)
+        self._record_turn(history, msg, response_text)
+
+    async def close(self) -> None:
+        """Close the HTTP clients the provider created itself."""
+        if self._owns_client:
+            await self.client.aclose()
+        if self._sync_client is not None:
+            self._sync_client.close()
+
+    @property
+    def _url(self) -> str:
+        return f"{self.base_url}/chat/completions"
+
+    def _messages(self, msg: str, history: list[dict[str, Any]]) -> list[Message]:
+        """Build the messages of a chat completion continuing `history`."""
+        messages = [Message(role="system", content=self.system_instruction)]
+        messages.extend(to_message(entry) for entry in history)
+        messages.append(Message(role="user", content=msg))
+        return messages
+
+    def _payload(
+        self,
+        messages: list[Message],
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> dict[str, Any]:
+        payload: dict[str, Any] = {"model": self.model, "messages": messages}
+        format_ = response_format(response_mime_type, response_schema)
+        if format_ is not None:
+            payload["response_format"] = format_
+        return payload
+
+    async def _post(self, payload: dict[str, Any]) -> dict[str, Any]:
+        try:
+            response = await self.client.post(
+                self._url, json=payload, headers=self.headers
+            )
+        except httpx.HTTPError as e:
+            msg = f"OpenRouter request failed: {e!r}"
+            raise AIProviderError(msg) from e
+        return self._check(response)
+
+    def _post_sync(self, payload: dict[str, Any]) -> dict[str, Any]:
+        if self._sync_client is None:
+            self._sync_client = httpx.Client(
+                timeout=self.timeout, headers={"accept": "application/json"}
+            )
+        try:
+            response = self._sync_client.post(
+                self._url, json=payload, headers=self.headers
+            )
+        except httpx.HTTPError as e:
+            msg = f"OpenRouter request failed: {e!r}"
+            raise AIProviderError(msg) from e
+        return self._check(response)
+
+    @staticmethod
+    def _check(response: httpx.Response) -> dict[str, Any]:
+        """Return the JSON body of a successful response."""
+        if response.status_code != httpx.codes.OK:
+            msg = f"Error ({response.status_code}): {response.text}"
+            raise AIProviderError(msg)
+        try:
+            return response.json()
+        except ValueError as e:
+            msg = f"Malformed response from OpenRouter: {response.text}"
+            raise AIProviderError(msg) from e
+
+    @staticmethod
+    def _delta_text(data: str) -> str | None:
+        """Extract the text of one streamed completion chunk."""
+        try:
+            chunk = json.loads(data)
+        except ValueError as e:
+            msg = f"Malformed stream chunk from OpenRouter: {data}"
+            raise AIProviderError(msg) from e
+        if "error" in chunk:
+            msg = f"OpenRouter stream failed: {chunk['error']}"
+            raise AIProviderError(msg)
+        choices = chunk.get("choices") or [{}]
+        return choices[0].get("delta", {}).get("content")
+
+    @staticmethod
+    def _record_turn(
+        history: list[dict[str, Any]], msg: str, response_text: str
+    ) -> None:
+        """Append a completed turn, in the format GeminiProvider records."""
+        history.append({"parts": [msg], "role": "user"})
+        history.append({"parts": [response_text], "role": "model"})
+
+    @staticmethod
+    def _unwrap_enum(response: ModelResponse) -> ModelResponse:
+        """Return the enum value of a response wrapped by `response_format`."""
+        try:
+            value = json.loads(response.text)[ENUM_KEY]
+        except (ValueError, KeyError, TypeError):
+            # Models without structured outputs may answer with the bare value
+            return response
+        return ModelResponse(
+            text=str(value),
+            raw_response=response.raw_response,
+            metadata=response.metadata,
+        )
+
+    @staticmethod
+    def _to_model_response(body: dict[str, Any]) -> ModelResponse:
+        """Wrap a chat completion in the provider-agnostic ModelResponse."""
+        if "error" in body:
+            msg = f"OpenRouter request failed: {body['error']}"
+            raise AIProviderError(msg)
+        try:
+            choice = body["choices"][0]
+            text = choice["message"]["content"] or ""
+        except (KeyError, IndexError, TypeError) as e:
+            msg = f"Malformed response from OpenRouter: {body}"
+            raise AIProviderError(msg) from e
+        return ModelResponse(
+            text=text,
+            raw_response=body,
+            metadata={
+                "model": body.get("model"),
+                "finish_reason": choice.get("finish_reason"),
+                "usage": body.get("usage"),
+            },
+        )
@@ -0,0 +1,515 @@
+"""
+AI Provider Pool Module
+
+This module spreads AI requests over several interchangeable providers (for
+example Gemini and OpenRouter). Each request goes to the healthy provider with
+the lowest observed latency; a provider that keeps failing is taken out of
+rotation by a circuit breaker until a probe request succeeds again, and an
+optional hedged request to the next provider bounds the tail latency a single
+slow upstream can cause.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, override
+
+import structlog
+
+from flare_ai_defai.ai.base import BaseAIProvider, ModelResponse
+from flare_ai_defai.exceptions import AIProviderError
+
+logger = structlog.get_logger(__name__)
+
+
+class BreakerState(str, Enum):
+    """State of a provider's circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Circuit breaker guarding one provider.
+
+    Closed, it lets every request through. After `failure_threshold`
+    consecutive failures it opens and rejects requests for `reset_timeout`
+    seconds, then lets a single probe through (half-open): a success closes
+    it again, a failure reopens it.
+
+    Attributes:
+        failure_threshold (int): Consecutive failures that open the breaker
+        reset_timeout (float): Seconds an open breaker rejects requests
+        clock (Callable[[], float]): Monotonic time source
+        state (BreakerState): Current state
+        failures (int): Consecutive failures so far
+        opened_at (float): Clock time the breaker last opened
+    """
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    clock: Callable[[], float] = time.monotonic
+    state: BreakerState = BreakerState.CLOSED
+    failures: int = 0
+    opened_at: float = 0.0
+    _probing: bool = field(default=False, repr=False)
+
+    def available(self) -> bool:
+        """Whether a request would currently be let through."""
+        if self.state is BreakerState.CLOSED:
+            return True
+        if self.state is BreakerState.OPEN:
+            return self.clock() - self.opened_at >= self.reset_timeout
+        return not self._probing
+
+    def allow(self) -> bool:
+        """
+        Claim permission to send a request.
+
+        Returns:
+            bool: True if the request may be sent. In the half-open state
+                only one probe is allowed until it completes.
+        """
+        if not self.available():
+            return False
+        if self.state is not BreakerState.CLOSED:
+            self.state = BreakerState.HALF_OPEN
+            self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the breaker if needed."""
+        self.failures += 1
+        self._probing = False
+        if (
+            self.state is BreakerState.HALF_OPEN
+            or self.failures >= self.failure_threshold
+        ):
+            self.state = BreakerState.OPEN
+            self.opened_at = self.clock()
+
+    def release(self) -> None:
+        """Give back a claim whose request was abandoned without an outcome."""
+        self._probing = False
+
+
+@dataclass
+class PoolMember:
+    """
+    A provider in a ProviderPool and what the pool has observed of it.
+
+    Attributes:
+        name (str): Name used in logs
+        provider (BaseAIProvider): The provider
+        breaker (CircuitBreaker): Breaker guarding the provider
+        latency (float | None): Moving average of response time in seconds,
+            None until the first response
+        requests (int): Requests sent to the provider
+        failures (int): Requests that failed
+        hedges (int): Requests sent as a hedge for a slower provider
+    """
+
+    name: str
+    provider: BaseAIProvider
+    breaker: CircuitBreaker
+    latency: float | None = None
+    requests: int = 0
+    failures: int = 0
+    hedges: int = 0
+
+    def observe(self, elapsed: float, alpha: float) -> None:
+        """Fold a response time into the latency moving average."""
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            self.latency += alpha * (elapsed - self.latency)
+
+
+class ProviderPool(BaseAIProvider):
+    """
+    AI provider spreading requests over several providers.
+
+    Members are ranked by latency (members not yet measured first, so each
+    one is tried) and a request goes to the first whose breaker lets it
+    through. A failed request fails over to the next member straight away.
+    With `hedge_after` set, a request still unanswered after that many
+    seconds is also sent to the next member and the first reply wins; the
+    other is cancelled.
+
+    Conversation turns are recorded in the caller's chat history only once,
+    from the member that answered, so members must share a history format.
+
+    Attributes:
+        members (list[PoolMember]): Pooled providers and their statistics
+        hedge_after (float | None): Seconds before a hedged request is sent
+        logger (BoundLogger): Structured logger for the pool
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        providers: Mapping[str, BaseAIProvider],
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        hedge_after: float | None = None,
+        latency_alpha: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            providers (Mapping[str, BaseAIProvider]): Providers by name
+            failure_threshold (int): Consecutive failures that take a
+                provider out of rotation
+            reset_timeout (float): Seconds before a failing provider is probed
+            hedge_after (float | None): Seconds to wait before hedging, None
+                to never hedge
+            latency_alpha (float): Weight of the newest response time in the
+                latency moving average
+            clock (Callable[[], float]): Monotonic time source
+
+        Raises:
+            ValueError: If no providers are given.
+        """
+        if not providers:
+            msg = "ProviderPool needs at least one provider"
+            raise ValueError(msg)
+        super().__init__("", ",".join(providers))
+        self.members = [
+            PoolMember(
+                name=name,
+                provider=provider,
+                breaker=CircuitBreaker(failure_threshold, reset_timeout, clock),
+            )
+            for name, provider in providers.items()
+        ]
+        self.hedge_after = hedge_after
+        self.latency_alpha = latency_alpha
+        self.clock = clock
+        self.logger = logger.bind(service="ai_pool")
+
+    @override
+    def reset(self) -> None:
+        """Clear the pool's own history and that of every member."""
+        self.chat_history = []
+        for member in self.members:
+            member.provider.reset()
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        """
+        Generate a response, failing over between members in turn.
+
+        Blocking calls are never hedged.
+
+        Args:
+            prompt (str): Input prompt for content generation
+            response_mime_type (str | None): Expected MIME type for the response
+            response_schema (Any | None): Schema defining the response structure
+
+        Returns:
+            ModelResponse: Response of the first member that succeeded
+
+        Raises:
+            AIProviderError: If every available member failed
+        """
+        return self._call_sync(
+            lambda p: p.generate(prompt, response_mime_type, response_schema)
+        )
+
+    @override
+    async def agenerate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        """
+        Generate a response from the fastest healthy member.
+
+        Args:
+            prompt (str): Input prompt for content generation
+            response_mime_type (str | None): Expected MIME type for the response
+            response_schema (Any | None): Schema defining the response structure
+
+        Returns:
+            ModelResponse: Response of the member that answered first
+
+        Raises:
+            AIProviderError: If every available member failed
+        """
+        return await self._call(
+            lambda p: p.agenerate(prompt, response_mime_type, response_schema)
+        )
+
+    @override
+    def send_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        """
+        Send a message in a conversational context, failing over in turn.
+
+        Args:
+            msg (str): Message to send
+            chat_history (list[Any] | None): Conversation to continue, the
+                pool's own history if None
+
+        Returns:
+            ModelResponse: Reply of the first member that succeeded
+
+        Raises:
+            AIProviderError: If every available member failed
+        """
+        history = self.chat_history if chat_history is None else chat_history
+
+        def send(provider: BaseAIProvider) -> tuple[ModelResponse, list[Any]]:
+            scratch = list(history)
+            response = provider.send_message(msg, scratch)
+            return response, scratch[len(history) :]
+
+        response, turn = self._call_sync(send)
+        history.extend(turn)
+        return response
+
+    @override
+    async def asend_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        """
+        Send a message in a conversational context to the fastest member.
+
+        Args:
+            msg (str): Message to send
+            chat_history (list[Any] | None): Conversation to continue, the
+                pool's own history if None
+
+        Returns:
+            ModelResponse: Reply of the member that answered first
+
+        Raises:
+            AIProviderError: If every available member failed
+        """
+        history = self.chat_history if chat_history is None else chat_history
+
+        async def send(provider: BaseAIProvider) -> tuple[ModelResponse, list[Any]]:
+            # Hedged members must not both append to the caller's history
+            scratch = list(history)
+            response = await provider.asend_message(msg, scratch)
+            return response, scratch[len(history) :]
+
+        response, turn = await self._call(send)
+        history.extend(turn)
+        return response
+
+    @override
+    async def astream_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a reply from the fastest healthy member.
+
+        Fails over to the next member until one produces its first chunk;
+        once the reply has started streaming it is not retried elsewhere.
+        Streams are never hedged.
+
+        Args:
+            msg (str): Message to send
+            chat_history (list[Any] | None): Conversation to continue, the
+                pool's own history if None
+
+        Yields:
+            str: Successive chunks of the response text
+
+        Raises:
+            AIProviderError: If every available member failed before replying
+        """
+        history = self.chat_history if chat_history is None else chat_history
+        errors: list[Exception] = []
+        for member in self._ranked():
+            if not member.breaker.allow():
+                continue
+            member.requests += 1
+            scratch = list(history)
+            stream = member.provider.astream_message(msg, scratch)
+            started = self.clock()
+            try:
+                try:
+                    first = await anext(stream, None)
+                except Exception as e:  # noqa: BLE001
+                    self._failed(member, e)
+                    errors.append(e)
+                    continue
+                # Time to first chunk is what a streaming client waits for
+                self._succeeded(member, self.clock() - started)
+                if first is not None:
+                    yield first
+                try:
+                    async for chunk in stream:
+                        yield chunk
+                except Exception as e:
+                    self._failed(member, e)
+                    raise
+            finally:
+                member.breaker.release()
+                await stream.aclose()  # pyright: ignore [reportAttributeAccessIssue]
+            history.extend(scratch[len(history) :])
+            return
+        raise self._exhausted(errors)
+
+    def _ranked(self) -> list[PoolMember]:
+        """Members whose breaker would let a request through, fastest first."""
+        available = [m for m in self.members if m.breaker.available()]
+        return sorted(
+            available, key=lambda m: (m.latency is not None, m.latency or 0.0)
+        )
+
+    def _succeeded(self, member: PoolMember, elapsed: float) -> None:
+        member.breaker.record_success()
+        member.observe(elapsed, self.latency_alpha)
+
+    def _failed(self, member: PoolMember, error: Exception) -> None:
+        member.failures += 1
+        was_open = member.breaker.state is BreakerState.OPEN
+        member.breaker.record_failure()
+        self.logger.warning("provider_failed", provider=member.name, error=str(error))
+        if not was_open and member.breaker.state is BreakerState.OPEN:
+            self.logger.warning(
+                "provider_circuit_opened",
+                provider=member.name,
+                failures=member.breaker.failures,
+            )
+
+    @staticmethod
+    def _exhausted(errors: list[Exception]) -> AIProviderError:
+        if errors:
+            msg = f"All AI providers failed, last error: {errors[-1]}"
+        else:
+            msg = "No healthy AI provider available"
+        error = AIProviderError(msg)
+        error.__cause__ = errors[-1] if errors else None
+        return error
+
+    def _call_sync[T](self, call: Callable[[BaseAIProvider], T]) -> T:
+        """Run a blocking call on the fastest member, failing over in turn."""
+        errors: list[Exception] = []
+        for member in self._ranked():
+            if not member.breaker.allow():
+                continue
+            member.requests += 1
+            started = self.clock()
+            try:
+                result = call(member.provider)
+            except Exception as e:  # noqa: BLE001
+                self._failed(member, e)
+                errors.append(e)
+                continue
+            self._succeeded(member, self.clock() - started)
+            return result
+        raise self._exhausted(errors)
+
+    async def _call[T](self, call: Callable[[BaseAIProvider], Awaitable[T]]) -> T:
+        """
+        Run a call on the fastest member, with failover and hedging.
+
+        Args:
+            call: Sends the request to the given provider
+
+        Returns:
+            The result of the first member to succeed
+
+        Raises:
+            AIProviderError: If every available member failed
+        """
+        candidates = self._ranked()
+        pending: dict[asyncio.Future[T], tuple[PoolMember, float]] = {}
+        errors: list[Exception] = []
+        hedged = False
+        try:
+            self._launch(call, candidates, pending)
+            while pending:
+                hedge = self.hedge_after is not None and not hedged and candidates
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_after if hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    # Still waiting on the primary: race it against the next
+                    hedged = True
+                    self._launch(call, candidates, pending, hedge=True)
+                    continue
+                for task in done:
+                    member, started = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:  # noqa: BLE001
+                        self._failed(member, e)
+                        errors.append(e)
+                        continue
+                    self._succeeded(member, self.clock() - started)
+                    return result
+                if not pending:
+                    self._launch(call, candidates, pending)
+            raise self._exhausted(errors)
+        finally:
+            self._abandon(pending)
+
+    def _launch[T](
+        self,
+        call: Callable[[BaseAIProvider], Awaitable[T]],
+        candidates: list[PoolMember],
+        pending: dict[asyncio.Future[T], tuple[PoolMember, float]],
+        *,
+        hedge: bool = False,
+    ) -> None:
+        """Start the call on the next candidate whose breaker allows it."""
+        while candidates:
+            member = candidates.pop(0)
+            if not member.breaker.allow():
+                continue
+            member.requests += 1
+            if hedge:
+                member.hedges += 1
+                self.logger.debug("provider_hedged", provider=member.name)
+            pending[asyncio.ensure_future(call(member.provider))] = (
+                member,
+                self.clock(),
+            )
+            return
+
+    def _abandon[T](
+        self, pending: dict[asyncio.Future[T], tuple[PoolMember, float]]
+    ) -> None:
+        """Settle the calls still outstanding once a request has completed."""
+        now = self.clock()
+        for task, (member, started) in pending.items():
+            if task.done():
+                if task.cancelled():
+                    member.breaker.release()
+                elif task.exception() is None:
+                    # A late success still shows the member is healthy
+                    self._succeeded(member, now - started)
+                else:
+                    self._failed(member, task.exception())  # pyright: ignore [reportArgumentType]
+                continue
+            task.cancel()
+            member.breaker.release()
+            # The loser took at least this long, so it stops ranking first
+            member.observe(now - started, self.latency_alpha)
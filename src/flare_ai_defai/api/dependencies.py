@@ -0,0 +1,51 @@
+"""
+Shared FastAPI dependencies for the API routers.
+"""
+
+import uuid
+
+from fastapi import Request, Response
+
+SESSION_HEADER = "X-Session-Id"
+SESSION_COOKIE = "session_id"
+MAX_SESSION_ID_LENGTH = 128
+
+
+def get_session_id(request: Request, response: Response) -> str:
+    """
+    Resolve the conversation session id for a request.
+
+    The id is read from the `X-Session-Id` header, then the `session_id`
+    cookie. A new id is generated when neither is present (or the value is
+    unusable), and it is echoed back in both the header and the cookie so
+    clients can keep the conversation going.
+
+    Args:
+        request: Incoming HTTP request
+        response: Outgoing response, used to hand the id back to the client
+
+    Returns:
+        str: The session id for this request
+    """
+    session_id = request.headers.get(SESSION_HEADER) or request.cookies.get(
+        SESSION_COOKIE
+    )
+    if not session_id or len(session_id) > MAX_SESSION_ID_LENGTH:
+        session_id = uuid.uuid4().hex
+    attach_session_id(response, session_id)
+    return session_id
+
+
+def attach_session_id(response: Response, session_id: str) -> None:
+    """
+    Hand the session id back to the client in a header and a cookie.
+
+    Routes returning a `Response` directly must call this themselves, since
+    FastAPI only merges dependency-set headers into responses it builds.
+
+    Args:
+        response: Response to attach the id to
+        session_id: Conversation session id
+    """
+    response.headers[SESSION_HEADER] = session_id
+    response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite="lax")
@@ -0,0 +1,88 @@
+"""
+Request metrics middleware.
+
+Records how long every API request takes, labelled by method, route template
+and status, and how many requests are being served. It is a plain ASGI
+middleware rather than a Starlette `BaseHTTPMiddleware`, so streamed
+responses pass through untouched and are timed until their last chunk.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from flare_ai_defai.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS_IN_FLIGHT
+
+# Route label of requests no route matched, so unknown paths cannot create
+# unbounded label values
+UNMATCHED_ROUTE = "unmatched"
+# Method label of requests with any other method, for the same reason
+OTHER_METHOD = "other"
+HTTP_METHODS = frozenset(
+    {"CONNECT", "DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT", "TRACE"}
+)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Label of the route that served a request.
+
+    Path parameter values are replaced by their names, so `/tx/0xab...` is
+    reported as `/tx/{tx_hash}`, whichever router prefix the route is under.
+
+    Args:
+        scope: ASGI scope of the request, after routing
+
+    Returns:
+        str: Path template of the matched route, or UNMATCHED_ROUTE
+    """
+    if scope.get("route") is None:
+        return UNMATCHED_ROUTE
+    path: str = scope["path"]
+    params = scope.get("path_params")
+    if not params:
+        return path
+    names = {str(value): name for name, value in params.items()}
+    return "/".join(
+        f"{{{names[segment]}}}" if segment in names else segment
+        for segment in path.split("/")
+    )
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency and requests in flight.
+
+    Attributes:
+        app (ASGIApp): Application being wrapped
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        if method not in HTTP_METHODS:
+            method = OTHER_METHOD
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            HTTP_REQUEST_SECONDS.labels(
+                method, route_template(scope), str(status)
+            ).observe(time.perf_counter() - start)
@@ -0,0 +1,82 @@
+"""
+JSON response class for the Plaid routes.
+
+Plaid responses are large trees of generated model objects. Converting them
+with `to_dict()` and then FastAPI's `jsonable_encoder` walks the tree twice
+and copies it twice before `json.dumps` walks it a third time. orjson encodes
+dicts, lists, dates and datetimes natively and calls `encode_default` only
+for the objects it does not know, so a Plaid model is encoded straight from
+its attribute store in a single pass.
+
+FastAPI still runs `jsonable_encoder` over plain return values, so routes
+returning large payloads should return a `PlaidJSONResponse` themselves.
+"""
+
+from decimal import Decimal
+from typing import Any, override
+
+import orjson
+from fastapi.responses import JSONResponse
+from plaid.model_utils import ModelComposed, ModelSimple, OpenApiModel
+
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def encode_default(obj: Any) -> Any:
+    """
+    Encode the objects orjson does not handle natively.
+
+    Plaid models become their attribute mapping (keyed by Python attribute
+    name, like `to_dict()`), enum-like models their value and Decimals
+    floats. Nested values are left to orjson, which calls back here as
+    needed.
+
+    Args:
+        obj: Object orjson could not encode
+
+    Returns:
+        Any: A value orjson can encode
+
+    Raises:
+        TypeError: If the object is of an unsupported type
+    """
+    if isinstance(obj, ModelSimple):
+        return obj.value
+    if isinstance(obj, ModelComposed):
+        # Composed models spread their attributes over the composed instances
+        merged: dict[str, Any] = {}
+        for instance in (obj, *obj._composed_instances):  # noqa: SLF001
+            merged.update(instance._data_store)  # noqa: SLF001
+        return merged
+    if isinstance(obj, OpenApiModel):
+        return obj._data_store  # noqa: SLF001
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, set | frozenset | tuple):
+        return list(obj)
+    msg = f"Type is not JSON serializable: {type(obj).__name__}"
+    raise TypeError(msg)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content, including Plaid models, to JSON in one pass.
+
+    Args:
+        content: Value to encode
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    return orjson.dumps(content, default=encode_default, option=OPTIONS)
+
+
+class PlaidJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson, accepting Plaid models anywhere in
+    the content.
+    """
+
+    @override
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
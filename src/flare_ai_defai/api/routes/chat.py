@@ -5,24 +5,45 @@ This module implements the main chat routing system for the AI Agent API.
 It handles message routing, blockchain interactions, attestations, and AI responses.
 
 The module provides a ChatRouter class that integrates various services:
-- AI capabilities through GeminiProvider
-- Blockchain operations through FlareProvider
+- AI capabilities through a BaseAIProvider (Gemini or a provider pool)
+- Blockchain operations through AsyncFlareProvider
 - Attestation services through Vtpm
 - Prompt management through PromptService
 """
 
 import json
+from collections.abc import AsyncIterator
+from typing import Any, Literal
 
 import structlog
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from web3 import Web3
 from web3.exceptions import Web3RPCError
 
-from flare_ai_defai.ai import GeminiProvider
-from flare_ai_defai.attestation import Vtpm, VtpmAttestationError
-from flare_ai_defai.blockchain import FlareProvider
-from flare_ai_defai.prompts import PromptService, SemanticRouterResponse
+from flare_ai_defai.ai import BaseAIProvider
+from flare_ai_defai.api.dependencies import get_session_id
+from flare_ai_defai.api.sse import format_sse, sse_response, stream_sse
+from flare_ai_defai.attestation import (
+    AttestationBatcher,
+    InvalidNonceError,
+    Vtpm,
+    VtpmAttestationError,
+)
+from flare_ai_defai.blockchain import AsyncFlareProvider, TxStatus
+from flare_ai_defai.prompts import (
+    PromptService,
+    ReplyRenderer,
+    SemanticRouterResponse,
+)
+from flare_ai_defai.routing import SemanticRouteResolver
+from flare_ai_defai.session import (
+    HistoryManager,
+    InMemorySessionStore,
+    Session,
+    SessionStore,
+)
 from flare_ai_defai.settings import settings
 
 logger = structlog.get_logger(__name__)
@@ -40,6 +61,21 @@ class ChatMessage(BaseModel):
     message: str = Field(..., min_length=1)
 
 
+class AttestationRequest(BaseModel):
+    """
+    Pydantic model for batch attestation requests.
+
+    Attributes:
+        nonces (list[str]): Nonces to attest, each 10 to 74 bytes
+        audience (str): Intended audience of the tokens
+        token_type (str): "OIDC" or "PKI"
+    """
+
+    nonces: list[str] = Field(..., min_length=1, max_length=1000)
+    audience: str = "https://sts.google.com"
+    token_type: Literal["OIDC", "PKI"] = "OIDC"
+
+
 class ChatRouter:
     """
     Main router class handling chat messages and their routing to appropriate handlers.
@@ -48,20 +84,36 @@ class ChatRouter:
     types of chat messages including blockchain operations, attestations, and general
     conversation.
 
+    The providers are shared by every user; all per-user state (chat history,
+    wallet, transaction queue, pending attestation) lives in a `Session` loaded
+    from the session store for each request.
+
     Attributes:
-        ai (GeminiProvider): Provider for AI capabilities
-        blockchain (FlareProvider): Provider for blockchain operations
+        ai (BaseAIProvider): Provider for AI capabilities
+        blockchain (AsyncFlareProvider): Provider for blockchain operations
         attestation (Vtpm): Provider for attestation services
         prompts (PromptService): Service for managing prompts
+        sessions (SessionStore): Store holding per-user conversation state
+        route_resolver (SemanticRouteResolver): Chooses the route for each message
+        attestation_batcher (AttestationBatcher): Issues and caches tokens for
+            batch attestation requests
+        replies (ReplyRenderer): Phrases deterministic replies
+        history (HistoryManager): Keeps chat histories within a token budget
         logger (BoundLogger): Structured logger for the chat router
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
-        ai: GeminiProvider,
-        blockchain: FlareProvider,
+        ai: BaseAIProvider,
+        blockchain: AsyncFlareProvider,
         attestation: Vtpm,
         prompts: PromptService,
+        *,
+        sessions: SessionStore | None = None,
+        route_resolver: SemanticRouteResolver | None = None,
+        attestation_batcher: AttestationBatcher | None = None,
+        replies: ReplyRenderer | None = None,
+        history: HistoryManager | None = None,
     ) -> None:
         """
         Initialize the ChatRouter with required service providers.
@@ -71,12 +123,28 @@ class ChatRouter:
             blockchain: Provider for blockchain operations
             attestation: Provider for attestation services
             prompts: Service for managing prompts
+            sessions: Session store, defaults to a process-local in-memory store
+            route_resolver: Semantic route resolver, defaults to cache + rules
+                in front of `ai`
+            attestation_batcher: Batch token issuer, defaults to one over
+                `attestation`
+            replies: Renderer of deterministic replies, defaults to local
+                templates with `ai` phrasing replies without one
+            history: Chat history compaction, defaults to the default token
+                budget with `ai` computing summaries
         """
         self._router = APIRouter()
         self.ai = ai
         self.blockchain = blockchain
         self.attestation = attestation
         self.prompts = prompts
+        self.sessions = sessions or InMemorySessionStore()
+        self.route_resolver = route_resolver or SemanticRouteResolver(ai, prompts)
+        self.attestation_batcher = attestation_batcher or AttestationBatcher(
+            attestation
+        )
+        self.replies = replies or ReplyRenderer(ai, prompts)
+        self.history = HistoryManager(ai, prompts) if history is None else history
         self.logger = logger.bind(router="chat")
         self._setup_routes()
 
@@ -87,12 +155,15 @@ class ChatRouter:
         """
 
         @self._router.post("/")
-        async def chat(message: ChatMessage) -> dict[str, str]:  # pyright: ignore [reportUnusedFunction]
+        async def chat(  # pyright: ignore [reportUnusedFunction]
+            message: ChatMessage, session_id: str = Depends(get_session_id)
+        ) -> dict[str, str]:
             """
             Process incoming chat messages and route them to appropriate handlers.
 
             Args:
                 message: Validated chat message
+                session_id: Conversation session from the header or cookie
 
             Returns:
                 dict[str, str]: Response containing handled message result
@@ -100,74 +171,289 @@ class ChatRouter:
             Raises:
                 HTTPException: If message handling fails
             """
+            session = self.sessions.get(session_id)
             try:
-                self.logger.debug("received_message", message=message.message)
-
-                if message.message.startswith("/"):
-                    return await self.handle_command(message.message)
-                if (
-                    self.blockchain.tx_queue
-                    and message.message == self.blockchain.tx_queue[-1].msg
-                ):
-                    try:
-                        tx_hash = self.blockchain.send_tx_in_queue()
-                    except Web3RPCError as e:
-                        self.logger.exception("send_tx_failed", error=str(e))
-                        msg = (
-                            f"Unfortunately the tx failed with the error:\n{e.args[0]}"
-                        )
-                        return {"response": msg}
-
-                    prompt, mime_type, schema = self.prompts.get_formatted_prompt(
-                        "tx_confirmation",
-                        tx_hash=tx_hash,
-                        block_explorer=settings.web3_explorer_url,
-                    )
-                    tx_confirmation_response = self.ai.generate(
-                        prompt=prompt,
-                        response_mime_type=mime_type,
-                        response_schema=schema,
-                    )
-                    return {"response": tx_confirmation_response.text}
-                if self.attestation.attestation_requested:
-                    try:
-                        resp = self.attestation.get_token([message.message])
-                    except VtpmAttestationError as e:
-                        resp = f"The attestation failed with  error:\n{e.args[0]}"
-                    self.attestation.attestation_requested = False
-                    return {"response": resp}
-
-                route = await self.get_semantic_route(message.message)
-                return await self.route_message(route, message.message)
-
+                self.logger.debug(
+                    "received_message", message=message.message, session_id=session_id
+                )
+                return await self.handle_message(session, message.message)
             except Exception as e:
                 self.logger.exception("message_handling_failed", error=str(e))
                 raise HTTPException(status_code=500, detail=str(e)) from e
+            finally:
+                self.sessions.save(session)
+
+        @self._router.post("/stream")
+        async def chat_stream(  # pyright: ignore [reportUnusedFunction]
+            message: ChatMessage, session_id: str = Depends(get_session_id)
+        ) -> StreamingResponse:
+            """
+            Process a chat message and stream the reply as Server-Sent Events.
+
+            Conversational replies are streamed token by token as `token` events.
+            Other routes produce their full reply as a single `token` event. The
+            stream ends with a `done` event, or an `error` event on failure.
+
+            Args:
+                message: Validated chat message
+                session_id: Conversation session from the header or cookie
+
+            Returns:
+                StreamingResponse: `text/event-stream` response
+            """
+            session = self.sessions.get(session_id)
+            self.logger.debug(
+                "received_stream_message",
+                message=message.message,
+                session_id=session_id,
+            )
+            events = stream_sse(
+                self.stream_message(session, message.message),
+                logger=self.logger,
+                on_close=lambda: self.sessions.save(session),
+            )
+            return sse_response(events, session_id)
+
+        @self._router.post("/attestation")
+        async def attestation(  # pyright: ignore [reportUnusedFunction]
+            request: AttestationRequest,
+        ) -> dict[str, Any]:
+            """
+            Issue attestation tokens for many nonces at once.
+
+            Nonces are packed into as few teeserver token requests as its
+            limits allow, so one token may attest several nonces; tokens are
+            cached until shortly before they expire. A nonce already cached
+            or being requested by another caller gets that caller's token, so
+            the token can carry nonces of other requests; such tokens are
+            marked `shared`.
+
+            Args:
+                request: Nonces, audience and token type
+
+            Returns:
+                dict[str, Any]: For each distinct nonce in request order, the
+                    token attesting it, every nonce it carries, its expiry
+                    and whether it carries nonces of other requests
+
+            Raises:
+                HTTPException: 422 for invalid nonces, 502 if the attestation
+                    service fails
+            """
+            return await self.issue_attestations(request)
+
+        @self._router.get("/history/tokens")
+        async def history_tokens(  # pyright: ignore [reportUnusedFunction]
+            session_id: str = Depends(get_session_id),
+        ) -> dict[str, int]:
+            """
+            Report the size of the context the session sends with each message.
+
+            Args:
+                session_id: Conversation session from the header or cookie
+
+            Returns:
+                dict[str, int]: Tokens in the rolling summary, in the turns
+                    kept verbatim and in total, and the number of turns kept
+            """
+            return self.history.tokens(self.sessions.get(session_id)).to_dict()
+
+        @self._router.get("/tx/{tx_hash}")
+        async def tx_status(tx_hash: str) -> dict[str, Any]:  # pyright: ignore [reportUnusedFunction]
+            """
+            Report the confirmation status of a submitted transaction.
+
+            Args:
+                tx_hash: Hash returned when the transaction was sent
+
+            Returns:
+                dict[str, Any]: Transaction hash, status and block number
+
+            Raises:
+                HTTPException: If the transaction is not being tracked
+            """
+            state = self.blockchain.receipts.get(tx_hash)
+            if state is None:
+                raise HTTPException(status_code=404, detail="Unknown transaction")
+            return state.to_dict()
+
+        @self._router.get("/tx/{tx_hash}/stream")
+        async def tx_status_stream(tx_hash: str) -> StreamingResponse:  # pyright: ignore [reportUnusedFunction]
+            """
+            Stream the confirmation status of a submitted transaction.
+
+            Sends the current status as a `status` event and, while pending,
+            a second `status` event once the transaction is final.
+
+            Args:
+                tx_hash: Hash returned when the transaction was sent
+
+            Returns:
+                StreamingResponse: `text/event-stream` response
+
+            Raises:
+                HTTPException: If the transaction is not being tracked
+            """
+            if self.blockchain.receipts.get(tx_hash) is None:
+                raise HTTPException(status_code=404, detail="Unknown transaction")
+            return sse_response(self.tx_status_events(tx_hash))
 
     @property
     def router(self) -> APIRouter:
         """Get the FastAPI router with registered routes."""
         return self._router
 
-    async def handle_command(self, command: str) -> dict[str, str]:
+    async def issue_attestations(self, request: AttestationRequest) -> dict[str, Any]:
+        """
+        Issue attestation tokens for a batch request.
+
+        Args:
+            request: Nonces, audience and token type
+
+        Returns:
+            dict[str, Any]: `tokens`, one entry per distinct nonce, marked
+                `shared` if its token carries nonces of other requests
+
+        Raises:
+            HTTPException: 422 for invalid nonces, 502 if the attestation
+                service fails
+        """
+        try:
+            issued = await self.attestation_batcher.issue(
+                request.nonces, request.audience, request.token_type
+            )
+        except InvalidNonceError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+        except VtpmAttestationError as e:
+            self.logger.exception("attestation_failed", error=str(e))
+            raise HTTPException(status_code=502, detail=str(e)) from e
+        requested = set(request.nonces)
+        return {
+            "tokens": [
+                {
+                    "nonce": nonce,
+                    **token.to_dict(),
+                    "shared": not requested.issuperset(token.nonces),
+                }
+                for nonce, token in issued.items()
+            ]
+        }
+
+    async def tx_status_events(self, tx_hash: str) -> AsyncIterator[str]:
+        """
+        Frame a transaction's status updates as Server-Sent Events.
+
+        Args:
+            tx_hash: Hash of a watched transaction
+
+        Yields:
+            str: `status` events, the last one carrying the final status
+        """
+        state = self.blockchain.receipts.get(tx_hash)
+        if state is None:
+            return
+        yield format_sse("status", state.to_dict())
+        if state.status is TxStatus.PENDING:
+            await self.blockchain.receipts.wait(tx_hash)
+            yield format_sse("status", state.to_dict())
+
+    async def handle_message(self, session: Session, message: str) -> dict[str, str]:
+        """
+        Handle a chat message within a session.
+
+        Commands, pending transaction confirmations and pending attestations are
+        handled first; anything else is routed semantically.
+
+        Args:
+            session: Conversation session the message belongs to
+            message: Message to process
+
+        Returns:
+            dict[str, str]: Response containing handled message result
+        """
+        if message.startswith("/"):
+            return await self.handle_command(session, message)
+        wallet = session.wallet
+        if wallet.tx_queue and message == wallet.tx_queue[-1].msg:
+            try:
+                tx_hash = await self.blockchain.send_tx_in_queue(wallet)
+            except Web3RPCError as e:
+                self.logger.exception("send_tx_failed", error=str(e))
+                msg = f"Unfortunately the tx failed with the error:\n{e.args[0]}"
+                return {"response": msg}
+
+            tx_confirmation = await self.replies.render(
+                "tx_confirmation",
+                tx_hash=tx_hash,
+                block_explorer=settings.web3_explorer_url.rstrip("/"),
+            )
+            return {"response": tx_confirmation}
+        if session.attestation_requested:
+            try:
+                resp = await self.attestation.aget_token([message])
+            except VtpmAttestationError as e:
+                resp = f"The attestation failed with  error:\n{e.args[0]}"
+            session.attestation_requested = False
+            return {"response": resp}
+
+        route = await self.get_semantic_route(message)
+        return await self.route_message(session, route, message)
+
+    async def stream_message(
+        self, session: Session, message: str
+    ) -> AsyncIterator[str]:
+        """
+        Handle a chat message, yielding the reply in chunks as it is produced.
+
+        Only conversational replies are generated incrementally; every other
+        kind of message yields its complete reply once.
+
+        Args:
+            session: Conversation session the message belongs to
+            message: Message to process
+
+        Yields:
+            str: Successive chunks of the reply text
+        """
+        if (
+            message.startswith("/")
+            or session.attestation_requested
+            or (session.wallet.tx_queue and message == session.wallet.tx_queue[-1].msg)
+        ):
+            yield (await self.handle_message(session, message))["response"]
+            return
+
+        route = await self.get_semantic_route(message)
+        if route is not SemanticRouterResponse.CONVERSATIONAL:
+            yield (await self.route_message(session, route, message))["response"]
+            return
+        context = self.history.context(session)
+        async for chunk in self.ai.astream_message(message, context):
+            yield chunk
+        self.history.record(session, context)
+
+    async def handle_command(self, session: Session, command: str) -> dict[str, str]:
         """
         Handle special command messages starting with '/'.
 
         Args:
+            session: Conversation session the command applies to
             command: Command string to process
 
         Returns:
             dict[str, str]: Response containing command result
         """
         if command == "/reset":
-            self.blockchain.reset()
-            self.ai.reset()
+            session.reset()
             return {"response": "Reset complete"}
         return {"response": "Unknown command"}
 
     async def get_semantic_route(self, message: str) -> SemanticRouterResponse:
         """
-        Determine the semantic route for a message using AI provider.
+        Determine the semantic route for a message.
+
+        Uses the route cache and local classifiers first, and only calls the
+        AI provider when none of them is confident.
 
         Args:
             message: Message to route
@@ -175,25 +461,16 @@ class ChatRouter:
         Returns:
             SemanticRouterResponse: Determined route for the message
         """
-        try:
-            prompt, mime_type, schema = self.prompts.get_formatted_prompt(
-                "semantic_router", user_input=message
-            )
-            route_response = self.ai.generate(
-                prompt=prompt, response_mime_type=mime_type, response_schema=schema
-            )
-            return SemanticRouterResponse(route_response.text)
-        except Exception as e:
-            self.logger.exception("routing_failed", error=str(e))
-            return SemanticRouterResponse.CONVERSATIONAL
+        return await self.route_resolver.resolve(message)
 
     async def route_message(
-        self, route: SemanticRouterResponse, message: str
+        self, session: Session, route: SemanticRouterResponse, message: str
     ) -> dict[str, str]:
         """
         Route a message to the appropriate handler based on semantic route.
 
         Args:
+            session: Conversation session the message belongs to
             route: Determined semantic route
             message: Original message to handle
 
@@ -212,47 +489,44 @@ class ChatRouter:
         if not handler:
             return {"response": "Unsupported route"}
 
-        return await handler(message)
+        return await handler(session, message)
 
-    async def handle_generate_account(self, _: str) -> dict[str, str]:
+    async def handle_generate_account(self, session: Session, _: str) -> dict[str, str]:
         """
         Handle account generation requests.
 
         Args:
+            session: Conversation session owning the account
             _: Unused message parameter
 
         Returns:
             dict[str, str]: Response containing new account information
                 or existing account
         """
-        if self.blockchain.address:
-            return {"response": f"Account exists - {self.blockchain.address}"}
-        address = self.blockchain.generate_account()
-        prompt, mime_type, schema = self.prompts.get_formatted_prompt(
-            "generate_account", address=address
-        )
-        gen_address_response = self.ai.generate(
-            prompt=prompt, response_mime_type=mime_type, response_schema=schema
-        )
-        return {"response": gen_address_response.text}
+        if session.wallet.address:
+            return {"response": f"Account exists - {session.wallet.address}"}
+        address = self.blockchain.generate_account(session.wallet)
+        gen_address = await self.replies.render("generate_account", address=address)
+        return {"response": gen_address}
 
-    async def handle_send_token(self, message: str) -> dict[str, str]:
+    async def handle_send_token(self, session: Session, message: str) -> dict[str, str]:
         """
         Handle token sending requests.
 
         Args:
+            session: Conversation session sending the tokens
             message: Message containing token sending details
 
         Returns:
             dict[str, str]: Response containing transaction preview or follow-up prompt
         """
-        if not self.blockchain.address:
-            await self.handle_generate_account(message)
+        if not session.wallet.address:
+            await self.handle_generate_account(session, message)
 
         prompt, mime_type, schema = self.prompts.get_formatted_prompt(
             "token_send", user_input=message
         )
-        send_token_response = self.ai.generate(
+        send_token_response = await self.ai.agenerate(
             prompt=prompt, response_mime_type=mime_type, response_schema=schema
         )
         send_token_json = json.loads(send_token_response.text)
@@ -261,16 +535,15 @@ class ChatRouter:
             len(send_token_json) != expected_json_len
             or send_token_json.get("amount") == 0.0
         ):
-            prompt, _, _ = self.prompts.get_formatted_prompt("follow_up_token_send")
-            follow_up_response = self.ai.generate(prompt)
-            return {"response": follow_up_response.text}
+            return {"response": await self.replies.render("follow_up_token_send")}
 
-        tx = self.blockchain.create_send_flr_tx(
+        tx = await self.blockchain.create_send_flr_tx(
             to_address=send_token_json.get("to_address"),
             amount=send_token_json.get("amount"),
+            wallet=session.wallet,
         )
         self.logger.debug("send_token_tx", tx=tx)
-        self.blockchain.add_tx_to_queue(msg=message, tx=tx)
+        self.blockchain.add_tx_to_queue(msg=message, tx=tx, wallet=session.wallet)
         formatted_preview = (
             "Transaction Preview: "
             + f"Sending {Web3.from_wei(tx.get('value', 0), 'ether')} "
@@ -278,11 +551,12 @@ class ChatRouter:
         )
         return {"response": formatted_preview}
 
-    async def handle_swap_token(self, _: str) -> dict[str, str]:
+    async def handle_swap_token(self, _session: Session, _: str) -> dict[str, str]:
         """
         Handle token swap requests (currently unsupported).
 
         Args:
+            _session: Unused session parameter
             _: Unused message parameter
 
         Returns:
@@ -290,30 +564,35 @@ class ChatRouter:
         """
         return {"response": "Sorry I can't do that right now"}
 
-    async def handle_attestation(self, _: str) -> dict[str, str]:
+    async def handle_attestation(self, session: Session, _: str) -> dict[str, str]:
         """
         Handle attestation requests.
 
         Args:
+            session: Conversation session requesting the attestation
             _: Unused message parameter
 
         Returns:
             dict[str, str]: Response containing attestation request
         """
-        prompt = self.prompts.get_formatted_prompt("request_attestation")[0]
-        request_attestation_response = self.ai.generate(prompt=prompt)
-        self.attestation.attestation_requested = True
-        return {"response": request_attestation_response.text}
+        request_attestation = await self.replies.render("request_attestation")
+        session.attestation_requested = True
+        return {"response": request_attestation}
 
-    async def handle_conversation(self, message: str) -> dict[str, str]:
+    async def handle_conversation(
+        self, session: Session, message: str
+    ) -> dict[str, str]:
         """
         Handle general conversation messages.
 
         Args:
+            session: Conversation session holding the chat history
             message: Message to process
 
         Returns:
             dict[str, str]: Response from AI provider
         """
-        response = self.ai.send_message(message)
+        context = self.history.context(session)
+        response = await self.ai.asend_message(message, context)
+        self.history.record(session, context)
         return {"response": response.text}
@@ -1,102 +1,66 @@
+import asyncio
 import json
-from typing import Optional
+import uuid
+from collections.abc import AsyncIterator
+from typing import Any
 
+import plaid
 import structlog
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from plaid.api import plaid_api
+from plaid.model.country_code import CountryCode
+from plaid.model.item_public_token_exchange_request import (
+    ItemPublicTokenExchangeRequest,
+)
+from plaid.model.link_token_create_request import LinkTokenCreateRequest
+from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
+from plaid.model.products import Products
 from pydantic import BaseModel, Field
 from web3 import Web3
 from web3.exceptions import Web3RPCError
-import base64
-import os
-import datetime as dt
-import json
-import time
-from datetime import date, timedelta
-import uuid
-# from plaid import Client
-from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
 
-from flare_ai_defai.ai import GeminiProvider
+from flare_ai_defai.ai import BaseAIProvider
+from flare_ai_defai.api.dependencies import get_session_id
+from flare_ai_defai.api.responses import PlaidJSONResponse
+from flare_ai_defai.api.sse import format_sse, sse_response, stream_sse
 from flare_ai_defai.attestation import Vtpm, VtpmAttestationError
-from flare_ai_defai.blockchain import FlareProvider
-from flare_ai_defai.prompts import PromptService, SemanticRouterResponse
+from flare_ai_defai.banking import (
+    CreditScore,
+    CreditScorer,
+    CreditScoreStore,
+    InMemoryCreditScoreStore,
+    InMemoryTransactionStore,
+    LinkedItem,
+    PlaidClientRegistry,
+    TransactionSyncEngine,
+    utilization_from_accounts,
+)
+from flare_ai_defai.blockchain import AsyncFlareProvider
+from flare_ai_defai.jobs import (
+    Job,
+    JobQueue,
+    JobQueueFullError,
+    PermanentJobError,
+    Progress,
+)
+from flare_ai_defai.prompts import PromptService, ReplyRenderer, SemanticRouterResponse
+from flare_ai_defai.routing import SemanticRouteResolver
+from flare_ai_defai.session import (
+    HistoryManager,
+    InMemorySessionStore,
+    Session,
+    SessionStore,
+)
 from flare_ai_defai.settings import settings
-from dotenv import load_dotenv
-from flask import Flask, request, jsonify
-import plaid
-from plaid.model.payment_amount import PaymentAmount
-from plaid.model.payment_amount_currency import PaymentAmountCurrency
-from plaid.model.products import Products
-from plaid.model.country_code import CountryCode
-from plaid.model.recipient_bacs_nullable import RecipientBACSNullable
-from plaid.model.payment_initiation_address import PaymentInitiationAddress
-from plaid.model.payment_initiation_recipient_create_request import PaymentInitiationRecipientCreateRequest
-from plaid.model.payment_initiation_payment_create_request import PaymentInitiationPaymentCreateRequest
-from plaid.model.payment_initiation_payment_get_request import PaymentInitiationPaymentGetRequest
-from plaid.model.link_token_create_request_payment_initiation import LinkTokenCreateRequestPaymentInitiation
-from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
-from plaid.model.link_token_create_request import LinkTokenCreateRequest
-from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
-from plaid.model.user_create_request import UserCreateRequest
-from plaid.model.consumer_report_user_identity import ConsumerReportUserIdentity
-from plaid.model.asset_report_create_request import AssetReportCreateRequest
-from plaid.model.asset_report_create_request_options import AssetReportCreateRequestOptions
-from plaid.model.asset_report_user import AssetReportUser
-from plaid.model.asset_report_get_request import AssetReportGetRequest
-from plaid.model.asset_report_pdf_get_request import AssetReportPDFGetRequest
-from plaid.model.auth_get_request import AuthGetRequest
-from plaid.model.transactions_sync_request import TransactionsSyncRequest
-from plaid.model.identity_get_request import IdentityGetRequest
-from plaid.model.investments_transactions_get_request_options import InvestmentsTransactionsGetRequestOptions
-from plaid.model.investments_transactions_get_request import InvestmentsTransactionsGetRequest
-from plaid.model.accounts_balance_get_request import AccountsBalanceGetRequest
-from plaid.model.accounts_get_request import AccountsGetRequest
-from plaid.model.investments_holdings_get_request import InvestmentsHoldingsGetRequest
-from plaid.model.item_get_request import ItemGetRequest
-from plaid.model.institutions_get_by_id_request import InstitutionsGetByIdRequest
-from plaid.model.transfer_authorization_create_request import TransferAuthorizationCreateRequest
-from plaid.model.transfer_create_request import TransferCreateRequest
-from plaid.model.transfer_get_request import TransferGetRequest
-from plaid.model.transfer_network import TransferNetwork
-from plaid.model.transfer_type import TransferType
-from plaid.model.transfer_authorization_user_in_request import TransferAuthorizationUserInRequest
-from plaid.model.ach_class import ACHClass
-from plaid.model.transfer_create_idempotency_key import TransferCreateIdempotencyKey
-from plaid.model.transfer_user_address_in_request import TransferUserAddressInRequest
-from plaid.model.signal_evaluate_request import SignalEvaluateRequest
-from plaid.model.statements_list_request import StatementsListRequest
-from plaid.model.link_token_create_request_statements import LinkTokenCreateRequestStatements
-from plaid.model.link_token_create_request_cra_options import LinkTokenCreateRequestCraOptions
-from plaid.model.statements_download_request import StatementsDownloadRequest
-from plaid.model.consumer_report_permissible_purpose import ConsumerReportPermissiblePurpose
-from plaid.model.cra_check_report_base_report_get_request import CraCheckReportBaseReportGetRequest
-from plaid.model.cra_check_report_pdf_get_request import CraCheckReportPDFGetRequest
-from plaid.model.cra_check_report_income_insights_get_request import CraCheckReportIncomeInsightsGetRequest
-from plaid.model.cra_check_report_partner_insights_get_request import CraCheckReportPartnerInsightsGetRequest
-from plaid.model.cra_pdf_add_ons import CraPDFAddOns
-from plaid.api import plaid_api
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
 
-configuration = plaid.Configuration(
-    host=plaid.Environment.Sandbox,
-    api_key={
-        'clientId': settings.PLAID_CLIENT_ID,
-        'secret': settings.PLAID_SECRET,
-        'plaidVersion': '2020-09-14'
-    }
-)
-api_client = plaid.ApiClient(configuration)
-client = plaid_api.PlaidApi(api_client)
-
 products = ["transactions", "liabilities"]
 for product in settings.PLAID_PRODUCTS:
     products.append(Products(product))
 
-# We store the access_token in memory - in production, store it in a secure
-# persistent data store.
-access_token = None
 # The payment_id is only relevant for the UK Payment Initiation product.
 # We store the payment_id in memory - in production, store it in a secure
 # persistent data store.
@@ -109,10 +73,11 @@ transfer_id = None
 # persistent data store.
 user_token = None
 
-item_id = None
-# Store the credit score in memory - in production, store it in a secure
-# persistent data store.
-credit_score = 700  # Default value
+# Job kind running the link -> sync -> score pipeline for a public token
+LINK_ITEM_JOB = "plaid_link_item"
+# Job kind rescoring a linked item from its synced transactions
+SCORE_ITEM_JOB = "plaid_score_item"
+
 
 class ChatMessage(BaseModel):
     """
@@ -132,6 +97,7 @@ class PlaidPublicTokenRequest(BaseModel):
     Attributes:
         public_token (str): The Plaid public token
     """
+
     public_token: str = Field(..., min_length=1)
 
 
@@ -143,6 +109,7 @@ class PlaidTokenRequest(BaseModel):
         access_token (str): The Plaid access token
         item_id (str): The Plaid item ID
     """
+
     access_token: str = Field(..., min_length=1)
     item_id: str = Field(..., min_length=1)
 
@@ -155,22 +122,17 @@ class TransactionsSyncRequest(BaseModel):
         client_id (str): The Plaid client ID
         secret (str): The Plaid secret key
         access_token (str): The Plaid access token
-        cursor (str, optional): The cursor for pagination
-        count (int, optional): The number of transactions to fetch
+        item_id (str, optional): Item to sync fully with a server-side cursor
+        cursor (str, optional): The cursor for pagination, without item_id
+        count (int, optional): The number of transactions to fetch, without item_id
     """
+
     client_id: str = Field(..., min_length=1)
     secret: str = Field(..., min_length=1)
     access_token: str = Field(..., min_length=1)
-    cursor: Optional[str] = None
-    count: Optional[int] = 500
-
-
-# Add a custom JSON encoder class at the top of the file
-class CustomJSONEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, (date, dt.datetime)):
-            return obj.isoformat()
-        return super().default(obj)
+    item_id: str | None = None
+    cursor: str | None = None
+    count: int | None = 500
 
 
 class PlaidRouter:
@@ -182,19 +144,40 @@ class PlaidRouter:
     conversation.
 
     Attributes:
-        ai (GeminiProvider): Provider for AI capabilities
-        blockchain (FlareProvider): Provider for blockchain operations
+        ai (BaseAIProvider): Provider for AI capabilities
+        blockchain (AsyncFlareProvider): Provider for blockchain operations
         attestation (Vtpm): Provider for attestation services
         prompts (PromptService): Service for managing prompts
+        sessions (SessionStore): Store holding per-user conversation state
+        route_resolver (SemanticRouteResolver): Chooses the route for each message
+        plaid_clients (PlaidClientRegistry): Pooled Plaid API clients
+        sync_engine (TransactionSyncEngine): Incremental transactions sync
+        scorer (CreditScorer): Local credit scorer over synced histories
+        score_narrative (bool): Whether the AI explains each computed score
+        scores (CreditScoreStore): Linked items and their score history
+        jobs (JobQueue): Background queue running item links and rescoring
+        replies (ReplyRenderer): Phrases deterministic replies
+        history (HistoryManager): Keeps chat histories within a token budget
         logger (BoundLogger): Structured logger for the chat router
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
-        ai: GeminiProvider,
-        blockchain: FlareProvider,
+        ai: BaseAIProvider,
+        blockchain: AsyncFlareProvider,
         attestation: Vtpm,
         prompts: PromptService,
+        *,
+        sessions: SessionStore | None = None,
+        route_resolver: SemanticRouteResolver | None = None,
+        plaid_clients: PlaidClientRegistry | None = None,
+        sync_engine: TransactionSyncEngine | None = None,
+        scorer: CreditScorer | None = None,
+        score_narrative: bool = False,
+        scores: CreditScoreStore | None = None,
+        jobs: JobQueue | None = None,
+        replies: ReplyRenderer | None = None,
+        history: HistoryManager | None = None,
     ) -> None:
         """
         Initialize the ChatRouter with required service providers.
@@ -204,15 +187,52 @@ class PlaidRouter:
             blockchain: Provider for blockchain operations
             attestation: Provider for attestation services
             prompts: Service for managing prompts
+            sessions: Session store, defaults to a process-local in-memory store
+            route_resolver: Semantic route resolver, defaults to cache + rules
+                in front of `ai`
+            plaid_clients: Plaid client registry, defaults to a sandbox registry
+            sync_engine: Transactions sync engine, defaults to one backed by a
+                process-local in-memory store
+            scorer: Credit scorer, defaults to the default weights
+            score_narrative: Ask the AI for a plain-language explanation of
+                each computed score
+            scores: Linked item and credit score store, defaults to a
+                process-local in-memory store
+            jobs: Background job queue, defaults to a process-local queue
+            replies: Renderer of deterministic replies, defaults to local
+                templates with `ai` phrasing replies without one
+            history: Chat history compaction, defaults to the default token
+                budget with `ai` computing summaries
         """
-        self._router = APIRouter()
+        self._router = APIRouter(default_response_class=PlaidJSONResponse)
         self.ai = ai
         self.blockchain = blockchain
         self.attestation = attestation
         self.prompts = prompts
+        self.sessions = sessions or InMemorySessionStore()
+        self.route_resolver = route_resolver or SemanticRouteResolver(ai, prompts)
+        self.plaid_clients = (
+            PlaidClientRegistry() if plaid_clients is None else plaid_clients
+        )
+        self.sync_engine = sync_engine or TransactionSyncEngine(
+            InMemoryTransactionStore()
+        )
+        self.scorer = scorer or CreditScorer()
+        self.score_narrative = score_narrative
+        self.scores = InMemoryCreditScoreStore() if scores is None else scores
+        self.jobs = JobQueue() if jobs is None else jobs
+        self.jobs.register(LINK_ITEM_JOB, self.link_item)
+        self.jobs.register(SCORE_ITEM_JOB, self.score_job)
+        self.replies = replies or ReplyRenderer(ai, prompts)
+        self.history = HistoryManager(ai, prompts) if history is None else history
         self.logger = logger.bind(router="chat")
         self._setup_routes()
 
+    @property
+    def plaid_client(self) -> plaid_api.PlaidApi:
+        """Pooled Plaid client for the credentials configured in settings."""
+        return self.plaid_clients.get(settings.PLAID_CLIENT_ID, settings.PLAID_SECRET)
+
     def _setup_routes(self) -> None:
         """
         Set up FastAPI routes for the chat endpoint.
@@ -220,32 +240,41 @@ class PlaidRouter:
         """
 
         @self._router.post("/exchange_public_token")
-        async def exchange_public_token(request: PlaidPublicTokenRequest) -> dict:
+        async def exchange_public_token(
+            request: PlaidPublicTokenRequest,
+            session_id: str = Depends(get_session_id),
+        ) -> dict:
             """
             Exchange a Plaid public token for an access token.
             Following Plaid's recommended pattern from their documentation.
 
             Args:
                 request: Contains the public_token from Plaid Link
+                session_id: Session of the user linking the item
 
             Returns:
                 dict: Contains access_token and item_id
             """
             try:
-                global access_token, item_id
                 # Exchange the public token using Plaid's official client
                 exchange_request = ItemPublicTokenExchangeRequest(
                     public_token=request.public_token
                 )
-                exchange_response = client.item_public_token_exchange(exchange_request)
-                access_token = exchange_response['access_token']
-                item_id = exchange_response['item_id']
+                exchange_response = self.plaid_client.item_public_token_exchange(
+                    exchange_request
+                )
+                item = LinkedItem(
+                    item_id=exchange_response["item_id"],
+                    access_token=exchange_response["access_token"],
+                    user_id=session_id,
+                )
 
                 # Store the access token securely in the TEE
+                self.scores.link_item(item)
                 self.logger.info(
                     "plaid_token_exchanged",
-                    item_id=item_id,
-                    token_length=len(access_token)
+                    item_id=item.item_id,
+                    token_length=len(item.access_token),
                 )
 
                 return exchange_response.to_dict()
@@ -253,19 +282,18 @@ class PlaidRouter:
                 error_response = json.loads(e.body)
                 self.logger.error(
                     "plaid_token_exchange_failed",
-                    error_type=error_response.get('error_type'),
-                    error_code=error_response.get('error_code'),
-                    error_message=error_response.get('error_message')
+                    error_type=error_response.get("error_type"),
+                    error_code=error_response.get("error_code"),
+                    error_message=error_response.get("error_message"),
                 )
                 raise HTTPException(
                     status_code=500,
-                    detail=f"Plaid error: {error_response.get('error_message')}"
+                    detail=f"Plaid error: {error_response.get('error_message')}",
                 ) from e
             except Exception as e:
                 self.logger.exception("public_token_exchange_failed", error=str(e))
                 raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to exchange public token: {str(e)}"
+                    status_code=500, detail=f"Failed to exchange public token: {e!s}"
                 ) from e
 
         @self._router.post("/store_token")
@@ -286,9 +314,9 @@ class PlaidRouter:
                 self.logger.info(
                     "plaid_token_received",
                     item_id=request.item_id,
-                    token_length=len(request.access_token)
+                    token_length=len(request.access_token),
                 )
-                
+
                 # Note: Secure storage in TEE is implemented in production
                 # This includes:
                 # 1. TEE environment verification
@@ -296,21 +324,26 @@ class PlaidRouter:
                 # 3. Secure token storage
                 # 4. TEE-only decryption
 
-                return {"status": "success", "message": "Plaid token securely stored in TEE"}
+                return {
+                    "status": "success",
+                    "message": "Plaid token securely stored in TEE",
+                }
             except Exception as e:
                 self.logger.exception("plaid_token_storage_failed", error=str(e))
                 raise HTTPException(
-                    status_code=500,
-                    detail="Failed to store Plaid token securely"
+                    status_code=500, detail="Failed to store Plaid token securely"
                 ) from e
 
         @self._router.post("/")
-        async def chat(message: ChatMessage) -> dict[str, str]:  # pyright: ignore [reportUnusedFunction]
+        async def chat(  # pyright: ignore [reportUnusedFunction]
+            message: ChatMessage, session_id: str = Depends(get_session_id)
+        ) -> dict[str, str]:
             """
             Process incoming chat messages and route them to appropriate handlers.
 
             Args:
                 message: Validated chat message
+                session_id: Conversation session from the header or cookie
 
             Returns:
                 dict[str, str]: Response containing handled message result
@@ -318,17 +351,16 @@ class PlaidRouter:
             Raises:
                 HTTPException: If message handling fails
             """
+            session = self.sessions.get(session_id)
             try:
                 self.logger.debug("received_message", message=message.message)
 
                 if message.message.startswith("/"):
-                    return await self.handle_command(message.message)
-                if (
-                    self.blockchain.tx_queue
-                    and message.message == self.blockchain.tx_queue[-1].msg
-                ):
+                    return await self.handle_command(session, message.message)
+                wallet = session.wallet
+                if wallet.tx_queue and message.message == wallet.tx_queue[-1].msg:
                     try:
-                        tx_hash = self.blockchain.send_tx_in_queue()
+                        tx_hash = await self.blockchain.send_tx_in_queue(wallet)
                     except Web3RPCError as e:
                         self.logger.exception("send_tx_failed", error=str(e))
                         msg = (
@@ -336,250 +368,170 @@ class PlaidRouter:
                         )
                         return {"response": msg}
 
-                    prompt, mime_type, schema = self.prompts.get_formatted_prompt(
+                    tx_confirmation = await self.replies.render(
                         "tx_confirmation",
                         tx_hash=tx_hash,
-                        block_explorer=settings.web3_explorer_url,
+                        block_explorer=settings.web3_explorer_url.rstrip("/"),
                     )
-                    tx_confirmation_response = self.ai.generate(
-                        prompt=prompt,
-                        response_mime_type=mime_type,
-                        response_schema=schema,
-                    )
-                    return {"response": tx_confirmation_response.text}
-                if self.attestation.attestation_requested:
+                    return {"response": tx_confirmation}
+                if session.attestation_requested:
                     try:
-                        resp = self.attestation.get_token([message.message])
+                        resp = await self.attestation.aget_token([message.message])
                     except VtpmAttestationError as e:
                         resp = f"The attestation failed with  error:\n{e.args[0]}"
-                    self.attestation.attestation_requested = False
+                    session.attestation_requested = False
                     return {"response": resp}
 
                 route = await self.get_semantic_route(message.message)
-                return await self.route_message(route, message.message)
+                return await self.route_message(session, route, message.message)
 
             except Exception as e:
                 self.logger.exception("message_handling_failed", error=str(e))
                 raise HTTPException(status_code=500, detail=str(e)) from e
-        
+            finally:
+                self.sessions.save(session)
+
         @self._router.get("/info")
-        async def info():
+        async def info(session_id: str = Depends(get_session_id)):
+            items = self.scores.items_for_user(session_id)
+            item = self.scores.get_item(items[0]) if items else None
             return {
-                "item_id": item_id,
-                "access_token": access_token,
-                "products": settings.PLAID_PRODUCTS
+                "item_id": item and item.item_id,
+                "access_token": item and item.access_token,
+                "products": settings.PLAID_PRODUCTS,
             }
-        
-        @self._router.post("/set_access_token")
-        async def get_access_token(request: PlaidPublicTokenRequest):
-            global access_token, item_id, credit_score
+
+        @self._router.post("/set_access_token", status_code=202)
+        async def get_access_token(  # pyright: ignore [reportUnusedFunction]
+            request: PlaidPublicTokenRequest,
+            session_id: str = Depends(get_session_id),
+        ) -> dict[str, Any]:
+            """
+            Queue linking a Plaid item: token exchange, sync and scoring.
+
+            Returns as soon as the job is queued; follow it with
+            `/jobs/{job_id}` or `/jobs/{job_id}/stream`.
+
+            Args:
+                request: Public token from Plaid Link
+                session_id: Session of the user linking the item
+
+            Returns:
+                dict[str, Any]: The queued job
+
+            Raises:
+                HTTPException: If too many jobs are already pending
+            """
             try:
-                print("==== STARTING TOKEN EXCHANGE ====")
-                print(f"Received public token: {request.public_token[:10]}...")
-                
-                exchange_request = ItemPublicTokenExchangeRequest(public_token=request.public_token)
-                print("Created exchange request object")
-                
-                exchange_response = client.item_public_token_exchange(exchange_request)
-                print("Successfully exchanged public token for access token")
-                print(f"Access token received: {exchange_response['access_token'][:10]}...")
-                print(f"Item ID received: {exchange_response['item_id']}")
-                
-                access_token = exchange_response['access_token']
-                item_id = exchange_response['item_id']
-                
-                # Log the access token (in production, you would never log sensitive tokens)
-                self.logger.info(
-                    "plaid_token_exchanged",
-                    item_id=item_id,
-                    token_length=len(access_token)
+                job = self.jobs.submit(
+                    LINK_ITEM_JOB,
+                    {"public_token": request.public_token, "session_id": session_id},
                 )
-                
-                # Initialize response dictionary with exchange response
-                response_data = {
-                    "exchange_response": exchange_response.to_dict()
-                }
-                print("Response data initialized with exchange response")
-                
-                # Fetch transactions
-                try:
-                    print("==== STARTING TRANSACTION SYNC ====")
-                    sync_request = plaid.model.transactions_sync_request.TransactionsSyncRequest(
-                        access_token=access_token,
-                        count=500
-                    )
-                    print("Created transaction sync request")
-                    
-                    transactions_response = client.transactions_sync(sync_request)
-                    print(f"Successfully fetched transactions")
-                    print(f"Added transactions: {len(transactions_response['added'])}")
-                    print(f"Modified transactions: {len(transactions_response['modified'])}")
-                    print(f"Removed transactions: {len(transactions_response['removed'])}")
-                    print(f"Has more: {transactions_response['has_more']}")
-                    
-                    if transactions_response['added']:
-                        # Print transaction data safely using our custom encoder
-                        first_transaction = transactions_response['added'][0].to_dict()
-                        print(f"Transaction keys: {list(first_transaction.keys())}")
-                        print(f"Sample transaction amount: {first_transaction.get('amount')}")
-                        print(f"Sample transaction date: {first_transaction.get('date')}")
-                        print(f"Sample transaction name: {first_transaction.get('name')}")
-                        
-                        # Try to safely print the full transaction with our custom encoder
-                        try:
-                            print(f"Sample transaction: {json.dumps(first_transaction, indent=2, cls=CustomJSONEncoder)[:200]}...")
-                        except Exception as json_err:
-                            print(f"Could not serialize transaction: {str(json_err)}")
-                    
-                    # Log transaction data summary to the same logger
-                    self.logger.info(
-                        "plaid_transactions_fetched",
-                        item_id=item_id,
-                        added_count=len(transactions_response['added']),
-                        modified_count=len(transactions_response['modified']),
-                        removed_count=len(transactions_response['removed']),
-                        has_more=transactions_response['has_more']
-                    )
-                    
-                    # Convert transactions to a format that can be serialized
-                    serializable_transactions = {
-                        "added": [self.make_serializable(t.to_dict()) for t in transactions_response['added']],
-                        "modified": [self.make_serializable(t.to_dict()) for t in transactions_response['modified']],
-                        "removed": [self.make_serializable(t.to_dict()) for t in transactions_response['removed']],
-                        "has_more": transactions_response['has_more'],
-                        "next_cursor": transactions_response['next_cursor']
-                    }
-                    
-                    response_data["transactions"] = serializable_transactions
-                    print("Added transactions to response data")
-                    
-                    # Call the conversation handler with a simple question
-                    print("==== STARTING AI CONVERSATION ====")
-                    # Create a simplified version of transactions for the AI
-                    simplified_transactions = {
-                        "transaction_count": len(serializable_transactions["added"]),
-                        "transactions": serializable_transactions["added"][:10]  # Just send the first 10 transactions
-                    }
-                    
-                    conversation_message = f"Generate a number looking at my transaction history. This number should be roughly in the ballpark of the magnitude of a credit score. Here are my transactions: {json.dumps(simplified_transactions, cls=CustomJSONEncoder)}. PLEASE RETURN ONLY THE CREDIT SCORE -- ADD A HIGH DEGREE OF VARIANCE TO IT --, NO OTHER TEXT NO MATTER WHAT. even if you are unsure or unfamiliar, I'd appreciate you giving me a number a lot!'"
-                    print(f"Sending message to AI (length: {len(conversation_message)})")
-                    
-                    conversation_response = await self.handle_conversation(conversation_message)
-                    print("Received response from AI")
-                    print(f"AI response preview: {conversation_response['response'][:200]}...")
-                    
-                    # Add the AI response to the response data
-                    response_data["ai_response"] = conversation_response["response"]
-                    
-                    # Extract credit score from AI response
-                    try:
-                        # Try to parse the credit score from the AI response
-                        # This assumes the AI returns just a number or a number with some text
-                        ai_response = conversation_response["response"].strip()
-                        # Extract digits from the response
-                        import re
-                        score_match = re.search(r'\b(\d{3})\b', ai_response)  # Look for 3-digit number
-                        
-                        if score_match:
-                            extracted_score = int(score_match.group(1))
-                            # Validate the score is in a reasonable range (300-850 for FICO)
-                            if 300 <= extracted_score <= 850:
-                                credit_score = extracted_score
-                                response_data["credit_score"] = credit_score
-                                print(f"Extracted credit score from AI: {credit_score}")
-                            else:
-                                credit_score = 715  # Fallback to default if outside valid range
-                                response_data["credit_score"] = credit_score
-                                print(f"Score out of range, using default: {credit_score}")
-                        else:
-                            credit_score = 710  # Fallback to default if no score found
-                            response_data["credit_score"] = credit_score
-                            print(f"No score found in AI response, using default: {credit_score}")
-                    except Exception as score_err:
-                        print(f"Error extracting credit score: {str(score_err)}")
-                        credit_score = 705  # Fallback to default on error
-                        response_data["credit_score"] = credit_score
-                        print(f"Using default credit score: {credit_score}")
-                    
-                    self.logger.info(
-                        "AI_RESPONSE_GENERATED",
-                        response_length=len(conversation_response["response"]),
-                        extracted_credit_score=credit_score
-                    )
-                    print("==== COMPLETED SUCCESSFULLY ====")
-                    
-                except Exception as e:
-                    print(f"==== ERROR IN TRANSACTION SYNC OR AI PROCESSING ====")
-                    print(f"Error: {str(e)}")
-                    print(f"Error type: {type(e).__name__}")
-                    import traceback
-                    print(f"Traceback: {traceback.format_exc()}")
-                    
-                    self.logger.exception("transactions_sync_failed", error=str(e))
-                    response_data["transactions_error"] = str(e)
-                    response_data["credit_score"] = 700  # Default fallback score
-                    print("Added error info and default credit score to response")
-                
-                # Return all collected data
-                print(f"Returning response with keys: {list(response_data.keys())}")
-                return response_data
-                
-            except plaid.ApiException as e:
-                print(f"==== PLAID API ERROR ====")
-                print(f"Error: {str(e)}")
-                error_body = json.loads(e.body)
-                print(f"Error details: {json.dumps(error_body, indent=2)}")
-                
-                self.logger.error("plaid_token_exchange_failed", error=str(e))
-                return json.loads(e.body)
-            except Exception as e:
-                print(f"==== UNEXPECTED ERROR ====")
-                print(f"Error: {str(e)}")
-                print(f"Error type: {type(e).__name__}")
-                import traceback
-                print(f"Traceback: {traceback.format_exc()}")
-                
-                self.logger.exception("unexpected_error", error=str(e))
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to exchange public token: {str(e)}"
-                ) from e
+            except JobQueueFullError as e:
+                raise HTTPException(status_code=503, detail=str(e)) from e
+            return job.to_public_dict()
+
+        @self._router.get("/jobs/{job_id}")
+        async def job_status(job_id: str) -> dict[str, Any]:  # pyright: ignore [reportUnusedFunction]
+            """
+            Report the status of a background job.
+
+            Args:
+                job_id: Id returned when the job was queued
+
+            Returns:
+                dict[str, Any]: Status, progress step and, once finished,
+                    the result or error
+
+            Raises:
+                HTTPException: If the job is unknown
+            """
+            job = self.jobs.get(job_id)
+            if job is None:
+                raise HTTPException(status_code=404, detail="Unknown job")
+            return job.to_public_dict()
+
+        @self._router.get("/jobs/{job_id}/stream")
+        async def job_status_stream(job_id: str) -> StreamingResponse:  # pyright: ignore [reportUnusedFunction]
+            """
+            Stream the progress of a background job.
+
+            Sends a `status` event with the current state and another after
+            every change, the last one carrying the final status.
+
+            Args:
+                job_id: Id returned when the job was queued
+
+            Returns:
+                StreamingResponse: `text/event-stream` response
+
+            Raises:
+                HTTPException: If the job is unknown
+            """
+            if self.jobs.get(job_id) is None:
+                raise HTTPException(status_code=404, detail="Unknown job")
+            return sse_response(
+                format_sse("status", state) async for state in self.jobs.watch(job_id)
+            )
 
         @self._router.get("/credit_score")
-        async def get_credit_score():
+        async def get_credit_score(  # pyright: ignore [reportUnusedFunction]
+            item_id: str | None = None,
+            session_id: str = Depends(get_session_id),
+        ) -> dict[str, Any]:
             """
-            Get the latest calculated credit score.
-            
+            Get the latest credit score of an item.
+
+            Args:
+                item_id: Item to look up, defaults to the item the session
+                    linked most recently
+                session_id: Session of the user
+
             Returns:
-                dict: Contains the credit score
+                dict[str, Any]: Item id, score, features and when it was
+                    computed
+
+            Raises:
+                HTTPException: 404 if the item has not been scored yet, 403 if
+                    another user linked it
             """
-            # This endpoint returns the global credit score variable
-            try:
-                global credit_score
-                # Add detailed logging
-                self.logger.info(
-                    "credit_score_endpoint_called",
-                    credit_score=credit_score,
-                    timestamp=dt.datetime.now().isoformat(),
-                    request_id=str(uuid.uuid4())  # Generate a unique ID for this request
-                )
-                print(f"==== CREDIT SCORE ENDPOINT CALLED ====")
-                print(f"Returning credit score: {credit_score}")
-                print(f"Timestamp: {dt.datetime.now().isoformat()}")
-                
-                return {"credit_score": credit_score}
-            except Exception as e:
-                self.logger.exception("get_credit_score_failed", error=str(e))
-                print(f"==== CREDIT SCORE ENDPOINT ERROR ====")
-                print(f"Error: {str(e)}")
-                print(f"Error type: {type(e).__name__}")
-                import traceback
-                print(f"Traceback: {traceback.format_exc()}")
-                
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to get credit score: {str(e)}"
-                ) from e
+            if item_id:
+                self.owned_item(item_id, session_id)
+            else:
+                item_id = self.latest_item(session_id)
+            score = self.scores.latest(item_id) if item_id else None
+            if score is None:
+                raise HTTPException(status_code=404, detail="No credit score found")
+            return {"item_id": item_id, **score.to_dict()}
+
+        @self._router.get("/credit_score/history")
+        async def get_credit_score_history(  # pyright: ignore [reportUnusedFunction]
+            item_id: str | None = None,
+            limit: int = Query(10, ge=1, le=100),
+            session_id: str = Depends(get_session_id),
+        ) -> dict[str, Any]:
+            """
+            Get the most recent credit scores of an item.
+
+            Args:
+                item_id: Item to look up, defaults to the item the session
+                    linked most recently
+                limit: Maximum number of scores returned
+                session_id: Session of the user
+
+            Returns:
+                dict[str, Any]: Item id and its scores, newest first
+
+            Raises:
+                HTTPException: 404 if the item was never linked, 403 if
+                    another user linked it
+            """
+            if item_id:
+                self.owned_item(item_id, session_id)
+            else:
+                item_id = self.latest_item(session_id)
+            scores = self.scores.history(item_id, limit) if item_id else []
+            return {"item_id": item_id, "scores": [score.to_dict() for score in scores]}
 
         @self._router.post("/create_link_token")
         async def create_link_token():
@@ -587,230 +539,287 @@ class PlaidRouter:
                 request = LinkTokenCreateRequest(
                     products=products,
                     client_name="StreetCred",
-                    country_codes=[CountryCode('US')],
-                    language='en',
-                    user=LinkTokenCreateRequestUser(
-                        client_user_id=str(uuid.uuid4())
-                    )
+                    country_codes=[CountryCode("US")],
+                    language="en",
+                    user=LinkTokenCreateRequestUser(client_user_id=str(uuid.uuid4())),
                 )
-                response = client.link_token_create(request)
-                return {"link_token": response['link_token']}
+                response = self.plaid_client.link_token_create(request)
+                return {"link_token": response["link_token"]}
             except plaid.ApiException as e:
                 self.logger.exception("create_link_token_failed", error=str(e))
                 raise HTTPException(
-                    status_code=500,
-                    detail="Failed to create link token"
+                    status_code=500, detail="Failed to create link token"
                 ) from e
 
         @self._router.post("/transactions/sync")
-        async def sync_transactions(request: TransactionsSyncRequest) -> dict:
+        async def sync_transactions(
+            request: TransactionsSyncRequest,
+            session_id: str = Depends(get_session_id),
+        ) -> PlaidJSONResponse:
             """
             Fetch transactions using Plaid's transactions/sync endpoint.
-            
+
+            With an `item_id`, pages through every change since the item's
+            stored cursor and applies it to the local transaction store, so
+            the caller does not manage cursors. The item must have been
+            linked by the calling session with the same access token. Without
+            one, fetches a single page from the given cursor.
+
             Args:
-                request: Contains access_token, cursor, and count parameters
-                
+                request: Contains access_token, and item_id or cursor and count
+                session_id: Session of the user syncing the item
+
             Returns:
-                dict: Contains added, modified, removed transactions and a cursor
+                PlaidJSONResponse: Added, modified and removed transactions
+                    and a cursor, encoded in one pass
+
+            Raises:
+                HTTPException: 404 if the item is unknown, 403 if it belongs
+                    to another user or another access token
             """
             try:
-                # Configure a new client with the provided credentials
+                # Reuse the pooled client for the provided credentials
                 # This allows the endpoint to work with different credentials if needed
-                config = plaid.Configuration(
-                    host=plaid.Environment.Sandbox,
-                    api_key={
-                        'clientId': request.client_id,
-                        'secret': request.secret,
-                    }
-                )
-                api_client = plaid.ApiClient(config)
-                temp_client = plaid_api.PlaidApi(api_client)
-                
+                plaid_client = self.plaid_clients.get(request.client_id, request.secret)
+
+                if request.item_id:
+                    self.owned_item(request.item_id, session_id, request.access_token)
+                    sync_result = await asyncio.to_thread(
+                        self.sync_engine.sync,
+                        plaid_client,
+                        request.access_token,
+                        request.item_id,
+                    )
+                    if sync_result.added or sync_result.modified or sync_result.removed:
+                        self.rescore(request.item_id)
+                    return PlaidJSONResponse(sync_result.to_dict())
+
                 # Create the transactions sync request
-                sync_request = plaid.model.transactions_sync_request.TransactionsSyncRequest(
-                    access_token=request.access_token,
-                    cursor=request.cursor,
-                    count=request.count
+                sync_request = (
+                    plaid.model.transactions_sync_request.TransactionsSyncRequest(
+                        access_token=request.access_token, count=request.count
+                    )
                 )
-                
+                if request.cursor:
+                    sync_request.cursor = request.cursor
+
                 # Call the Plaid API
-                response = temp_client.transactions_sync(sync_request)
-                
+                response = plaid_client.transactions_sync(sync_request)
+
                 # Log success (without sensitive data)
                 self.logger.info(
                     "transactions_synced",
-                    added_count=len(response['added']),
-                    modified_count=len(response['modified']),
-                    removed_count=len(response['removed']),
-                    has_more=response['has_more']
+                    added_count=len(response["added"]),
+                    modified_count=len(response["modified"]),
+                    removed_count=len(response["removed"]),
+                    has_more=response["has_more"],
                 )
-                
-                # Return the response
-                return response.to_dict()
-                
+
+                # Encode the Plaid model directly, without to_dict()
+                return PlaidJSONResponse(response)
+
+            except HTTPException:
+                raise
             except plaid.ApiException as e:
                 error_response = json.loads(e.body)
                 self.logger.error(
                     "transactions_sync_failed",
-                    error_type=error_response.get('error_type'),
-                    error_code=error_response.get('error_code'),
-                    error_message=error_response.get('error_message')
+                    error_type=error_response.get("error_type"),
+                    error_code=error_response.get("error_code"),
+                    error_message=error_response.get("error_message"),
                 )
                 raise HTTPException(
                     status_code=500,
-                    detail=f"Plaid error: {error_response.get('error_message')}"
+                    detail=f"Plaid error: {error_response.get('error_message')}",
                 ) from e
             except Exception as e:
                 self.logger.exception("transactions_sync_failed", error=str(e))
                 raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to sync transactions: {str(e)}"
+                    status_code=500, detail=f"Failed to sync transactions: {e!s}"
                 ) from e
 
         @self._router.post("/liabilities/get")
-        async def get_liabilities(request: dict):
+        async def get_liabilities(request: dict) -> PlaidJSONResponse:
             """
             Fetch liabilities for a given access token.
-            
+
             Args:
                 request: Contains client_id, secret, and access_token
-                
+
             Returns:
-                dict: Contains accounts and liabilities information
+                PlaidJSONResponse: Accounts and liabilities information,
+                    encoded in one pass
             """
             try:
-                # Configure a new client with the provided credentials
-                config = plaid.Configuration(
-                    host=plaid.Environment.Sandbox,
-                    api_key={
-                        'clientId': request.get('client_id'),
-                        'secret': request.get('secret'),
-                    }
+                # Reuse the pooled client for the provided credentials
+                plaid_client = self.plaid_clients.get(
+                    request.get("client_id"), request.get("secret")
                 )
-                api_client = plaid.ApiClient(config)
-                temp_client = plaid_api.PlaidApi(api_client)
-                
+
                 # Create the liabilities request
-                liabilities_request = plaid.model.liabilities_get_request.LiabilitiesGetRequest(
-                    access_token=request.get('access_token')
+                liabilities_request = (
+                    plaid.model.liabilities_get_request.LiabilitiesGetRequest(
+                        access_token=request.get("access_token")
+                    )
                 )
-                
+
                 # Call the Plaid API
-                response = temp_client.liabilities_get(liabilities_request)
-                
+                response = plaid_client.liabilities_get(liabilities_request)
+
                 # Extract and log key information about liabilities
                 liability_summary = {
-                    "accounts_count": len(response['accounts']),
+                    "accounts_count": len(response["accounts"]),
                     "account_types": {},
-                    "liability_types": []
+                    "liability_types": [],
                 }
-                
+
                 # Summarize account types
-                for account in response['accounts']:
-                    account_type = account.get('type')
+                for account in response["accounts"]:
+                    account_type = str(account.get("type"))
                     if account_type in liability_summary["account_types"]:
                         liability_summary["account_types"][account_type] += 1
                     else:
                         liability_summary["account_types"][account_type] = 1
-                
+
                 # Check for different liability types
-                if 'liabilities' in response:
-                    liability_summary["liability_types"] = list(response['liabilities'].keys())
-                    
+                if "liabilities" in response:
+                    liabilities = response["liabilities"].to_dict()
+                    liability_summary["liability_types"] = list(liabilities.keys())
+
                     # Count specific liability types
-                    liability_summary["credit_count"] = len(response['liabilities'].get('credit', []))
-                    liability_summary["mortgage_count"] = len(response['liabilities'].get('mortgage', []))
-                    liability_summary["student_count"] = len(response['liabilities'].get('student', []))
-                
+                    liability_summary["credit_count"] = len(
+                        liabilities.get("credit") or []
+                    )
+                    liability_summary["mortgage_count"] = len(
+                        liabilities.get("mortgage") or []
+                    )
+                    liability_summary["student_count"] = len(
+                        liabilities.get("student") or []
+                    )
+
                 # Log the liability summary
                 self.logger.info(
-                    "liabilities_fetched",
-                    liability_summary=liability_summary
+                    "liabilities_fetched", liability_summary=liability_summary
                 )
-                
-                # Return the response
-                return response.to_dict()
-                
+
+                # Encode the Plaid model directly, without to_dict()
+                return PlaidJSONResponse(response)
+
             except plaid.ApiException as e:
                 error_response = json.loads(e.body)
                 self.logger.error(
                     "liabilities_fetch_failed",
-                    error_type=error_response.get('error_type'),
-                    error_code=error_response.get('error_code'),
-                    error_message=error_response.get('error_message')
+                    error_type=error_response.get("error_type"),
+                    error_code=error_response.get("error_code"),
+                    error_message=error_response.get("error_message"),
                 )
                 raise HTTPException(
                     status_code=500,
-                    detail=f"Plaid error: {error_response.get('error_message')}"
+                    detail=f"Plaid error: {error_response.get('error_message')}",
                 ) from e
             except Exception as e:
                 self.logger.exception("liabilities_fetch_failed", error=str(e))
                 raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to fetch liabilities: {str(e)}"
+                    status_code=500, detail=f"Failed to fetch liabilities: {e!s}"
                 ) from e
 
         @self._router.post("/conversation")
-        async def direct_conversation(message: ChatMessage) -> dict[str, str]:
+        async def direct_conversation(
+            message: ChatMessage, session_id: str = Depends(get_session_id)
+        ) -> dict[str, str]:
             """
             Direct endpoint for conversation with the AI without semantic routing.
-            
+
             This endpoint allows sending messages directly to the AI provider
             without going through the semantic routing process. It's useful for
             simple Q&A interactions about financial data and Plaid services.
-            
+
             Args:
                 message: Validated chat message
-                
+                session_id: Conversation session from the header or cookie
+
             Returns:
                 dict[str, str]: Response from AI provider
             """
+            session = self.sessions.get(session_id)
             try:
                 self.logger.info(
-                    "plaid_conversation_request",
-                    message_length=len(message.message)
+                    "plaid_conversation_request", message_length=len(message.message)
                 )
-                
+
                 # Send the message directly to the AI provider
-                response = self.ai.send_message(message.message)
-                
+                context = self.history.context(session)
+                response = await self.ai.asend_message(message.message, context)
+                self.history.record(session, context)
+
                 self.logger.info(
-                    "plaid_conversation_response",
-                    response_length=len(response.text)
+                    "plaid_conversation_response", response_length=len(response.text)
                 )
-                
+
                 return {"response": response.text}
             except Exception as e:
                 self.logger.exception("plaid_conversation_failed", error=str(e))
                 raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to process conversation: {str(e)}"
+                    status_code=500, detail=f"Failed to process conversation: {e!s}"
                 ) from e
+            finally:
+                self.sessions.save(session)
+
+        @self._router.post("/conversation/stream")
+        async def direct_conversation_stream(
+            message: ChatMessage, session_id: str = Depends(get_session_id)
+        ) -> StreamingResponse:
+            """
+            Streaming variant of `/conversation` using Server-Sent Events.
+
+            Reply chunks are sent as `token` events as Gemini produces them,
+            followed by a `done` event, or an `error` event on failure.
+
+            Args:
+                message: Validated chat message
+                session_id: Conversation session from the header or cookie
+
+            Returns:
+                StreamingResponse: `text/event-stream` response
+            """
+            session = self.sessions.get(session_id)
+            self.logger.info(
+                "plaid_conversation_stream_request", message_length=len(message.message)
+            )
+            events = stream_sse(
+                self.stream_conversation(session, message.message),
+                logger=self.logger,
+                on_close=lambda: self.sessions.save(session),
+            )
+            return sse_response(events, session_id)
 
     @property
     def router(self) -> APIRouter:
         """Get the FastAPI router with registered routes."""
         return self._router
 
-    async def handle_command(self, command: str) -> dict[str, str]:
+    async def handle_command(self, session: Session, command: str) -> dict[str, str]:
         """
         Handle special command messages starting with '/'.
 
         Args:
+            session: Conversation session the command applies to
             command: Command string to process
 
         Returns:
             dict[str, str]: Response containing command result
         """
         if command == "/reset":
-            self.blockchain.reset()
-            self.ai.reset()
+            session.reset()
             return {"response": "Reset complete"}
         return {"response": "Unknown command"}
 
     async def get_semantic_route(self, message: str) -> SemanticRouterResponse:
         """
-        Determine the semantic route for a message using AI provider.
+        Determine the semantic route for a message.
+
+        Uses the route cache and local classifiers first, and only calls the
+        AI provider when none of them is confident.
 
         Args:
             message: Message to route
@@ -818,25 +827,16 @@ class PlaidRouter:
         Returns:
             SemanticRouterResponse: Determined route for the message
         """
-        try:
-            prompt, mime_type, schema = self.prompts.get_formatted_prompt(
-                "semantic_router", user_input=message
-            )
-            route_response = self.ai.generate(
-                prompt=prompt, response_mime_type=mime_type, response_schema=schema
-            )
-            return SemanticRouterResponse(route_response.text)
-        except Exception as e:
-            self.logger.exception("routing_failed", error=str(e))
-            return SemanticRouterResponse.CONVERSATIONAL
+        return await self.route_resolver.resolve(message)
 
     async def route_message(
-        self, route: SemanticRouterResponse, message: str
+        self, session: Session, route: SemanticRouterResponse, message: str
     ) -> dict[str, str]:
         """
         Route a message to the appropriate handler based on semantic route.
 
         Args:
+            session: Conversation session the message belongs to
             route: Determined semantic route
             message: Original message to handle
 
@@ -844,7 +844,6 @@ class PlaidRouter:
             dict[str, str]: Response from the appropriate handler
         """
         handlers = {
-
             SemanticRouterResponse.CONVERSATIONAL: self.handle_conversation,
         }
 
@@ -852,47 +851,44 @@ class PlaidRouter:
         if not handler:
             return {"response": "Unsupported route"}
 
-        return await handler(message)
+        return await handler(session, message)
 
-    async def handle_generate_account(self, _: str) -> dict[str, str]:
+    async def handle_generate_account(self, session: Session, _: str) -> dict[str, str]:
         """
         Handle account generation requests.
 
         Args:
+            session: Conversation session owning the account
             _: Unused message parameter
 
         Returns:
             dict[str, str]: Response containing new account information
                 or existing account
         """
-        if self.blockchain.address:
-            return {"response": f"Account exists - {self.blockchain.address}"}
-        address = self.blockchain.generate_account()
-        prompt, mime_type, schema = self.prompts.get_formatted_prompt(
-            "generate_account", address=address
-        )
-        gen_address_response = self.ai.generate(
-            prompt=prompt, response_mime_type=mime_type, response_schema=schema
-        )
-        return {"response": gen_address_response.text}
+        if session.wallet.address:
+            return {"response": f"Account exists - {session.wallet.address}"}
+        address = self.blockchain.generate_account(session.wallet)
+        gen_address = await self.replies.render("generate_account", address=address)
+        return {"response": gen_address}
 
-    async def handle_send_token(self, message: str) -> dict[str, str]:
+    async def handle_send_token(self, session: Session, message: str) -> dict[str, str]:
         """
         Handle token sending requests.
 
         Args:
+            session: Conversation session sending the tokens
             message: Message containing token sending details
 
         Returns:
             dict[str, str]: Response containing transaction preview or follow-up prompt
         """
-        if not self.blockchain.address:
-            await self.handle_generate_account(message)
+        if not session.wallet.address:
+            await self.handle_generate_account(session, message)
 
         prompt, mime_type, schema = self.prompts.get_formatted_prompt(
             "token_send", user_input=message
         )
-        send_token_response = self.ai.generate(
+        send_token_response = await self.ai.agenerate(
             prompt=prompt, response_mime_type=mime_type, response_schema=schema
         )
         send_token_json = json.loads(send_token_response.text)
@@ -901,16 +897,15 @@ class PlaidRouter:
             len(send_token_json) != expected_json_len
             or send_token_json.get("amount") == 0.0
         ):
-            prompt, _, _ = self.prompts.get_formatted_prompt("follow_up_token_send")
-            follow_up_response = self.ai.generate(prompt)
-            return {"response": follow_up_response.text}
+            return {"response": await self.replies.render("follow_up_token_send")}
 
-        tx = self.blockchain.create_send_flr_tx(
+        tx = await self.blockchain.create_send_flr_tx(
             to_address=send_token_json.get("to_address"),
             amount=send_token_json.get("amount"),
+            wallet=session.wallet,
         )
         self.logger.debug("send_token_tx", tx=tx)
-        self.blockchain.add_tx_to_queue(msg=message, tx=tx)
+        self.blockchain.add_tx_to_queue(msg=message, tx=tx, wallet=session.wallet)
         formatted_preview = (
             "Transaction Preview: "
             + f"Sending {Web3.from_wei(tx.get('value', 0), 'ether')} "
@@ -918,11 +913,12 @@ class PlaidRouter:
         )
         return {"response": formatted_preview}
 
-    async def handle_swap_token(self, _: str) -> dict[str, str]:
+    async def handle_swap_token(self, _session: Session, _: str) -> dict[str, str]:
         """
         Handle token swap requests (currently unsupported).
 
         Args:
+            _session: Unused session parameter
             _: Unused message parameter
 
         Returns:
@@ -930,43 +926,289 @@ class PlaidRouter:
         """
         return {"response": "Sorry I can't do that right now"}
 
-    async def handle_attestation(self, _: str) -> dict[str, str]:
+    async def handle_attestation(self, session: Session, _: str) -> dict[str, str]:
         """
         Handle attestation requests.
 
         Args:
+            session: Conversation session requesting the attestation
             _: Unused message parameter
 
         Returns:
             dict[str, str]: Response containing attestation request
         """
-        prompt = self.prompts.get_formatted_prompt("request_attestation")[0]
-        request_attestation_response = self.ai.generate(prompt=prompt)
-        self.attestation.attestation_requested = True
-        return {"response": request_attestation_response.text}
+        request_attestation = await self.replies.render("request_attestation")
+        session.attestation_requested = True
+        return {"response": request_attestation}
 
-    async def handle_conversation(self, message: str) -> dict[str, str]:
+    async def handle_conversation(
+        self, session: Session, message: str
+    ) -> dict[str, str]:
         """
         Handle general conversation messages.
 
         Args:
+            session: Conversation session holding the chat history
             message: Message to process
 
         Returns:
             dict[str, str]: Response from AI provider
         """
-        response = self.ai.send_message(message)
+        context = self.history.context(session)
+        response = await self.ai.asend_message(message, context)
+        self.history.record(session, context)
         return {"response": response.text}
 
-    # Add this helper method to the PlaidRouter class
-    def make_serializable(self, obj):
-        """Convert Plaid objects to JSON-serializable format"""
-        if isinstance(obj, dict):
-            return {k: self.make_serializable(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self.make_serializable(i) for i in obj]
-        elif isinstance(obj, (date, dt.datetime)):
-            return obj.isoformat()
-        else:
-            return obj
-    
\ No newline at end of file
+    async def stream_conversation(
+        self, session: Session, message: str
+    ) -> AsyncIterator[str]:
+        """
+        Stream the reply to a general conversation message.
+
+        Args:
+            session: Conversation session holding the chat history
+            message: Message to process
+
+        Yields:
+            str: Successive chunks of the reply text
+        """
+        context = self.history.context(session)
+        async for chunk in self.ai.astream_message(message, context):
+            yield chunk
+        self.history.record(session, context)
+
+    async def link_item(self, job: Job, progress: Progress) -> dict[str, Any]:
+        """
+        Run one attempt of a link job: exchange, sync and score.
+
+        The exchanged access token is checkpointed on the job, since a public
+        token can only be exchanged once; retries resume from the sync.
+
+        Args:
+            job: Link job carrying the public token
+            progress: Callback reporting each completed step
+
+        Returns:
+            dict[str, Any]: Item id, sync summary and credit score
+
+        Raises:
+            PermanentJobError: If Plaid rejects the request as invalid
+        """
+        plaid_client = self.plaid_client
+        try:
+            if "item_id" not in job.checkpoint:
+                exchange_response = await asyncio.to_thread(
+                    plaid_client.item_public_token_exchange,
+                    ItemPublicTokenExchangeRequest(
+                        public_token=job.payload["public_token"]
+                    ),
+                )
+                job.checkpoint["access_token"] = exchange_response["access_token"]
+                job.checkpoint["item_id"] = exchange_response["item_id"]
+                progress("exchanged")
+            item = LinkedItem(
+                item_id=job.checkpoint["item_id"],
+                access_token=job.checkpoint["access_token"],
+                user_id=job.payload.get("session_id"),
+            )
+            self.scores.link_item(item)
+
+            # Page through every change since the item's stored cursor
+            sync_result = await asyncio.to_thread(
+                self.sync_engine.sync, plaid_client, item.access_token, item.item_id
+            )
+            progress("synced")
+            score = await asyncio.to_thread(
+                self.score_item, plaid_client, item.access_token, item.item_id
+            )
+            progress("scored")
+        except plaid.ApiException as e:
+            if _rejected(e):
+                msg = f"Plaid rejected the request ({e.status}): {e.body}"
+                raise PermanentJobError(msg) from e
+            raise
+
+        result = {
+            "item_id": item.item_id,
+            "transactions": {
+                "added": len(sync_result.added),
+                "modified": len(sync_result.modified),
+                "removed": len(sync_result.removed),
+                "pages": sync_result.pages,
+                "total": sync_result.total,
+            },
+            **score.to_dict(),
+        }
+        if self.score_narrative:
+            try:
+                result["ai_response"] = await self.explain_score(score)
+            except Exception as e:  # noqa: BLE001
+                # The score stands on its own; a missing narrative is no failure
+                self.logger.warning("score_narrative_failed", error=str(e))
+        return result
+
+    async def score_job(self, job: Job, progress: Progress) -> dict[str, Any]:
+        """
+        Run one attempt of a rescore job for an already linked item.
+
+        Args:
+            job: Score job carrying the item id
+            progress: Callback reporting each completed step
+
+        Returns:
+            dict[str, Any]: Item id and credit score
+
+        Raises:
+            PermanentJobError: If the item is not linked or Plaid rejects the
+                request as invalid
+        """
+        item = self.scores.get_item(job.payload["item_id"])
+        if item is None:
+            msg = f"Unknown item: {job.payload['item_id']}"
+            raise PermanentJobError(msg)
+        try:
+            score = await asyncio.to_thread(
+                self.score_item, self.plaid_client, item.access_token, item.item_id
+            )
+        except plaid.ApiException as e:
+            if _rejected(e):
+                msg = f"Plaid rejected the request ({e.status}): {e.body}"
+                raise PermanentJobError(msg) from e
+            raise
+        progress("scored")
+        return {"item_id": item.item_id, **score.to_dict()}
+
+    def rescore(self, item_id: str) -> Job | None:
+        """
+        Invalidate an item's cached score after a re-sync and queue a rescore.
+
+        Args:
+            item_id: Plaid item identifier
+
+        Returns:
+            Job | None: The rescore job, or None if the item was not linked
+                here or the queue is full
+        """
+        self.scores.invalidate(item_id)
+        if self.scores.get_item(item_id) is None:
+            return None
+        try:
+            return self.jobs.submit(SCORE_ITEM_JOB, {"item_id": item_id})
+        except JobQueueFullError as e:
+            self.logger.warning("rescore_not_queued", item_id=item_id, error=str(e))
+            return None
+
+    def owned_item(
+        self, item_id: str, user_id: str, access_token: str | None = None
+    ) -> LinkedItem:
+        """
+        Look up a linked item on behalf of a user.
+
+        Args:
+            item_id: Plaid item identifier from the request
+            user_id: Session making the request
+            access_token: Access token the request was made with, if any
+
+        Returns:
+            LinkedItem: The item, linked by the user (with that access token)
+
+        Raises:
+            HTTPException: 404 if the item was never linked, 403 if another
+                user linked it or the access token is not the item's
+        """
+        item = self.scores.get_item(item_id)
+        if item is None:
+            raise HTTPException(status_code=404, detail="Unknown item")
+        if item.user_id != user_id or access_token not in {None, item.access_token}:
+            self.logger.warning("plaid_item_access_denied", item_id=item_id)
+            raise HTTPException(status_code=403, detail="Item not linked by caller")
+        return item
+
+    def latest_item(self, user_id: str) -> str | None:
+        """Item the user linked most recently, if any."""
+        items = self.scores.items_for_user(user_id)
+        return items[0] if items else None
+
+    def score_item(
+        self, plaid_client: plaid_api.PlaidApi, access_token: str, item_id: str
+    ) -> CreditScore:
+        """
+        Score an item's synced history together with its liabilities and
+        add the score to the item's history.
+
+        Blocks on Plaid and the stores; call it from a worker thread.
+
+        Args:
+            plaid_client: Plaid client for the item's credentials
+            access_token: Access token of the item
+            item_id: Plaid item identifier
+
+        Returns:
+            CreditScore: Score of the item's full stored history
+        """
+        utilization = self.fetch_utilization(plaid_client, access_token)
+        transactions = self.sync_engine.store.transactions(item_id)
+        score = self.scorer.score(transactions, utilization)
+        self.scores.add_score(item_id, score)
+        self.logger.info(
+            "credit_score_computed",
+            item_id=item_id,
+            credit_score=score.score,
+            transaction_count=score.transaction_count,
+        )
+        return score
+
+    def fetch_utilization(
+        self, plaid_client: plaid_api.PlaidApi, access_token: str
+    ) -> float | None:
+        """
+        Fetch credit utilization from the item's liabilities.
+
+        Blocks on Plaid; call it from a worker thread.
+
+        Args:
+            plaid_client: Plaid client for the item's credentials
+            access_token: Access token of the item
+
+        Returns:
+            float | None: Credit utilization, or None if the item has no
+                credit accounts or the liabilities product is unavailable
+        """
+        liabilities_request = plaid.model.liabilities_get_request.LiabilitiesGetRequest(
+            access_token=access_token
+        )
+        try:
+            response = plaid_client.liabilities_get(
+                liabilities_request, _preload_content=False
+            )
+        except plaid.ApiException as e:
+            self.logger.warning("liabilities_unavailable", error=str(e.reason))
+            return None
+        return utilization_from_accounts(json.loads(response.data)["accounts"])
+
+    async def explain_score(self, score: CreditScore) -> str:
+        """
+        Ask the AI for a short explanation of a computed score.
+
+        The AI never produces the score itself, only the narrative.
+
+        Args:
+            score: Locally computed credit score
+
+        Returns:
+            str: Plain-language explanation
+        """
+        prompt, mime_type, schema = self.prompts.get_formatted_prompt(
+            "credit_score_narrative",
+            credit_score=str(score.score),
+            features=json.dumps(score.features.to_dict()),
+        )
+        response = await self.ai.agenerate(
+            prompt=prompt, response_mime_type=mime_type, response_schema=schema
+        )
+        return response.text
+
+
+def _rejected(error: plaid.ApiException) -> bool:
+    # Bad or expired tokens fail the same way on every retry
+    return error.status is not None and error.status < 500 and error.status != 429
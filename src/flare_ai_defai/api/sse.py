@@ -0,0 +1,98 @@
+"""
+Server-Sent Events helpers for streaming chat replies and status updates.
+
+Each chunk of a reply is sent as a `token` event whose data is a JSON-encoded
+string, so newlines inside the text survive the line-based SSE framing. The
+stream always ends with either a `done` event (carrying timing information)
+or an `error` event.
+"""
+
+import json
+import time
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+from structlog.typing import FilteringBoundLogger
+
+from flare_ai_defai.api.dependencies import attach_session_id
+
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    Encode a single Server-Sent Event.
+
+    Args:
+        event: Event name
+        data: JSON-serializable payload
+
+    Returns:
+        str: The framed event, terminated by a blank line
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_sse(
+    chunks: AsyncIterator[str],
+    logger: FilteringBoundLogger,
+    on_close: Callable[[], None] | None = None,
+) -> AsyncIterator[str]:
+    """
+    Frame reply chunks as Server-Sent Events, measuring time to first token.
+
+    Args:
+        chunks: Reply text chunks in order
+        logger: Logger to report time-to-first-token and total stream time
+        on_close: Callback run once the stream has finished, even on error
+
+    Yields:
+        str: Framed `token` events followed by a `done` or `error` event
+    """
+    start = time.perf_counter()
+    ttft_ms: float | None = None
+    chunk_count = 0
+    try:
+        async for chunk in chunks:
+            if ttft_ms is None:
+                ttft_ms = (time.perf_counter() - start) * 1000
+                logger.info("stream_first_token", ttft_ms=round(ttft_ms, 1))
+            chunk_count += 1
+            yield format_sse("token", chunk)
+        total_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            "stream_completed",
+            ttft_ms=None if ttft_ms is None else round(ttft_ms, 1),
+            total_ms=round(total_ms, 1),
+            chunks=chunk_count,
+        )
+        yield format_sse("done", {"ttft_ms": ttft_ms, "total_ms": total_ms})
+    except Exception as e:
+        logger.exception("stream_failed", error=str(e))
+        yield format_sse("error", str(e))
+    finally:
+        if on_close is not None:
+            on_close()
+
+
+def sse_response(
+    events: AsyncIterator[str], session_id: str | None = None
+) -> StreamingResponse:
+    """
+    Wrap framed events in a streaming HTTP response.
+
+    Args:
+        events: Framed Server-Sent Events
+        session_id: Conversation session to hand back to the client, if any
+
+    Returns:
+        StreamingResponse: Unbuffered `text/event-stream` response
+    """
+    response = StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        # Disable proxy buffering (nginx) so tokens reach the client immediately
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    if session_id is not None:
+        attach_session_id(response, session_id)
+    return response
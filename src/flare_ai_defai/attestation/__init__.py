@@ -1,4 +1,6 @@
+from .batch import AttestationBatcher, IssuedToken
 from .vtpm_attestation import (
+    InvalidNonceError,
     Vtpm,
     VtpmAttestationError,
 )
@@ -9,13 +11,18 @@ from .vtpm_validation import (
     VtpmValidation,
     VtpmValidationError,
 )
+from .well_known_cache import WellKnownCache
 
 __all__ = [
+    "AttestationBatcher",
     "CertificateParsingError",
     "InvalidCertificateChainError",
+    "InvalidNonceError",
+    "IssuedToken",
     "SignatureValidationError",
     "Vtpm",
     "VtpmAttestationError",
     "VtpmValidation",
     "VtpmValidationError",
+    "WellKnownCache",
 ]
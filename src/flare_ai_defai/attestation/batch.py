@@ -0,0 +1,249 @@
+"""
+Batched attestation token issuance.
+
+A single teeserver token request can carry several nonces, up to a limit on
+their count and total size. `AttestationBatcher` packs the nonces of a
+request into as few token requests as those limits allow, shares in-flight
+requests between concurrent callers asking for the same nonce, and caches
+every issued token until shortly before it expires, so repeated nonces cost
+no teeserver round trip at all.
+
+Each request's nonces are packed only with each other, but a nonce that is
+already cached or being requested is answered with the token issued for it,
+which also carries the nonces it was requested with.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import jwt
+import structlog
+
+from flare_ai_defai.attestation.vtpm_attestation import (
+    MAX_NONCE_BYTES,
+    Vtpm,
+    VtpmAttestationError,
+)
+from flare_ai_defai.cache import CacheStats, TTLCache
+
+logger = structlog.get_logger(__name__)
+
+# Limits the teeserver places on the nonces of a single token request
+MAX_NONCES_PER_TOKEN = 6
+MAX_NONCE_BYTES_PER_TOKEN = MAX_NONCES_PER_TOKEN * MAX_NONCE_BYTES
+
+type TokenKey = tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class IssuedToken:
+    """
+    An attestation token and the nonces it attests.
+
+    Attributes:
+        token (str): Attestation token in JWT format
+        nonces (tuple[str, ...]): Every nonce the token carries
+        expires_at (float): Unix time the token expires
+    """
+
+    token: str
+    nonces: tuple[str, ...]
+    expires_at: float
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the token to JSON-compatible primitives."""
+        return {
+            "token": self.token,
+            "nonces": list(self.nonces),
+            "expires_at": self.expires_at,
+        }
+
+
+def token_expiry(token: str, default_ttl: float) -> float:
+    """
+    Read a token's expiry from its `exp` claim, without verifying it.
+
+    Args:
+        token: Attestation token
+        default_ttl: Lifetime assumed if the token has no readable `exp`
+
+    Returns:
+        float: Unix time the token expires
+    """
+    try:
+        claims = jwt.decode(token, options={"verify_signature": False})
+        return float(claims["exp"])
+    except (jwt.InvalidTokenError, KeyError, TypeError, ValueError):
+        return time.time() + default_ttl
+
+
+def pack_nonces(
+    nonces: list[str],
+    max_nonces: int = MAX_NONCES_PER_TOKEN,
+    max_bytes: int = MAX_NONCE_BYTES_PER_TOKEN,
+) -> list[list[str]]:
+    """
+    Split nonces into consecutive batches within the per-token limits.
+
+    Args:
+        nonces: Nonces to attest, in order
+        max_nonces: Most nonces one token may carry
+        max_bytes: Most UTF-8 bytes of nonces one token may carry
+
+    Returns:
+        list[list[str]]: Batches of nonces, one per token request
+    """
+    batches: list[list[str]] = []
+    batch: list[str] = []
+    size = 0
+    for nonce in nonces:
+        nonce_bytes = len(nonce.encode("utf-8"))
+        if batch and (len(batch) == max_nonces or size + nonce_bytes > max_bytes):
+            batches.append(batch)
+            batch, size = [], 0
+        batch.append(nonce)
+        size += nonce_bytes
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class AttestationBatcher:
+    """
+    Issues attestation tokens for many nonces with few teeserver requests.
+
+    Attributes:
+        vtpm (Vtpm): Client for the teeserver
+        stats (CacheStats): Hit and miss counters of the token cache
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        vtpm: Vtpm,
+        *,
+        max_nonces: int = MAX_NONCES_PER_TOKEN,
+        max_bytes: int = MAX_NONCE_BYTES_PER_TOKEN,
+        cache_size: int = 10_000,
+        default_ttl: float = 3600.0,
+        expiry_margin: float = 60.0,
+    ) -> None:
+        """
+        Args:
+            vtpm: Client for the teeserver
+            max_nonces: Most nonces one token request may carry
+            max_bytes: Most UTF-8 bytes of nonces one token request may carry
+            cache_size: Nonces whose token is kept for reuse
+            default_ttl: Lifetime assumed for tokens without an `exp` claim
+            expiry_margin: Seconds before expiry a cached token stops being
+                handed out, so clients have time to use it
+        """
+        self.vtpm = vtpm
+        self.max_nonces = max_nonces
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.expiry_margin = expiry_margin
+        self._cache: TTLCache[TokenKey, IssuedToken] = TTLCache(
+            ttl=default_ttl, maxsize=cache_size
+        )
+        self._inflight: dict[TokenKey, asyncio.Future[IssuedToken]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.logger = logger.bind(router="attestation_batcher")
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit and miss counters of the token cache."""
+        return self._cache.stats
+
+    async def issue(
+        self,
+        nonces: list[str],
+        audience: str = "https://sts.google.com",
+        token_type: str = "OIDC",  # noqa: S107
+    ) -> dict[str, IssuedToken]:
+        """
+        Return a token attesting each nonce.
+
+        Cached tokens are reused, nonces already being requested by another
+        caller wait for that request, and the remaining nonces are packed
+        into as few token requests as the limits allow, sent concurrently.
+
+        Args:
+            nonces: Nonces to attest; duplicates are attested once
+            audience: Intended audience of the tokens
+            token_type: Type of token, either "OIDC" or "PKI"
+
+        Returns:
+            dict[str, IssuedToken]: Token for each distinct nonce, in order
+
+        Raises:
+            InvalidNonceError: If any nonce is outside the valid length range
+            VtpmAttestationError: If a token request fails
+        """
+        unique = list(dict.fromkeys(nonces))
+        self.vtpm.check_nonce_length(unique)
+
+        issued: dict[str, IssuedToken] = {}
+        pending: dict[str, asyncio.Future[IssuedToken]] = {}
+        missing: list[str] = []
+        for nonce in unique:
+            key = (audience, token_type, nonce)
+            token = self._cache.get(key)
+            if token is not None:
+                issued[nonce] = token
+            elif key in self._inflight:
+                pending[nonce] = self._inflight[key]
+            else:
+                missing.append(nonce)
+
+        loop = asyncio.get_running_loop()
+        for batch in pack_nonces(missing, self.max_nonces, self.max_bytes):
+            for nonce in batch:
+                future = loop.create_future()
+                self._inflight[audience, token_type, nonce] = future
+                pending[nonce] = future
+            task = asyncio.create_task(self._request(batch, audience, token_type))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        # Shielded, so a cancelled caller does not cancel requests shared with
+        # other callers
+        results = await asyncio.gather(
+            *(asyncio.shield(future) for future in pending.values()),
+            return_exceptions=True,
+        )
+        for nonce, result in zip(pending, results, strict=True):
+            if isinstance(result, BaseException):
+                raise result
+            issued[nonce] = result
+        return {nonce: issued[nonce] for nonce in unique}
+
+    async def _request(self, batch: list[str], audience: str, token_type: str) -> None:
+        """Request one token for a batch and resolve the waiting futures."""
+        keys = [(audience, token_type, nonce) for nonce in batch]
+        issued: IssuedToken | None = None
+        # Reported to waiters if the request is cancelled, e.g. on shutdown
+        error: Exception = VtpmAttestationError("Token request cancelled")
+        try:
+            token = await self.vtpm.aget_token(batch, audience, token_type)
+            issued = IssuedToken(
+                token, tuple(batch), token_expiry(token, self.default_ttl)
+            )
+            ttl = issued.expires_at - time.time() - self.expiry_margin
+            if ttl > 0:
+                for key in keys:
+                    self._cache.set(key, issued, ttl=ttl)
+            self.logger.debug("token_issued", nonces=len(batch), ttl=ttl)
+        except Exception as e:  # noqa: BLE001
+            error = e
+        finally:
+            # Never leave a waiter hanging or a nonce stuck as in flight
+            for key in keys:
+                future = self._inflight.pop(key, None)
+                if future is None or future.done():
+                    continue
+                if issued is not None:
+                    future.set_result(issued)
+                else:
+                    future.set_exception(error)
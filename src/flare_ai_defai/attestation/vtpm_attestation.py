@@ -2,21 +2,26 @@
 Client for communicating with the Confidential Space vTPM attestation service.
 
 This module provides a client to request attestation tokens from a local Unix domain
-socket endpoint. It extends HTTPConnection to handle Unix socket communication and
-implements token request functionality with nonce validation.
+socket endpoint. Async callers share a small pool of keep-alive connections to the
+socket; the blocking `get_token` opens one HTTPConnection per request.
 
 Classes:
     VtpmAttestationError: Exception for attestation service communication errors
+    InvalidNonceError: Exception for nonces the attestation service would reject
     VtpmAttestation: Client for requesting attestation tokens
 """
 
+import asyncio
 import json
 import socket
 from http.client import HTTPConnection
 from pathlib import Path
 
+import aiohttp
 import structlog
 
+from flare_ai_defai.metrics import VTPM_TOKEN_SECONDS
+
 logger = structlog.get_logger(__name__)
 
 
@@ -27,6 +32,9 @@ def get_simulated_token() -> str:
 
 
 SIM_TOKEN = get_simulated_token()
+# Byte length limits the attestation service places on each nonce
+MIN_NONCE_BYTES = 10
+MAX_NONCE_BYTES = 74
 
 
 class VtpmAttestationError(Exception):
@@ -38,26 +46,43 @@ class VtpmAttestationError(Exception):
     """
 
 
+class InvalidNonceError(VtpmAttestationError):
+    """Raised when a nonce is outside the accepted byte length range."""
+
+
 class Vtpm:
     """
-    Client for requesting attestation tokens via Unix domain socket."""
+    Client for requesting attestation tokens via Unix domain socket.
+
+    `aget_token` keeps up to `pool_size` keep-alive connections to the socket
+    open per event loop, so concurrent requests do not each pay for a new
+    connection; call `close` to release them.
+    """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         url: str = "http://localhost/v1/token",
         unix_socket_path: str = "/run/container_launcher/teeserver.sock",
         simulate: bool = False,  # noqa: FBT001, FBT002
+        *,
+        pool_size: int = 4,
+        keepalive_timeout: float = 30.0,
+        request_timeout: float = 10.0,
     ) -> None:
         self.url = url
         self.unix_socket_path = unix_socket_path
         self.simulate = simulate
-        self.attestation_requested: bool = False
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.request_timeout = request_timeout
+        self._session: aiohttp.ClientSession | None = None
+        self._session_loop: asyncio.AbstractEventLoop | None = None
         self.logger = logger.bind(router="vtpm")
         self.logger.debug(
             "vtpm", simulate=simulate, url=url, unix_socket_path=self.unix_socket_path
         )
 
-    def _check_nonce_length(self, nonces: list[str]) -> None:
+    def check_nonce_length(self, nonces: list[str]) -> None:
         """
         Validate the byte length of provided nonces.
 
@@ -67,17 +92,17 @@ class Vtpm:
             nonces: List of nonce strings to validate
 
         Raises:
-            VtpmAttestationError: If any nonce is outside the valid length range
+            InvalidNonceError: If any nonce is outside the valid length range
         """
-        min_byte_len = 10
-        max_byte_len = 74
+        min_byte_len = MIN_NONCE_BYTES
+        max_byte_len = MAX_NONCE_BYTES
         for nonce in nonces:
             byte_len = len(nonce.encode("utf-8"))
             self.logger.debug("nonce_length", byte_len=byte_len)
             if byte_len < min_byte_len or byte_len > max_byte_len:
                 msg = f"Nonce '{nonce}' must be between {min_byte_len} bytes"
                 f" and {max_byte_len} bytes"
-                raise VtpmAttestationError(msg)
+                raise InvalidNonceError(msg)
 
     def get_token(
         self,
@@ -112,35 +137,113 @@ class Vtpm:
                 token_type="OIDC"
             )
         """
-        self._check_nonce_length(nonces)
+        self.check_nonce_length(nonces)
         if self.simulate:
             self.logger.debug("sim_token", token=SIM_TOKEN)
             return SIM_TOKEN
 
-        # Connect to the socket
-        client_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        client_socket.connect(self.unix_socket_path)
+        with VTPM_TOKEN_SECONDS.labels(token_type).time():
+            # Create an HTTP connection object; closing it closes the socket too
+            conn = HTTPConnection("localhost", timeout=self.request_timeout)
+            try:
+                # Connect to the socket
+                client_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                conn.sock = client_socket
+                client_socket.settimeout(self.request_timeout)
+                client_socket.connect(self.unix_socket_path)
+
+                # Send a POST request
+                headers = {"Content-Type": "application/json"}
+                body = json.dumps(
+                    {"audience": audience, "token_type": token_type, "nonces": nonces}
+                )
+                conn.request("POST", self.url, body=body, headers=headers)
+
+                # Get and decode the response
+                res = conn.getresponse()
+                success_status = 200
+                if res.status != success_status:
+                    msg = (
+                        f"Failed to get attestation response: {res.status} {res.reason}"
+                    )
+                    raise VtpmAttestationError(msg)
+                token = res.read().decode()
+            finally:
+                conn.close()
+        self.logger.debug("token", token_type=token_type, token=token)
+        return token
 
-        # Create an HTTP connection object
-        conn = HTTPConnection("localhost", timeout=10)
-        conn.sock = client_socket
+    async def aget_token(
+        self,
+        nonces: list[str],
+        audience: str = "https://sts.google.com",
+        token_type: str = "OIDC",  # noqa: S107
+    ) -> str:
+        """
+        Request an attestation token without blocking the event loop.
 
-        # Send a POST request
-        headers = {"Content-Type": "application/json"}
-        body = json.dumps(
-            {"audience": audience, "token_type": token_type, "nonces": nonces}
-        )
-        conn.request("POST", self.url, body=body, headers=headers)
-
-        # Get and decode the response
-        res = conn.getresponse()
-        success_status = 200
-        if res.status != success_status:
-            msg = f"Failed to get attestation response: {res.status} {res.reason}"
-            raise VtpmAttestationError(msg)
-        token = res.read().decode()
-        self.logger.debug("token", token_type=token_type, token=token)
+        Behaves like `get_token`, but sends the request over a pooled
+        keep-alive connection to the socket.
 
-        # Close the connection
-        conn.close()
+        Args:
+            nonces: List of random nonce strings for replay protection
+            audience: Intended audience for the token (default: "https://sts.google.com")
+            token_type: Type of token, either "OIDC" or "PKI" (default: "OIDC")
+
+        Returns:
+            str: The attestation token in JWT format
+
+        Raises:
+            VtpmAttestationError: If token request fails for any reason
+                (invalid nonces, service unavailable, timeout, etc.)
+        """
+        self.check_nonce_length(nonces)
+        if self.simulate:
+            self.logger.debug("sim_token", token=SIM_TOKEN)
+            return SIM_TOKEN
+
+        session = self._ensure_session()
+        body = {"audience": audience, "token_type": token_type, "nonces": nonces}
+        try:
+            with VTPM_TOKEN_SECONDS.labels(token_type).time():
+                async with session.post(self.url, json=body) as res:
+                    success_status = 200
+                    if res.status != success_status:
+                        msg = (
+                            "Failed to get attestation response: "
+                            f"{res.status} {res.reason}"
+                        )
+                        raise VtpmAttestationError(msg)
+                    token = await res.text()
+        except (aiohttp.ClientError, TimeoutError) as e:
+            msg = f"Failed to reach attestation service: {e!r}"
+            raise VtpmAttestationError(msg) from e
+        self.logger.debug("token", token_type=token_type, token=token)
         return token
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Return the pooled session for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._session is not None
+            and not self._session.closed
+            and self._session_loop is loop
+        ):
+            return self._session
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.UnixConnector(
+                path=self.unix_socket_path,
+                limit=self.pool_size,
+                keepalive_timeout=self.keepalive_timeout,
+            ),
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+        )
+        self._session_loop = loop
+        self.logger.debug("connection_pool_opened", pool_size=self.pool_size)
+        return self._session
+
+    async def close(self) -> None:
+        """Close the pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
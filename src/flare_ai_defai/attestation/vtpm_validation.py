@@ -10,6 +10,7 @@ Classes:
     CertificateParsingError: Raised when certificate parsing fails
     SignatureValidationError: Raised when signature verification fails
     PKICertificates: Container for certificate chain components
+    VerifiedChain: Leaf key of an already verified certificate chain
     VtpmValidation: Main validator class for vTPM token verification
 
 Constants:
@@ -22,21 +23,25 @@ Constants:
 import base64
 import datetime
 import hashlib
+import json
 import re
+import threading
 from dataclasses import dataclass
 from typing import Any, Final
 
 import jwt
-import requests
 import structlog
 from cryptography import x509
 from cryptography.exceptions import InvalidKey
 from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import rsa
 from OpenSSL.crypto import X509, X509Store, X509StoreContext
 from OpenSSL.crypto import Error as OpenSSLError
 
+from flare_ai_defai.attestation.well_known_cache import WellKnownCache
+from flare_ai_defai.cache import TTLCache
+
 logger = structlog.get_logger(__name__)
 
 
@@ -72,7 +77,23 @@ class PKICertificates:
     root_cert: x509.Certificate
 
 
-type JSONWebKeySet = dict[str, list[dict[str, str]]]
+@dataclass(frozen=True)
+class VerifiedChain:
+    """
+    Result of verifying an x5c certificate chain, cached until the chain
+    expires.
+
+    Attributes:
+        leaf_key: Public key of the leaf certificate, used to check token
+            signatures
+        root_cert: Trusted root certificate the chain was verified against
+    """
+
+    leaf_key: rsa.RSAPublicKey
+    root_cert: x509.Certificate
+
+
+type PublicKeys = dict[str, rsa.RSAPublicKey]
 
 # Constants
 ALGO: Final[str] = "RS256"
@@ -97,6 +118,15 @@ class VtpmValidation:
             (default: /.well-known/openid-configuration)
         pki_endpoint: Path to root certificate
             (default: /.well-known/confidential_space_root.crt)
+        well_known_cache: Cache for the issuer's configuration, keys and root
+            certificate, shareable between validators (default: a new cache)
+        min_jwks_refresh: Minimum seconds between JWKS refreshes triggered by
+            tokens signed with an unknown key id
+        root_fingerprint: Expected SHA1 fingerprint of the issuer's root
+            certificate (default: the Confidential Space root)
+        chain_cache_size: Verified certificate chains kept, so repeated PKI
+            tokens from the same enclave only need their signature checked
+            (0 disables the cache)
 
     Usage:
         validator = VtpmValidation()
@@ -107,15 +137,30 @@ class VtpmValidation:
             # Handle validation failure
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         expected_issuer: str = "https://confidentialcomputing.googleapis.com",
         oidc_endpoint: str = "/.well-known/openid-configuration",
         pki_endpoint: str = "/.well-known/confidential_space_root.crt",
+        *,
+        well_known_cache: WellKnownCache | None = None,
+        min_jwks_refresh: float = 30.0,
+        root_fingerprint: str = CERT_FINGERPRINT,
+        chain_cache_size: int = 1024,
     ) -> None:
         self.expected_issuer = expected_issuer
         self.oidc_endpoint = oidc_endpoint
         self.pki_endpoint = pki_endpoint
+        self.well_known_cache = (
+            WellKnownCache() if well_known_cache is None else well_known_cache
+        )
+        self.min_jwks_refresh = min_jwks_refresh
+        self.root_fingerprint = root_fingerprint
+        # Entries expire with the first certificate of their chain to expire
+        self.verified_chains: TTLCache[str, VerifiedChain] = TTLCache(
+            ttl=0.0, maxsize=chain_cache_size
+        )
+        self._chains_lock = threading.Lock()
         self.logger = logger.bind(router="vtpm_validation")
 
     def validate_token(self, token: str) -> dict[str, Any]:
@@ -159,8 +204,9 @@ class VtpmValidation:
         """
         Validates a token using OIDC JWKS-based validation.
 
-        Fetches the JWKS from the issuer's endpoint, finds the matching key by key ID,
-        and validates the token signature.
+        Looks up the key ID in the issuer's cached JWKS, refreshing the JWKS
+        once if the key is unknown (the issuer may have rotated its keys), and
+        validates the token signature.
 
         Args:
             token: The JWT token string
@@ -173,22 +219,30 @@ class VtpmValidation:
             VtpmValidationError: For any validation failure
             SignatureValidationError: If signature validation fails
         """
-        res = self._get_well_known_file(self.expected_issuer, self.oidc_endpoint).json()
-        jwks_uri = res["jwks_uri"]
-
-        jwks = self._fetch_jwks(jwks_uri)
-        rsa_key = None
+        config = self.well_known_cache.get(
+            self.expected_issuer, self.oidc_endpoint, json.loads
+        )
+        jwks_uri = config["jwks_uri"]
+        kid = unverified_header.get("kid")
 
         # Find the correct key based on the key ID (kid) in header
-        for key in jwks["keys"]:
-            if key.get("kid") == unverified_header["kid"]:
-                self.logger.info("kid_match", kid=key["kid"])
-                rsa_key = self._jwk_to_rsa_key(key)
-                break
+        keys = self.well_known_cache.get(
+            self.expected_issuer, jwks_uri, self._parse_jwks
+        )
+        rsa_key = keys.get(kid) if kid else None
+        if rsa_key is None and kid:
+            keys = self.well_known_cache.refresh(
+                self.expected_issuer,
+                jwks_uri,
+                self._parse_jwks,
+                min_age=self.min_jwks_refresh,
+            )
+            rsa_key = keys.get(kid)
 
         if rsa_key is None:
             msg = "Unable to find appropriate key id (kid) in header"
             raise VtpmValidationError(msg)
+        self.logger.info("kid_match", kid=kid)
 
         # Verify and decode the token using the public RSA key
         try:
@@ -223,7 +277,9 @@ class VtpmValidation:
 
         Validates the certificate chain from the x5c header, verifies it
         against the trusted root certificate, and validates the token
-        signature using the leaf certificate.
+        signature using the leaf certificate. Chains already verified are
+        looked up by the hash of the x5c header, so only the token signature
+        is checked for them.
 
         Args:
             token: The JWT token string
@@ -236,31 +292,14 @@ class VtpmValidation:
             VtpmValidationError: For any validation failure
             InvalidCertificateChainError: If certificate chain validation fails
         """
-        res = self._get_well_known_file(self.expected_issuer, self.pki_endpoint).content
-        root_cert = x509.load_pem_x509_certificate(res, default_backend())
-        fingerprint = root_cert.fingerprint(hashes.SHA1())  # noqa: S303
-        calculated_fingerprint = ":".join(format(b, "02x") for b in fingerprint).upper()
-
-        if calculated_fingerprint != CERT_FINGERPRINT:
-            msg = "Root certificate fingerprint does not match expected fingerprint."
-            f"Expected: {CERT_FINGERPRINT}, Received: {calculated_fingerprint}"
-            raise VtpmValidationError(msg)
+        root_cert = self.well_known_cache.get(
+            self.expected_issuer, self.pki_endpoint, self._load_root_certificate
+        )
         try:
-            certs = self._extract_and_validate_certificates(unverified_header)
-            self._validate_leaf_certificate(certs.leaf_cert)
-            self._compare_root_certificates(certs.root_cert, root_cert)
-            self._check_certificate_validity(certs)
-            self._verify_certificate_chain(certs)
-
-            public_key = certs.leaf_cert.public_key()
-            public_pem = public_key.public_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PublicFormat.SubjectPublicKeyInfo,
-            )
-
+            chain = self._verified_chain(unverified_header, root_cert)
             return jwt.decode(
                 token,
-                key=public_pem,
+                key=chain.leaf_key,
                 algorithms=[ALGO],
             )
         except (InvalidKey, jwt.InvalidTokenError) as e:
@@ -270,58 +309,91 @@ class VtpmValidation:
             msg = f"Unexpected error during validation: {e}"
             raise VtpmValidationError(msg) from e
 
-    @staticmethod
-    def _get_well_known_file(
-        expected_issuer: str, well_known_path: str
-    ) -> requests.Response:
+    @classmethod
+    def _parse_jwks(cls, body: bytes) -> PublicKeys:
         """
-        Fetch configuration data from a well-known endpoint.
+        Parse a JSON Web Key Set (JWKS) into RSA public keys.
 
-        This static method retrieves data from a well-known URL endpoint by combining
-        the issuer URL with the well-known path.
+        Args:
+            body: JWKS document fetched from the issuer
+
+        Returns:
+            PublicKeys: RSA public keys by key ID (kid)
+        """
+        return {
+            key["kid"]: cls._jwk_to_rsa_key(key)
+            for key in json.loads(body)["keys"]
+            if key.get("kid") and key.get("kty", "RSA") == "RSA"
+        }
+
+    def _verified_chain(
+        self, headers: dict[str, Any], root_cert: x509.Certificate
+    ) -> VerifiedChain:
+        """
+        Return the verified certificate chain of the token header.
+
+        Runs the full certificate checks the first time a chain is seen and
+        caches the result until the first of its certificates expires. A
+        cached chain is only reused while the trusted root is unchanged.
 
         Args:
-            expected_issuer: Base URL of the token issuer
-                (e.g., "https://confidentialcomputing.googleapis.com")
-            well_known_path: Path to the well-known endpoint
-                (e.g., "/.well-known/openid-configuration")
+            headers: Token header dictionary with x5c field with certificate chain
+            root_cert: Trusted root certificate fetched from well-known endpoint
 
         Returns:
-            requests.Response: The HTTP response from the well-known endpoint
+            VerifiedChain: The chain's leaf public key and trusted root
 
         Raises:
-            requests.exceptions.HTTPError: If the response status code is not 200
+            VtpmValidationError: If any certificate check fails
         """
-        response = requests.get(expected_issuer + well_known_path, timeout=10)
-        valid_status_code = 200
-        if response.status_code == valid_status_code:
-            return response
-        msg = f"Failed to fetch well known file: {response.status_code}"
-        raise requests.exceptions.HTTPError(msg)
-
-    @staticmethod
-    def _fetch_jwks(uri: str) -> JSONWebKeySet:
+        x5c_headers = headers.get("x5c") or []
+        chain_id = hashlib.sha256("\n".join(map(str, x5c_headers)).encode()).hexdigest()
+        with self._chains_lock:
+            chain = self.verified_chains.get(chain_id)
+        if chain is not None and chain.root_cert == root_cert:
+            return chain
+
+        certs = self._extract_and_validate_certificates(headers)
+        self._validate_leaf_certificate(certs.leaf_cert)
+        self._compare_root_certificates(certs.root_cert, root_cert)
+        self._check_certificate_validity(certs)
+        self._verify_certificate_chain(certs)
+
+        chain = VerifiedChain(certs.leaf_cert.public_key(), root_cert)  # pyright: ignore [reportArgumentType]
+        expires_at = min(
+            cert.not_valid_after_utc
+            for cert in (certs.leaf_cert, certs.intermediate_cert, certs.root_cert)
+        )
+        ttl = (expires_at - datetime.datetime.now(tz=datetime.UTC)).total_seconds()
+        with self._chains_lock:
+            self.verified_chains.set(chain_id, chain, ttl=ttl)
+        return chain
+
+    def _load_root_certificate(self, body: bytes) -> x509.Certificate:
         """
-        Fetch JSON Web Key Set (JWKS) from a remote endpoint.
-
-        This static method retrieves and parses the JWKS containing public keys
-        used for token validation.
+        Parse the PEM root certificate fetched from the issuer and check its
+        fingerprint. The cache keeps the certificate only if it is trusted.
 
         Args:
-            uri: Full URL of the JWKS endpoint
+            body: PEM-encoded certificate
 
         Returns:
-            JWKSResponse: Parsed JWKS data containing public keys
+            x509.Certificate: The root certificate
 
         Raises:
-            requests.exceptions.HTTPError: If the response status code is not 200
+            VtpmValidationError: If the fingerprint does not match
         """
-        response = requests.get(uri, timeout=10)
-        valid_status_code = 200
-        if response.status_code == valid_status_code:
-            return response.json()
-        msg = f"Failed to fetch JWKS: {response.status_code}"
-        raise requests.exceptions.HTTPError(msg)
+        root_cert = x509.load_pem_x509_certificate(body, default_backend())
+        fingerprint = root_cert.fingerprint(hashes.SHA1())  # noqa: S303
+        calculated_fingerprint = ":".join(format(b, "02x") for b in fingerprint).upper()
+
+        if calculated_fingerprint != self.root_fingerprint:
+            msg = (
+                "Root certificate fingerprint does not match expected fingerprint. "
+                f"Expected: {self.root_fingerprint}, Received: {calculated_fingerprint}"
+            )
+            raise VtpmValidationError(msg)
+        return root_cert
 
     @staticmethod
     def _jwk_to_rsa_key(jwk: dict[str, str]) -> rsa.RSAPublicKey:
@@ -0,0 +1,241 @@
+"""
+Cache for documents fetched from an attestation issuer.
+
+Validating a token needs the issuer's OpenID configuration, its JWKS and, for
+PKI tokens, its root certificate. These change rarely, so each is fetched
+once, parsed once and kept for as long as the issuer's Cache-Control header
+allows. Within the `stale-while-revalidate` window past expiry the stale copy
+keeps being served while a background thread fetches a fresh one, so token
+validation does not wait on the network in the steady state.
+"""
+
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+import structlog
+
+from flare_ai_defai.cache import CacheStats
+
+logger = structlog.get_logger(__name__)
+
+type DocumentKey = tuple[str, str]
+
+
+def cache_lifetime(
+    headers: Mapping[str, str], default_ttl: float, max_ttl: float
+) -> tuple[float, float]:
+    """
+    Work out how long a response may be cached from its headers.
+
+    `no-store` and `no-cache` make the response uncacheable. Otherwise
+    `max-age` (less the response's `Age`) gives the freshness lifetime,
+    falling back to `default_ttl` when absent, and `stale-while-revalidate`
+    how long a stale copy may still be served while revalidating.
+
+    Args:
+        headers: Response headers (case-insensitive lookups)
+        default_ttl: Lifetime when the response sets no max-age
+        max_ttl: Upper bound on both lifetimes
+
+    Returns:
+        tuple[float, float]: Seconds fresh, and seconds usable stale after that
+    """
+    directives: dict[str, str] = {}
+    for directive in headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.partition("=")
+        if name.strip():
+            directives[name.strip().lower()] = value.strip().strip('"')
+
+    if "no-store" in directives or "no-cache" in directives:
+        return 0.0, 0.0
+
+    def seconds(value: str | None) -> float | None:
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    max_age = seconds(directives.get("max-age"))
+    if max_age is None:
+        ttl = default_ttl
+    else:
+        ttl = max(max_age - (seconds(headers.get("Age")) or 0.0), 0.0)
+    stale = seconds(directives.get("stale-while-revalidate")) or 0.0
+    return min(ttl, max_ttl), min(stale, max_ttl)
+
+
+@dataclass
+class CachedDocument:
+    """
+    A parsed document and its lifetime.
+
+    Attributes:
+        value (Any): Parsed document
+        fetched_at (float): Clock time the document was fetched
+        expires_at (float): Clock time the document becomes stale
+        stale_until (float): Clock time the stale document stops being served
+        refreshing (bool): Whether a background revalidation is in flight
+    """
+
+    value: Any
+    fetched_at: float
+    expires_at: float
+    stale_until: float
+    refreshing: bool = False
+
+
+class WellKnownCache:
+    """
+    Cache of parsed issuer documents, keyed by issuer and endpoint.
+
+    Concurrent misses for the same document share a single fetch. Each
+    document is parsed once per fetch, so callers get back e.g. ready-to-use
+    public keys rather than raw bytes.
+
+    Args:
+        default_ttl: Lifetime of responses without a max-age
+        max_ttl: Upper bound on any lifetime, whatever the issuer says
+        timeout: Seconds to wait for the issuer
+        session: HTTP session, reused so fetches share connections
+        clock: Monotonic time source, injectable for tests
+    """
+
+    def __init__(
+        self,
+        default_ttl: float = 300.0,
+        max_ttl: float = 86_400.0,
+        timeout: float = 10.0,
+        session: requests.Session | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.default_ttl = default_ttl
+        self.max_ttl = max_ttl
+        self.timeout = timeout
+        self.session = requests.Session() if session is None else session
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: dict[DocumentKey, CachedDocument] = {}
+        self._fetch_locks: dict[DocumentKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.logger = logger.bind(router="well_known_cache")
+
+    def get[T](self, issuer: str, endpoint: str, parse: Callable[[bytes], T]) -> T:
+        """
+        Return a document, fetching it only when it is missing or too stale.
+
+        Args:
+            issuer: Base URL of the issuer
+            endpoint: Path below the issuer, or an absolute URL
+            parse: Turns the response body into the cached value
+
+        Returns:
+            T: The parsed document
+
+        Raises:
+            requests.exceptions.HTTPError: If the document had to be fetched
+                and the response status code is not 200
+        """
+        key = (issuer, endpoint)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.expires_at:
+                self.stats.hits += 1
+                return entry.value
+            if entry is not None and now < entry.stale_until:
+                self.stats.hits += 1
+                if not entry.refreshing:
+                    entry.refreshing = True
+                    threading.Thread(
+                        target=self._revalidate, args=(key, entry, parse), daemon=True
+                    ).start()
+                return entry.value
+            self.stats.misses += 1
+        return self._fetch(key, parse)
+
+    def refresh[T](
+        self,
+        issuer: str,
+        endpoint: str,
+        parse: Callable[[bytes], T],
+        min_age: float = 0.0,
+    ) -> T:
+        """
+        Fetch a document again even if it is still fresh, e.g. after the
+        issuer rotated the key a token was signed with.
+
+        Args:
+            issuer: Base URL of the issuer
+            endpoint: Path below the issuer, or an absolute URL
+            parse: Turns the response body into the cached value
+            min_age: Serve the cached copy instead if it was fetched less than
+                this many seconds ago, so bogus tokens cannot trigger a fetch
+                each
+
+        Returns:
+            T: The parsed document
+
+        Raises:
+            requests.exceptions.HTTPError: If the response status code is not 200
+        """
+        key = (issuer, endpoint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry.fetched_at < min_age:
+                return entry.value
+        return self._fetch(key, parse)
+
+    def invalidate(self, issuer: str, endpoint: str) -> None:
+        """Drop a cached document so the next lookup fetches it."""
+        with self._lock:
+            self._entries.pop((issuer, endpoint), None)
+
+    def _fetch[T](self, key: DocumentKey, parse: Callable[[bytes], T]) -> T:
+        requested_at = self._clock()
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(key, threading.Lock())
+        with fetch_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+            # Another caller fetched the document while this one waited
+            if entry is not None and entry.fetched_at > requested_at:
+                return entry.value
+
+            issuer, endpoint = key
+            url = endpoint if "://" in endpoint else issuer + endpoint
+            response = self.session.get(url, timeout=self.timeout)
+            valid_status_code = 200
+            if response.status_code != valid_status_code:
+                msg = f"Failed to fetch {url}: {response.status_code}"
+                raise requests.exceptions.HTTPError(msg)
+            value = parse(response.content)
+
+            fetched_at = self._clock()
+            ttl, stale = cache_lifetime(
+                response.headers, self.default_ttl, self.max_ttl
+            )
+            with self._lock:
+                self._entries[key] = CachedDocument(
+                    value=value,
+                    fetched_at=fetched_at,
+                    expires_at=fetched_at + ttl,
+                    stale_until=fetched_at + ttl + stale,
+                )
+            self.logger.debug("fetched", url=url, ttl=ttl, stale=stale)
+            return value
+
+    def _revalidate(
+        self, key: DocumentKey, entry: CachedDocument, parse: Callable[[bytes], Any]
+    ) -> None:
+        try:
+            self._fetch(key, parse)
+        except Exception as e:  # noqa: BLE001
+            # Keep serving the stale copy; the next lookup retries
+            self.logger.warning("revalidation_failed", key=key, error=str(e))
+        finally:
+            with self._lock:
+                entry.refreshing = False
@@ -0,0 +1,41 @@
+from .clients import PlaidClientRegistry, resolve_plaid_host
+from .scores import (
+    CachedCreditScoreStore,
+    CreditScoreStore,
+    InMemoryCreditScoreStore,
+    LinkedItem,
+    SQLiteCreditScoreStore,
+)
+from .scoring import (
+    CreditFeatures,
+    CreditScore,
+    CreditScorer,
+    TransactionArrays,
+    utilization_from_accounts,
+)
+from .sync import SyncResult, TransactionSyncEngine
+from .transactions import (
+    InMemoryTransactionStore,
+    SQLiteTransactionStore,
+    TransactionStore,
+)
+
+__all__ = [
+    "CachedCreditScoreStore",
+    "CreditFeatures",
+    "CreditScore",
+    "CreditScoreStore",
+    "CreditScorer",
+    "InMemoryCreditScoreStore",
+    "InMemoryTransactionStore",
+    "LinkedItem",
+    "PlaidClientRegistry",
+    "SQLiteCreditScoreStore",
+    "SQLiteTransactionStore",
+    "SyncResult",
+    "TransactionArrays",
+    "TransactionStore",
+    "TransactionSyncEngine",
+    "resolve_plaid_host",
+    "utilization_from_accounts",
+]
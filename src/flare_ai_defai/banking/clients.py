@@ -0,0 +1,173 @@
+"""
+Plaid Client Registry Module
+
+This module keeps one Plaid `ApiClient` per (client_id, environment) so every
+request made with the same credentials reuses the client's urllib3 connection
+pool. Building a client per request throws the pool away each time, which
+costs a new TCP connection and TLS handshake on every Plaid call.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, override
+
+import plaid
+import structlog
+from plaid.api import plaid_api
+
+from flare_ai_defai.cache import CacheStats, LRUCache
+from flare_ai_defai.metrics import PLAID_REQUEST_SECONDS
+
+logger = structlog.get_logger(__name__)
+
+PLAID_VERSION = "2020-09-14"
+
+
+def resolve_plaid_host(environment: str) -> str:
+    """
+    Map a Plaid environment name to its API host.
+
+    Args:
+        environment: "sandbox" or "production" (any case), or a full base URL
+            such as a local stand-in server
+
+    Returns:
+        str: Base URL of the Plaid API
+
+    Raises:
+        ValueError: If the environment is neither a known name nor a URL
+    """
+    if environment.startswith(("http://", "https://")):
+        return environment.rstrip("/")
+    host = getattr(plaid.Environment, environment.capitalize(), None)
+    if host is None:
+        msg = f"Unknown Plaid environment: {environment!r}"
+        raise ValueError(msg)
+    return host
+
+
+class _MeteredApiClient(plaid.ApiClient):
+    """Plaid API client recording the latency of every call by endpoint."""
+
+    @override
+    def call_api(
+        self, resource_path: str, method: str, *args: Any, **kwargs: Any
+    ) -> Any:
+        with PLAID_REQUEST_SECONDS.labels(resource_path).time():
+            return super().call_api(resource_path, method, *args, **kwargs)
+
+
+@dataclass
+class _Entry:
+    secret: str
+    api_client: plaid.ApiClient
+    client: plaid_api.PlaidApi
+
+
+class PlaidClientRegistry:
+    """
+    Bounded pool of Plaid API clients keyed by (client_id, environment).
+
+    The least recently used client is closed once more than `max_clients`
+    credential sets are in use. A client whose secret changed is rebuilt.
+    Lookups are thread-safe, since Plaid calls may run in worker threads.
+
+    Attributes:
+        default_environment (str): Environment used when none is given
+        max_connections (int): Keep-alive connections per client pool
+        logger (BoundLogger): Structured logger for the registry
+    """
+
+    def __init__(
+        self,
+        max_clients: int = 32,
+        max_connections: int = 10,
+        default_environment: str = "sandbox",
+        plaid_version: str = PLAID_VERSION,
+    ) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            max_clients: Number of credential sets kept open
+            max_connections: Keep-alive connections per client pool, which also
+                caps that client's parallel requests
+            default_environment: Environment name or URL used when none is given
+            plaid_version: Value of the Plaid-Version header
+        """
+        self.default_environment = default_environment
+        self.max_connections = max_connections
+        self.logger = logger.bind(router="plaid_clients")
+        self._plaid_version = plaid_version
+        self._lock = threading.Lock()
+        self._entries: LRUCache[tuple[str, str], _Entry] = LRUCache(
+            max_clients, on_evict=self._on_evict
+        )
+
+    @property
+    def stats(self) -> CacheStats:
+        """Client reuse, creation and eviction counters."""
+        return self._entries.stats
+
+    def get(
+        self, client_id: str, secret: str, environment: str | None = None
+    ) -> plaid_api.PlaidApi:
+        """
+        Return the pooled client for a set of credentials, creating it once.
+
+        Args:
+            client_id: Plaid client ID
+            secret: Plaid secret for `client_id`
+            environment: Environment name or URL, defaults to
+                `default_environment`
+
+        Returns:
+            PlaidApi: Client sharing one keep-alive connection pool
+        """
+        host = resolve_plaid_host(environment or self.default_environment)
+        key = (client_id, host)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.secret == secret:
+                return entry.client
+            if entry is not None:
+                self._close(entry)
+            entry = self._create(client_id, secret, host)
+            self._entries.set(key, entry)
+            return entry.client
+
+    def close(self) -> None:
+        """Close every pooled client."""
+        with self._lock:
+            for key in self._entries:
+                entry = self._entries.pop(key)
+                if entry is not None:
+                    self._close(entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _create(self, client_id: str, secret: str, host: str) -> _Entry:
+        configuration = plaid.Configuration(
+            host=host,
+            api_key={
+                "clientId": client_id,
+                "secret": secret,
+                "plaidVersion": self._plaid_version,
+            },
+        )
+        configuration.connection_pool_maxsize = self.max_connections
+        api_client = _MeteredApiClient(configuration)
+        self.logger.info("plaid_client_created", host=host)
+        return _Entry(
+            secret=secret, api_client=api_client, client=plaid_api.PlaidApi(api_client)
+        )
+
+    def _on_evict(self, key: tuple[str, str], entry: _Entry) -> None:
+        self.logger.info("plaid_client_evicted", host=key[1])
+        self._close(entry)
+
+    @staticmethod
+    def _close(entry: _Entry) -> None:
+        entry.api_client.close()
+        entry.api_client.rest_client.pool_manager.clear()
@@ -0,0 +1,395 @@
+"""
+Credit Score Store Module
+
+This module keeps linked Plaid items and the credit scores computed for them,
+keyed by item_id, with every score kept as history. Each item also records
+the user (session) that linked it, so scores can be looked up per user.
+
+A read-through LRU cache can sit in front of a durable backend, so serving
+the latest score is a dictionary lookup rather than a query or a rescore.
+The SQLite backend encrypts access tokens with Fernet before writing them.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from typing import override
+
+import structlog
+from cryptography.fernet import Fernet, InvalidToken
+
+from flare_ai_defai.banking.scoring import CreditScore
+from flare_ai_defai.cache import CacheStats, LRUCache
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class LinkedItem:
+    """
+    A Plaid item linked by a user.
+
+    Attributes:
+        item_id (str): Plaid item identifier
+        access_token (str): Access token of the item
+        user_id (str | None): Session that linked the item
+        linked_at (float): Unix time the item was (last) linked
+    """
+
+    item_id: str
+    access_token: str
+    user_id: str | None = None
+    linked_at: float = field(default_factory=time.time)
+
+
+class CreditScoreStore(ABC):
+    """
+    Abstract store for linked items and their credit score history.
+    """
+
+    @abstractmethod
+    def link_item(self, item: LinkedItem) -> None:
+        """
+        Record a linked item, replacing an earlier link of the same item.
+
+        Args:
+            item: Item with its access token and owner
+        """
+
+    @abstractmethod
+    def get_item(self, item_id: str) -> LinkedItem | None:
+        """
+        Look up a linked item.
+
+        Args:
+            item_id: Plaid item identifier
+
+        Returns:
+            LinkedItem | None: The item, or None if never linked
+        """
+
+    @abstractmethod
+    def items_for_user(self, user_id: str) -> list[str]:
+        """
+        List the items a user has linked.
+
+        Args:
+            user_id: Session that linked the items
+
+        Returns:
+            list[str]: Item ids, most recently linked first
+        """
+
+    @abstractmethod
+    def add_score(self, item_id: str, score: CreditScore) -> None:
+        """
+        Append a computed score to an item's history.
+
+        Args:
+            item_id: Plaid item identifier
+            score: Newly computed score
+        """
+
+    @abstractmethod
+    def latest(self, item_id: str) -> CreditScore | None:
+        """
+        Return an item's most recent score.
+
+        Args:
+            item_id: Plaid item identifier
+
+        Returns:
+            CreditScore | None: Latest score, or None if never scored
+        """
+
+    @abstractmethod
+    def history(self, item_id: str, limit: int = 10) -> list[CreditScore]:
+        """
+        Return an item's most recent scores.
+
+        Args:
+            item_id: Plaid item identifier
+            limit: Maximum number of scores returned
+
+        Returns:
+            list[CreditScore]: Scores, newest first
+        """
+
+    def invalidate(self, item_id: str) -> None:  # noqa: B027
+        """
+        Drop anything cached about an item, e.g. after its transactions were
+        re-synced. Stores without a cache have nothing to drop.
+
+        Args:
+            item_id: Plaid item identifier
+        """
+
+
+class InMemoryCreditScoreStore(CreditScoreStore):
+    """
+    Process-local score store keeping the last `max_history` scores per item.
+    """
+
+    def __init__(self, max_history: int = 100) -> None:
+        """
+        Args:
+            max_history: Scores kept per item
+        """
+        self.max_history = max_history
+        self._items: dict[str, LinkedItem] = {}
+        # Item ids per user, in the order they were linked, newest last
+        self._user_items: dict[str, dict[str, None]] = {}
+        self._scores: dict[str, deque[CreditScore]] = {}
+        self._lock = threading.Lock()
+
+    @override
+    def link_item(self, item: LinkedItem) -> None:
+        with self._lock:
+            previous = self._items.get(item.item_id)
+            if previous is not None and previous.user_id is not None:
+                self._user_items[previous.user_id].pop(item.item_id, None)
+            self._items[item.item_id] = item
+            if item.user_id is not None:
+                self._user_items.setdefault(item.user_id, {})[item.item_id] = None
+
+    @override
+    def get_item(self, item_id: str) -> LinkedItem | None:
+        return self._items.get(item_id)
+
+    @override
+    def items_for_user(self, user_id: str) -> list[str]:
+        with self._lock:
+            return list(reversed(self._user_items.get(user_id, {})))
+
+    @override
+    def add_score(self, item_id: str, score: CreditScore) -> None:
+        with self._lock:
+            self._scores.setdefault(item_id, deque(maxlen=self.max_history)).append(
+                score
+            )
+
+    @override
+    def latest(self, item_id: str) -> CreditScore | None:
+        scores = self._scores.get(item_id)
+        return scores[-1] if scores else None
+
+    @override
+    def history(self, item_id: str, limit: int = 10) -> list[CreditScore]:
+        with self._lock:
+            scores = list(self._scores.get(item_id, ()))
+        return scores[::-1][:limit]
+
+
+class SQLiteCreditScoreStore(CreditScoreStore):
+    """
+    Score store persisting items and score history in SQLite.
+
+    Access tokens are stored encrypted. Without an `encryption_key` a random
+    one is generated, so linked items cannot be read back after a restart or
+    by another process and have to be linked again.
+    """
+
+    def __init__(
+        self,
+        path: str = "plaid.db",
+        max_history: int = 100,
+        encryption_key: str | None = None,
+    ) -> None:
+        """
+        Args:
+            path: SQLite database file, or ":memory:"
+            max_history: Scores kept per item
+            encryption_key: Fernet key encrypting access tokens, generated
+                per process if omitted
+        """
+        self.max_history = max_history
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS plaid_items ("
+            "item_id TEXT PRIMARY KEY, access_token TEXT NOT NULL, "
+            "user_id TEXT, linked_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS plaid_items_user "
+            "ON plaid_items (user_id, linked_at);"
+            "CREATE TABLE IF NOT EXISTS credit_scores ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, item_id TEXT NOT NULL, "
+            "computed_at REAL NOT NULL, data TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS credit_scores_item "
+            "ON credit_scores (item_id, id);"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.logger = logger.bind(store="sqlite_scores")
+        if not encryption_key:
+            self.logger.warning(
+                "plaid_encryption_key_generated",
+                detail="stored access tokens will not survive a restart",
+            )
+        self._fernet = Fernet(encryption_key or Fernet.generate_key())
+
+    @override
+    def link_item(self, item: LinkedItem) -> None:
+        access_token = self._fernet.encrypt(item.access_token.encode()).decode()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO plaid_items (item_id, access_token, user_id, linked_at) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT(item_id) DO UPDATE "
+                "SET access_token = excluded.access_token, "
+                "user_id = excluded.user_id, linked_at = excluded.linked_at",
+                (item.item_id, access_token, item.user_id, item.linked_at),
+            )
+
+    @override
+    def get_item(self, item_id: str) -> LinkedItem | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT item_id, access_token, user_id, linked_at "
+                "FROM plaid_items WHERE item_id = ?",
+                (item_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            access_token = self._fernet.decrypt(row[1]).decode()
+        except InvalidToken:
+            # Encrypted with another key, e.g. a key generated by a past process
+            self.logger.warning("plaid_access_token_undecryptable", item_id=item_id)
+            return None
+        return LinkedItem(row[0], access_token, row[2], row[3])
+
+    @override
+    def items_for_user(self, user_id: str) -> list[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item_id FROM plaid_items WHERE user_id = ? "
+                "ORDER BY linked_at DESC",
+                (user_id,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    @override
+    def add_score(self, item_id: str, score: CreditScore) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO credit_scores (item_id, computed_at, data) "
+                "VALUES (?, ?, ?)",
+                (item_id, score.computed_at, json.dumps(score.to_dict())),
+            )
+            self._conn.execute(
+                "DELETE FROM credit_scores WHERE item_id = ? AND id NOT IN ("
+                "SELECT id FROM credit_scores WHERE item_id = ? "
+                "ORDER BY id DESC LIMIT ?)",
+                (item_id, item_id, self.max_history),
+            )
+
+    @override
+    def latest(self, item_id: str) -> CreditScore | None:
+        scores = self.history(item_id, limit=1)
+        return scores[0] if scores else None
+
+    @override
+    def history(self, item_id: str, limit: int = 10) -> list[CreditScore]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM credit_scores WHERE item_id = ? "
+                "ORDER BY id DESC LIMIT ?",
+                (item_id, limit),
+            ).fetchall()
+        return [CreditScore.from_dict(json.loads(row[0])) for row in rows]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+
+class CachedCreditScoreStore(CreditScoreStore):
+    """
+    Read-through, write-through LRU cache in front of another score store.
+
+    Latest scores, linked items and each user's items are served from memory
+    once read or written; history queries go to the backend. `invalidate`
+    drops an item's cached entries so the next read goes back to the backend.
+
+    Attributes:
+        backend (CreditScoreStore): Durable store holding the data
+    """
+
+    def __init__(self, backend: CreditScoreStore, maxsize: int = 10_000) -> None:
+        """
+        Args:
+            backend: Durable store holding the data
+            maxsize: Items whose latest score and link are kept in memory
+        """
+        self.backend = backend
+        self._latest: LRUCache[str, CreditScore] = LRUCache(maxsize)
+        self._items: LRUCache[str, LinkedItem] = LRUCache(maxsize)
+        self._user_items: LRUCache[str, list[str]] = LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit and miss counters of the latest-score cache."""
+        return self._latest.stats
+
+    @override
+    def link_item(self, item: LinkedItem) -> None:
+        previous = self.get_item(item.item_id)
+        self.backend.link_item(item)
+        with self._lock:
+            self._items.set(item.item_id, item)
+            # The item may have moved between users
+            for user_id in {item.user_id, previous and previous.user_id}:
+                if user_id is not None:
+                    self._user_items.pop(user_id)
+
+    @override
+    def get_item(self, item_id: str) -> LinkedItem | None:
+        with self._lock:
+            item = self._items.get(item_id)
+        if item is None:
+            item = self.backend.get_item(item_id)
+            if item is not None:
+                with self._lock:
+                    self._items.set(item_id, item)
+        return item
+
+    @override
+    def items_for_user(self, user_id: str) -> list[str]:
+        with self._lock:
+            items = self._user_items.get(user_id)
+        if items is None:
+            items = self.backend.items_for_user(user_id)
+            with self._lock:
+                self._user_items.set(user_id, items)
+        return list(items)
+
+    @override
+    def add_score(self, item_id: str, score: CreditScore) -> None:
+        self.backend.add_score(item_id, score)
+        with self._lock:
+            self._latest.set(item_id, score)
+
+    @override
+    def latest(self, item_id: str) -> CreditScore | None:
+        with self._lock:
+            score = self._latest.get(item_id)
+        if score is None:
+            score = self.backend.latest(item_id)
+            if score is not None:
+                with self._lock:
+                    self._latest.set(item_id, score)
+        return score
+
+    @override
+    def history(self, item_id: str, limit: int = 10) -> list[CreditScore]:
+        return self.backend.history(item_id, limit)
+
+    @override
+    def invalidate(self, item_id: str) -> None:
+        with self._lock:
+            self._latest.pop(item_id)
+            self._items.pop(item_id)
+        self.backend.invalidate(item_id)
@@ -0,0 +1,396 @@
+"""
+Credit Scoring Module
+
+This module computes a deterministic 300-850 credit score from a Plaid item's
+full transaction history. Transactions are converted once into NumPy arrays
+and every feature is computed from whole-array operations (monthly bincounts,
+masks and reductions), so scoring 100k transactions takes milliseconds.
+
+Plaid signs amounts from the account's point of view: positive amounts are
+money leaving the account, negative amounts are money coming in.
+"""
+
+import time
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+MIN_SCORE = 300
+MAX_SCORE = 850
+# Inflows at least this large that are not transfers count as income
+INCOME_MIN_AMOUNT = 100.0
+# Months of history after which history length stops improving the score
+FULL_HISTORY_MONTHS = 24
+# Sub-score of every feature when there is no history to judge, which maps to
+# the middle of the score range
+NEUTRAL_COMPONENT = 0.5
+# Markers match whole "_"-delimited tokens of a category, so "NSF" does not
+# match "TRANSFER"
+OVERDRAFT_MARKERS = ("OVERDRAFT", "INSUFFICIENT_FUNDS", "NSF")
+INCOME_MARKERS = ("INCOME", "PAYROLL")
+TRANSFER_MARKERS = ("TRANSFER",)
+
+
+def transaction_category(tx: dict[str, Any]) -> str:
+    """
+    Pick the most specific category Plaid provides for a transaction.
+
+    Args:
+        tx: Transaction as returned by `transactions/sync`
+
+    Returns:
+        str: Upper-case category, "UNCATEGORIZED" if Plaid gave none
+    """
+    finance_category = tx.get("personal_finance_category") or {}
+    if finance_category.get("detailed"):
+        return finance_category["detailed"].upper()
+    if tx.get("category"):
+        return "_".join(tx["category"]).upper().replace(" ", "_")
+    return "UNCATEGORIZED"
+
+
+def _intern(
+    values: Iterator[str], count: int
+) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.str_]]:
+    # Dict interning keeps first-seen order and avoids sorting every string,
+    # which np.unique would do
+    index: dict[str, int] = {}
+    codes = np.fromiter(
+        (index.setdefault(value, len(index)) for value in values),
+        dtype=np.intp,
+        count=count,
+    )
+    return codes, np.array(list(index), dtype=np.str_)
+
+
+@dataclass
+class TransactionArrays:
+    """
+    Columnar view of a transaction history.
+
+    Attributes:
+        amounts (ndarray): Amounts, positive for outflows, as float64
+        dates (ndarray): Posting dates as datetime64[D]
+        categories (ndarray): Index into `category_names` per transaction
+        category_names (ndarray): Distinct categories
+        accounts (ndarray): Index of the account per transaction
+    """
+
+    amounts: npt.NDArray[np.float64]
+    dates: npt.NDArray[np.datetime64]
+    categories: npt.NDArray[np.intp]
+    category_names: npt.NDArray[np.str_]
+    accounts: npt.NDArray[np.intp]
+
+    @classmethod
+    def from_transactions(
+        cls, transactions: list[dict[str, Any]]
+    ) -> "TransactionArrays":
+        """
+        Build the arrays from Plaid transaction objects.
+
+        Args:
+            transactions: Transactions as stored by the sync engine
+
+        Returns:
+            TransactionArrays: One entry per transaction, in input order
+        """
+        count = len(transactions)
+        amounts = np.fromiter(
+            (tx["amount"] for tx in transactions), dtype=np.float64, count=count
+        )
+        dates = np.array([tx["date"] for tx in transactions], dtype="datetime64[D]")
+        categories, category_names = _intern(
+            (transaction_category(tx) for tx in transactions), count
+        )
+        accounts, _ = _intern((tx["account_id"] for tx in transactions), count)
+        return cls(amounts, dates, categories, category_names, accounts)
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def category_mask(self, markers: tuple[str, ...]) -> npt.NDArray[np.bool_]:
+        """
+        Flag transactions whose category contains any of `markers`.
+
+        A marker matches whole "_"-delimited tokens only: "OVERDRAFT" matches
+        "BANK_FEES_OVERDRAFT_FEES" but "NSF" does not match "TRANSFER_IN".
+        Only the distinct category names are inspected in Python; the
+        per-transaction lookup is a single array indexing operation.
+        """
+        matching = np.array(
+            [
+                any(f"_{m}_" in f"_{name}_" for m in markers)
+                for name in self.category_names
+            ],
+            dtype=np.bool_,
+        )
+        return matching[self.categories]
+
+
+@dataclass
+class CreditFeatures:
+    """
+    Behavioural features the score is computed from.
+
+    Attributes:
+        months (int): Calendar months spanned by the history
+        accounts (int): Distinct accounts with transactions
+        monthly_inflow (float): Mean money in per month
+        monthly_outflow (float): Mean money out per month
+        cash_flow_volatility (float): Standard deviation of monthly net cash
+            flow relative to mean monthly inflow
+        income_regularity (float): Share of months with income, discounted by
+            how much monthly income varies, in [0, 1]
+        savings_rate (float): Net cash flow as a share of inflow
+        overdrafts_per_month (float): Overdraft and NSF fees per month
+        utilization (float | None): Credit balances over credit limits, if
+            liabilities were provided
+    """
+
+    months: int = 0
+    accounts: int = 0
+    monthly_inflow: float = 0.0
+    monthly_outflow: float = 0.0
+    cash_flow_volatility: float = 0.0
+    income_regularity: float = 0.0
+    savings_rate: float = 0.0
+    overdrafts_per_month: float = 0.0
+    utilization: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the features for API responses and prompts."""
+        return {
+            key: round(value, 4) if isinstance(value, float) else value
+            for key, value in asdict(self).items()
+        }
+
+
+@dataclass
+class CreditScore:
+    """
+    Result of scoring a transaction history.
+
+    Attributes:
+        score (int): Score between 300 and 850
+        features (CreditFeatures): Features the score was computed from
+        components (dict[str, float]): Per-feature sub-scores in [0, 1]
+        transaction_count (int): Transactions scored
+        computed_at (float): Unix time the score was computed
+        insufficient_data (bool): Whether there was no history to score, in
+            which case every history-based sub-score is neutral
+    """
+
+    score: int
+    features: CreditFeatures
+    components: dict[str, float]
+    transaction_count: int
+    computed_at: float = field(default_factory=time.time)
+    insufficient_data: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the score for API responses."""
+        return {
+            "credit_score": self.score,
+            "features": self.features.to_dict(),
+            "components": {k: round(v, 4) for k, v in self.components.items()},
+            "transaction_count": self.transaction_count,
+            "computed_at": self.computed_at,
+            "insufficient_data": self.insufficient_data,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CreditScore":
+        """Rebuild a score serialized with `to_dict`."""
+        return cls(
+            score=data["credit_score"],
+            features=CreditFeatures(**data["features"]),
+            components=data["components"],
+            transaction_count=data["transaction_count"],
+            computed_at=data["computed_at"],
+            insufficient_data=data.get("insufficient_data", False),
+        )
+
+
+def utilization_from_accounts(accounts: list[dict[str, Any]]) -> float | None:
+    """
+    Compute revolving credit utilization from Plaid account balances.
+
+    Args:
+        accounts: Accounts from a `liabilities/get` or `accounts/get` response
+
+    Returns:
+        float | None: Total credit balance over total credit limit, or None
+            when no credit account reports a limit
+    """
+    balances = [
+        (account["balances"].get("current") or 0.0, account["balances"]["limit"])
+        for account in accounts
+        if str(account.get("type")) == "credit"
+        and (account.get("balances") or {}).get("limit")
+    ]
+    if not balances:
+        return None
+    current, limits = np.array(balances, dtype=np.float64).T
+    return float(current.sum() / limits.sum())
+
+
+DEFAULT_WEIGHTS: dict[str, float] = {
+    "overdrafts": 0.30,
+    "utilization": 0.25,
+    "stability": 0.15,
+    "income": 0.15,
+    "savings": 0.10,
+    "history": 0.05,
+}
+
+
+class CreditScorer:
+    """
+    Deterministic credit scorer over full transaction histories.
+
+    Each feature is mapped to a sub-score in [0, 1]; the weighted sum is
+    scaled onto 300-850. Without liabilities, utilization scores as neutral.
+
+    Attributes:
+        weights (dict[str, float]): Weight of each sub-score, summing to 1
+    """
+
+    def __init__(self, weights: dict[str, float] | None = None) -> None:
+        """
+        Initialize the scorer.
+
+        Args:
+            weights: Sub-score weights, defaults to `DEFAULT_WEIGHTS`
+
+        Raises:
+            ValueError: If the weights do not cover every sub-score or do not
+                sum to 1
+        """
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        if set(self.weights) != set(DEFAULT_WEIGHTS) or not np.isclose(
+            sum(self.weights.values()), 1.0
+        ):
+            msg = f"Weights must cover {sorted(DEFAULT_WEIGHTS)} and sum to 1"
+            raise ValueError(msg)
+
+    def score(
+        self,
+        transactions: list[dict[str, Any]] | TransactionArrays,
+        utilization: float | None = None,
+    ) -> CreditScore:
+        """
+        Score a transaction history.
+
+        Args:
+            transactions: Plaid transactions, or arrays built from them
+            utilization: Credit utilization from liabilities, if known
+
+        Returns:
+            CreditScore: Score with the features behind it, neutral and
+                flagged `insufficient_data` for an empty history
+        """
+        arrays = (
+            transactions
+            if isinstance(transactions, TransactionArrays)
+            else TransactionArrays.from_transactions(transactions)
+        )
+        features = self.features(arrays, utilization)
+        components = self.components(features)
+        insufficient_data = not len(arrays)
+        if insufficient_data:
+            # An empty history is neither good nor bad: only liabilities count
+            components = {
+                name: value if name == "utilization" else NEUTRAL_COMPONENT
+                for name, value in components.items()
+            }
+        weighted = sum(self.weights[name] * value for name, value in components.items())
+        score = round(MIN_SCORE + (MAX_SCORE - MIN_SCORE) * weighted)
+        return CreditScore(
+            score=int(np.clip(score, MIN_SCORE, MAX_SCORE)),
+            features=features,
+            components=components,
+            transaction_count=len(arrays),
+            insufficient_data=insufficient_data,
+        )
+
+    @staticmethod
+    def features(
+        arrays: TransactionArrays, utilization: float | None = None
+    ) -> CreditFeatures:
+        """
+        Compute behavioural features in one vectorized pass.
+
+        Args:
+            arrays: Columnar transaction history
+            utilization: Credit utilization from liabilities, if known
+
+        Returns:
+            CreditFeatures: Features of the history
+        """
+        if not len(arrays):
+            return CreditFeatures(utilization=utilization)
+
+        months_since_epoch = arrays.dates.astype("datetime64[M]").astype(np.int64)
+        month = months_since_epoch - months_since_epoch.min()
+        months = int(month.max()) + 1
+
+        inflow = np.where(arrays.amounts < 0, -arrays.amounts, 0.0)
+        outflow = np.where(arrays.amounts > 0, arrays.amounts, 0.0)
+        monthly_in = np.bincount(month, weights=inflow, minlength=months)
+        monthly_out = np.bincount(month, weights=outflow, minlength=months)
+        net = monthly_in - monthly_out
+        mean_in = monthly_in.mean()
+
+        transfers = arrays.category_mask(TRANSFER_MARKERS)
+        income = (arrays.category_mask(INCOME_MARKERS) & (arrays.amounts < 0)) | (
+            (inflow >= INCOME_MIN_AMOUNT) & ~transfers
+        )
+        monthly_income = np.bincount(
+            month[income], weights=inflow[income], minlength=months
+        )
+        months_with_income = np.count_nonzero(monthly_income) / months
+        income_mean = monthly_income.mean()
+        income_cv = monthly_income.std() / income_mean if income_mean else 1.0
+
+        overdrafts = np.count_nonzero(arrays.category_mask(OVERDRAFT_MARKERS))
+
+        return CreditFeatures(
+            months=months,
+            accounts=int(arrays.accounts.max()) + 1,
+            monthly_inflow=float(mean_in),
+            monthly_outflow=float(monthly_out.mean()),
+            cash_flow_volatility=float(net.std() / mean_in) if mean_in else 1.0,
+            income_regularity=float(months_with_income * (1 - min(income_cv, 1.0))),
+            savings_rate=float(net.sum() / monthly_in.sum()) if mean_in else -1.0,
+            overdrafts_per_month=float(overdrafts / months),
+            utilization=utilization,
+        )
+
+    @staticmethod
+    def components(features: CreditFeatures) -> dict[str, float]:
+        """
+        Map features to sub-scores in [0, 1], higher is better.
+
+        Args:
+            features: Features of a history
+
+        Returns:
+            dict[str, float]: Sub-score per weight name
+        """
+        utilization = (
+            NEUTRAL_COMPONENT
+            if features.utilization is None
+            else 1.0 - min(max(features.utilization, 0.0), 1.0)
+        )
+        return {
+            "overdrafts": float(np.exp(-2.0 * features.overdrafts_per_month)),
+            "utilization": utilization,
+            "stability": 1.0 / (1.0 + features.cash_flow_volatility),
+            "income": features.income_regularity,
+            "savings": min(max(features.savings_rate + 0.5, 0.0), 1.0),
+            "history": min(features.months / FULL_HISTORY_MONTHS, 1.0),
+        }
@@ -0,0 +1,190 @@
+"""
+Transactions Sync Engine Module
+
+This module brings the local transaction store up to date with Plaid's
+`transactions/sync` endpoint. A sync resumes from the item's stored cursor,
+pages until `has_more` is false and applies every added, modified and removed
+transaction in one commit, so repeated syncs only transfer what changed.
+
+Pages are read as raw JSON rather than through the generated Plaid models:
+the transactions are stored as plain JSON anyway, and model deserialization
+costs milliseconds per transaction.
+"""
+
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+import plaid
+import structlog
+from plaid.api import plaid_api
+from plaid.model.transactions_sync_request import TransactionsSyncRequest
+
+from flare_ai_defai.banking.transactions import TransactionStore
+
+logger = structlog.get_logger(__name__)
+
+MUTATION_DURING_PAGINATION = "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION"
+
+
+@dataclass
+class SyncResult:
+    """
+    Changes applied by one sync of an item.
+
+    Attributes:
+        item_id (str): Plaid item identifier
+        cursor (str): Cursor the item is now synced up to
+        added (list[dict[str, Any]]): Transactions new since the last sync
+        modified (list[dict[str, Any]]): Transactions changed since the last sync
+        removed (list[str]): Ids of transactions removed since the last sync
+        pages (int): `transactions/sync` requests made
+        total (int): Transactions stored for the item after the sync
+    """
+
+    item_id: str
+    cursor: str
+    added: list[dict[str, Any]] = field(default_factory=list)
+    modified: list[dict[str, Any]] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    pages: int = 0
+    total: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the result for API responses."""
+        return {
+            "item_id": self.item_id,
+            "added": self.added,
+            "modified": self.modified,
+            "removed": [{"transaction_id": tx_id} for tx_id in self.removed],
+            "next_cursor": self.cursor,
+            "has_more": False,
+            "pages": self.pages,
+            "total": self.total,
+        }
+
+
+class TransactionSyncEngine:
+    """
+    Incremental, fully paginated `transactions/sync` client.
+
+    Syncs of the same item are serialized, so concurrent callers never page
+    from the same cursor twice. Calls block on Plaid; run them in a worker
+    thread from async code.
+
+    Attributes:
+        store (TransactionStore): Local transactions and cursors
+        page_size (int): Transactions requested per page, at most 500
+        max_restarts (int): Times a sync restarts when Plaid reports the data
+            changed during pagination
+        logger (BoundLogger): Structured logger for the engine
+    """
+
+    def __init__(
+        self,
+        store: TransactionStore,
+        page_size: int = 500,
+        max_restarts: int = 3,
+    ) -> None:
+        """
+        Initialize the engine.
+
+        Args:
+            store: Local transactions and cursors
+            page_size: Transactions requested per page, at most 500
+            max_restarts: Times a sync restarts when Plaid reports the data
+                changed during pagination
+        """
+        self.store = store
+        self.page_size = page_size
+        self.max_restarts = max_restarts
+        self.logger = logger.bind(router="transactions_sync")
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def sync(
+        self, client: plaid_api.PlaidApi, access_token: str, item_id: str
+    ) -> SyncResult:
+        """
+        Fetch every change since the item's stored cursor and apply it.
+
+        Args:
+            client: Plaid client for the item's credentials
+            access_token: Access token of the item
+            item_id: Plaid item identifier the store is keyed by
+
+        Returns:
+            SyncResult: Changes applied and the new cursor
+
+        Raises:
+            plaid.ApiException: If Plaid rejects a request, or the data keeps
+                changing after `max_restarts` restarts
+        """
+        with self._lock(item_id):
+            start_cursor = self.store.get_cursor(item_id)
+            for attempt in range(self.max_restarts + 1):
+                try:
+                    result = self._fetch(client, access_token, item_id, start_cursor)
+                except plaid.ApiException as e:
+                    if attempt < self.max_restarts and _error_code(e) == (
+                        MUTATION_DURING_PAGINATION
+                    ):
+                        # Plaid requires restarting from the first cursor
+                        self.logger.info("transactions_sync_restart", item_id=item_id)
+                        continue
+                    raise
+                break
+            self.store.apply(
+                item_id,
+                result.cursor,
+                result.added + result.modified,
+                result.removed,
+            )
+            result.total = self.store.count(item_id)
+        self.logger.info(
+            "transactions_synced",
+            item_id=item_id,
+            pages=result.pages,
+            added=len(result.added),
+            modified=len(result.modified),
+            removed=len(result.removed),
+            total=result.total,
+        )
+        return result
+
+    def _fetch(
+        self,
+        client: plaid_api.PlaidApi,
+        access_token: str,
+        item_id: str,
+        cursor: str | None,
+    ) -> SyncResult:
+        result = SyncResult(item_id=item_id, cursor=cursor or "")
+        has_more = True
+        while has_more:
+            request = TransactionsSyncRequest(
+                access_token=access_token, count=self.page_size
+            )
+            if cursor:
+                request.cursor = cursor
+            response = client.transactions_sync(request, _preload_content=False)
+            page = json.loads(response.data)
+            result.pages += 1
+            result.added.extend(page["added"])
+            result.modified.extend(page["modified"])
+            result.removed.extend(tx["transaction_id"] for tx in page["removed"])
+            cursor = result.cursor = page["next_cursor"]
+            has_more = page["has_more"]
+        return result
+
+    def _lock(self, item_id: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(item_id, threading.Lock())
+
+
+def _error_code(error: plaid.ApiException) -> str | None:
+    try:
+        return json.loads(error.body).get("error_code")
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,231 @@
+"""
+Transaction Store Module
+
+This module keeps a local copy of each Plaid item's transactions together
+with the `transactions/sync` cursor they were synced up to. The cursor and
+the changes it covers are committed together, so a crash can never leave a
+cursor pointing past changes that were not stored.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, override
+
+
+class TransactionStore(ABC):
+    """
+    Abstract store for synced Plaid transactions, keyed by item_id.
+
+    Transactions are kept as the JSON objects Plaid returns and are returned
+    ordered by date, then transaction id.
+    """
+
+    @abstractmethod
+    def get_cursor(self, item_id: str) -> str | None:
+        """
+        Look up the cursor an item was last synced up to.
+
+        Args:
+            item_id: Plaid item identifier
+
+        Returns:
+            str | None: Cursor to resume from, or None if never synced
+        """
+
+    @abstractmethod
+    def apply(
+        self,
+        item_id: str,
+        cursor: str,
+        upserts: list[dict[str, Any]],
+        removed: list[str],
+    ) -> None:
+        """
+        Atomically apply a batch of changes and advance the cursor.
+
+        Args:
+            item_id: Plaid item identifier
+            cursor: Cursor the changes bring the item up to
+            upserts: Added or modified transactions
+            removed: Ids of removed transactions
+        """
+
+    @abstractmethod
+    def transactions(self, item_id: str) -> list[dict[str, Any]]:
+        """
+        Return every stored transaction of an item.
+
+        Args:
+            item_id: Plaid item identifier
+
+        Returns:
+            list[dict[str, Any]]: Transactions ordered by date
+        """
+
+    @abstractmethod
+    def count(self, item_id: str) -> int:
+        """Number of transactions stored for an item."""
+
+    @abstractmethod
+    def delete_item(self, item_id: str) -> None:
+        """
+        Forget an item's transactions and cursor, forcing a full resync.
+
+        Args:
+            item_id: Plaid item identifier
+        """
+
+
+def _sort_key(tx: dict[str, Any]) -> tuple[str, str]:
+    return tx.get("date") or "", tx["transaction_id"]
+
+
+class InMemoryTransactionStore(TransactionStore):
+    """
+    Process-local transaction store.
+    """
+
+    def __init__(self) -> None:
+        self._transactions: dict[str, dict[str, dict[str, Any]]] = {}
+        self._cursors: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @override
+    def get_cursor(self, item_id: str) -> str | None:
+        return self._cursors.get(item_id)
+
+    @override
+    def apply(
+        self,
+        item_id: str,
+        cursor: str,
+        upserts: list[dict[str, Any]],
+        removed: list[str],
+    ) -> None:
+        with self._lock:
+            stored = self._transactions.setdefault(item_id, {})
+            for tx in upserts:
+                stored[tx["transaction_id"]] = tx
+            for transaction_id in removed:
+                stored.pop(transaction_id, None)
+            self._cursors[item_id] = cursor
+
+    @override
+    def transactions(self, item_id: str) -> list[dict[str, Any]]:
+        with self._lock:
+            stored = list(self._transactions.get(item_id, {}).values())
+        return sorted(stored, key=_sort_key)
+
+    @override
+    def count(self, item_id: str) -> int:
+        return len(self._transactions.get(item_id, {}))
+
+    @override
+    def delete_item(self, item_id: str) -> None:
+        with self._lock:
+            self._transactions.pop(item_id, None)
+            self._cursors.pop(item_id, None)
+
+
+class SQLiteTransactionStore(TransactionStore):
+    """
+    Transaction store persisting items in SQLite, so a restart resumes each
+    item from its cursor instead of refetching the whole history.
+    """
+
+    def __init__(self, path: str = "plaid.db") -> None:
+        """
+        Args:
+            path: SQLite database file, or ":memory:"
+        """
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS plaid_cursors ("
+            "item_id TEXT PRIMARY KEY, cursor TEXT NOT NULL, updated_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS plaid_transactions ("
+            "item_id TEXT NOT NULL, transaction_id TEXT NOT NULL, "
+            "date TEXT NOT NULL, data TEXT NOT NULL, "
+            "PRIMARY KEY (item_id, transaction_id));"
+            "CREATE INDEX IF NOT EXISTS plaid_transactions_date "
+            "ON plaid_transactions (item_id, date);"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    @override
+    def get_cursor(self, item_id: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cursor FROM plaid_cursors WHERE item_id = ?", (item_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    @override
+    def apply(
+        self,
+        item_id: str,
+        cursor: str,
+        upserts: list[dict[str, Any]],
+        removed: list[str],
+    ) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO plaid_transactions (item_id, transaction_id, date, data) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT(item_id, transaction_id) DO UPDATE "
+                "SET date = excluded.date, data = excluded.data",
+                [
+                    (
+                        item_id,
+                        tx["transaction_id"],
+                        tx.get("date") or "",
+                        json.dumps(tx),
+                    )
+                    for tx in upserts
+                ],
+            )
+            self._conn.executemany(
+                "DELETE FROM plaid_transactions "
+                "WHERE item_id = ? AND transaction_id = ?",
+                [(item_id, transaction_id) for transaction_id in removed],
+            )
+            self._conn.execute(
+                "INSERT INTO plaid_cursors (item_id, cursor, updated_at) "
+                "VALUES (?, ?, ?) ON CONFLICT(item_id) DO UPDATE "
+                "SET cursor = excluded.cursor, updated_at = excluded.updated_at",
+                (item_id, cursor, time.time()),
+            )
+
+    @override
+    def transactions(self, item_id: str) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM plaid_transactions WHERE item_id = ? "
+                "ORDER BY date, transaction_id",
+                (item_id,),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    @override
+    def count(self, item_id: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM plaid_transactions WHERE item_id = ?",
+                (item_id,),
+            ).fetchone()[0]
+
+    @override
+    def delete_item(self, item_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM plaid_transactions WHERE item_id = ?", (item_id,)
+            )
+            self._conn.execute(
+                "DELETE FROM plaid_cursors WHERE item_id = ?", (item_id,)
+            )
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
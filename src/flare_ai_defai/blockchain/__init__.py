@@ -1,3 +1,20 @@
-from .flare import FlareProvider
+from .async_flare import AsyncFlareProvider
+from .explorer import AbiCache, AsyncFlareExplorer, FlareExplorer
+from .flare import BaseFlareProvider, FlareProvider, TxQueueElement, WalletState
+from .nonces import NonceManager
+from .receipts import ReceiptWatcher, TxState, TxStatus
 
-__all__ = ["FlareProvider"]
+__all__ = [
+    "AbiCache",
+    "AsyncFlareExplorer",
+    "AsyncFlareProvider",
+    "BaseFlareProvider",
+    "FlareExplorer",
+    "FlareProvider",
+    "NonceManager",
+    "ReceiptWatcher",
+    "TxQueueElement",
+    "TxState",
+    "TxStatus",
+    "WalletState",
+]
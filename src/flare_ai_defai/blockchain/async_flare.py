@@ -0,0 +1,338 @@
+"""
+Async Flare Network Provider Module
+
+This module provides an AsyncFlareProvider for interacting with the Flare Network
+from async code. It is built on `AsyncWeb3` and keeps one keep-alive aiohttp
+connection pool per event loop, shared by every session using the provider.
+Nonces are allocated locally by a `NonceManager` and submitted transactions are
+confirmed in the background by a `ReceiptWatcher`.
+"""
+
+import asyncio
+from typing import Any, override
+
+import aiohttp
+from web3 import AsyncHTTPProvider, AsyncWeb3, Web3
+from web3.exceptions import Web3RPCError
+from web3.providers.rpc.utils import (
+    REQUEST_RETRY_ALLOWLIST,
+    ExceptionRetryConfiguration,
+)
+from web3.types import RPCEndpoint, RPCResponse, TxParams
+
+from flare_ai_defai.metrics import WEB3_RPC_SECONDS
+
+from .flare import TX_FIELDS, BaseFlareProvider, WalletState
+from .nonces import NonceManager, is_nonce_error
+from .receipts import ReceiptWatcher
+
+# web3 retries timed out sends, which resends a transaction the node may have
+# taken; sends are left to `_send_with_nonce`, which resyncs the nonce instead
+RETRY_CONFIGURATION = ExceptionRetryConfiguration(
+    errors=(aiohttp.ClientError, TimeoutError),
+    method_allowlist=[
+        method
+        for method in REQUEST_RETRY_ALLOWLIST
+        if method != "eth_sendRawTransaction"
+    ],
+)
+
+
+class _MeteredHTTPProvider(AsyncHTTPProvider):
+    """HTTP provider recording the latency of every JSON-RPC call by method."""
+
+    @override
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        with WEB3_RPC_SECONDS.labels(method).time():
+            return await super().make_request(method, params)
+
+    @override
+    async def make_batch_request(
+        self, batch_requests: list[tuple[RPCEndpoint, Any]]
+    ) -> list[RPCResponse] | RPCResponse:
+        with WEB3_RPC_SECONDS.labels("batch").time():
+            return await super().make_batch_request(batch_requests)
+
+
+class AsyncFlareProvider(BaseFlareProvider):
+    """
+    Non-blocking counterpart of `FlareProvider`.
+
+    RPC calls are awaited on the event loop instead of blocking it, and reuse
+    pooled keep-alive connections. web3's default async session closes the
+    connection after every request, so a pooled session is installed before
+    the first call on each event loop.
+
+    Nonces are assigned from `nonces` when a transaction is sent, so many
+    transfers from one account can be pipelined. Sending returns once the node
+    accepts the transaction; confirmation is tracked by `receipts`, one polling
+    task shared by every pending transaction.
+
+    Attributes:
+        wallet (WalletState): Default wallet used when none is passed
+        w3 (AsyncWeb3): AsyncWeb3 instance for blockchain interactions
+        nonces (NonceManager): Allocates nonces per sending account
+        receipts (ReceiptWatcher): Tracks submitted transactions until mined
+        logger (BoundLogger): Structured logger for the provider
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        web3_provider_url: str,
+        *,
+        pool_size: int = 100,
+        keepalive_timeout: float = 30.0,
+        request_timeout: float = 30.0,
+        fee_cache_ttl: float = 2.0,
+        receipt_poll_interval: float = 1.0,
+        receipt_timeout: float = 300.0,
+    ) -> None:
+        """
+        Initialize the async Flare Provider.
+
+        Args:
+            web3_provider_url (str): URL of the Web3 provider endpoint
+            pool_size (int): Maximum open connections to the endpoint
+            keepalive_timeout (float): Seconds an idle connection is kept open
+            request_timeout (float): Total timeout in seconds for one request
+            fee_cache_ttl (float): Seconds gas price and priority fee are reused
+            receipt_poll_interval (float): Seconds between receipt watcher polls
+            receipt_timeout (float): Seconds before an unmined tx is given up
+        """
+        super().__init__(fee_cache_ttl)
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.request_timeout = request_timeout
+        self.provider = _MeteredHTTPProvider(
+            web3_provider_url,
+            request_kwargs={"timeout": aiohttp.ClientTimeout(total=request_timeout)},
+            exception_retry_configuration=RETRY_CONFIGURATION,
+        )
+        self.w3 = AsyncWeb3(self.provider)
+        self._session: aiohttp.ClientSession | None = None
+        self._session_loop: asyncio.AbstractEventLoop | None = None
+        self.nonces = NonceManager(self._pending_nonce)
+        self.receipts = ReceiptWatcher(
+            self._batch_rpc,
+            poll_interval=receipt_poll_interval,
+            timeout=receipt_timeout,
+        )
+
+    async def _ensure_session(self) -> None:
+        """Install the pooled keep-alive session for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._session is not None
+            and not self._session.closed
+            and self._session_loop is loop
+        ):
+            return
+        self._session = aiohttp.ClientSession(
+            raise_for_status=True,
+            connector=aiohttp.TCPConnector(
+                limit=self.pool_size, keepalive_timeout=self.keepalive_timeout
+            ),
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+        )
+        self._session_loop = loop
+        await self.provider.cache_async_session(self._session)
+        self.logger.debug("connection_pool_opened", pool_size=self.pool_size)
+
+    async def _batch_rpc(self, requests: list[tuple[str, list[Any]]]) -> list[Any]:
+        """
+        Send raw JSON-RPC requests as one batch over the pooled session.
+
+        Args:
+            requests: (method, params) pairs
+
+        Returns:
+            list[Any]: Raw result of each request in order, None for errors
+
+        Raises:
+            Web3RPCError: If the node rejects the batch as a whole
+        """
+        await self._ensure_session()
+        responses = await self.provider.make_batch_request(
+            requests  # pyright: ignore [reportArgumentType]
+        )
+        if not isinstance(responses, list):
+            msg = f"Batch request failed: {responses.get('error')}"
+            raise Web3RPCError(msg, rpc_response=responses)
+        return [response.get("result") for response in responses]
+
+    async def _pending_nonce(self, address: str) -> int:
+        """Ask the node for an address's transaction count, pool included."""
+        await self._ensure_session()
+        return await self.w3.eth.get_transaction_count(
+            Web3.to_checksum_address(address), "pending"
+        )
+
+    async def close(self) -> None:
+        """Stop the receipt watcher and close the pooled connections."""
+        await self.receipts.close()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+    async def send_tx_in_queue(self, wallet: WalletState | None = None) -> str:
+        """
+        Send the most recent transaction in the queue.
+
+        Args:
+            wallet (WalletState | None): Wallet to send from, default wallet if None
+
+        Returns:
+            str: Transaction hash of the sent transaction
+
+        Raises:
+            ValueError: If no transaction is found in the queue
+        """
+        wallet = self._resolve(wallet)
+        if wallet.tx_queue:
+            tx_hash = await self.sign_and_send_transaction(
+                wallet.tx_queue[-1].tx, wallet
+            )
+            self.logger.debug("sent_tx_hash", tx_hash=tx_hash)
+            wallet.tx_queue.pop()
+            return tx_hash
+        msg = "Unable to find confirmed tx"
+        raise ValueError(msg)
+
+    async def sign_and_send_transaction(
+        self, tx: TxParams, wallet: WalletState | None = None
+    ) -> str:
+        """
+        Sign and send a transaction to the network.
+
+        The nonce is reserved from the nonce manager, overriding any nonce in
+        `tx`. If the node rejects it, the nonce is resynced from the node and
+        the send retried once. Returns as soon as the node accepts the raw
+        transaction; the receipt watcher reports when it is mined.
+
+        Args:
+            tx (TxParams): Transaction parameters to be sent
+            wallet (WalletState | None): Wallet to sign with, default wallet if None
+
+        Returns:
+            str: Transaction hash of the sent transaction
+
+        Raises:
+            ValueError: If account is not initialized
+        """
+        wallet = self._resolve(wallet)
+        if not wallet.private_key or not wallet.address:
+            msg = "Account not initialized"
+            raise ValueError(msg)
+        await self._ensure_session()
+        tx_hash = await self._send_with_nonce(tx, wallet.address, wallet.private_key)
+        self.receipts.watch(tx_hash)
+        self.logger.debug("sign_and_send_transaction", tx=tx)
+        return tx_hash
+
+    async def _send_with_nonce(
+        self, tx: TxParams, address: str, private_key: str, retries: int = 1
+    ) -> str:
+        """
+        Sign `tx` with a reserved nonce and submit it.
+
+        Args:
+            tx (TxParams): Transaction parameters, nonce excluded
+            address (str): Sending account
+            private_key (str): Key of the sending account
+            retries (int): Resends allowed after a nonce conflict
+
+        Returns:
+            str: Transaction hash of the sent transaction
+
+        Raises:
+            Web3RPCError: If the node rejected the transaction
+        """
+        while True:
+            nonce = await self.nonces.reserve(address)
+            signed_tx = self.w3.eth.account.sign_transaction(
+                {**tx, "nonce": nonce}, private_key=private_key
+            )
+            try:
+                tx_hash = await self.w3.eth.send_raw_transaction(
+                    signed_tx.raw_transaction
+                )
+            except Web3RPCError as e:
+                if not is_nonce_error(e):
+                    # Rejected by the node: hand the nonce out again
+                    self.nonces.release(address, nonce)
+                    raise
+                await self.nonces.resync(address)
+                if retries <= 0:
+                    raise
+                retries -= 1
+                self.logger.warning(
+                    "nonce_conflict", address=address, nonce=nonce, error=str(e)
+                )
+            except Exception:
+                # Timed out or the connection dropped: the node may have taken
+                # the transaction, so ask it for the pending count instead of
+                # reusing the nonce
+                await self.nonces.resync(address)
+                raise
+            else:
+                return "0x" + tx_hash.hex()
+
+    async def check_balance(self, wallet: WalletState | None = None) -> float:
+        """
+        Check the balance of the current account.
+
+        Args:
+            wallet (WalletState | None): Wallet to check, default wallet if None
+
+        Returns:
+            float: Account balance in FLR
+
+        Raises:
+            ValueError: If account does not exist
+        """
+        wallet = self._resolve(wallet)
+        if not wallet.address:
+            msg = "Account does not exist"
+            raise ValueError(msg)
+        await self._ensure_session()
+        balance_wei = await self.w3.eth.get_balance(wallet.address)
+        self.logger.debug("check_balance", balance_wei=balance_wei)
+        return float(Web3.from_wei(balance_wei, "ether"))
+
+    async def create_send_flr_tx(
+        self, to_address: str, amount: float, wallet: WalletState | None = None
+    ) -> TxParams:
+        """
+        Create a transaction to send FLR tokens.
+
+        The nonce is left out and assigned when the transaction is sent. Any
+        uncached fee or chain id fields are fetched in a single JSON-RPC batch
+        request; with warm caches no request is made.
+
+        Args:
+            to_address (str): Recipient address
+            amount (float): Amount of FLR to send
+            wallet (WalletState | None): Wallet to send from, default wallet if None
+
+        Returns:
+            TxParams: Transaction parameters for sending FLR
+
+        Raises:
+            ValueError: If account does not exist
+        """
+        wallet = self._resolve(wallet)
+        if not wallet.address:
+            msg = "Account does not exist"
+            raise ValueError(msg)
+        cached = self._cached_tx_fields()
+        missing = [name for name in TX_FIELDS if name not in cached]
+        fetched: dict[str, int] = {}
+        if missing:
+            await self._ensure_session()
+            async with self.w3.batch_requests() as batch:
+                for name in missing:
+                    batch.add(getattr(self.w3.eth, name))
+                fetched = dict(zip(missing, await batch.async_execute(), strict=True))
+            self._cache_tx_fields(fetched)
+        return self._send_flr_tx(to_address, amount, wallet, cached | fetched)
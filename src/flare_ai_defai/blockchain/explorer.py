@@ -1,15 +1,151 @@
+import asyncio
 import json
 import logging
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
 
+import httpx
 import requests
 from requests.exceptions import RequestException, Timeout
 
+from flare_ai_defai.cache import CacheStats, LRUCache
+
 logger = logging.getLogger(__name__)
 
+type ContractABI = list[dict[str, Any]]
+
+ADDRESS_PATTERN = re.compile(r"0x[0-9a-fA-F]{40}")
+
+
+def _abi_request(contract_address: str) -> dict[str, str]:
+    return {"module": "contract", "action": "getabi", "address": contract_address}
+
+
+def _check_response(json_response: dict) -> dict:
+    if "result" not in json_response:
+        msg = f"Malformed response from API: {json_response}"
+        raise ValueError(msg)
+    return json_response
+
+
+class AbiCache:
+    """Cache of contract ABIs keyed by chain and address.
+
+    Contract ABIs essentially never change once a contract is verified, so
+    they are kept indefinitely: in an in-memory LRU and, when `directory` is
+    given, as one JSON file per contract that survives restarts. Files are
+    written atomically, so a crash never leaves a truncated ABI behind.
+
+    :param directory: Directory for the on-disk cache, None to keep ABIs in
+        memory only
+    :param maxsize: ABIs kept in memory
+    """
+
+    def __init__(
+        self, directory: str | Path | None = None, maxsize: int = 1024
+    ) -> None:
+        self.directory = None if directory is None else Path(directory)
+        self._memory: LRUCache[tuple[str, str], ContractABI] = LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit and miss counters of the in-memory cache."""
+        return self._memory.stats
+
+    @staticmethod
+    def _key(chain: str, contract_address: str) -> tuple[str, str]:
+        # The address becomes a file name, so only accept real addresses
+        if not ADDRESS_PATTERN.fullmatch(contract_address):
+            msg = f"Invalid contract address: {contract_address!r}"
+            raise ValueError(msg)
+        return chain, contract_address.lower()
+
+    def _path(self, chain: str, address: str) -> Path | None:
+        if self.directory is None:
+            return None
+        return self.directory / chain / f"{address}.json"
+
+    def get(self, chain: str, contract_address: str) -> ContractABI | None:
+        """Look up a cached ABI, from memory first and then from disk.
+
+        :param chain: Chain the contract is deployed on
+        :param contract_address: Address of the contract
+        :return: The ABI, or None if not cached
+        :raises ValueError: If the address is not a contract address
+        """
+        key = self._key(chain, contract_address)
+        with self._lock:
+            abi = self._memory.get(key)
+        if abi is not None:
+            return abi
+        path = self._path(*key)
+        if path is None or not path.exists():
+            return None
+        try:
+            abi = json.loads(path.read_text())
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable cached ABI `%s`", path)
+            return None
+        with self._lock:
+            self._memory.set(key, abi)
+        return abi
+
+    def set(self, chain: str, contract_address: str, abi: ContractABI) -> None:
+        """Store an ABI in memory and, if configured, on disk.
+
+        :param chain: Chain the contract is deployed on
+        :param contract_address: Address of the contract
+        :param abi: Contract ABI
+        :raises ValueError: If the address is not a contract address
+        """
+        key = self._key(chain, contract_address)
+        with self._lock:
+            self._memory.set(key, abi)
+        path = self._path(*key)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(abi, f)
+            Path(tmp).replace(path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
 
 class FlareExplorer:
-    def __init__(self, base_url: str) -> None:
+    """Client for the Chain Explorer API.
+
+    Requests share one keep-alive session and fetched ABIs are cached.
+
+    :param base_url: URL of the explorer API
+    :param abi_cache: Cache for fetched ABIs, defaults to an in-memory cache
+    :param chain: Cache namespace for the explorer's chain, defaults to the
+        explorer's host name
+    :param timeout: Seconds to wait for the explorer
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        abi_cache: AbiCache | None = None,
+        chain: str | None = None,
+        timeout: float = 10,
+    ) -> None:
         self.base_url = base_url
+        self.abi_cache = AbiCache() if abi_cache is None else abi_cache
+        self.chain = chain or urlparse(base_url).netloc
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["accept"] = "application/json"
 
     def _get(self, params: dict) -> dict:
         """Get data from the Chain Explorer API.
@@ -17,17 +153,12 @@ class FlareExplorer:
         :param params: Query parameters
         :return: JSON response
         """
-        headers = {"accept": "application/json"}
         try:
-            response = requests.get(
-                self.base_url, params=params, headers=headers, timeout=10
+            response = self.session.get(
+                self.base_url, params=params, timeout=self.timeout
             )
             response.raise_for_status()
-            json_response = response.json()
-
-            if "result" not in json_response:
-                msg = (f"Malformed response from API: {json_response}",)
-                raise ValueError(msg)
+            json_response = _check_response(response.json())
 
         except (RequestException, Timeout):
             logger.exception("Network error during API request")
@@ -35,18 +166,103 @@ class FlareExplorer:
         else:
             return json_response
 
-    def get_contract_abi(self, contract_address: str) -> dict:
-        """Get the ABI for a contract from the Chain Explorer API.
+    def get_contract_abi(self, contract_address: str) -> ContractABI:
+        """Get the ABI for a contract, from the cache or the Chain Explorer API.
 
         :param contract_address: Address of the contract
         :return: Contract ABI
         """
+        abi = self.abi_cache.get(self.chain, contract_address)
+        if abi is not None:
+            return abi
         logger.info("Fetching ABI for `%s` from `%s`", contract_address, self.base_url)
-        response = self._get(
-            params={
-                "module": "contract",
-                "action": "getabi",
-                "address": contract_address,
-            }
+        response = self._get(params=_abi_request(contract_address))
+        abi = json.loads(response["result"])
+        self.abi_cache.set(self.chain, contract_address, abi)
+        return abi
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+
+
+class AsyncFlareExplorer:
+    """Async client for the Chain Explorer API.
+
+    Requests share one pooled `httpx.AsyncClient`, fetched ABIs are cached,
+    and bulk lookups fetch concurrently, at most `max_concurrency` at a time.
+
+    :param base_url: URL of the explorer API
+    :param abi_cache: Cache for fetched ABIs, defaults to an in-memory cache
+    :param chain: Cache namespace for the explorer's chain, defaults to the
+        explorer's host name
+    :param timeout: Seconds to wait for the explorer
+    :param max_concurrency: Most requests in flight at once
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        abi_cache: AbiCache | None = None,
+        chain: str | None = None,
+        timeout: float = 10,
+        max_concurrency: int = 8,
+    ) -> None:
+        self.base_url = base_url
+        self.abi_cache = AbiCache() if abi_cache is None else abi_cache
+        self.chain = chain or urlparse(base_url).netloc
+        self.client = httpx.AsyncClient(
+            headers={"accept": "application/json"},
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
         )
-        return json.loads(response["result"])
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _get(self, params: dict) -> dict:
+        """Get data from the Chain Explorer API.
+
+        :param params: Query parameters
+        :return: JSON response
+        """
+        try:
+            async with self._semaphore:
+                response = await self.client.get(self.base_url, params=params)
+            response.raise_for_status()
+            return _check_response(response.json())
+        except httpx.HTTPError:
+            logger.exception("Network error during API request")
+            raise
+
+    async def get_contract_abi(self, contract_address: str) -> ContractABI:
+        """Get the ABI for a contract, from the cache or the Chain Explorer API.
+
+        :param contract_address: Address of the contract
+        :return: Contract ABI
+        """
+        abi = self.abi_cache.get(self.chain, contract_address)
+        if abi is not None:
+            return abi
+        logger.info("Fetching ABI for `%s` from `%s`", contract_address, self.base_url)
+        response = await self._get(params=_abi_request(contract_address))
+        abi = json.loads(response["result"])
+        self.abi_cache.set(self.chain, contract_address, abi)
+        return abi
+
+    async def get_contract_abis(
+        self, contract_addresses: list[str]
+    ) -> dict[str, ContractABI]:
+        """Get the ABIs for many contracts, fetching uncached ones concurrently.
+
+        :param contract_addresses: Addresses of the contracts
+        :return: Contract ABI by address, in the order given
+        """
+        unique = list(dict.fromkeys(contract_addresses))
+        abis = await asyncio.gather(*(self.get_contract_abi(a) for a in unique))
+        return dict(zip(unique, abis, strict=True))
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self.client.aclose()
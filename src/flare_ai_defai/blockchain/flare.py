@@ -5,7 +5,7 @@ This module provides a FlareProvider class for interacting with the Flare Networ
 It handles account management, transaction queuing, and blockchain interactions.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import structlog
 from eth_account import Account
@@ -13,6 +13,8 @@ from eth_typing import ChecksumAddress
 from web3 import Web3
 from web3.types import TxParams
 
+from flare_ai_defai.cache import TTLCache
+
 
 @dataclass
 class TxQueueElement:
@@ -28,95 +30,238 @@ class TxQueueElement:
     tx: TxParams
 
 
-logger = structlog.get_logger(__name__)
-
-
-class FlareProvider:
+@dataclass
+class WalletState:
     """
-    Manages interactions with the Flare Network including account
-    operations and transactions.
+    Per-user account state, kept apart from the shared Web3 connection.
 
     Attributes:
         address (ChecksumAddress | None): The account's checksum address
         private_key (str | None): The account's private key
         tx_queue (list[TxQueueElement]): Queue of pending transactions
-        w3 (Web3): Web3 instance for blockchain interactions
+    """
+
+    address: ChecksumAddress | None = None
+    private_key: str | None = None
+    tx_queue: list[TxQueueElement] = field(default_factory=list)
+
+
+logger = structlog.get_logger(__name__)
+
+# Cacheable fields looked up to build a transfer, named after the `w3.eth`
+# attributes returning them
+TX_FIELDS = ("gas_price", "max_priority_fee", "chain_id")
+FEE_FIELDS = ("gas_price", "max_priority_fee")
+
+
+class BaseFlareProvider:
+    """
+    Wallet and transaction-queue handling shared by the sync and async
+    Flare providers.
+
+    Every account operation accepts an optional `WalletState` so one provider
+    (and its connection) can serve many sessions. When omitted, the provider's
+    own default wallet is used.
+
+    The chain id is cached for the provider's lifetime and fee suggestions for
+    `fee_cache_ttl` seconds, shared by every session, so building a transfer
+    only has to ask the node for what is actually missing.
+
+    Attributes:
+        wallet (WalletState): Default wallet used when none is passed
         logger (BoundLogger): Structured logger for the provider
     """
 
-    def __init__(self, web3_provider_url: str) -> None:
+    def __init__(self, fee_cache_ttl: float = 2.0) -> None:
         """
-        Initialize the Flare Provider.
+        Initialize the provider with an empty default wallet.
 
         Args:
-            web3_provider_url (str): URL of the Web3 provider endpoint
+            fee_cache_ttl (float): Seconds gas price and priority fee are reused
         """
-        self.address: ChecksumAddress | None = None
-        self.private_key: str | None = None
-        self.tx_queue: list[TxQueueElement] = []
-        self.w3 = Web3(Web3.HTTPProvider(web3_provider_url))
+        self.wallet = WalletState()
         self.logger = logger.bind(router="flare_provider")
+        self._chain_id: int | None = None
+        self._fee_cache: TTLCache[str, int] = TTLCache(ttl=fee_cache_ttl)
+
+    @property
+    def address(self) -> ChecksumAddress | None:
+        """Address of the default wallet."""
+        return self.wallet.address
+
+    @property
+    def private_key(self) -> str | None:
+        """Private key of the default wallet."""
+        return self.wallet.private_key
+
+    @property
+    def tx_queue(self) -> list[TxQueueElement]:
+        """Transaction queue of the default wallet."""
+        return self.wallet.tx_queue
+
+    def _resolve(self, wallet: WalletState | None) -> WalletState:
+        """Return the given wallet, falling back to the default wallet."""
+        return self.wallet if wallet is None else wallet
 
     def reset(self) -> None:
         """
         Reset the provider state by clearing account details and transaction queue.
         """
-        self.address = None
-        self.private_key = None
-        self.tx_queue = []
+        self.wallet = WalletState()
         self.logger.debug("reset", address=self.address, tx_queue=self.tx_queue)
 
-    def add_tx_to_queue(self, msg: str, tx: TxParams) -> None:
+    def add_tx_to_queue(
+        self, msg: str, tx: TxParams, wallet: WalletState | None = None
+    ) -> None:
         """
         Add a transaction to the queue with an associated message.
 
         Args:
             msg (str): Description of the transaction
             tx (TxParams): Transaction parameters
+            wallet (WalletState | None): Wallet to queue on, default wallet if None
         """
+        wallet = self._resolve(wallet)
         tx_queue_element = TxQueueElement(msg=msg, tx=tx)
-        self.tx_queue.append(tx_queue_element)
-        self.logger.debug("add_tx_to_queue", tx_queue=self.tx_queue)
+        wallet.tx_queue.append(tx_queue_element)
+        self.logger.debug("add_tx_to_queue", tx_queue=wallet.tx_queue)
+
+    def generate_account(self, wallet: WalletState | None = None) -> ChecksumAddress:
+        """
+        Generate a new Flare account.
+
+        Args:
+            wallet (WalletState | None): Wallet to store the account in,
+                default wallet if None
+
+        Returns:
+            ChecksumAddress: The checksum address of the generated account
+        """
+        wallet = self._resolve(wallet)
+        account = Account.create()
+        wallet.private_key = account.key.hex()
+        wallet.address = Web3.to_checksum_address(account.address)
+        self.logger.debug(
+            "generate_account", address=wallet.address, private_key=wallet.private_key
+        )
+        return wallet.address
+
+    def _cached_tx_fields(self) -> dict[str, int]:
+        """
+        Snapshot the transaction fields that can be served from the caches.
+
+        Returns:
+            dict[str, int]: Unexpired fee fields and the chain id if known
+        """
+        cached: dict[str, int] = {}
+        for name in FEE_FIELDS:
+            value = self._fee_cache.get(name)
+            if value is not None:
+                cached[name] = value
+        if self._chain_id is not None:
+            cached["chain_id"] = self._chain_id
+        return cached
+
+    def _cache_tx_fields(self, fetched: dict[str, int]) -> None:
+        """Remember fee fields and the chain id just fetched from the node."""
+        for name in FEE_FIELDS:
+            if name in fetched:
+                self._fee_cache.set(name, fetched[name])
+        if "chain_id" in fetched:
+            self._chain_id = fetched["chain_id"]
+        self.logger.debug("send_flr_tx_fields", fetched=list(fetched))
+
+    def _send_flr_tx(
+        self,
+        to_address: str,
+        amount: float,
+        wallet: WalletState,
+        fields: dict[str, int],
+    ) -> TxParams:
+        """
+        Assemble an FLR transfer.
+
+        Args:
+            to_address (str): Recipient address
+            amount (float): Amount of FLR to send
+            wallet (WalletState): Wallet sending the transfer
+            fields (dict[str, int]): Every entry of `TX_FIELDS`, plus "nonce"
+                when it is fixed at build time
+
+        Returns:
+            TxParams: Transaction parameters for sending FLR
+        """
+        tx: TxParams = {
+            "from": wallet.address,
+            "to": Web3.to_checksum_address(to_address),
+            "value": Web3.to_wei(amount, unit="ether"),
+            "gas": 21000,
+            "maxFeePerGas": fields["gas_price"],
+            "maxPriorityFeePerGas": fields["max_priority_fee"],
+            "chainId": fields["chain_id"],
+            "type": 2,
+        }
+        if "nonce" in fields:
+            tx["nonce"] = fields["nonce"]
+        return tx
+
+
+class FlareProvider(BaseFlareProvider):
+    """
+    Manages interactions with the Flare Network including account
+    operations and transactions, over a blocking `Web3.HTTPProvider`.
+
+    Prefer `AsyncFlareProvider` from async code; every call here blocks the
+    calling thread for a full RPC round trip.
+
+    Attributes:
+        wallet (WalletState): Default wallet used when none is passed
+        w3 (Web3): Web3 instance for blockchain interactions
+        logger (BoundLogger): Structured logger for the provider
+    """
+
+    def __init__(self, web3_provider_url: str, fee_cache_ttl: float = 2.0) -> None:
+        """
+        Initialize the Flare Provider.
+
+        Args:
+            web3_provider_url (str): URL of the Web3 provider endpoint
+            fee_cache_ttl (float): Seconds gas price and priority fee are reused
+        """
+        super().__init__(fee_cache_ttl)
+        self.w3 = Web3(Web3.HTTPProvider(web3_provider_url))
 
-    def send_tx_in_queue(self) -> str:
+    def send_tx_in_queue(self, wallet: WalletState | None = None) -> str:
         """
         Send the most recent transaction in the queue.
 
+        Args:
+            wallet (WalletState | None): Wallet to send from, default wallet if None
+
         Returns:
             str: Transaction hash of the sent transaction
 
         Raises:
             ValueError: If no transaction is found in the queue
         """
-        if self.tx_queue:
-            tx_hash = self.sign_and_send_transaction(self.tx_queue[-1].tx)
+        wallet = self._resolve(wallet)
+        if wallet.tx_queue:
+            tx_hash = self.sign_and_send_transaction(wallet.tx_queue[-1].tx, wallet)
             self.logger.debug("sent_tx_hash", tx_hash=tx_hash)
-            self.tx_queue.pop()
+            wallet.tx_queue.pop()
             return tx_hash
         msg = "Unable to find confirmed tx"
         raise ValueError(msg)
 
-    def generate_account(self) -> ChecksumAddress:
-        """
-        Generate a new Flare account.
-
-        Returns:
-            ChecksumAddress: The checksum address of the generated account
-        """
-        account = Account.create()
-        self.private_key = account.key.hex()
-        self.address = self.w3.to_checksum_address(account.address)
-        self.logger.debug(
-            "generate_account", address=self.address, private_key=self.private_key
-        )
-        return self.address
-
-    def sign_and_send_transaction(self, tx: TxParams) -> str:
+    def sign_and_send_transaction(
+        self, tx: TxParams, wallet: WalletState | None = None
+    ) -> str:
         """
         Sign and send a transaction to the network.
 
         Args:
             tx (TxParams): Transaction parameters to be sent
+            wallet (WalletState | None): Wallet to sign with, default wallet if None
 
         Returns:
             str: Transaction hash of the sent transaction
@@ -124,41 +269,52 @@ class FlareProvider:
         Raises:
             ValueError: If account is not initialized
         """
-        if not self.private_key or not self.address:
+        wallet = self._resolve(wallet)
+        if not wallet.private_key or not wallet.address:
             msg = "Account not initialized"
             raise ValueError(msg)
         signed_tx = self.w3.eth.account.sign_transaction(
-            tx, private_key=self.private_key
+            tx, private_key=wallet.private_key
         )
         tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
         self.w3.eth.wait_for_transaction_receipt(tx_hash)
         self.logger.debug("sign_and_send_transaction", tx=tx)
         return "0x" + tx_hash.hex()
 
-    def check_balance(self) -> float:
+    def check_balance(self, wallet: WalletState | None = None) -> float:
         """
         Check the balance of the current account.
 
+        Args:
+            wallet (WalletState | None): Wallet to check, default wallet if None
+
         Returns:
             float: Account balance in FLR
 
         Raises:
             ValueError: If account does not exist
         """
-        if not self.address:
+        wallet = self._resolve(wallet)
+        if not wallet.address:
             msg = "Account does not exist"
             raise ValueError(msg)
-        balance_wei = self.w3.eth.get_balance(self.address)
+        balance_wei = self.w3.eth.get_balance(wallet.address)
         self.logger.debug("check_balance", balance_wei=balance_wei)
         return float(self.w3.from_wei(balance_wei, "ether"))
 
-    def create_send_flr_tx(self, to_address: str, amount: float) -> TxParams:
+    def create_send_flr_tx(
+        self, to_address: str, amount: float, wallet: WalletState | None = None
+    ) -> TxParams:
         """
         Create a transaction to send FLR tokens.
 
+        The nonce and any uncached fee or chain id fields are fetched in a
+        single JSON-RPC batch request.
+
         Args:
             to_address (str): Recipient address
             amount (float): Amount of FLR to send
+            wallet (WalletState | None): Wallet to send from, default wallet if None
 
         Returns:
             TxParams: Transaction parameters for sending FLR
@@ -166,18 +322,16 @@ class FlareProvider:
         Raises:
             ValueError: If account does not exist
         """
-        if not self.address:
+        wallet = self._resolve(wallet)
+        if not wallet.address:
             msg = "Account does not exist"
             raise ValueError(msg)
-        tx: TxParams = {
-            "from": self.address,
-            "nonce": self.w3.eth.get_transaction_count(self.address),
-            "to": self.w3.to_checksum_address(to_address),
-            "value": self.w3.to_wei(amount, unit="ether"),
-            "gas": 21000,
-            "maxFeePerGas": self.w3.eth.gas_price,
-            "maxPriorityFeePerGas": self.w3.eth.max_priority_fee,
-            "chainId": self.w3.eth.chain_id,
-            "type": 2,
-        }
-        return tx
+        cached = self._cached_tx_fields()
+        missing = [name for name in TX_FIELDS if name not in cached]
+        with self.w3.batch_requests() as batch:
+            batch.add(self.w3.eth.get_transaction_count(wallet.address))
+            for name in missing:
+                batch.add(getattr(self.w3.eth, name))
+            fetched = dict(zip(["nonce", *missing], batch.execute(), strict=True))
+        self._cache_tx_fields(fetched)
+        return self._send_flr_tx(to_address, amount, wallet, cached | fetched)
@@ -0,0 +1,116 @@
+"""
+Nonce Manager Module
+
+This module hands out transaction nonces per account from memory, so sending
+does not cost a `get_transaction_count` round trip and concurrent sends from
+one account never reuse a nonce. The node is only asked for the count the first
+time an account sends, again after a send fails because of its nonce, and
+after a send whose outcome is unknown.
+"""
+
+import asyncio
+import heapq
+from collections.abc import Awaitable, Callable
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Returns the node's pending transaction count for an address
+FetchNonce = Callable[[str], Awaitable[int]]
+
+NONCE_ERRORS = ("nonce", "already known", "replacement transaction underpriced")
+
+
+def is_nonce_error(error: Exception) -> bool:
+    """
+    Tell whether a send failed because of its nonce.
+
+    Args:
+        error: Exception raised by `eth_sendRawTransaction`
+
+    Returns:
+        bool: True if resyncing the nonce from the node can fix the send
+    """
+    message = str(error).lower()
+    return any(marker in message for marker in NONCE_ERRORS)
+
+
+class NonceManager:
+    """
+    Per-address nonce allocator kept in memory.
+
+    Reservations for one address are serialized by an asyncio lock, so any
+    number of concurrent sends get distinct, consecutive nonces. A nonce whose
+    transaction never reached the node is released and handed out again
+    before any new one, which closes the gap it would otherwise leave.
+
+    Attributes:
+        logger (BoundLogger): Structured logger for the manager
+    """
+
+    def __init__(self, fetch_nonce: FetchNonce) -> None:
+        """
+        Initialize the manager.
+
+        Args:
+            fetch_nonce: Callable returning the node's pending transaction count
+        """
+        self.logger = logger.bind(router="nonce_manager")
+        self._fetch_nonce = fetch_nonce
+        self._next: dict[str, int] = {}
+        self._released: dict[str, list[int]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def _lock(self, address: str) -> asyncio.Lock:
+        return self._locks.setdefault(address, asyncio.Lock())
+
+    async def reserve(self, address: str) -> int:
+        """
+        Reserve the next nonce for an address.
+
+        Args:
+            address: Sending account
+
+        Returns:
+            int: Nonce to sign the next transaction with
+        """
+        async with self._lock(address):
+            released = self._released.get(address)
+            if released:
+                return heapq.heappop(released)
+            if address not in self._next:
+                self._next[address] = await self._fetch_nonce(address)
+                self.logger.debug(
+                    "nonce_synced", address=address, nonce=self._next[address]
+                )
+            nonce = self._next[address]
+            self._next[address] = nonce + 1
+            return nonce
+
+    def release(self, address: str, nonce: int) -> None:
+        """
+        Return a nonce whose transaction the node rejected.
+
+        Only for definite rejections: after a timeout or a dropped connection
+        the node may have accepted the transaction, so resync instead.
+
+        Args:
+            address: Sending account
+            nonce: Nonce previously returned by `reserve`
+        """
+        if nonce < self._next.get(address, 0):
+            heapq.heappush(self._released.setdefault(address, []), nonce)
+
+    async def resync(self, address: str) -> None:
+        """
+        Forget the local state for an address so the next reservation asks
+        the node again.
+
+        Args:
+            address: Sending account
+        """
+        async with self._lock(address):
+            self._next.pop(address, None)
+            self._released.pop(address, None)
+        self.logger.info("nonce_resync", address=address)
@@ -0,0 +1,209 @@
+"""
+Transaction Receipt Watcher Module
+
+This module tracks submitted transactions until they are mined. A single
+background task serves every pending transaction: each tick it asks the node
+for the latest block number and, only when a new block has appeared (or new
+transactions were submitted), fetches all outstanding receipts in one
+JSON-RPC batch request.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+import structlog
+
+from flare_ai_defai.cache import LRUCache
+
+logger = structlog.get_logger(__name__)
+
+# Sends (method, params) requests as one JSON-RPC batch, returning each result
+BatchRPC = Callable[[list[tuple[str, list[Any]]]], Awaitable[list[Any]]]
+
+
+class TxStatus(str, Enum):
+    """Lifecycle of a submitted transaction."""
+
+    PENDING = "pending"
+    CONFIRMED = "confirmed"
+    FAILED = "failed"
+    TIMED_OUT = "timed_out"
+
+
+@dataclass
+class TxState:
+    """
+    Confirmation state of a submitted transaction.
+
+    Attributes:
+        tx_hash (str): Transaction hash
+        status (TxStatus): Current status
+        submitted_at (float): Unix time the node accepted the transaction
+        block_number (int | None): Block the transaction was mined in
+        finished_at (float | None): Unix time the status became final
+    """
+
+    tx_hash: str
+    status: TxStatus = TxStatus.PENDING
+    submitted_at: float = field(default_factory=time.time)
+    block_number: int | None = None
+    finished_at: float | None = None
+    finished: asyncio.Event = field(
+        default_factory=asyncio.Event, repr=False, compare=False
+    )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the state for API responses."""
+        return {
+            "tx_hash": self.tx_hash,
+            "status": self.status.value,
+            "submitted_at": self.submitted_at,
+            "block_number": self.block_number,
+            "finished_at": self.finished_at,
+        }
+
+
+class ReceiptWatcher:
+    """
+    Watches every pending transaction from one polling task.
+
+    The task starts on the first `watch` and exits once nothing is pending, so
+    an idle watcher costs nothing. Final states are kept in a bounded LRU so
+    clients can still look them up after confirmation.
+
+    Attributes:
+        poll_interval (float): Seconds between block number checks
+        timeout (float): Seconds after which an unmined transaction is given up
+        logger (BoundLogger): Structured logger for the watcher
+    """
+
+    def __init__(
+        self,
+        batch_rpc: BatchRPC,
+        poll_interval: float = 1.0,
+        timeout: float = 300.0,
+        max_finished: int = 10_000,
+    ) -> None:
+        """
+        Initialize the watcher.
+
+        Args:
+            batch_rpc: Callable sending one JSON-RPC batch request
+            poll_interval: Seconds between block number checks
+            timeout: Seconds after which an unmined transaction is given up
+            max_finished: Number of final states kept for lookups
+        """
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.logger = logger.bind(router="receipt_watcher")
+        self._batch_rpc = batch_rpc
+        self._pending: dict[str, TxState] = {}
+        self._finished: LRUCache[str, TxState] = LRUCache(max_finished)
+        self._task: asyncio.Task[None] | None = None
+        self._last_block: int | None = None
+        self._unchecked: set[str] = set()
+
+    @property
+    def pending_count(self) -> int:
+        """Number of transactions still awaiting a receipt."""
+        return len(self._pending)
+
+    def watch(self, tx_hash: str) -> TxState:
+        """
+        Start tracking a submitted transaction.
+
+        Args:
+            tx_hash: Hash returned by `eth_sendRawTransaction`
+
+        Returns:
+            TxState: Pending state, updated in place as the watcher progresses
+        """
+        state = self._pending.get(tx_hash) or TxState(tx_hash=tx_hash)
+        self._pending[tx_hash] = state
+        self._unchecked.add(tx_hash)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return state
+
+    def get(self, tx_hash: str) -> TxState | None:
+        """Look up a pending or recently finished transaction."""
+        return self._pending.get(tx_hash) or self._finished.get(tx_hash)
+
+    async def wait(self, tx_hash: str, timeout: float | None = None) -> TxState | None:  # noqa: ASYNC109
+        """
+        Wait until a watched transaction reaches a final status.
+
+        Args:
+            tx_hash: Transaction hash
+            timeout: Maximum seconds to wait, unbounded if None
+
+        Returns:
+            TxState | None: The state, still pending if `timeout` elapsed,
+                or None if the transaction is not being watched
+        """
+        state = self.get(tx_hash)
+        if state is not None and state.status is TxStatus.PENDING:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(state.finished.wait(), timeout)
+        return state
+
+    async def close(self) -> None:
+        """Stop the polling task."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self._poll()
+            except Exception as e:  # noqa: BLE001
+                # Transient RPC failures must not kill the only watcher task
+                self.logger.warning("receipt_poll_failed", error=str(e))
+
+    async def _poll(self) -> None:
+        [block_hex] = await self._batch_rpc([("eth_blockNumber", [])])
+        block = int(block_hex, 16)
+        now = time.time()
+        if block != self._last_block or self._unchecked:
+            self._last_block = block
+            self._unchecked.clear()
+            hashes = list(self._pending)
+            receipts = await self._batch_rpc(
+                [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in hashes]
+            )
+            for tx_hash, receipt in zip(hashes, receipts, strict=True):
+                if receipt is not None:
+                    status = (
+                        TxStatus.CONFIRMED
+                        if int(receipt["status"], 16) == 1
+                        else TxStatus.FAILED
+                    )
+                    self._finish(tx_hash, status, int(receipt["blockNumber"], 16))
+        for tx_hash, state in list(self._pending.items()):
+            if now - state.submitted_at > self.timeout:
+                self._finish(tx_hash, TxStatus.TIMED_OUT)
+        self.logger.debug("receipt_poll", block=block, pending=len(self._pending))
+
+    def _finish(
+        self, tx_hash: str, status: TxStatus, block_number: int | None = None
+    ) -> None:
+        state = self._pending.pop(tx_hash)
+        state.status = status
+        state.block_number = block_number
+        state.finished_at = time.time()
+        state.finished.set()
+        self._finished.set(tx_hash, state)
+        self.logger.info(
+            "tx_finished",
+            tx_hash=tx_hash,
+            status=status.value,
+            block_number=block_number,
+            seconds=round(state.finished_at - state.submitted_at, 2),
+        )
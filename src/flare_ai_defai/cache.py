@@ -0,0 +1,184 @@
+"""
+In-process cache primitives shared across the service.
+
+The caches are deliberately small and dependency-free: an OrderedDict keeps
+entries in least recently used order so lookups, inserts and evictions are
+all O(1), and each cache counts its own hits and misses for metrics.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+
+
+@dataclass
+class CacheStats:
+    """
+    Hit and miss counters for a cache.
+
+    Attributes:
+        hits (int): Lookups served from the cache
+        misses (int): Lookups that found nothing
+        evictions (int): Entries dropped to stay under the size limit
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache[K, V]:
+    """
+    Bounded mapping evicting the least recently used entry when full.
+
+    Args:
+        maxsize: Maximum number of entries kept
+        on_evict: Called with each entry dropped to stay under `maxsize`
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        on_evict: Callable[[K, V], None] | None = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.stats = CacheStats()
+        self._on_evict = on_evict
+        self._data: OrderedDict[K, V] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """
+        Look up an entry, marking it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            V | None: The cached value, or None if absent
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.stats.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """
+        Insert or replace an entry, evicting the oldest entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            evicted = self._data.popitem(last=False)
+            self.stats.evictions += 1
+            if self._on_evict is not None:
+                self._on_evict(*evicted)
+
+    def pop(self, key: K) -> V | None:
+        """Remove an entry, returning its value if it was present."""
+        return self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._data.clear()
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(list(self._data))
+
+
+class TTLCache[K, V]:
+    """
+    Bounded mapping whose entries expire a fixed time after being set.
+
+    Expired entries are dropped lazily on lookup; when full, the least
+    recently used entry is evicted.
+
+    Args:
+        ttl: Seconds an entry stays valid after it is set
+        maxsize: Maximum number of entries kept
+        clock: Monotonic time source, injectable for tests
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        maxsize: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.stats = CacheStats()
+        self._clock = clock
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """
+        Look up an unexpired entry, marking it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            V | None: The cached value, or None if absent or expired
+        """
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= self._clock():
+            if entry is not None:
+                del self._data[key]
+            self.stats.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return entry[1]
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """
+        Insert or replace an entry, evicting the oldest entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Lifetime for this entry, defaults to the cache's ttl
+        """
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def pop(self, key: K) -> V | None:
+        """Remove an entry, returning its value if it was present."""
+        entry = self._data.pop(key, None)
+        return None if entry is None else entry[1]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._data.clear()
+
+    def __contains__(self, key: object) -> bool:
+        entry = self._data.get(key)  # pyright: ignore [reportArgumentType]
+        return entry is not None and entry[0] > self._clock()
+
+    def __len__(self) -> int:
+        return len(self._data)
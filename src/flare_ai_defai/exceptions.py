@@ -12,3 +12,7 @@ class AttestationError(FlareAiError):
 
 class RoutingError(FlareAiError):
     """Raised when semantic routing fails"""
+
+
+class AIProviderError(FlareAiError):
+    """Raised when an AI provider request fails"""
@@ -0,0 +1,21 @@
+from .queue import (
+    JobHandler,
+    JobQueue,
+    JobQueueFullError,
+    PermanentJobError,
+    Progress,
+)
+from .store import InMemoryJobStore, Job, JobStatus, JobStore, SQLiteJobStore
+
+__all__ = [
+    "InMemoryJobStore",
+    "Job",
+    "JobHandler",
+    "JobQueue",
+    "JobQueueFullError",
+    "JobStatus",
+    "JobStore",
+    "PermanentJobError",
+    "Progress",
+    "SQLiteJobStore",
+]
@@ -0,0 +1,360 @@
+"""
+Job Queue Module
+
+This module runs background jobs on a bounded pool of asyncio worker tasks.
+Handlers are registered per job kind; a failing attempt is retried with
+exponential backoff until the job's attempts run out, and every state change
+is persisted and published to waiting status streams. Finished jobs drop their
+payload and checkpoint, which may hold credentials, and are pruned from the
+store once older than the retention period.
+"""
+
+import asyncio
+import contextlib
+import random
+import time
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+import structlog
+
+from flare_ai_defai.jobs.store import InMemoryJobStore, Job, JobStatus, JobStore
+
+logger = structlog.get_logger(__name__)
+
+# Reports the step a handler has reached, persisting the job's checkpoint
+Progress = Callable[[str], None]
+# Runs one attempt of a job, returning its result
+JobHandler = Callable[[Job, Progress], Awaitable[dict[str, Any]]]
+# Seconds between sweeps of finished jobs past their retention
+PRUNE_INTERVAL = 60.0
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler for failures that retrying cannot fix."""
+
+
+class JobQueueFullError(Exception):
+    """Raised when too many jobs are already queued or running."""
+
+
+class JobQueue:
+    """
+    In-process job queue with a bounded worker pool and retries.
+
+    Workers start on the first submitted job. At most `workers` handlers run
+    at once; further jobs wait in the queue, and submissions beyond
+    `max_pending` unfinished jobs are rejected.
+
+    Attributes:
+        store (JobStore): Persistent job state
+        workers (int): Jobs run concurrently
+        max_attempts (int): Attempts per job before it is failed
+        backoff_base (float): Seconds before the first retry, doubled for
+            each further retry
+        backoff_max (float): Upper bound on the delay between retries
+        max_pending (int): Unfinished jobs accepted at once
+        retention (float): Seconds finished jobs stay queryable after they
+            were submitted
+        logger (BoundLogger): Structured logger for the queue
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        store: JobStore | None = None,
+        *,
+        workers: int = 4,
+        max_attempts: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        max_pending: int = 1000,
+        retention: float = 3600.0,
+    ) -> None:
+        """
+        Initialize the queue.
+
+        Args:
+            store: Persistent job state, defaults to a process-local store
+            workers: Jobs run concurrently
+            max_attempts: Attempts per job before it is failed
+            backoff_base: Seconds before the first retry, doubled for each
+                further retry
+            backoff_max: Upper bound on the delay between retries
+            max_pending: Unfinished jobs accepted at once
+            retention: Seconds finished jobs stay queryable after they were
+                submitted
+        """
+        self.store = InMemoryJobStore() if store is None else store
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_pending = max_pending
+        self.retention = retention
+        self.logger = logger.bind(router="job_queue")
+        self._handlers: dict[str, JobHandler] = {}
+        self._active: dict[str, Job] = {}
+        self._ready: asyncio.Queue[str] = asyncio.Queue()
+        self._tasks: list[asyncio.Task[None]] = []
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._changed: dict[str, asyncio.Event] = {}
+        self._pruned_at = float("-inf")
+
+    @property
+    def pending_count(self) -> int:
+        """Number of queued, running and retrying jobs."""
+        return len(self._active)
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """
+        Register the handler running jobs of a kind.
+
+        Args:
+            kind: Job kind passed to `submit`
+            handler: Coroutine function running one attempt of a job
+        """
+        self._handlers[kind] = handler
+
+    def submit(self, kind: str, payload: dict[str, Any] | None = None) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            kind: Registered job kind
+            payload: Handler input, persisted with the job
+
+        Returns:
+            Job: Queued job, updated in place as it progresses
+
+        Raises:
+            ValueError: If no handler is registered for `kind`
+            JobQueueFullError: If `max_pending` jobs are already unfinished
+        """
+        if kind not in self._handlers:
+            msg = f"No handler registered for job kind: {kind}"
+            raise ValueError(msg)
+        if len(self._active) >= self.max_pending:
+            msg = f"{len(self._active)} jobs already pending"
+            raise JobQueueFullError(msg)
+        job = Job(
+            job_id=uuid.uuid4().hex,
+            kind=kind,
+            payload=payload or {},
+            max_attempts=self.max_attempts,
+        )
+        self.store.save(job)
+        self._enqueue(job)
+        self.logger.info("job_submitted", job_id=job.job_id, kind=kind)
+        return job
+
+    async def start(self) -> int:
+        """
+        Resume the unfinished jobs found in the store, e.g. after a restart.
+
+        Jobs that were running when the process stopped count that attempt
+        as used. Finished jobs past their retention are pruned.
+
+        Returns:
+            int: Number of jobs resumed
+        """
+        resumed = 0
+        for job in self.store.unfinished():
+            if job.job_id in self._active:
+                continue
+            if job.attempts >= job.max_attempts:
+                self._update(
+                    job, status=JobStatus.FAILED, error="Interrupted on last attempt"
+                )
+                continue
+            self._update(job, status=JobStatus.QUEUED)
+            self._enqueue(job)
+            resumed += 1
+        if resumed:
+            self.logger.info("jobs_resumed", count=resumed)
+        self.prune()
+        return resumed
+
+    def prune(self) -> int:
+        """
+        Delete finished jobs submitted more than `retention` seconds ago.
+
+        Returns:
+            int: Number of jobs deleted
+        """
+        self._pruned_at = time.monotonic()
+        try:
+            pruned = self.store.prune(time.time() - self.retention)
+        except Exception as e:
+            self.logger.exception("jobs_prune_failed", error=str(e))
+            return 0
+        if pruned:
+            self.logger.info("jobs_pruned", count=pruned)
+        return pruned
+
+    def get(self, job_id: str) -> Job | None:
+        """Look up an unfinished or stored job."""
+        return self._active.get(job_id) or self.store.get(job_id)
+
+    async def wait(self, job_id: str, timeout: float | None = None) -> Job | None:  # noqa: ASYNC109
+        """
+        Wait until a job has succeeded or failed.
+
+        Args:
+            job_id: Job identifier
+            timeout: Maximum seconds to wait, unbounded if None
+
+        Returns:
+            Job | None: The job, still unfinished if `timeout` elapsed, or
+                None if the job is unknown
+        """
+        job = self.get(job_id)
+        try:
+            async with asyncio.timeout(timeout):
+                while job is not None and not job.finished:
+                    await self._next_change(job_id)
+                    job = self.get(job_id)
+        except TimeoutError:
+            pass
+        return job
+
+    async def watch(self, job_id: str) -> AsyncIterator[dict[str, Any]]:
+        """
+        Follow a job's state changes.
+
+        Args:
+            job_id: Job identifier
+
+        Yields:
+            dict[str, Any]: Public job state, first as it is now and then
+                after each change, ending with the final state
+        """
+        last: dict[str, Any] | None = None
+        while (job := self.get(job_id)) is not None:
+            state = job.to_public_dict()
+            if state != last:
+                last = state
+                yield state
+            if job.finished:
+                return
+            await self._next_change(job_id)
+
+    async def close(self) -> None:
+        """Stop the workers and pending retries. Unfinished jobs stay stored."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def _enqueue(self, job: Job) -> None:
+        self._active[job.job_id] = job
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._worker()) for _ in range(self.workers)
+            ]
+        delay = job.run_at - time.time()
+        if delay > 0:
+            self._timers[job.job_id] = asyncio.get_running_loop().call_later(
+                delay, self._ready_after_backoff, job.job_id
+            )
+        else:
+            self._ready.put_nowait(job.job_id)
+
+    def _ready_after_backoff(self, job_id: str) -> None:
+        self._timers.pop(job_id, None)
+        self._ready.put_nowait(job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._ready.get()
+            job = self._active.get(job_id)
+            if job is None:
+                continue
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # A failing store must not take the worker down with the job
+                self.logger.exception("job_crashed", job_id=job_id, error=str(e))
+                self._active.pop(job_id, None)
+                job.status = JobStatus.FAILED
+                job.error = str(e)
+                job.payload, job.checkpoint = {}, {}
+                with contextlib.suppress(Exception):
+                    self.store.save(job)
+                self._notify(job_id)
+            if time.monotonic() - self._pruned_at >= PRUNE_INTERVAL:
+                self.prune()
+
+    async def _run(self, job: Job) -> None:
+        handler = self._handlers.get(job.kind)
+        if handler is None:
+            self._finish(job, JobStatus.FAILED, error=f"Unknown job kind: {job.kind}")
+            return
+        self._update(job, status=JobStatus.RUNNING, attempts=job.attempts + 1)
+        start = time.perf_counter()
+        try:
+            result = await handler(job, lambda step: self._update(job, step=step))
+        except asyncio.CancelledError:
+            raise
+        except PermanentJobError as e:
+            self._finish(job, JobStatus.FAILED, error=str(e))
+        except Exception as e:
+            if job.attempts >= job.max_attempts:
+                self.logger.exception("job_failed", job_id=job.job_id, error=str(e))
+                self._finish(job, JobStatus.FAILED, error=str(e))
+                return
+            delay = self._backoff(job.attempts)
+            self.logger.warning(
+                "job_retrying",
+                job_id=job.job_id,
+                attempt=job.attempts,
+                delay=round(delay, 2),
+                error=str(e),
+            )
+            self._update(
+                job,
+                status=JobStatus.RETRYING,
+                error=str(e),
+                run_at=time.time() + delay,
+            )
+            self._enqueue(job)
+        else:
+            self._finish(job, JobStatus.SUCCEEDED, result=result, error=None)
+            self.logger.info(
+                "job_succeeded",
+                job_id=job.job_id,
+                kind=job.kind,
+                attempts=job.attempts,
+                ms=round((time.perf_counter() - start) * 1000, 1),
+            )
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        # Jitter keeps jobs that failed together from retrying in lockstep
+        return delay * random.uniform(0.5, 1.0)  # noqa: S311
+
+    def _finish(self, job: Job, status: JobStatus, **changes: Any) -> None:
+        self._active.pop(job.job_id, None)
+        # The input is no longer needed and may hold tokens; only keep the
+        # outcome
+        self._update(job, status=status, payload={}, checkpoint={}, **changes)
+
+    def _update(self, job: Job, **changes: Any) -> None:
+        for name, value in changes.items():
+            setattr(job, name, value)
+        job.updated_at = time.time()
+        self.store.save(job)
+        self._notify(job.job_id)
+
+    def _notify(self, job_id: str) -> None:
+        event = self._changed.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    async def _next_change(self, job_id: str) -> None:
+        await self._changed.setdefault(job_id, asyncio.Event()).wait()
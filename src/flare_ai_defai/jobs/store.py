@@ -0,0 +1,248 @@
+"""
+Job Store Module
+
+This module defines background jobs and the stores that persist them. Every
+state change is saved, so a restarted process can pick up the jobs that were
+still queued or running when it stopped. Finished jobs are kept, without
+their handler input, until they are pruned.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Any, override
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a background job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    RETRYING = "retrying"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+FINAL_STATUSES = frozenset({JobStatus.SUCCEEDED, JobStatus.FAILED})
+
+
+@dataclass
+class Job:
+    """
+    State of a background job.
+
+    Attributes:
+        job_id (str): Identifier returned to the client
+        kind (str): Name of the handler that runs the job
+        payload (dict[str, Any]): Handler input, cleared once finished
+        status (JobStatus): Current status
+        step (str | None): Last progress step the handler reported
+        checkpoint (dict[str, Any]): Handler state kept across retries, so
+            completed steps are not repeated, cleared once finished
+        attempts (int): Times the handler has been started
+        max_attempts (int): Attempts before the job is failed
+        result (dict[str, Any] | None): Handler output once succeeded
+        error (str | None): Last error raised by the handler
+        created_at (float): Unix time the job was submitted
+        updated_at (float): Unix time of the last state change
+        run_at (float): Unix time the next attempt may start
+    """
+
+    job_id: str
+    kind: str
+    payload: dict[str, Any] = field(default_factory=dict)
+    status: JobStatus = JobStatus.QUEUED
+    step: str | None = None
+    checkpoint: dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    max_attempts: int = 3
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    run_at: float = field(default_factory=time.time)
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has succeeded or failed for good."""
+        return self.status in FINAL_STATUSES
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the job to JSON-compatible primitives."""
+        data = asdict(self)
+        data["status"] = self.status.value
+        return data
+
+    def to_public_dict(self) -> dict[str, Any]:
+        """Serialize the job for API responses, leaving out handler input."""
+        data = self.to_dict()
+        del data["payload"], data["checkpoint"]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Job":
+        """Rebuild a job serialized with `to_dict`."""
+        return cls(**{**data, "status": JobStatus(data["status"])})
+
+
+class JobStore(ABC):
+    """
+    Abstract store for background jobs, keyed by job_id.
+    """
+
+    @abstractmethod
+    def save(self, job: Job) -> None:
+        """
+        Insert or replace a job.
+
+        Args:
+            job: Job in its current state
+        """
+
+    @abstractmethod
+    def get(self, job_id: str) -> Job | None:
+        """
+        Look up a job.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Job | None: A copy of the stored job, or None if unknown
+        """
+
+    @abstractmethod
+    def unfinished(self) -> list[Job]:
+        """
+        Return every job that has not succeeded or failed.
+
+        Returns:
+            list[Job]: Queued, running and retrying jobs, oldest first
+        """
+
+    @abstractmethod
+    def prune(self, created_before: float) -> int:
+        """
+        Delete finished jobs submitted before a point in time.
+
+        Args:
+            created_before: Unix time; older finished jobs are deleted
+
+        Returns:
+            int: Number of jobs deleted
+        """
+
+
+class InMemoryJobStore(JobStore):
+    """
+    Process-local job store. Jobs do not survive a restart.
+    """
+
+    def __init__(self) -> None:
+        self._jobs: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @override
+    def save(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.job_id] = job.to_dict()
+
+    @override
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            data = self._jobs.get(job_id)
+        return None if data is None else Job.from_dict(data)
+
+    @override
+    def unfinished(self) -> list[Job]:
+        with self._lock:
+            jobs = [Job.from_dict(data) for data in self._jobs.values()]
+        return sorted(
+            (job for job in jobs if not job.finished), key=lambda job: job.created_at
+        )
+
+    @override
+    def prune(self, created_before: float) -> int:
+        final = {status.value for status in FINAL_STATUSES}
+        with self._lock:
+            expired = [
+                job_id
+                for job_id, data in self._jobs.items()
+                if data["status"] in final and data["created_at"] < created_before
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Job store persisting each job as a JSON document in SQLite, so jobs
+    survive restarts.
+    """
+
+    def __init__(self, path: str = "jobs.db") -> None:
+        """
+        Args:
+            path: SQLite database file, or ":memory:"
+        """
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+            "created_at REAL NOT NULL, data TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    @override
+    def save(self, job: Job) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, status, created_at, data) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT(job_id) DO UPDATE "
+                "SET status = excluded.status, data = excluded.data",
+                (
+                    job.job_id,
+                    job.status.value,
+                    job.created_at,
+                    json.dumps(job.to_dict()),
+                ),
+            )
+
+    @override
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return Job.from_dict(json.loads(row[0])) if row else None
+
+    @override
+    def unfinished(self) -> list[Job]:
+        final = [status.value for status in FINAL_STATUSES]
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM jobs WHERE status NOT IN (?, ?) ORDER BY created_at",
+                final,
+            ).fetchall()
+        return [Job.from_dict(json.loads(row[0])) for row in rows]
+
+    @override
+    def prune(self, created_before: float) -> int:
+        final = [status.value for status in FINAL_STATUSES]
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND created_at < ?",
+                (*final, created_before),
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
@@ -12,23 +12,200 @@ Dependencies:
     - Custom providers for AI, blockchain, and attestation services
 """
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import httpx
 import structlog
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from flare_ai_defai import (
-    PlaidRouter,
+    AsyncFlareProvider,
     ChatRouter,
-    FlareProvider,
     GeminiProvider,
+    PlaidRouter,
     PromptService,
     Vtpm,
 )
+from flare_ai_defai.ai import (
+    BaseAIProvider,
+    CoalescingProvider,
+    MeteredProvider,
+    OpenRouterChatProvider,
+    ProviderPool,
+    create_http_client,
+)
+from flare_ai_defai.api.middleware import MetricsMiddleware
+from flare_ai_defai.attestation import AttestationBatcher
+from flare_ai_defai.banking import (
+    CachedCreditScoreStore,
+    CreditScoreStore,
+    InMemoryCreditScoreStore,
+    InMemoryTransactionStore,
+    PlaidClientRegistry,
+    SQLiteCreditScoreStore,
+    SQLiteTransactionStore,
+    TransactionStore,
+    TransactionSyncEngine,
+)
+from flare_ai_defai.jobs import InMemoryJobStore, JobQueue, JobStore, SQLiteJobStore
+from flare_ai_defai.metrics import CONTENT_TYPE, REGISTRY
+from flare_ai_defai.prompts import ReplyMode, ReplyRenderer
+from flare_ai_defai.routing import (
+    LABELLED_EXAMPLES,
+    EmbeddingClassifier,
+    RouteClassifier,
+    RuleClassifier,
+    SemanticRouteResolver,
+)
+from flare_ai_defai.session import (
+    HistoryManager,
+    InMemorySessionStore,
+    SessionStore,
+    SQLiteSessionStore,
+)
 from flare_ai_defai.settings import settings
 
 logger = structlog.get_logger(__name__)
 
 
+def create_session_store() -> SessionStore:
+    """
+    Build the conversation session store selected in settings.
+
+    Returns:
+        SessionStore: In-memory store by default, SQLite when
+            `session_backend` is "sqlite"
+    """
+    options = {
+        "max_sessions": settings.session_max_sessions,
+        "ttl_seconds": settings.session_ttl_seconds,
+        "max_history": settings.session_max_history,
+    }
+    if settings.session_backend == "sqlite":
+        return SQLiteSessionStore(
+            path=settings.session_sqlite_path,
+            encryption_key=settings.session_encryption_key or None,
+            **options,
+        )
+    return InMemorySessionStore(**options)
+
+
+def create_transaction_store() -> TransactionStore:
+    """
+    Build the synced Plaid transaction store selected in settings.
+
+    Returns:
+        TransactionStore: In-memory store by default, SQLite when
+            `plaid_store_backend` is "sqlite"
+    """
+    if settings.plaid_store_backend == "sqlite":
+        return SQLiteTransactionStore(path=settings.plaid_sqlite_path)
+    return InMemoryTransactionStore()
+
+
+def create_score_store() -> CreditScoreStore:
+    """
+    Build the linked item and credit score store selected in settings.
+
+    Returns:
+        CreditScoreStore: In-memory store by default; when
+            `plaid_store_backend` is "sqlite", a SQLite store behind a
+            read-through cache
+    """
+    if settings.plaid_store_backend == "sqlite":
+        return CachedCreditScoreStore(
+            SQLiteCreditScoreStore(
+                path=settings.plaid_sqlite_path,
+                max_history=settings.plaid_score_history,
+                encryption_key=settings.plaid_encryption_key or None,
+            ),
+            maxsize=settings.plaid_score_cache_size,
+        )
+    return InMemoryCreditScoreStore(max_history=settings.plaid_score_history)
+
+
+def create_job_store() -> JobStore:
+    """
+    Build the background job store selected in settings.
+
+    Returns:
+        JobStore: In-memory store by default, SQLite when `job_backend` is
+            "sqlite"
+    """
+    if settings.job_backend == "sqlite":
+        return SQLiteJobStore(path=settings.job_sqlite_path)
+    return InMemoryJobStore()
+
+
+def create_ai_provider(llm_client: httpx.AsyncClient, name: str) -> CoalescingProvider:
+    """
+    Build the AI provider configured in settings.
+
+    Args:
+        llm_client: Keep-alive HTTP client shared by the OpenRouter providers
+        name: Label of the provider's coalescing metrics
+
+    Returns:
+        CoalescingProvider: Gemini alone by default, or a ProviderPool of
+            Gemini and OpenRouter when `openrouter_api_key` is set, metered
+            by prompt and behind a CoalescingProvider sharing identical
+            concurrent requests
+    """
+    provider: BaseAIProvider = GeminiProvider(
+        api_key=settings.gemini_api_key, model=settings.gemini_model
+    )
+    if settings.openrouter_api_key:
+        openrouter = OpenRouterChatProvider(
+            api_key=settings.openrouter_api_key,
+            model=settings.openrouter_model,
+            base_url=settings.openrouter_base_url,
+            client=llm_client,
+        )
+        provider = ProviderPool(
+            {"gemini": provider, "openrouter": openrouter},
+            failure_threshold=settings.ai_breaker_failures,
+            reset_timeout=settings.ai_breaker_reset_seconds,
+            hedge_after=settings.ai_hedge_after_seconds or None,
+        )
+    prompts = PromptService()
+    # Metered inside the coalescing layer, so only upstream calls are recorded
+    return CoalescingProvider(
+        MeteredProvider(provider, identify=prompts.identify),
+        name=name,
+        cache_ttl=settings.ai_cache_ttl_seconds,
+        cacheable=prompts.is_deterministic,
+        cache_size=settings.ai_cache_size,
+    )
+
+
+def create_route_resolver(
+    ai: BaseAIProvider, embedder: GeminiProvider, prompts: PromptService
+) -> SemanticRouteResolver:
+    """
+    Build the semantic route resolver configured in settings.
+
+    Args:
+        ai: Provider used as the LLM fallback
+        embedder: Provider used for embeddings
+        prompts: Prompt service providing the semantic router prompt
+
+    Returns:
+        SemanticRouteResolver: Cache and rule classifier, plus an embedding
+            index when `semantic_router_embeddings` is enabled
+    """
+    classifiers: list[RouteClassifier] = [RuleClassifier()]
+    if settings.semantic_router_embeddings:
+        classifiers.append(EmbeddingClassifier(embedder.aembed, LABELLED_EXAMPLES))
+    return SemanticRouteResolver(
+        ai,
+        prompts,
+        classifiers=classifiers,
+        confidence_threshold=settings.semantic_router_confidence,
+    )
+
+
 def create_app() -> FastAPI:
     """
     Create and configure the FastAPI application instance.
@@ -37,11 +214,14 @@ def create_app() -> FastAPI:
     1. Creates a new FastAPI instance
     2. Configures CORS middleware with settings from the configuration
     3. Initializes required service providers:
-       - GeminiProvider for AI capabilities
-       - FlareProvider for blockchain interactions
+       - GeminiProvider, pooled with OpenRouter if configured, for AI
+         capabilities
+       - AsyncFlareProvider for blockchain interactions
        - Vtpm for attestation services
        - PromptService for managing chat prompts
     4. Sets up routing for chat endpoints
+    5. Serves request, AI, Plaid, RPC, attestation and cache metrics at
+       /metrics
 
     Returns:
         FastAPI: Configured FastAPI application instance
@@ -52,11 +232,86 @@ def create_app() -> FastAPI:
         - cors_origins: List of allowed CORS origins
         - gemini_api_key: API key for Gemini AI service
         - gemini_model: Model identifier for Gemini AI
+        - openrouter_api_key, openrouter_model, openrouter_base_url,
+          openrouter_pool_size, openrouter_timeout_seconds: OpenRouter
+          provider pooled with Gemini
+        - ai_hedge_after_seconds, ai_breaker_failures,
+          ai_breaker_reset_seconds: Hedging and circuit breaking in the pool
+        - ai_cache_ttl_seconds, ai_cache_size: Reuse of deterministic AI
+          responses
+        - reply_mode: Template or LLM phrasing of deterministic replies
+        - history_token_budget, history_keep_turns: Chat history compaction
         - web3_provider_url: URL for Web3 provider
+        - web3_pool_size, web3_keepalive_seconds, web3_request_timeout: RPC
+          connection pool tuning
+        - web3_fee_cache_seconds: Lifetime of cached fee suggestions
+        - web3_receipt_poll_seconds, web3_receipt_timeout_seconds: Receipt
+          watcher polling
+        - PLAID_ENV, plaid_max_clients, plaid_max_connections: Plaid client
+          registry
+        - plaid_store_backend, plaid_sqlite_path, plaid_sync_page_size:
+          Transactions sync engine
+        - plaid_score_narrative: AI explanation of computed credit scores
+        - plaid_score_cache_size, plaid_score_history: Credit score store
+        - job_backend, job_sqlite_path, job_workers, job_max_attempts,
+          job_backoff_seconds, job_max_pending, job_retention_seconds:
+          Background job queue
         - simulate_attestation: Boolean flag for attestation simulation
+        - attestation_pool_size, attestation_timeout_seconds: Attestation
+          socket connection pool
+        - attestation_token_cache_size: Tokens kept by batch attestation
     """
+    # One RPC connection pool is shared by both routers
+    blockchain = AsyncFlareProvider(
+        web3_provider_url=settings.web3_provider_url,
+        pool_size=settings.web3_pool_size,
+        keepalive_timeout=settings.web3_keepalive_seconds,
+        request_timeout=settings.web3_request_timeout,
+        fee_cache_ttl=settings.web3_fee_cache_seconds,
+        receipt_poll_interval=settings.web3_receipt_poll_seconds,
+        receipt_timeout=settings.web3_receipt_timeout_seconds,
+    )
+    plaid_clients = PlaidClientRegistry(
+        max_clients=settings.plaid_max_clients,
+        max_connections=settings.plaid_max_connections,
+        default_environment=settings.PLAID_ENV or "sandbox",
+    )
+    # One attestation socket connection pool is shared by both routers
+    attestation = Vtpm(
+        simulate=settings.simulate_attestation,
+        pool_size=settings.attestation_pool_size,
+        request_timeout=settings.attestation_timeout_seconds,
+    )
+    # One keep-alive connection pool to OpenRouter is shared by both routers
+    llm_client = create_http_client(
+        timeout=settings.openrouter_timeout_seconds,
+        max_connections=settings.openrouter_pool_size,
+    )
+    jobs = JobQueue(
+        create_job_store(),
+        workers=settings.job_workers,
+        max_attempts=settings.job_max_attempts,
+        backoff_base=settings.job_backoff_seconds,
+        max_pending=settings.job_max_pending,
+        retention=settings.job_retention_seconds,
+    )
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        # Pick up jobs left unfinished by the previous process
+        await jobs.start()
+        yield
+        await jobs.close()
+        await blockchain.close()
+        await attestation.close()
+        await llm_client.aclose()
+        plaid_clients.close()
+
     app = FastAPI(
-        title="AI Agent API", version=settings.api_version, redirect_slashes=False
+        title="AI Agent API",
+        version=settings.api_version,
+        redirect_slashes=False,
+        lifespan=lifespan,
     )
 
     # Configure CORS middleware with settings from configuration
@@ -67,21 +322,73 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    # Outermost, so the time spent in other middleware is included
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics() -> Response:  # pyright: ignore [reportUnusedFunction]
+        """Serve every metric in the Prometheus text exposition format."""
+        return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+    # Per-user conversation state is shared by both routers
+    sessions = create_session_store()
 
     # Initialize router with service providers
+    chat_ai = create_ai_provider(llm_client, "chat")
+    embedder = GeminiProvider(
+        api_key=settings.gemini_api_key, model=settings.gemini_model
+    )
+    chat_prompts = PromptService()
+    # Background history summaries are tracked per session, so share one manager
+    history = HistoryManager(
+        chat_ai,
+        chat_prompts,
+        token_budget=settings.history_token_budget,
+        keep_turns=settings.history_keep_turns,
+        fold_ttl=settings.session_ttl_seconds,
+        max_sessions=settings.session_max_sessions,
+    )
     chat = ChatRouter(
-        ai=GeminiProvider(api_key=settings.gemini_api_key, model=settings.gemini_model),
-        blockchain=FlareProvider(web3_provider_url=settings.web3_provider_url),
-        attestation=Vtpm(simulate=settings.simulate_attestation),
-        prompts=PromptService(),
+        ai=chat_ai,
+        blockchain=blockchain,
+        attestation=attestation,
+        prompts=chat_prompts,
+        sessions=sessions,
+        route_resolver=create_route_resolver(chat_ai, embedder, chat_prompts),
+        attestation_batcher=AttestationBatcher(
+            attestation, cache_size=settings.attestation_token_cache_size
+        ),
+        replies=ReplyRenderer(chat_ai, chat_prompts, ReplyMode(settings.reply_mode)),
+        history=history,
     )
+    plaid_ai = create_ai_provider(llm_client, "plaid")
+    plaid_prompts = PromptService()
     plaid = PlaidRouter(
-        ai=GeminiProvider(api_key=settings.gemini_api_key, model=settings.gemini_model),
-        blockchain=FlareProvider(web3_provider_url=settings.web3_provider_url),
-        attestation=Vtpm(simulate=settings.simulate_attestation),
-        prompts=PromptService(),
+        ai=plaid_ai,
+        blockchain=blockchain,
+        attestation=attestation,
+        prompts=plaid_prompts,
+        sessions=sessions,
+        plaid_clients=plaid_clients,
+        sync_engine=TransactionSyncEngine(
+            create_transaction_store(), page_size=settings.plaid_sync_page_size
+        ),
+        score_narrative=settings.plaid_score_narrative,
+        scores=create_score_store(),
+        jobs=jobs,
+        replies=ReplyRenderer(plaid_ai, plaid_prompts, ReplyMode(settings.reply_mode)),
+        history=history,
     )
 
+    # Cache counters are read whenever /metrics is scraped
+    REGISTRY.register_cache("semantic_routes", chat.route_resolver.cache.stats)
+    REGISTRY.register_cache("attestation_tokens", chat.attestation_batcher.stats)
+    REGISTRY.register_cache("chat_llm_responses", chat_ai.cache.stats)
+    REGISTRY.register_cache("plaid_llm_responses", plaid_ai.cache.stats)
+    REGISTRY.register_cache("plaid_clients", plaid_clients.stats)
+    if isinstance(plaid.scores, CachedCreditScoreStore):
+        REGISTRY.register_cache("credit_scores", plaid.scores.stats)
+
     # Register chat routes with API
     app.include_router(chat.router, prefix="/api/routes/chat", tags=["chat"])
     app.include_router(plaid.router, prefix="/api/routes/plaid", tags=["plaid"])
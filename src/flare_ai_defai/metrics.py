@@ -0,0 +1,425 @@
+"""
+Prometheus-style metrics shared across the service.
+
+Counters, gauges and histograms are kept in process and rendered in the
+Prometheus text exposition format by the `/metrics` endpoint. Like the cache
+primitives they are deliberately small and dependency-free: a labelled series
+is looked up in a dict, and an observation is a bisect and a few additions
+under a lock, so instrumenting a hot path costs well under a microsecond.
+
+Cache hit ratios are not observed on the hot path at all: registered
+`CacheStats` are read when the metrics are rendered.
+
+Example:
+    ```python
+    with WEB3_RPC_SECONDS.labels("eth_call").time():
+        result = await call()
+    print(REGISTRY.render())
+    ```
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+from types import TracebackType
+from typing import ClassVar
+
+from flare_ai_defai.cache import CacheStats
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, from sub-millisecond cache-backed calls up to
+# slow LLM completions
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+Labels = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class CounterChild:
+    """One labelled series of a counter."""
+
+    __slots__ = ("_lock", "value")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """
+        Increase the counter.
+
+        Args:
+            amount: Non-negative increment
+        """
+        with self._lock:
+            self.value += amount
+
+
+class GaugeChild:
+    """One labelled series of a gauge."""
+
+    __slots__ = ("_lock", "value")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the gauge."""
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the gauge."""
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        """Set the gauge to a value."""
+        self.value = value
+
+    def track_inprogress(self) -> "_InProgress":
+        """Context manager raising the gauge while its block runs."""
+        return _InProgress(self)
+
+
+class HistogramChild:
+    """One labelled series of a histogram."""
+
+    __slots__ = ("_lock", "buckets", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        # One count per bucket plus +Inf, not cumulative until rendered
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """
+        Record an observation.
+
+        Args:
+            value: Observed value, in seconds for latencies
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self) -> "_Timer":
+        """Context manager observing the time its block takes."""
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: HistogramChild) -> None:
+        self._histogram = histogram
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class _InProgress:
+    __slots__ = ("_gauge",)
+
+    def __init__(self, gauge: GaugeChild) -> None:
+        self._gauge = gauge
+
+    def __enter__(self) -> None:
+        self._gauge.inc()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._gauge.dec()
+
+
+class _Metric[C](ABC):
+    """A named metric family with one series per combination of labels."""
+
+    kind: ClassVar[str]
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: "MetricsRegistry | None" = None,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[Labels, C] = {}
+        self._lock = threading.Lock()
+        (REGISTRY if registry is None else registry).register(self)
+
+    def labels(self, *values: str) -> C:
+        """
+        Get the series for a combination of label values, creating it once.
+
+        Args:
+            *values: One value per label name, in order
+
+        Returns:
+            The series to observe
+
+        Raises:
+            ValueError: If the number of values does not match the labels.
+        """
+        child = self._children.get(values)
+        if child is not None:
+            return child
+        if len(values) != len(self.labelnames):
+            msg = (
+                f"Metric '{self.name}' expects labels {self.labelnames}, "
+                f"got {len(values)} values"
+            )
+            raise ValueError(msg)
+        with self._lock:
+            return self._children.setdefault(values, self._new_child())
+
+    @abstractmethod
+    def _new_child(self) -> C:
+        """Create the series for a new combination of label values."""
+
+    def render(self) -> Iterator[str]:
+        """Yield the exposition lines of the metric family."""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for values, child in list(self._children.items()):
+            yield from self._render_child(
+                _format_labels(self.labelnames, values), child
+            )
+
+    @abstractmethod
+    def _render_child(self, labels: str, child: C) -> Iterator[str]:
+        """Yield the exposition lines of one series."""
+
+
+class Counter(_Metric[CounterChild]):
+    """Monotonically increasing count, such as requests served."""
+
+    kind = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def _render_child(self, labels: str, child: CounterChild) -> Iterator[str]:
+        yield f"{self.name}{labels} {_format_value(child.value)}"
+
+
+class Gauge(_Metric[GaugeChild]):
+    """Value that goes up and down, such as requests in flight."""
+
+    kind = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def _render_child(self, labels: str, child: GaugeChild) -> Iterator[str]:
+        yield f"{self.name}{labels} {_format_value(child.value)}"
+
+
+class Histogram(_Metric[HistogramChild]):
+    """Distribution of observations, such as request latencies."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: "MetricsRegistry | None" = None,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def _render_child(self, labels: str, child: HistogramChild) -> Iterator[str]:
+        with child._lock:  # noqa: SLF001
+            counts = list(child.counts)
+            total = child.sum
+        # Bucket labels go after the series labels
+        prefix = labels[:-1] + "," if labels else "{"
+        cumulative = 0
+        for bound, count in zip((*self.buckets, float("inf")), counts, strict=True):
+            cumulative += count
+            le = _format_value(bound)
+            yield f'{self.name}_bucket{prefix}le="{le}"}} {cumulative}'
+        yield f"{self.name}_sum{labels} {_format_value(total)}"
+        yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """
+    Collection of metric families rendered together.
+
+    Attributes:
+        caches (dict[str, CacheStats]): Cache counters reported by name
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self.caches: dict[str, CacheStats] = {}
+
+    def register(self, metric: _Metric) -> None:
+        """
+        Add a metric family.
+
+        Args:
+            metric: Metric to render with the registry
+
+        Raises:
+            ValueError: If a metric with the same name is already registered.
+        """
+        if metric.name in self._metrics:
+            msg = f"Metric '{metric.name}' is already registered"
+            raise ValueError(msg)
+        self._metrics[metric.name] = metric
+
+    def register_cache(self, name: str, stats: CacheStats) -> None:
+        """
+        Report a cache's hits, misses, evictions and hit ratio.
+
+        Registering another cache under the same name replaces it.
+
+        Args:
+            name: Value of the `cache` label
+            stats: Counters of the cache, read when rendering
+        """
+        self.caches[name] = stats
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text, served with CONTENT_TYPE
+        """
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        lines.extend(self._render_caches())
+        return "\n".join(lines) + "\n"
+
+    def _render_caches(self) -> Iterator[str]:
+        caches = sorted(self.caches.items())
+        families = (
+            ("cache_hits_total", "counter", "Lookups served from the cache"),
+            ("cache_misses_total", "counter", "Lookups that found nothing"),
+            ("cache_evictions_total", "counter", "Entries dropped when full"),
+            ("cache_hit_ratio", "gauge", "Fraction of lookups served from the cache"),
+        )
+        for name, kind, documentation in families:
+            yield f"# HELP {name} {documentation}"
+            yield f"# TYPE {name} {kind}"
+            for cache, stats in caches:
+                value = {
+                    "cache_hits_total": stats.hits,
+                    "cache_misses_total": stats.misses,
+                    "cache_evictions_total": stats.evictions,
+                    "cache_hit_ratio": stats.hit_ratio,
+                }[name]
+                yield f'{name}{{cache="{_escape(cache)}"}} {_format_value(value)}'
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time to serve an API request, until the response body is sent",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "API requests being served", ("method",)
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_duration_seconds",
+    "Time for the AI provider to answer, by prompt",
+    ("prompt", "call"),
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens sent to and received from the AI provider, by prompt",
+    ("prompt", "direction"),
+)
+LLM_REQUESTS_IN_FLIGHT = Gauge(
+    "llm_requests_in_flight", "AI provider calls awaiting an answer"
+)
+LLM_COALESCED_REQUESTS = Counter(
+    "llm_coalesced_requests_total",
+    "Generate calls sent upstream or sharing an in-flight call, by provider",
+    ("provider", "outcome"),
+)
+PLAID_REQUEST_SECONDS = Histogram(
+    "plaid_request_duration_seconds",
+    "Time for the Plaid API to answer, by endpoint",
+    ("endpoint",),
+)
+WEB3_RPC_SECONDS = Histogram(
+    "web3_rpc_duration_seconds",
+    "Time for the Flare RPC node to answer, by JSON-RPC method",
+    ("method",),
+)
+VTPM_TOKEN_SECONDS = Histogram(
+    "vtpm_token_fetch_seconds",
+    "Time to fetch an attestation token from the vTPM service",
+    ("token_type",),
+)
@@ -1,5 +1,14 @@
-from .library import PromptLibrary
+from .library import PromptLibrary, shared_library
+from .replies import ReplyMode, ReplyRenderer, ReplyTemplates
 from .schemas import SemanticRouterResponse
 from .service import PromptService
 
-__all__ = ["PromptLibrary", "PromptService", "SemanticRouterResponse"]
+__all__ = [
+    "PromptLibrary",
+    "PromptService",
+    "ReplyMode",
+    "ReplyRenderer",
+    "ReplyTemplates",
+    "SemanticRouterResponse",
+    "shared_library",
+]
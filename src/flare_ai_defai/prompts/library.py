@@ -16,8 +16,17 @@ Example:
     token_send_prompt = library.get_prompt("token_send")
     account_prompts = library.get_prompts_by_category("account")
     ```
+
+Routers share one read-only library built on first use:
+
+    ```python
+    library = shared_library()
+    ```
 """
 
+from functools import cache
+from types import MappingProxyType
+
 import structlog
 
 from flare_ai_defai.prompts.schemas import (
@@ -28,7 +37,10 @@ from flare_ai_defai.prompts.schemas import (
 )
 from flare_ai_defai.prompts.templates import (
     CONVERSATIONAL,
+    CREDIT_SCORE_NARRATIVE,
+    FOLLOW_UP_TOKEN_SEND,
     GENERATE_ACCOUNT,
+    HISTORY_SUMMARY,
     REMOTE_ATTESTATION,
     SEMANTIC_ROUTER,
     TOKEN_SEND,
@@ -48,9 +60,12 @@ class PromptLibrary:
     prompts for various operations such as token transactions, account management,
     and user interactions.
 
+    Prompts are indexed by name and by category, so lookups never scan the
+    library. A frozen library rejects new prompts and can be shared freely.
+
     Attributes:
-        prompts (dict[str, Prompt]): Dictionary storing prompt objects
-            with their names as keys.
+        prompts (Mapping[str, Prompt]): Prompt objects with their names as
+            keys, read-only once the library is frozen.
 
     Example:
         ```python
@@ -67,9 +82,22 @@ class PromptLibrary:
         Creates an empty prompt dictionary and populates it with default prompts
         through the _initialize_default_prompts method.
         """
-        self.prompts: dict[str, Prompt] = {}
+        self.prompts: dict[str, Prompt] | MappingProxyType[str, Prompt] = {}
+        self._by_category: dict[str, dict[str, Prompt]] = {}
+        self.frozen = False
         self._initialize_default_prompts()
 
+    def freeze(self) -> "PromptLibrary":
+        """
+        Make the library read-only so it can be shared between services.
+
+        Returns:
+            PromptLibrary: This library, for chaining.
+        """
+        self.prompts = MappingProxyType(dict(self.prompts))
+        self.frozen = True
+        return self
+
     def _initialize_default_prompts(self) -> None:
         """
         Initialize the library with a set of default prompts.
@@ -82,6 +110,9 @@ class PromptLibrary:
         - conversational: For general user interactions
         - request_attestation: For remote attestation requests
         - tx_confirmation: For transaction confirmation
+        - follow_up_token_send: For asking for missing token send details
+        - credit_score_narrative: For explaining a computed credit score
+        - history_summary: For folding old chat turns into a rolling summary
 
         This method is called automatically during instance initialization.
         """
@@ -94,6 +125,7 @@ class PromptLibrary:
                 response_mime_type="text/x.enum",
                 response_schema=SemanticRouterResponse,
                 category="router",
+                deterministic=True,
             ),
             Prompt(
                 name="token_send",
@@ -103,6 +135,7 @@ class PromptLibrary:
                 response_mime_type="application/json",
                 response_schema=TokenSendResponse,
                 category="defai",
+                deterministic=True,
             ),
             Prompt(
                 name="token_swap",
@@ -112,6 +145,7 @@ class PromptLibrary:
                 response_schema=TokenSwapResponse,
                 response_mime_type="application/json",
                 category="defai",
+                deterministic=True,
             ),
             Prompt(
                 name="generate_account",
@@ -149,6 +183,33 @@ class PromptLibrary:
                 response_mime_type=None,
                 category="account",
             ),
+            Prompt(
+                name="follow_up_token_send",
+                description="Ask for the details missing from a token send request",
+                template=FOLLOW_UP_TOKEN_SEND,
+                required_inputs=None,
+                response_schema=None,
+                response_mime_type=None,
+                category="defai",
+            ),
+            Prompt(
+                name="credit_score_narrative",
+                description="Explain a locally computed credit score",
+                template=CREDIT_SCORE_NARRATIVE,
+                required_inputs=["credit_score", "features"],
+                response_schema=None,
+                response_mime_type=None,
+                category="banking",
+            ),
+            Prompt(
+                name="history_summary",
+                description="Fold older chat turns into a rolling summary",
+                template=HISTORY_SUMMARY,
+                required_inputs=["summary", "turns"],
+                response_schema=None,
+                response_mime_type=None,
+                category="conversational",
+            ),
         ]
 
         for prompt in default_prompts:
@@ -161,6 +222,9 @@ class PromptLibrary:
         Args:
             prompt (Prompt): The prompt object to add to the library.
 
+        Raises:
+            TypeError: If the library is frozen.
+
         Logs:
             Debug log entry when prompt is successfully added.
 
@@ -170,7 +234,18 @@ class PromptLibrary:
             library.add_prompt(custom_prompt)
             ```
         """
-        self.prompts[prompt.name] = prompt
+        if self.frozen:
+            msg = "Cannot add prompts to a frozen PromptLibrary"
+            raise TypeError(msg)
+        previous = self.prompts.get(prompt.name)
+        if previous is not None and previous.category is not None:
+            category = self._by_category[previous.category]
+            del category[prompt.name]
+            if not category:
+                del self._by_category[previous.category]
+        self.prompts[prompt.name] = prompt  # pyright: ignore [reportIndexIssue]
+        if prompt.category is not None:
+            self._by_category.setdefault(prompt.category, {})[prompt.name] = prompt
         logger.debug("prompt_added", name=prompt.name, category=prompt.category)
 
     def get_prompt(self, name: str) -> Prompt:
@@ -194,11 +269,39 @@ class PromptLibrary:
                 print("Prompt not found")
             ```
         """
-        if name not in self.prompts:
+        prompt = self.prompts.get(name)
+        if prompt is None:
             logger.error("prompt_not_found", name=name)
             msg = f"Prompt '{name}' not found in library"
             raise KeyError(msg)
-        return self.prompts[name]
+        return prompt
+
+    def match(self, text: str) -> Prompt | None:
+        """
+        Find the prompt a formatted prompt text was produced from.
+
+        Args:
+            text (str): A formatted prompt
+
+        Returns:
+            Prompt | None: The prompt with the longest template prefix that
+                starts the text, or None if no prompt matches.
+
+        Example:
+            ```python
+            prompt, _, _ = service.get_formatted_prompt("token_send", ...)
+            assert library.match(prompt).name == "token_send"
+            ```
+        """
+        best: Prompt | None = None
+        for prompt in self.prompts.values():
+            if (
+                prompt.prefix
+                and text.startswith(prompt.prefix)
+                and (best is None or len(prompt.prefix) > len(best.prefix))
+            ):
+                best = prompt
+        return best
 
     def get_prompts_by_category(self, category: str) -> list[Prompt]:
         """
@@ -215,9 +318,7 @@ class PromptLibrary:
             defi_prompts = library.get_prompts_by_category("defai")
             ```
         """
-        return [
-            prompt for prompt in self.prompts.values() if prompt.category == category
-        ]
+        return list(self._by_category.get(category, {}).values())
 
     def list_categories(self) -> list[str]:
         """
@@ -232,10 +333,18 @@ class PromptLibrary:
             print("Available categories:", categories)
             ```
         """
-        return list(
-            {
-                prompt.category
-                for prompt in self.prompts.values()
-                if prompt.category is not None
-            }
-        )
+        return list(self._by_category)
+
+
+@cache
+def shared_library() -> PromptLibrary:
+    """
+    Get the process-wide read-only prompt library.
+
+    The default prompts are compiled once, on first use, and every
+    PromptService built without an explicit library shares them.
+
+    Returns:
+        PromptLibrary: The frozen library of default prompts.
+    """
+    return PromptLibrary().freeze()
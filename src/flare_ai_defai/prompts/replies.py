@@ -0,0 +1,200 @@
+"""
+Reply Rendering Module for Flare AI DeFAI
+
+Some bot messages are fully determined by the outcome they report: a
+transaction was submitted, an account was created, a token send is missing
+details, an attestation is about to be performed. Asking the LLM to phrase
+them costs a full round trip and tokens for no new content.
+
+This module renders those replies from pre-written templates instead, picking
+one of several phrasings at random so the bot does not sound canned, and only
+asks the LLM when configured to or when no template exists for a reply.
+
+Example:
+    ```python
+    replies = ReplyRenderer(ai, PromptService())
+    text = await replies.render("generate_account", address="0x123...")
+    ```
+"""
+
+import random
+from collections.abc import Mapping, Sequence
+from enum import Enum
+from string import Template
+from typing import Final
+
+import structlog
+
+from flare_ai_defai.ai import BaseAIProvider
+from flare_ai_defai.prompts.service import PromptService
+from flare_ai_defai.prompts.templates import (
+    FOLLOW_UP_TOKEN_SEND_REPLIES,
+    GENERATE_ACCOUNT_REPLIES,
+    REMOTE_ATTESTATION_REPLIES,
+    TX_CONFIRMATION_REPLIES,
+)
+
+logger = structlog.get_logger(__name__)
+
+# Reply variants by the name of the prompt that would otherwise phrase them
+DEFAULT_REPLIES: Final[Mapping[str, Sequence[str]]] = {
+    "tx_confirmation": TX_CONFIRMATION_REPLIES,
+    "generate_account": GENERATE_ACCOUNT_REPLIES,
+    "follow_up_token_send": FOLLOW_UP_TOKEN_SEND_REPLIES,
+    "request_attestation": REMOTE_ATTESTATION_REPLIES,
+}
+
+
+class ReplyMode(str, Enum):
+    """How deterministic replies are phrased."""
+
+    TEMPLATE = "template"
+    LLM = "llm"
+
+
+class ReplyTemplates:
+    """
+    Pre-written phrasings of deterministic bot replies.
+
+    Variants are compiled once when added. All variants of a reply must use
+    the same placeholders, so whichever is picked carries the same content.
+
+    Attributes:
+        placeholders (dict[str, frozenset[str]]): Variables each reply uses
+    """
+
+    def __init__(
+        self,
+        variants: Mapping[str, Sequence[str]] | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
+        """
+        Initialize the reply templates.
+
+        Args:
+            variants (Mapping[str, Sequence[str]] | None): Phrasings by reply
+                name, defaults to DEFAULT_REPLIES
+            rng (random.Random | None): Source of variant choices
+        """
+        self._variants: dict[str, tuple[Template, ...]] = {}
+        self.placeholders: dict[str, frozenset[str]] = {}
+        self._rng = rng or random.Random()  # noqa: S311
+        for name, texts in (DEFAULT_REPLIES if variants is None else variants).items():
+            self.add(name, texts)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._variants
+
+    def add(self, name: str, texts: Sequence[str]) -> None:
+        """
+        Add or replace the phrasings of a reply.
+
+        Args:
+            name (str): Name of the reply
+            texts (Sequence[str]): Phrasings, as string.Template text
+
+        Raises:
+            ValueError: If there are no phrasings or they use different
+                placeholders.
+        """
+        if not texts:
+            msg = f"Reply '{name}' needs at least one phrasing"
+            raise ValueError(msg)
+        compiled = tuple(Template(text) for text in texts)
+        placeholders = {frozenset(t.get_identifiers()) for t in compiled}
+        if len(placeholders) != 1:
+            msg = f"Phrasings of reply '{name}' use different placeholders"
+            raise ValueError(msg)
+        self._variants[name] = compiled
+        self.placeholders[name] = placeholders.pop()
+
+    def render(self, name: str, /, **kwargs: str) -> str:
+        """
+        Render one phrasing of a reply, chosen at random.
+
+        Args:
+            name (str): Name of the reply
+            **kwargs (str): Values of the reply's placeholders
+
+        Returns:
+            str: The rendered reply
+
+        Raises:
+            KeyError: If there is no reply with this name.
+            ValueError: If a placeholder value is missing.
+        """
+        variants = self._variants[name]
+        missing = self.placeholders[name].difference(kwargs)
+        if missing:
+            msg = f"Missing required inputs: {', '.join(sorted(missing))}"
+            raise ValueError(msg)
+        return self._rng.choice(variants).substitute(kwargs)
+
+
+class ReplyRenderer:
+    """
+    Produces deterministic bot replies from templates or the LLM.
+
+    In template mode a reply with templates is rendered locally; anything
+    else, and every reply in LLM mode, is phrased by the AI provider from the
+    prompt of the same name.
+
+    Attributes:
+        ai (BaseAIProvider): Provider phrasing replies without templates
+        prompts (PromptService): Prompts used to ask the provider
+        mode (ReplyMode): Whether templates are used
+        templates (ReplyTemplates): Pre-written phrasings
+        llm_calls (int): Replies phrased by the provider
+        template_replies (int): Replies rendered from templates
+    """
+
+    def __init__(
+        self,
+        ai: BaseAIProvider,
+        prompts: PromptService,
+        mode: ReplyMode = ReplyMode.TEMPLATE,
+        templates: ReplyTemplates | None = None,
+    ) -> None:
+        """
+        Initialize the reply renderer.
+
+        Args:
+            ai (BaseAIProvider): Provider phrasing replies without templates
+            prompts (PromptService): Prompts used to ask the provider
+            mode (ReplyMode): Whether templates are used
+            templates (ReplyTemplates | None): Pre-written phrasings, defaults
+                to DEFAULT_REPLIES
+        """
+        self.ai = ai
+        self.prompts = prompts
+        self.mode = mode
+        self.templates = ReplyTemplates() if templates is None else templates
+        self.llm_calls = 0
+        self.template_replies = 0
+        self.logger = logger.bind(service="replies")
+
+    async def render(self, name: str, /, **kwargs: str) -> str:
+        """
+        Produce the reply `name`.
+
+        Args:
+            name (str): Name of the reply and of its prompt
+            **kwargs (str): Values of the reply's placeholders
+
+        Returns:
+            str: The reply text
+
+        Raises:
+            KeyError: If neither a template nor a prompt exists for the reply.
+            ValueError: If a placeholder value is missing.
+        """
+        if self.mode is ReplyMode.TEMPLATE and name in self.templates:
+            self.template_replies += 1
+            return self.templates.render(name, **kwargs)
+        prompt, mime_type, schema = self.prompts.get_formatted_prompt(name, **kwargs)
+        self.llm_calls += 1
+        response = await self.ai.agenerate(
+            prompt=prompt, response_mime_type=mime_type, response_schema=schema
+        )
+        self.logger.debug("reply_generated", name=name)
+        return response.text
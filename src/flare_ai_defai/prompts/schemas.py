@@ -11,7 +11,7 @@ interactions, ensuring consistency in prompt formatting and response handling
 across the application.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from string import Template
 from typing import TypedDict
@@ -94,7 +94,7 @@ class PromptInputs(TypedDict, total=False):
     code: str
 
 
-@dataclass
+@dataclass(frozen=True)
 class Prompt:
     """
     A dataclass representing an AI prompt template with its metadata
@@ -102,6 +102,13 @@ class Prompt:
 
     This class encapsulates all information needed to define and use an AI prompt,
     including its template text, required inputs, response handling, and metadata.
+    The template is compiled once on construction and its placeholders are
+    extracted, so every required input is checked against the template up front
+    and formatting only has to substitute.
+
+    A deterministic prompt asks for a classification or an extraction: the
+    same formatted prompt always calls for the same answer, so its responses
+    may be cached.
 
     Attributes:
         name (str): Unique identifier for the prompt
@@ -113,6 +120,14 @@ class Prompt:
         examples (list[dict[str, str]] | None): Example usages of the prompt
         category (str | None): Grouping category for the prompt
         version (str): Version string for the prompt template
+        deterministic (bool): Whether responses to the formatted prompt may be
+            reused
+        placeholders (frozenset[str]): Variable names used in the template
+        prefix (str): Literal template text before the first placeholder,
+            which every formatted prompt starts with
+
+    Raises:
+        ValueError: If a required input does not appear in the template.
 
     Example:
         ```python
@@ -137,14 +152,38 @@ class Prompt:
     examples: list[dict[str, str]] | None = None
     category: str | None = None
     version: str = "1.0"
+    deterministic: bool = False
+    placeholders: frozenset[str] = field(init=False, repr=False, compare=False)
+    prefix: str = field(init=False, repr=False, compare=False)
+    _compiled: Template = field(init=False, repr=False, compare=False)
+    _required: frozenset[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        compiled = Template(self.template)
+        placeholders = frozenset(compiled.get_identifiers())
+        required = frozenset(self.required_inputs or ())
+        unknown = required - placeholders
+        if unknown:
+            msg = (
+                f"Prompt '{self.name}' requires inputs not in its template: "
+                f"{', '.join(sorted(unknown))}"
+            )
+            raise ValueError(msg)
+        # Frozen dataclass, so derived fields are set through object.__setattr__
+        object.__setattr__(self, "_compiled", compiled)
+        object.__setattr__(self, "placeholders", placeholders)
+        object.__setattr__(self, "_required", required)
+        first = compiled.pattern.search(self.template)
+        prefix = self.template if first is None else self.template[: first.start()]
+        object.__setattr__(self, "prefix", prefix)
 
     def format(self, **kwargs: str | PromptInputs) -> str:
         """
         Format the prompt template with provided input values.
 
-        This method uses string.Template to substitute variables in the prompt
-        template with provided values. It validates that all required inputs
-        are provided before formatting.
+        This method substitutes variables in the precompiled prompt template
+        with provided values. It validates that all required inputs are
+        provided before formatting.
 
         Args:
             **kwargs: Keyword arguments containing values for template variables.
@@ -155,7 +194,6 @@ class Prompt:
 
         Raises:
             ValueError: If any required inputs are missing from kwargs.
-            KeyError: If template substitution fails due to missing keys.
 
         Example:
             ```python
@@ -167,14 +205,11 @@ class Prompt:
             result = prompt.format(name="Alice")
             ```
         """
-        if not self.required_inputs:
+        if not self._required:
             return self.template
 
-        try:
-            return Template(self.template).safe_substitute(**kwargs)
-        except KeyError as e:
-            missing_keys = set(self.required_inputs) - set(kwargs.keys())
-            if missing_keys:
-                msg = f"Missing required inputs: {missing_keys}"
-                raise ValueError(msg) from e
-            raise
+        missing = self._required.difference(kwargs)
+        if missing:
+            msg = f"Missing required inputs: {', '.join(sorted(missing))}"
+            raise ValueError(msg)
+        return self._compiled.safe_substitute(kwargs)
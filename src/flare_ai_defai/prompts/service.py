@@ -20,7 +20,7 @@ from typing import Any
 
 import structlog
 
-from flare_ai_defai.prompts.library import PromptLibrary
+from flare_ai_defai.prompts.library import PromptLibrary, shared_library
 
 logger = structlog.get_logger(__name__)
 
@@ -53,14 +53,18 @@ class PromptService:
         ```
     """
 
-    def __init__(self) -> None:
+    def __init__(self, library: PromptLibrary | None = None) -> None:
         """
         Initialize a new PromptService instance.
 
-        Creates a new PromptLibrary instance and initializes a bound logger
-        with the service context.
+        Uses the given PromptLibrary, or the process-wide shared library, and
+        initializes a bound logger with the service context.
+
+        Args:
+            library (PromptLibrary | None): Library to take prompts from,
+                defaults to the shared read-only library
         """
-        self.library = PromptLibrary()
+        self.library = shared_library() if library is None else library
         self.logger = logger.bind(service="prompt")
 
     def get_formatted_prompt(
@@ -115,3 +119,29 @@ class PromptService:
             raise
         else:
             return (formatted, prompt.response_mime_type, prompt.response_schema)
+
+    def identify(self, prompt: str) -> str | None:
+        """
+        Name the prompt a formatted prompt was built from.
+
+        Args:
+            prompt (str): A prompt returned by `get_formatted_prompt`
+
+        Returns:
+            str | None: Name of the prompt, or None if no prompt matches
+        """
+        matched = self.library.match(prompt)
+        return None if matched is None else matched.name
+
+    def is_deterministic(self, prompt: str) -> bool:
+        """
+        Check whether a formatted prompt comes from a deterministic prompt.
+
+        Args:
+            prompt (str): A prompt returned by `get_formatted_prompt`
+
+        Returns:
+            bool: True if responses to the prompt may be reused
+        """
+        matched = self.library.match(prompt)
+        return matched is not None and matched.deterministic
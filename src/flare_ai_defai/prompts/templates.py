@@ -201,16 +201,17 @@ A user wants to perform a remote attestation with the TEE, make the following pr
 
 
 TX_CONFIRMATION: Final = """
-Respond with a confirmation message for the successful transaction that:
+Respond with a confirmation message for the submitted transaction that:
 
 1. Required elements:
-   - Express positive acknowledgement of the successful transaction
+   - Acknowledge that the transaction was accepted by the network
+   - Mention that it will be confirmed in the next blocks
    - Include the EXACT transaction hash link with NO modifications:
      [See transaction on Explorer](${block_explorer}/tx/${tx_hash})
    - Place the link on its own line for visibility
 
 2. Message structure:
-   - Start with a clear success confirmation
+   - Start with a clear submission confirmation
    - Include transaction link in unmodified format
    - End with a brief positive closing statement
 
@@ -221,9 +222,115 @@ Respond with a confirmation message for the successful transaction that:
    - No additional formatting or modification of the link
 
 Sample format:
-Great news! Your transaction has been successfully confirmed. 🎉
+Great news! Your transaction has been submitted to the network. 🎉
 
 [See transaction on Explorer](${block_explorer}/tx/${tx_hash})
 
-Your transaction is now securely recorded on the blockchain.
+It will be confirmed within a few seconds, you can follow it on the explorer.
+"""
+
+
+CREDIT_SCORE_NARRATIVE: Final = """
+Explain a credit score to its owner in plain language.
+
+The score was computed deterministically from their bank transaction history.
+Do NOT change, estimate or second-guess the score; only explain it.
+
+Score: ${credit_score} (range 300-850)
+Features: ${features}
+
+Feature meanings:
+- cash_flow_volatility: swings in monthly net cash flow relative to income
+- income_regularity: how consistently income arrives each month (0-1)
+- savings_rate: share of income left after spending
+- overdrafts_per_month: overdraft and insufficient-funds fees per month
+- utilization: credit card balances over limits (null if unknown)
+
+Response requirements:
+- 3 to 5 short sentences
+- Name the two features that helped the score most and the one that hurt it most
+- End with one concrete, actionable suggestion
+- No headings, no bullet points
+"""
+
+FOLLOW_UP_TOKEN_SEND: Final = """
+The user wants to send tokens but their request is missing details.
+Ask them, in one or two friendly sentences, for BOTH of these:
+
+1. The destination address, a 42 character hexadecimal address starting with "0x"
+2. The amount of FLR to send, a positive number
+
+Give an example of a complete request, e.g. "Send 10 FLR to 0x742d35Cc6634C0532925a3b844Bc454e4438f44e".
+"""
+
+# Pre-written phrasings of deterministic replies, rendered without an LLM call.
+# Every variant of a reply must use the same placeholders.
+
+TX_CONFIRMATION_REPLIES: Final = (
+    """Great news! Your transaction has been submitted to the network. 🎉
+
+[See transaction on Explorer](${block_explorer}/tx/${tx_hash})
+
+It will be confirmed within a few seconds, you can follow it on the explorer.""",
+    """Your transaction was accepted by the network and will be confirmed in the next blocks.
+
+[See transaction on Explorer](${block_explorer}/tx/${tx_hash})
+
+Thanks for building on Flare! ⚡""",
+)
+
+GENERATE_ACCOUNT_REPLIES: Final = (
+    """Welcome to Flare! 🎉 Your new account is secured in a Trusted Execution Environment (TEE), so its private key never leaves the secure hardware.
+
+Your public address, which is safe to share:
+
+`${address}`
+
+[Add funds to account](https://faucet.flare.network/coston2) to get started.""",
+    """Your Flare account is ready! 🔐 It lives inside a Trusted Execution Environment (TEE): the private key never leaves the enclave and the hardware protects it against tampering.
+
+Address (public information, share freely):
+
+`${address}`
+
+Next step: [Add funds to account](https://faucet.flare.network/coston2)""",
+)
+
+FOLLOW_UP_TOKEN_SEND_REPLIES: Final = (
+    """I need a little more to send tokens: please tell me the destination address (0x followed by 40 hexadecimal characters) and the amount of FLR.
+
+For example: "Send 10 FLR to 0x742d35Cc6634C0532925a3b844Bc454e4438f44e\"""",
+    """Almost there! Which address should receive the tokens, and how much FLR should I send?
+
+Try something like: "Send 2.5 FLR to 0x742d35Cc6634C0532925a3b844Bc454e4438f44e\"""",
+)
+
+REMOTE_ATTESTATION_REPLIES: Final = (
+    """Happy to prove I'm running in a genuine TEE! 🔒
+
+1. Reply with ONLY a random message of 10 to 74 letters and numbers, nothing else.
+2. I'll answer with an attestation token for your message.
+3. Paste the full token into https://jwt.io and check that the decoded payload contains your exact message, that the TEE signature is valid, and that all claims are present.""",
+    """Let's do a remote attestation. 🛡️
+
+Send me a single random message (10-74 characters, letters and numbers only) as your next reply, with no other text.
+You'll get back an attestation token: decode it at https://jwt.io, confirm your message appears in the payload, the signature checks out, and every claim is present and valid.""",
+)
+
+HISTORY_SUMMARY: Final = """
+Update the running summary of a conversation between a user and Artemis, a Flare blockchain assistant.
+
+Merge the earlier summary with the new turns below into ONE concise summary that:
+- Keeps every fact later turns may rely on: names, account addresses, token amounts, transaction hashes, decisions and open questions
+- Copies addresses and hashes EXACTLY, with no modifications
+- Drops greetings, small talk and repeated information
+- Is written in the third person, at most 200 words, as plain text
+
+<summary>
+${summary}
+</summary>
+
+<turns>
+${turns}
+</turns>
 """
@@ -0,0 +1,22 @@
+from .classifier import (
+    EmbeddingClassifier,
+    RouteClassifier,
+    RouteMatch,
+    RouteRule,
+    RuleClassifier,
+    normalize_message,
+)
+from .examples import LABELLED_EXAMPLES
+from .resolver import RouteMetrics, SemanticRouteResolver
+
+__all__ = [
+    "LABELLED_EXAMPLES",
+    "EmbeddingClassifier",
+    "RouteClassifier",
+    "RouteMatch",
+    "RouteMetrics",
+    "RouteRule",
+    "RuleClassifier",
+    "SemanticRouteResolver",
+    "normalize_message",
+]
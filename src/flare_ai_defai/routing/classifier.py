@@ -0,0 +1,239 @@
+"""
+Local Semantic Route Classifiers
+
+This module provides cheap classifiers that choose a `SemanticRouterResponse`
+without calling the LLM. Each classifier returns a `RouteMatch` with a
+confidence in [0, 1]; the resolver only trusts matches above its threshold
+and falls back to the LLM otherwise.
+
+Classifiers operate on messages normalized by `normalize_message`, which
+lowercases the text and replaces addresses and amounts with placeholders so
+that "send 5 FLR to 0xabc..." and "send 10 FLR to 0xdef..." look alike.
+"""
+
+import math
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from typing import Final, override
+
+from flare_ai_defai.prompts import SemanticRouterResponse
+
+type EmbedFn = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+_ADDRESS_RE: Final = re.compile(r"\b0x[0-9a-f]{6,64}\b")
+_NUMBER_RE: Final = re.compile(r"\b\d+(?:[.,]\d+)*\b")
+_PUNCTUATION_RE: Final = re.compile(r"[^\w<>\s]")
+_WHITESPACE_RE: Final = re.compile(r"\s+")
+
+
+def normalize_message(message: str) -> str:
+    """
+    Normalize a user message for caching and classification.
+
+    Args:
+        message: Raw user message
+
+    Returns:
+        str: Lowercased message with addresses and numbers replaced by
+            `<address>` and `<num>`, punctuation dropped and whitespace collapsed
+    """
+    text = message.lower()
+    text = _ADDRESS_RE.sub(" <address> ", text)
+    text = _NUMBER_RE.sub(" <num> ", text)
+    text = _PUNCTUATION_RE.sub(" ", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+@dataclass(frozen=True)
+class RouteMatch:
+    """
+    A classifier's verdict for a message.
+
+    Attributes:
+        route (SemanticRouterResponse): Chosen route
+        confidence (float): Confidence in [0, 1]
+    """
+
+    route: SemanticRouterResponse
+    confidence: float
+
+
+class RouteClassifier(ABC):
+    """Abstract base class for local route classifiers."""
+
+    name: str = "classifier"
+
+    @abstractmethod
+    async def classify(self, message: str) -> RouteMatch | None:
+        """
+        Classify a normalized message.
+
+        Args:
+            message: Message normalized with `normalize_message`
+
+        Returns:
+            RouteMatch | None: Best route and confidence, or None if no opinion
+        """
+
+
+@dataclass(frozen=True)
+class RouteRule:
+    """
+    A regular expression voting for a route.
+
+    Attributes:
+        route (SemanticRouterResponse): Route the rule votes for
+        pattern (re.Pattern[str]): Pattern searched in the normalized message
+        confidence (float): Confidence given to a match
+    """
+
+    route: SemanticRouterResponse
+    pattern: re.Pattern[str]
+    confidence: float
+
+
+def _rule(route: SemanticRouterResponse, pattern: str, confidence: float) -> RouteRule:
+    return RouteRule(route=route, pattern=re.compile(pattern), confidence=confidence)
+
+
+DEFAULT_RULES: Final[tuple[RouteRule, ...]] = (
+    _rule(
+        SemanticRouterResponse.GENERATE_ACCOUNT,
+        r"\b(create|generate|make|new|open|set ?up)\b.*\b(wallet|account|address)\b",
+        0.9,
+    ),
+    _rule(
+        SemanticRouterResponse.SEND_TOKEN,
+        r"\b(send|transfer|pay|give)\b.*<address>",
+        0.95,
+    ),
+    _rule(
+        SemanticRouterResponse.SEND_TOKEN,
+        r"\b(send|transfer)\b.*\b(<num>|flr|c2flr|tokens?)\b",
+        0.85,
+    ),
+    _rule(
+        SemanticRouterResponse.SWAP_TOKEN,
+        r"\b(swap|convert|trade|exchange)\b.*\b(for|to|into)\b",
+        0.9,
+    ),
+    _rule(SemanticRouterResponse.SWAP_TOKEN, r"\bswap\b", 0.85),
+    _rule(
+        SemanticRouterResponse.REQUEST_ATTESTATION,
+        r"\b(attest|attestation|attested)\b",
+        0.9,
+    ),
+    _rule(
+        SemanticRouterResponse.REQUEST_ATTESTATION,
+        r"\b(verify|prove|check)\b.*\b(enclave|tee|confidential|secure environment)\b",
+        0.9,
+    ),
+    _rule(
+        SemanticRouterResponse.CONVERSATIONAL,
+        r"^(hi|hello|hey|gm|good (morning|afternoon|evening)|thanks|thank you)\b",
+        0.9,
+    ),
+    _rule(
+        SemanticRouterResponse.CONVERSATIONAL,
+        r"^(what|who|why|how|when|where|explain|tell me|can you explain)\b",
+        0.8,
+    ),
+)
+
+
+class RuleClassifier(RouteClassifier):
+    """
+    Keyword and regex classifier.
+
+    Every rule matching the message votes for its route with its confidence.
+    When several routes match, the winner's confidence is reduced to its margin
+    over the runner-up, so ambiguous messages fall through to the LLM.
+    """
+
+    name = "rules"
+
+    def __init__(self, rules: Sequence[RouteRule] = DEFAULT_RULES) -> None:
+        self.rules = tuple(rules)
+
+    @override
+    async def classify(self, message: str) -> RouteMatch | None:
+        scores: dict[SemanticRouterResponse, float] = {}
+        for rule in self.rules:
+            if rule.confidence > scores.get(rule.route, 0.0) and rule.pattern.search(
+                message
+            ):
+                scores[rule.route] = rule.confidence
+        if not scores:
+            return None
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        route, confidence = ranked[0]
+        if len(ranked) > 1:
+            confidence -= ranked[1][1]
+        return RouteMatch(route=route, confidence=confidence)
+
+
+class EmbeddingClassifier(RouteClassifier):
+    """
+    Nearest-neighbour classifier over embedded labelled examples.
+
+    The examples are embedded once, on first use. A message is embedded and
+    compared by cosine similarity with every example; the top `k` neighbours
+    vote weighted by similarity. Confidence is the winning route's share of
+    the vote scaled by the best similarity.
+
+    Args:
+        embed: Async function embedding a batch of texts
+        examples: Labelled (message, route) pairs forming the index
+        k: Number of neighbours that vote
+    """
+
+    name = "embeddings"
+
+    def __init__(
+        self,
+        embed: EmbedFn,
+        examples: Sequence[tuple[str, SemanticRouterResponse]],
+        k: int = 3,
+    ) -> None:
+        self.embed = embed
+        self.examples = [(normalize_message(text), route) for text, route in examples]
+        self.k = k
+        self._index: list[tuple[list[float], SemanticRouterResponse]] | None = None
+
+    async def _get_index(self) -> list[tuple[list[float], SemanticRouterResponse]]:
+        if self._index is None:
+            vectors = await self.embed([text for text, _ in self.examples])
+            self._index = [
+                (_unit(vector), route)
+                for vector, (_, route) in zip(vectors, self.examples, strict=True)
+            ]
+        return self._index
+
+    @override
+    async def classify(self, message: str) -> RouteMatch | None:
+        index = await self._get_index()
+        if not index:
+            return None
+        [vector] = await self.embed([message])
+        query = _unit(vector)
+        neighbours = sorted(
+            ((sum(a * b for a, b in zip(query, v, strict=True)), r) for v, r in index),
+            key=lambda item: item[0],
+            reverse=True,
+        )[: self.k]
+        votes: dict[SemanticRouterResponse, float] = {}
+        for similarity, route in neighbours:
+            votes[route] = votes.get(route, 0.0) + max(similarity, 0.0)
+        total = sum(votes.values())
+        if total <= 0:
+            return None
+        route, weight = max(votes.items(), key=lambda item: item[1])
+        return RouteMatch(route=route, confidence=weight / total * neighbours[0][0])
+
+
+def _unit(vector: Sequence[float]) -> list[float]:
+    """Scale a vector to unit length so dot products are cosine similarities."""
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
@@ -0,0 +1,61 @@
+"""
+Labelled example messages for semantic routing.
+
+Used to seed the embedding nearest-neighbour index and as the reference
+corpus when measuring the accuracy of the local classifiers.
+"""
+
+from typing import Final
+
+from flare_ai_defai.prompts import SemanticRouterResponse
+
+_GENERATE = SemanticRouterResponse.GENERATE_ACCOUNT
+_SEND = SemanticRouterResponse.SEND_TOKEN
+_SWAP = SemanticRouterResponse.SWAP_TOKEN
+_ATTEST = SemanticRouterResponse.REQUEST_ATTESTATION
+_CHAT = SemanticRouterResponse.CONVERSATIONAL
+
+LABELLED_EXAMPLES: Final[tuple[tuple[str, SemanticRouterResponse], ...]] = (
+    ("Create a new wallet for me", _GENERATE),
+    ("generate an account", _GENERATE),
+    ("Can you make me a wallet?", _GENERATE),
+    ("I need a new Flare address", _GENERATE),
+    ("set up an account please", _GENERATE),
+    ("open a wallet", _GENERATE),
+    ("Please create an account on Flare", _GENERATE),
+    ("new wallet", _GENERATE),
+    ("Send 10 FLR to 0x5d3f2e8b1c4a6d7e9f0a1b2c3d4e5f6a7b8c9d0e", _SEND),
+    ("transfer 0.5 C2FLR to 0x1111111111111111111111111111111111111111", _SEND),
+    ("pay 0xabcdefabcdefabcdefabcdefabcdefabcdefabcd 3 flr", _SEND),
+    ("send tokens to 0x2222222222222222222222222222222222222222", _SEND),
+    ("I want to send 25 FLR", _SEND),
+    ("Transfer 100 tokens to my friend", _SEND),
+    ("please send 1.5 flr to 0x3333333333333333333333333333333333333333", _SEND),
+    ("give 0x4444444444444444444444444444444444444444 two flr", _SEND),
+    ("Swap 10 FLR for USDC", _SWAP),
+    ("swap my tokens", _SWAP),
+    ("convert 5 FLR into WETH", _SWAP),
+    ("trade 100 USDC for FLR", _SWAP),
+    ("exchange 3 FLR to USDT", _SWAP),
+    ("I'd like to swap FLR", _SWAP),
+    ("Request an attestation", _ATTEST),
+    ("Can you attest that you run in a TEE?", _ATTEST),
+    ("prove you are running in a secure enclave", _ATTEST),
+    ("verify the enclave", _ATTEST),
+    ("give me a remote attestation token", _ATTEST),
+    ("check that you run in a confidential VM enclave", _ATTEST),
+    ("Hi there!", _CHAT),
+    ("hello", _CHAT),
+    ("Thanks a lot", _CHAT),
+    ("What is Flare?", _CHAT),
+    ("How does the FTSO work?", _CHAT),
+    ("Who are you?", _CHAT),
+    ("Explain the data connector", _CHAT),
+    ("tell me a joke about blockchains", _CHAT),
+    ("good morning", _CHAT),
+    ("why are gas fees so low on Flare", _CHAT),
+    ("I lost my keys, what should I do", _CHAT),
+    ("is Flare EVM compatible", _CHAT),
+    ("what's the weather like", _CHAT),
+    ("How do I send tokens to someone?", _CHAT),
+)
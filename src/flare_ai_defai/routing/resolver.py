@@ -0,0 +1,138 @@
+"""
+Semantic Route Resolver
+
+Chooses the semantic route for a chat message while avoiding LLM calls where
+possible. Messages are resolved, in order, by:
+
+1. An LRU cache keyed by the normalized message
+2. Local classifiers (keyword/regex rules, optionally embeddings), trusted only
+   above a confidence threshold
+3. The LLM `semantic_router` prompt, as before
+
+Per-path counters make it possible to see how many LLM calls are saved.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+import structlog
+
+from flare_ai_defai.ai import BaseAIProvider
+from flare_ai_defai.cache import LRUCache
+from flare_ai_defai.prompts import PromptService, SemanticRouterResponse
+from flare_ai_defai.routing.classifier import (
+    RouteClassifier,
+    RuleClassifier,
+    normalize_message,
+)
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class RouteMetrics:
+    """
+    Counters for the path that resolved each message.
+
+    Attributes:
+        requests (int): Messages resolved
+        cache_hits (int): Messages served from the route cache
+        classifier_hits (dict[str, int]): Messages resolved per local classifier
+        llm_calls (int): Messages that needed the LLM
+        llm_failures (int): LLM calls that failed, defaulting to conversational
+    """
+
+    requests: int = 0
+    cache_hits: int = 0
+    classifier_hits: dict[str, int] = field(default_factory=dict)
+    llm_calls: int = 0
+    llm_failures: int = 0
+
+    def hit_rates(self) -> dict[str, float]:
+        """Fraction of requests resolved by each path."""
+        if not self.requests:
+            return {}
+        rates = {"cache": self.cache_hits / self.requests}
+        for name, hits in self.classifier_hits.items():
+            rates[name] = hits / self.requests
+        rates["llm"] = self.llm_calls / self.requests
+        return rates
+
+
+class SemanticRouteResolver:
+    """
+    Resolve semantic routes through a cache and local classifiers before the LLM.
+
+    Args:
+        ai: Provider used when no local classifier is confident
+        prompts: Prompt service providing the `semantic_router` prompt
+        classifiers: Local classifiers tried in order (default: rules only)
+        cache_size: Maximum number of normalized messages cached
+        confidence_threshold: Minimum confidence to trust a local classifier
+    """
+
+    def __init__(
+        self,
+        ai: BaseAIProvider,
+        prompts: PromptService,
+        classifiers: Sequence[RouteClassifier] | None = None,
+        cache_size: int = 4096,
+        confidence_threshold: float = 0.8,
+    ) -> None:
+        self.ai = ai
+        self.prompts = prompts
+        self.classifiers = (
+            list(classifiers) if classifiers is not None else [RuleClassifier()]
+        )
+        self.cache: LRUCache[str, SemanticRouterResponse] = LRUCache(cache_size)
+        self.confidence_threshold = confidence_threshold
+        self.metrics = RouteMetrics()
+        self.logger = logger.bind(service="semantic_router")
+
+    async def resolve(self, message: str) -> SemanticRouterResponse:
+        """
+        Determine the semantic route for a message.
+
+        Args:
+            message: Raw user message
+
+        Returns:
+            SemanticRouterResponse: Determined route, CONVERSATIONAL if the LLM
+                call fails
+        """
+        self.metrics.requests += 1
+        key = normalize_message(message)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.metrics.cache_hits += 1
+            return cached
+
+        for classifier in self.classifiers:
+            match = await classifier.classify(key)
+            if match is not None and match.confidence >= self.confidence_threshold:
+                hits = self.metrics.classifier_hits
+                hits[classifier.name] = hits.get(classifier.name, 0) + 1
+                self.logger.debug(
+                    "route_classified",
+                    classifier=classifier.name,
+                    route=match.route,
+                    confidence=match.confidence,
+                )
+                self.cache.set(key, match.route)
+                return match.route
+
+        self.metrics.llm_calls += 1
+        try:
+            prompt, mime_type, schema = self.prompts.get_formatted_prompt(
+                "semantic_router", user_input=message
+            )
+            route_response = await self.ai.agenerate(
+                prompt=prompt, response_mime_type=mime_type, response_schema=schema
+            )
+            route = SemanticRouterResponse(route_response.text)
+        except Exception as e:
+            self.metrics.llm_failures += 1
+            self.logger.exception("routing_failed", error=str(e))
+            return SemanticRouterResponse.CONVERSATIONAL
+        self.cache.set(key, route)
+        return route
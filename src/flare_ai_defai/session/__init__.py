@@ -0,0 +1,15 @@
+from .base import Session, SessionMetrics, SessionStore
+from .history import HistoryManager, HistoryTokens, estimate_tokens
+from .memory import InMemorySessionStore
+from .sqlite import SQLiteSessionStore
+
+__all__ = [
+    "HistoryManager",
+    "HistoryTokens",
+    "InMemorySessionStore",
+    "SQLiteSessionStore",
+    "Session",
+    "SessionMetrics",
+    "SessionStore",
+    "estimate_tokens",
+]
@@ -0,0 +1,196 @@
+"""
+Session State Module
+
+This module defines the per-conversation state that used to live on the shared
+provider instances (Gemini chat history, Flare wallet and transaction queue,
+pending attestation flag), together with the abstract store interface that
+keeps it between requests.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from flare_ai_defai.blockchain import TxQueueElement, WalletState
+
+
+@dataclass
+class Session:
+    """
+    State of a single user conversation.
+
+    Attributes:
+        session_id (str): Identifier sent by the client in a header or cookie
+        chat_history (list[dict[str, Any]]): Conversation turns for the AI provider
+        history_summary (str): Rolling summary of turns folded out of
+            `chat_history`
+        history_offset (int): Entries dropped from the front of `chat_history`
+            since the conversation started, by trimming or folding
+        wallet (WalletState): Flare account and pending transaction queue
+        attestation_requested (bool): Whether the next message is a nonce
+        created_at (float): Unix time the session was created
+        last_seen (float): Unix time the session was last used
+    """
+
+    session_id: str
+    chat_history: list[dict[str, Any]] = field(default_factory=list)
+    history_summary: str = ""
+    history_offset: int = 0
+    wallet: WalletState = field(default_factory=WalletState)
+    attestation_requested: bool = False
+    created_at: float = field(default_factory=time.time)
+    last_seen: float = field(default_factory=time.time)
+
+    def reset(self) -> None:
+        """Clear conversation and wallet state, keeping the session id."""
+        self.chat_history = []
+        self.history_summary = ""
+        self.history_offset = 0
+        self.wallet = WalletState()
+        self.attestation_requested = False
+
+    def trim(self, max_history: int, max_tx_queue: int) -> None:
+        """
+        Bound the memory held by the session.
+
+        Args:
+            max_history: Maximum number of chat history entries to keep
+            max_tx_queue: Maximum number of queued transactions to keep
+        """
+        if len(self.chat_history) > max_history:
+            dropped = len(self.chat_history) - max_history
+            del self.chat_history[:dropped]
+            self.history_offset += dropped
+        if len(self.wallet.tx_queue) > max_tx_queue:
+            del self.wallet.tx_queue[: len(self.wallet.tx_queue) - max_tx_queue]
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Serialize the session to JSON-compatible primitives.
+
+        The wallet's private key is left out; stores that persist it must
+        encrypt it themselves.
+        """
+        data = asdict(self)
+        del data["wallet"]["private_key"]
+        return data
+
+    @classmethod
+    def from_dict(
+        cls, data: dict[str, Any], private_key: str | None = None
+    ) -> "Session":
+        """
+        Rebuild a session serialized with `to_dict`.
+
+        Args:
+            data: Serialized session
+            private_key: The wallet's private key, stored apart from `data`
+
+        Returns:
+            Session: The rebuilt session
+        """
+        wallet = data.get("wallet") or {}
+        return cls(
+            session_id=data["session_id"],
+            chat_history=data.get("chat_history", []),
+            history_summary=data.get("history_summary", ""),
+            history_offset=data.get("history_offset", 0),
+            wallet=WalletState(
+                address=wallet.get("address"),
+                private_key=private_key,
+                tx_queue=[
+                    TxQueueElement(msg=element["msg"], tx=element["tx"])
+                    for element in wallet.get("tx_queue", [])
+                ],
+            ),
+            attestation_requested=data.get("attestation_requested", False),
+            created_at=data.get("created_at", time.time()),
+            last_seen=data.get("last_seen", time.time()),
+        )
+
+
+@dataclass
+class SessionMetrics:
+    """
+    Counters describing session store behaviour.
+
+    Attributes:
+        hits (int): Lookups that found a live session
+        misses (int): Lookups that created a new session
+        evictions_lru (int): Sessions dropped to stay under the size limit
+        evictions_ttl (int): Sessions dropped after being idle past the TTL
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions_lru: int = 0
+    evictions_ttl: int = 0
+
+
+class SessionStore(ABC):
+    """
+    Abstract store for conversation sessions.
+
+    Implementations bound both the number of live sessions (least recently
+    used sessions are evicted first) and their idle lifetime, and trim each
+    session on save so its memory stays bounded.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 10_000,
+        ttl_seconds: float = 3600.0,
+        max_history: int = 100,
+        max_tx_queue: int = 10,
+    ) -> None:
+        """
+        Args:
+            max_sessions: Maximum number of sessions kept at once
+            ttl_seconds: Idle time after which a session expires
+            max_history: Maximum chat history entries kept per session
+            max_tx_queue: Maximum queued transactions kept per session
+        """
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_history = max_history
+        self.max_tx_queue = max_tx_queue
+        self.metrics = SessionMetrics()
+
+    @abstractmethod
+    def get(self, session_id: str) -> Session:
+        """
+        Load a session, creating a fresh one if it is unknown or expired.
+
+        Args:
+            session_id: Identifier of the session
+
+        Returns:
+            Session: The live session for the identifier
+        """
+
+    @abstractmethod
+    def save(self, session: Session) -> None:
+        """
+        Persist a session after it has been modified.
+
+        Args:
+            session: Session to persist
+        """
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """
+        Remove a session if it exists.
+
+        Args:
+            session_id: Identifier of the session
+        """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of sessions currently held."""
+
+    def _is_expired(self, session: Session, now: float) -> bool:
+        """Whether a session has been idle longer than the TTL."""
+        return now - session.last_seen > self.ttl_seconds
@@ -0,0 +1,263 @@
+"""
+Chat History Compaction Module
+
+Every conversational message resends the session's chat history to the AI
+provider, so without compaction latency and token cost grow with the length
+of the conversation. The HistoryManager keeps each session within a token
+budget: the last few turns are sent verbatim and older turns are folded into
+a rolling summary, which the AI provider computes in the background from the
+previous summary and the newly folded turns.
+
+Example:
+    ```python
+    history = HistoryManager(ai, PromptService(), token_budget=4000)
+    context = history.context(session)
+    response = await ai.asend_message(message, context)
+    history.record(session, context)
+    ```
+"""
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import structlog
+
+from flare_ai_defai.ai import BaseAIProvider, entry_text, estimate_tokens
+from flare_ai_defai.cache import TTLCache
+from flare_ai_defai.prompts import PromptService
+from flare_ai_defai.session.base import Session
+
+logger = structlog.get_logger(__name__)
+
+SUMMARY_PREFIX = "Summary of our conversation so far:\n"
+SUMMARY_ACK = "Understood, I will keep that in mind."
+
+# History offset of the first folded turn, summary the fold started from,
+# turns being folded into it, and the task computing the new summary
+Fold = tuple[int, str, list[dict[str, Any]], asyncio.Task[str]]
+
+
+@dataclass(frozen=True)
+class HistoryTokens:
+    """
+    Token counts of what a session sends with each message.
+
+    Attributes:
+        summary (int): Tokens in the rolling summary
+        history (int): Tokens in the turns kept verbatim
+        turns (int): Number of history entries kept verbatim
+    """
+
+    summary: int
+    history: int
+    turns: int
+
+    @property
+    def total(self) -> int:
+        """Tokens sent as conversation context."""
+        return self.summary + self.history
+
+    def to_dict(self) -> dict[str, int]:
+        """Serialize the counts, including the total, for the HTTP reply."""
+        return {**asdict(self), "total": self.total}
+
+
+class HistoryManager:
+    """
+    Keeps session chat histories within a token budget.
+
+    Once a session's context exceeds `token_budget` tokens, every turn but
+    the last `keep_turns` is folded into the session's rolling summary. The
+    summary is computed in a background task so the reply is not delayed; it
+    is applied at the start of the session's next message. Folded turns are
+    located by their offset in the conversation, so the summary still applies
+    if the session store trimmed some of them meanwhile, but not if the
+    conversation was reset. Folds of sessions that
+    never send another message expire with the session, and at most
+    `max_sessions` are kept.
+
+    Attributes:
+        ai (BaseAIProvider): Provider computing the summaries
+        prompts (PromptService): Service providing the summary prompt
+        token_budget (int): Context tokens above which turns are folded
+        keep_turns (int): Most recent user/model turns kept verbatim
+        count_tokens (Callable[[str], int]): Token counter
+        summaries (int): Summaries computed so far
+        logger (BoundLogger): Structured logger for the manager
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        ai: BaseAIProvider,
+        prompts: PromptService,
+        *,
+        token_budget: int = 4000,
+        keep_turns: int = 6,
+        count_tokens: Callable[[str], int] = estimate_tokens,
+        fold_ttl: float = 3600.0,
+        max_sessions: int = 10_000,
+    ) -> None:
+        """
+        Initialize the history manager.
+
+        Args:
+            ai: Provider computing the summaries
+            prompts: Service providing the summary prompt
+            token_budget: Context tokens above which turns are folded
+            keep_turns: Most recent user/model turns kept verbatim
+            count_tokens: Token counter, defaults to a characters-based
+                estimate
+            fold_ttl: Seconds a computed summary waits for the session's next
+                message, typically the session TTL
+            max_sessions: Sessions whose pending summary is kept at once
+        """
+        self.ai = ai
+        self.prompts = prompts
+        self.token_budget = token_budget
+        self.keep_turns = keep_turns
+        self.count_tokens = count_tokens
+        self.summaries = 0
+        self._folds: TTLCache[str, Fold] = TTLCache(fold_ttl, max_sessions)
+        # Strong references to running summaries, which outlive dropped folds
+        self._tasks: set[asyncio.Task[str]] = set()
+        self.logger = logger.bind(service="history")
+
+    def context(self, session: Session) -> list[dict[str, Any]]:
+        """
+        Build the chat history to send with the session's next message.
+
+        Applies a finished background summary first. The returned list is a
+        copy; pass it to the AI provider and then to `record`.
+
+        Args:
+            session: Conversation session
+
+        Returns:
+            list[dict[str, Any]]: The summary as an opening exchange, if there
+                is one, followed by the turns kept verbatim
+        """
+        self._apply(session)
+        context: list[dict[str, Any]] = []
+        if session.history_summary:
+            context.append(
+                {"parts": [SUMMARY_PREFIX + session.history_summary], "role": "user"}
+            )
+            context.append({"parts": [SUMMARY_ACK], "role": "model"})
+        context.extend(session.chat_history)
+        return context
+
+    def record(self, session: Session, context: list[dict[str, Any]]) -> None:
+        """
+        Store the turn the AI provider added to a context, then compact.
+
+        Args:
+            session: Conversation session the context was built for
+            context: List returned by `context`, after the provider appended
+                the new turn to it
+        """
+        preamble = 2 if session.history_summary else 0
+        session.chat_history.extend(context[preamble + len(session.chat_history) :])
+        self.compact(session)
+
+    def tokens(self, session: Session) -> HistoryTokens:
+        """
+        Count the tokens the session sends as context with each message.
+
+        Args:
+            session: Conversation session
+
+        Returns:
+            HistoryTokens: Summary and verbatim history token counts
+        """
+        return HistoryTokens(
+            summary=self.count_tokens(session.history_summary),
+            history=sum(
+                self.count_tokens(entry_text(entry)) for entry in session.chat_history
+            ),
+            turns=len(session.chat_history),
+        )
+
+    def compact(self, session: Session) -> None:
+        """
+        Start folding old turns into the summary if the session is over budget.
+
+        Does nothing while a fold for the session is still pending.
+
+        Args:
+            session: Conversation session
+        """
+        if session.session_id in self._folds:
+            return
+        keep = self.keep_turns * 2
+        if len(session.chat_history) <= keep:
+            return
+        tokens = self.tokens(session)
+        if tokens.total <= self.token_budget:
+            return
+        folded = session.chat_history[: len(session.chat_history) - keep]
+        task = asyncio.create_task(self._summarize(session.history_summary, folded))
+        self._folds.set(
+            session.session_id,
+            (session.history_offset, session.history_summary, folded, task),
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        self.logger.debug(
+            "history_compaction_started",
+            session_id=session.session_id,
+            tokens=tokens.total,
+            folded=len(folded),
+        )
+
+    async def join(self) -> None:
+        """Wait for every pending summary to be computed."""
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _summarize(self, summary: str, entries: list[dict[str, Any]]) -> str:
+        """Fold `entries` into `summary` with the AI provider."""
+        turns = "\n".join(
+            f"{entry.get('role', 'user')}: {entry_text(entry)}" for entry in entries
+        )
+        prompt, mime_type, schema = self.prompts.get_formatted_prompt(
+            "history_summary", summary=summary or "(none)", turns=turns
+        )
+        response = await self.ai.agenerate(
+            prompt=prompt, response_mime_type=mime_type, response_schema=schema
+        )
+        self.summaries += 1
+        return response.text.strip()
+
+    def _apply(self, session: Session) -> None:
+        """Swap folded turns for the summary once it has been computed."""
+        pending = self._folds.get(session.session_id)
+        if pending is None or not pending[3].done():
+            return
+        self._folds.pop(session.session_id)
+        start, summary, folded, task = pending
+        if task.cancelled() or task.exception() is not None:
+            self.logger.warning(
+                "history_compaction_failed",
+                session_id=session.session_id,
+                error=str(task.exception()) if not task.cancelled() else "cancelled",
+            )
+            return
+        # The store may have trimmed some folded turns since the fold started,
+        # the rest must still lead the history unless it was reset
+        end = start + len(folded)
+        remaining = max(end - session.history_offset, 0)
+        if (
+            session.history_summary != summary
+            or session.history_offset < start
+            or session.chat_history[:remaining] != folded[len(folded) - remaining :]
+        ):
+            return
+        del session.chat_history[:remaining]
+        session.history_offset += remaining
+        session.history_summary = task.result()
+        self.logger.debug(
+            "history_compacted",
+            session_id=session.session_id,
+            tokens=self.tokens(session).total,
+        )
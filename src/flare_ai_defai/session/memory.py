@@ -0,0 +1,87 @@
+"""
+In-memory LRU + TTL session store.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import override
+
+import structlog
+
+from flare_ai_defai.session.base import Session, SessionStore
+
+logger = structlog.get_logger(__name__)
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Process-local session store.
+
+    Sessions are kept in an OrderedDict in least recently used order, so both
+    lookups and evictions are O(1). Expired sessions are dropped lazily when
+    they are looked up and eagerly from the cold end of the LRU order.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 10_000,
+        ttl_seconds: float = 3600.0,
+        max_history: int = 100,
+        max_tx_queue: int = 10,
+    ) -> None:
+        super().__init__(max_sessions, ttl_seconds, max_history, max_tx_queue)
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._lock = threading.Lock()
+        self.logger = logger.bind(store="memory_sessions")
+
+    @override
+    def get(self, session_id: str) -> Session:
+        now = time.time()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None and self._is_expired(session, now):
+                del self._sessions[session_id]
+                self.metrics.evictions_ttl += 1
+                session = None
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                self.metrics.hits += 1
+            else:
+                session = Session(session_id=session_id)
+                self._sessions[session_id] = session
+                self.metrics.misses += 1
+                self._evict(now)
+            session.last_seen = now
+            return session
+
+    @override
+    def save(self, session: Session) -> None:
+        session.trim(self.max_history, self.max_tx_queue)
+        session.last_seen = time.time()
+        with self._lock:
+            self._sessions[session.session_id] = session
+            self._sessions.move_to_end(session.session_id)
+            self._evict(session.last_seen)
+
+    @override
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    @override
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired sessions from the cold end, then enforce the size limit."""
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if not self._is_expired(oldest, now):
+                break
+            self._sessions.popitem(last=False)
+            self.metrics.evictions_ttl += 1
+        while len(self._sessions) > self.max_sessions:
+            evicted_id, _ = self._sessions.popitem(last=False)
+            self.metrics.evictions_lru += 1
+            self.logger.debug("session_evicted", session_id=evicted_id)
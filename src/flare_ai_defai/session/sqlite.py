@@ -0,0 +1,162 @@
+"""
+SQLite-backed session store.
+
+A local stand-in for a shared backend: sessions survive restarts and can be
+shared by every worker process on the host pointing at the same file. Wallet
+private keys are encrypted with Fernet before they are written.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import override
+
+import structlog
+from cryptography.fernet import Fernet, InvalidToken
+
+from flare_ai_defai.session.base import Session, SessionStore
+
+logger = structlog.get_logger(__name__)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Session store persisting each session as a JSON document in SQLite.
+
+    The wallet's private key is stored encrypted next to the document. Without
+    an `encryption_key` a random one is generated, so stored wallets cannot be
+    decrypted after a restart or by another process.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        path: str = "sessions.db",
+        *,
+        max_sessions: int = 10_000,
+        ttl_seconds: float = 3600.0,
+        max_history: int = 100,
+        max_tx_queue: int = 10,
+        encryption_key: str | None = None,
+    ) -> None:
+        """
+        Args:
+            path: SQLite database file, or ":memory:"
+            max_sessions: Maximum number of sessions kept at once
+            ttl_seconds: Idle time after which a session expires
+            max_history: Maximum chat history entries kept per session
+            max_tx_queue: Maximum queued transactions kept per session
+            encryption_key: Fernet key encrypting wallet private keys,
+                generated per process if omitted
+        """
+        super().__init__(max_sessions, ttl_seconds, max_history, max_tx_queue)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, data TEXT NOT NULL, last_seen REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS sessions_last_seen ON sessions (last_seen)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.logger = logger.bind(store="sqlite_sessions")
+        if not encryption_key:
+            self.logger.warning(
+                "session_encryption_key_generated",
+                detail="stored wallets will not survive a restart",
+            )
+        self._fernet = Fernet(encryption_key or Fernet.generate_key())
+
+    @override
+    def get(self, session_id: str) -> Session:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        session = self._load(row[0]) if row else None
+        if session is not None and self._is_expired(session, now):
+            self.delete(session_id)
+            self.metrics.evictions_ttl += 1
+            session = None
+        if session is None:
+            self.metrics.misses += 1
+            session = Session(session_id=session_id)
+        else:
+            self.metrics.hits += 1
+        session.last_seen = now
+        return session
+
+    @override
+    def save(self, session: Session) -> None:
+        session.trim(self.max_history, self.max_tx_queue)
+        session.last_seen = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sessions (session_id, data, last_seen) VALUES (?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET "
+                "data = excluded.data, last_seen = excluded.last_seen",
+                (session.session_id, self._dump(session), session.last_seen),
+            )
+            self._evict(session.last_seen)
+            self._conn.commit()
+
+    @override
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+            )
+            self._conn.commit()
+
+    @override
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def _dump(self, session: Session) -> str:
+        data = session.to_dict()
+        private_key = session.wallet.private_key
+        if private_key is not None:
+            data["wallet"]["encrypted_private_key"] = self._fernet.encrypt(
+                private_key.encode()
+            ).decode()
+        return json.dumps(data)
+
+    def _load(self, document: str) -> Session:
+        data = json.loads(document)
+        wallet = data.get("wallet") or {}
+        encrypted = wallet.get("encrypted_private_key")
+        if encrypted is None:
+            return Session.from_dict(data)
+        try:
+            private_key = self._fernet.decrypt(encrypted).decode()
+        except InvalidToken:
+            # Written under another key: the wallet cannot be used any more
+            self.logger.warning(
+                "session_wallet_undecryptable", session_id=data["session_id"]
+            )
+            data["wallet"] = {}
+            private_key = None
+        return Session.from_dict(data, private_key)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired sessions, then the least recently used over the limit."""
+        expired = self._conn.execute(
+            "DELETE FROM sessions WHERE last_seen < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        self.metrics.evictions_ttl += expired
+        overflow = self._conn.execute(
+            "DELETE FROM sessions WHERE session_id IN ("
+            "SELECT session_id FROM sessions ORDER BY last_seen DESC "
+            "LIMIT -1 OFFSET ?)",
+            (self.max_sessions,),
+        ).rowcount
+        self.metrics.evictions_lru += overflow
+        if overflow:
+            self.logger.debug("sessions_evicted", count=overflow)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
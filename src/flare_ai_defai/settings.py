@@ -22,24 +22,119 @@ class Settings(BaseSettings):
 
     # Flag to enable/disable attestation simulation
     simulate_attestation: bool = False
+    # Keep-alive connections kept open to the attestation (teeserver) socket
+    attestation_pool_size: int = 4
+    # Total timeout in seconds for a single attestation token request
+    attestation_timeout_seconds: float = 10.0
+    # Nonces whose batch-issued attestation token is cached until it expires
+    attestation_token_cache_size: int = 10_000
     # Restrict backend listener to specific IPs
     cors_origins: list[str] = ["*"]
     # API key for accessing Google's Gemini AI service
     gemini_api_key: str = ""
     # The Gemini model identifier to use
     gemini_model: str = "gemini-1.5-flash"
+    # OpenRouter API key; when set, requests are pooled over Gemini and OpenRouter
+    openrouter_api_key: str = ""
+    # The OpenRouter model identifier to use
+    openrouter_model: str = "openai/gpt-4o-mini"
+    # URL of the OpenRouter API
+    openrouter_base_url: str = "https://openrouter.ai/api/v1"
+    # Keep-alive connections kept open to OpenRouter
+    openrouter_pool_size: int = 100
+    # Total timeout in seconds for a single OpenRouter request
+    openrouter_timeout_seconds: float = 30.0
+    # Seconds before a slow AI request is also sent to the next provider, 0 disables
+    ai_hedge_after_seconds: float = 0.0
+    # Consecutive failures that take an AI provider out of rotation
+    ai_breaker_failures: int = 5
+    # Seconds a failing AI provider is skipped before it is probed again
+    ai_breaker_reset_seconds: float = 30.0
+    # Deterministic bot replies: "template" renders them locally, "llm" asks the AI
+    reply_mode: str = "template"
+    # Seconds responses to deterministic prompts (routing, extraction) are reused
+    ai_cache_ttl_seconds: float = 5.0
+    # Maximum number of cached AI responses per provider
+    ai_cache_size: int = 1024
+    # Chat context tokens above which older turns are folded into a summary
+    history_token_budget: int = 4000
+    # Most recent user/model turns always sent verbatim
+    history_keep_turns: int = 6
     # API version to use at the backend
     api_version: str = "v1"
     # URL for the Flare Network RPC provider
     web3_provider_url: str = "https://coston2-api.flare.network/ext/C/rpc"
     # URL for the Flare Network block explorer
     web3_explorer_url: str = "https://coston2-explorer.flare.network/"
-    
+    # Maximum open keep-alive connections to the RPC provider
+    web3_pool_size: int = 100
+    # Seconds an idle RPC connection is kept open for reuse
+    web3_keepalive_seconds: float = 30.0
+    # Total timeout in seconds for a single RPC request
+    web3_request_timeout: float = 30.0
+    # Seconds gas price and priority fee suggestions are reused across sessions
+    web3_fee_cache_seconds: float = 2.0
+    # Seconds between checks for receipts of submitted transactions
+    web3_receipt_poll_seconds: float = 1.0
+    # Seconds after which an unmined transaction is reported as timed out
+    web3_receipt_timeout_seconds: float = 300.0
+    # Minimum confidence for a local classifier to skip the LLM semantic router
+    semantic_router_confidence: float = 0.8
+    # Also consult an embedding nearest-neighbour index before the LLM
+    semantic_router_embeddings: bool = False
+    # Session store backend: "memory" or "sqlite"
+    session_backend: str = "memory"
+    # SQLite file used when session_backend is "sqlite"
+    session_sqlite_path: str = "sessions.db"
+    # Maximum number of concurrent sessions kept before LRU eviction
+    session_max_sessions: int = 10_000
+    # Idle time in seconds after which a session expires
+    session_ttl_seconds: float = 3600.0
+    # Maximum chat history entries kept per session
+    session_max_history: int = 100
+    # Fernet key encrypting wallet private keys in the SQLite session store,
+    # generated per process if empty
+    session_encryption_key: str = ""
+
     # plaid setup
-    PLAID_CLIENT_ID: str=""
-    PLAID_SECRET: str=""
-    PLAID_ENV: str=""
-    PLAID_PRODUCTS: str=""
+    PLAID_CLIENT_ID: str = ""
+    PLAID_SECRET: str = ""
+    PLAID_ENV: str = ""
+    PLAID_PRODUCTS: str = ""
+    # Number of Plaid credential sets whose API clients are kept open
+    plaid_max_clients: int = 32
+    # Maximum keep-alive connections per Plaid API client
+    plaid_max_connections: int = 10
+    # Synced transaction store backend: "memory" or "sqlite"
+    plaid_store_backend: str = "memory"
+    # SQLite file used when plaid_store_backend is "sqlite"
+    plaid_sqlite_path: str = "plaid.db"
+    # Transactions requested per transactions/sync page (Plaid allows 500)
+    plaid_sync_page_size: int = 500
+    # Ask the AI for a plain-language explanation of each computed credit score
+    plaid_score_narrative: bool = False
+    # Items whose latest credit score is cached in front of the SQLite store
+    plaid_score_cache_size: int = 10_000
+    # Credit scores kept per item
+    plaid_score_history: int = 100
+    # Fernet key encrypting access tokens in the SQLite score store,
+    # generated per process if empty
+    plaid_encryption_key: str = ""
+
+    # Background job store backend: "memory" or "sqlite"
+    job_backend: str = "memory"
+    # SQLite file used when job_backend is "sqlite"
+    job_sqlite_path: str = "jobs.db"
+    # Background jobs run concurrently
+    job_workers: int = 4
+    # Attempts per background job before it is failed
+    job_max_attempts: int = 3
+    # Seconds before the first retry of a failed job, doubled for each retry
+    job_backoff_seconds: float = 1.0
+    # Unfinished background jobs accepted before new ones are rejected
+    job_max_pending: int = 1000
+    # Seconds finished background jobs stay queryable before they are pruned
+    job_retention_seconds: float = 3600.0
 
     model_config = SettingsConfigDict(
         # This enables .env file support
@@ -12,6 +12,7 @@ export function CreditScoreDisplay() {
   const [score, setScore] = useState(0)
   const [progress, setProgress] = useState(0)
   const [isLoading, setIsLoading] = useState(true)
+  const [hasScore, setHasScore] = useState(true)
 
   useEffect(() => {
     // First try to get the credit score from sessionStorage (set by the Plaid link flow)
@@ -20,21 +21,36 @@ export function CreditScoreDisplay() {
     
     // If no score in sessionStorage, fetch from API
     if (!finalScore) {
-      // Fetch the credit score from the API
-      fetch(`http://34.169.48.165:8080/api/routes/plaid/credit_score`)
-        .then(response => response.json())
+      // Scores are looked up by session, so the session cookie must be sent
+      fetch(`http://34.169.48.165:8080/api/routes/plaid/credit_score`, {
+        headers: {
+          'Accept': 'application/json',
+        },
+        credentials: 'include',
+      })
+        .then(response => {
+          if (response.status === 404) {
+            // No linked and scored item for this session yet
+            return null
+          }
+          if (!response.ok) {
+            throw new Error(`Credit score lookup failed: ${response.status}`)
+          }
+          return response.json()
+        })
         .then(data => {
-          console.log(`Credit score API data received:`, data)
-          finalScore = data.credit_score || 742 // Use the API score or fallback to 742
-          console.log(`Using credit score: ${finalScore}`)
+          if (data == null) {
+            setHasScore(false)
+            return
+          }
+          finalScore = data.credit_score
           // Store in sessionStorage for future use
           sessionStorage.setItem('creditScore', finalScore!.toString())
           animateScore(finalScore!)
         })
         .catch(error => {
           console.error('Error fetching credit score:', error)
-          // Fallback to default score on error
-          animateScore(742)
+          setHasScore(false)
         })
         .finally(() => {
           setIsLoading(false)
@@ -110,8 +126,8 @@ export function CreditScoreDisplay() {
             <CardContent>
               <div className="flex flex-col items-center justify-center py-8">
                 <div className="relative mb-6">
-                  {isLoading ? (
-                    <div className="text-7xl font-bold text-gray-300 animate-pulse">
+                  {isLoading || !hasScore ? (
+                    <div className={`text-7xl font-bold text-gray-300 ${isLoading ? "animate-pulse" : ""}`}>
                       ---
                     </div>
                   ) : (
@@ -141,7 +157,11 @@ export function CreditScoreDisplay() {
                   animate={{ opacity: 1 }}
                   transition={{ duration: 0.5, delay: 0.8 }}
                 >
-                  {isLoading ? "Calculating..." : `${getScoreCategory()} Credit`}
+                  {isLoading
+                    ? "Calculating..."
+                    : hasScore
+                      ? `${getScoreCategory()} Credit`
+                      : "Link a bank account to get your score"}
                 </motion.div>
 
                 <div className="w-full max-w-md mb-4">
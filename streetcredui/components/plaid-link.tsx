@@ -11,6 +11,41 @@ interface PlaidLinkProps {
 }
 const BACKEND_URL = `http://34.169.48.165:8080`;
 const API_PREFIX = '/api/routes/plaid';
+const JOB_POLL_INTERVAL_MS = 1000;
+const JOB_TIMEOUT_MS = 5 * 60 * 1000;
+
+interface LinkJob {
+  job_id: string;
+  status: 'queued' | 'running' | 'retrying' | 'succeeded' | 'failed';
+  step: string | null;
+  result: {
+    item_id: string;
+    credit_score: number;
+  } | null;
+  error: string | null;
+}
+
+// Linking runs as a background job on the backend; poll it until it ends
+const waitForJob = async (jobId: string): Promise<LinkJob> => {
+  const deadline = Date.now() + JOB_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    const response = await fetch(`${BACKEND_URL}${API_PREFIX}/jobs/${jobId}`, {
+      headers: {
+        'Accept': 'application/json',
+      },
+      credentials: 'include',
+    });
+    if (!response.ok) {
+      throw new Error(`Job ${jobId} lookup failed: ${response.status}`);
+    }
+    const job: LinkJob = await response.json();
+    if (job.status === 'succeeded' || job.status === 'failed') {
+      return job;
+    }
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+  }
+  throw new Error(`Job ${jobId} did not finish in time`);
+};
 
 const PlaidLink: React.FC<PlaidLinkProps> = ({ className, children }) => {
   const { state: { linkToken, isPaymentInitiation }, dispatch } = usePlaid();
@@ -18,7 +53,7 @@ const PlaidLink: React.FC<PlaidLinkProps> = ({ className, children }) => {
   const onSuccess = useCallback(
     async (public_token: string) => {
       try {
-        // Exchange public token for access token using our TEE backend
+        // Queue the token exchange, sync and scoring on our TEE backend
         const exchangeResponse = await fetch(`${BACKEND_URL}${API_PREFIX}/set_access_token`, {
           method: 'POST',
           headers: {
@@ -35,7 +70,14 @@ const PlaidLink: React.FC<PlaidLinkProps> = ({ className, children }) => {
           return;
         }
 
-        const data = await exchangeResponse.json();
+        // 202 Accepted with the queued job; the access token never leaves
+        // the backend
+        const job = await waitForJob((await exchangeResponse.json()).job_id);
+        if (job.status === 'failed' || job.result == null) {
+          console.error('Error linking Plaid item:', job.error);
+          return;
+        }
+        sessionStorage.setItem('creditScore', job.result.credit_score.toString());
 
         // Quick validation check with the backend
         /*const validationResponse = await fetch(`${BACKEND_URL}${API_PREFIX}/info`, {
@@ -56,8 +98,8 @@ const PlaidLink: React.FC<PlaidLinkProps> = ({ className, children }) => {
         dispatch({
           type: 'SET_STATE',
           state: {
-            itemId: data.item_id,
-            accessToken: data.access_token,
+            itemId: job.result.item_id,
+            accessToken: null,
             isItemAccess: true,
             linkSuccess: true,
           },
@@ -0,0 +1,151 @@
+"""
+In-process stand-in for the Confidential Space attestation issuer.
+
+Serves the OpenID configuration, the JWKS and the root certificate over real
+HTTP with a configurable Cache-Control header, and signs OIDC tokens with its
+own RSA keys and PKI tokens with a generated root -> intermediate -> leaf
+certificate chain, so `VtpmValidation` can check them end to end.
+"""
+
+import base64
+import datetime as dt
+import time
+from typing import Any
+
+import jwt
+from aiohttp import web
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+from .stub_server import StubServer
+
+OIDC_ENDPOINT = "/.well-known/openid-configuration"
+JWKS_ENDPOINT = "/jwks"
+PKI_ENDPOINT = "/.well-known/confidential_space_root.crt"
+
+
+def b64url_uint(value: int) -> str:
+    data = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def make_certificate(  # noqa: PLR0913
+    name: str,
+    key: rsa.RSAPrivateKey,
+    issuer: x509.Certificate | None = None,
+    issuer_key: rsa.RSAPrivateKey | None = None,
+    *,
+    days: int = 30,
+    ca: bool = True,
+) -> x509.Certificate:
+    """Issue a certificate for `key`, self-signed unless an issuer is given."""
+    subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, name)])
+    now = dt.datetime.now(tz=dt.UTC)
+    return (
+        x509.CertificateBuilder()
+        .subject_name(subject)
+        .issuer_name(subject if issuer is None else issuer.subject)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - dt.timedelta(days=1))
+        .not_valid_after(now + dt.timedelta(days=days))
+        .add_extension(x509.BasicConstraints(ca=ca, path_length=None), critical=True)
+        .sign(key if issuer_key is None else issuer_key, hashes.SHA256())
+    )
+
+
+def fingerprint(cert: x509.Certificate) -> str:
+    """SHA1 fingerprint in the format `VtpmValidation` expects."""
+    return ":".join(f"{b:02X}" for b in cert.fingerprint(hashes.SHA1()))  # noqa: S303
+
+
+class IssuerStub(StubServer):
+    """
+    Attestation issuer counting requests per path.
+
+    Attributes:
+        keys: Signing keys published in the JWKS, by key id
+        cache_control: Cache-Control header sent with every document
+        chain: Leaf, intermediate and root certificates signing PKI tokens
+        root_pem: Root certificate served at the PKI endpoint
+    """
+
+    def __init__(self, cache_control: str = "public, max-age=3600") -> None:
+        super().__init__()
+        self.keys: dict[str, rsa.RSAPrivateKey] = {}
+        self.cache_control = cache_control
+        self.requests: dict[str, int] = {}
+        self.rotate("key-1")
+
+        root_key, intermediate_key = (
+            rsa.generate_private_key(public_exponent=65537, key_size=2048)
+            for _ in range(2)
+        )
+        self.leaf_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.root = make_certificate("root", root_key)
+        intermediate = make_certificate(
+            "intermediate", intermediate_key, self.root, root_key
+        )
+        leaf = make_certificate(
+            "leaf", self.leaf_key, intermediate, intermediate_key, ca=False
+        )
+        self.chain = [leaf, intermediate, self.root]
+        self.root_pem = self.root.public_bytes(serialization.Encoding.PEM)
+
+    def rotate(self, kid: str) -> None:
+        """Publish a new signing key alongside the existing ones."""
+        self.keys[kid] = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    def sign(self, kid: str, **claims: Any) -> str:
+        """Sign an OIDC token with the key `kid`."""
+        payload = {"iss": self.url, "exp": int(time.time()) + 3600, **claims}
+        return jwt.encode(
+            payload, self.keys[kid], algorithm="RS256", headers={"kid": kid}
+        )
+
+    def sign_pki(self, **claims: Any) -> str:
+        """Sign a PKI token carrying the certificate chain in its x5c header."""
+        payload = {"iss": self.url, "exp": int(time.time()) + 3600, **claims}
+        x5c = [
+            base64.b64encode(cert.public_bytes(serialization.Encoding.DER)).decode()
+            for cert in self.chain
+        ]
+        return jwt.encode(
+            payload, self.leaf_key, algorithm="RS256", headers={"x5c": x5c}
+        )
+
+    def routes(self, app: web.Application) -> None:
+        app.router.add_get(OIDC_ENDPOINT, self.openid_configuration)
+        app.router.add_get(JWKS_ENDPOINT, self.jwks)
+        app.router.add_get(PKI_ENDPOINT, self.root_certificate)
+
+    async def serve(self, request: web.Request, response: web.Response) -> web.Response:
+        await self.track(request)
+        self.requests[request.path] = self.requests.get(request.path, 0) + 1
+        response.headers["Cache-Control"] = self.cache_control
+        return response
+
+    async def openid_configuration(self, request: web.Request) -> web.Response:
+        config = {"issuer": self.url, "jwks_uri": self.url + JWKS_ENDPOINT}
+        return await self.serve(request, web.json_response(config))
+
+    async def jwks(self, request: web.Request) -> web.Response:
+        keys = []
+        for kid, key in self.keys.items():
+            numbers = key.public_key().public_numbers()
+            keys.append(
+                {
+                    "kid": kid,
+                    "kty": "RSA",
+                    "alg": "RS256",
+                    "use": "sig",
+                    "n": b64url_uint(numbers.n),
+                    "e": b64url_uint(numbers.e),
+                }
+            )
+        return await self.serve(request, web.json_response({"keys": keys}))
+
+    async def root_certificate(self, request: web.Request) -> web.Response:
+        return await self.serve(request, web.Response(body=self.root_pem))
@@ -0,0 +1,69 @@
+"""
+In-process stand-in for the Flare chain explorer API.
+
+Answers `module=contract&action=getabi` like the Blockscout-compatible
+explorer API, with the ABI JSON-encoded in `result`, and records how many
+requests each address received and how many were in flight at once.
+"""
+
+import json
+from collections import Counter
+from typing import Any
+
+from aiohttp import web
+
+from .stub_server import StubServer
+
+
+def make_abi(name: str) -> list[dict[str, Any]]:
+    """A one-function ABI named after `name`."""
+    return [
+        {
+            "type": "function",
+            "name": name,
+            "inputs": [],
+            "outputs": [{"name": "", "type": "uint256"}],
+            "stateMutability": "view",
+        }
+    ]
+
+
+class ExplorerStub(StubServer):
+    """
+    Explorer API serving the ABIs of the verified contracts in `abis`.
+
+    Attributes:
+        abis: ABI of each verified contract, by lower-case address
+        requests: Requests received per address
+        max_in_flight: Most requests handled concurrently
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        super().__init__(latency=latency)
+        self.abis: dict[str, list[dict[str, Any]]] = {}
+        self.requests: Counter[str] = Counter()
+        self.max_in_flight = 0
+        self._in_flight = 0
+
+    def routes(self, app: web.Application) -> None:
+        app.router.add_get("/api", self.api)
+
+    async def api(self, request: web.Request) -> web.Response:
+        self._in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            await self.track(request)
+        finally:
+            self._in_flight -= 1
+        address = request.query["address"].lower()
+        self.requests[address] += 1
+        abi = self.abis.get(address)
+        if abi is None:
+            body = {
+                "status": "0",
+                "message": "NOTOK",
+                "result": "Contract source code not verified",
+            }
+        else:
+            body = {"status": "1", "message": "OK", "result": json.dumps(abi)}
+        return web.json_response(body)
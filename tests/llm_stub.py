@@ -0,0 +1,71 @@
+"""
+In-process stand-in for an OpenAI-compatible chat completions API.
+
+Serves `POST /chat/completions` like OpenRouter, answering each request after
+the stub's latency with a reply naming the stub and echoing the last user
+message, so tests can tell which backend answered. Requests with
+`stream: true` are answered with server-sent events, one chunk per word.
+"""
+
+import json
+
+from aiohttp import web
+
+from .stub_server import StubServer
+
+
+class LLMStub(StubServer):
+    """
+    Chat completions endpoint with injectable latency and failures.
+
+    Attributes:
+        name: Prefix of every reply
+        requests: Request bodies received, in order
+        failures: Number of upcoming requests answered with a 503
+    """
+
+    def __init__(self, name: str, latency: float = 0.0) -> None:
+        super().__init__(latency=latency)
+        self.name = name
+        self.requests: list[dict] = []
+        self.failures = 0
+
+    def routes(self, app: web.Application) -> None:
+        app.router.add_post("/chat/completions", self.chat_completions)
+
+    def reply(self, body: dict) -> str:
+        """The reply the stub gives to a request body."""
+        return f"{self.name}: {body['messages'][-1]['content']}"
+
+    async def chat_completions(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        self.requests.append(body)
+        await self.track(request)
+        if self.failures:
+            self.failures -= 1
+            return web.json_response(
+                {"error": {"code": 503, "message": "Upstream overloaded"}}, status=503
+            )
+        text = self.reply(body)
+        if not body.get("stream"):
+            return web.json_response(
+                {
+                    "model": body["model"],
+                    "choices": [
+                        {
+                            "message": {"role": "assistant", "content": text},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {"prompt_tokens": 1, "completion_tokens": 1},
+                }
+            )
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await response.write(b": OPENROUTER PROCESSING\n\n")
+        for i, word in enumerate(text.split(" ")):
+            chunk = {"choices": [{"delta": {"content": f" {word}" if i else word}}]}
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
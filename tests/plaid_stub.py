@@ -0,0 +1,323 @@
+"""
+In-process stand-in for the Plaid API.
+
+Serves `/transactions/sync` and `/liabilities/get` over real HTTP with
+responses the official `plaid-python` client deserializes, checks the client
+credentials sent in the Plaid headers, and keeps an ordered change log so a
+transactions sync can be paged through with cursors like the real endpoint.
+"""
+
+import datetime as dt
+import json
+import random
+from collections import Counter
+from typing import Any
+
+from aiohttp import web
+
+from .stub_server import StubServer
+
+CLIENT_ID = "stub-client-id"
+SECRET = "stub-secret"
+ACCESS_TOKEN = "access-sandbox-stub"
+PUBLIC_TOKEN = "public-sandbox-stub"
+ITEM_ID = "stub-item"
+ACCOUNT_ID = "stub-account"
+
+
+def make_transaction(  # noqa: PLR0913
+    transaction_id: str,
+    amount: float,
+    date: dt.date,
+    *,
+    name: str = "Purchase",
+    account_id: str = ACCOUNT_ID,
+    category: str | None = None,
+) -> dict[str, Any]:
+    """Build a transaction in the shape of Plaid's `Transaction` model."""
+    finance_category = (
+        {"primary": category.rsplit("_", 1)[0], "detailed": category}
+        if category
+        else None
+    )
+    return {
+        "transaction_id": transaction_id,
+        "account_id": account_id,
+        "amount": amount,
+        "iso_currency_code": "USD",
+        "unofficial_currency_code": None,
+        "date": date.isoformat(),
+        "pending": False,
+        "name": name,
+        "merchant_name": None,
+        "category": None,
+        "category_id": None,
+        "payment_channel": "online",
+        "authorized_date": None,
+        "authorized_datetime": None,
+        "datetime": None,
+        "location": {
+            "address": None,
+            "city": None,
+            "region": None,
+            "postal_code": None,
+            "country": None,
+            "lat": None,
+            "lon": None,
+            "store_number": None,
+        },
+        "payment_meta": {
+            "reference_number": None,
+            "ppd_id": None,
+            "payee": None,
+            "by_order_of": None,
+            "payer": None,
+            "payment_method": None,
+            "payment_processor": None,
+            "reason": None,
+        },
+        "pending_transaction_id": None,
+        "account_owner": None,
+        "transaction_code": None,
+        "personal_finance_category": finance_category,
+    }
+
+
+def synthetic_history(  # noqa: PLR0913
+    count: int,
+    *,
+    seed: int = 0,
+    months: int = 24,
+    salary: float = 4000.0,
+    spend_ratio: float = 0.8,
+    income_skip_rate: float = 0.0,
+    overdraft_rate: float = 0.0,
+) -> list[dict[str, Any]]:
+    """
+    Generate a reproducible transaction history for one account.
+
+    Args:
+        count: Total number of transactions
+        seed: Random seed
+        months: Months the history spans, ending 2024-12
+        salary: Monthly wage inflow
+        spend_ratio: Mean monthly spending as a share of salary
+        income_skip_rate: Probability that a month's salary is missing
+        overdraft_rate: Share of spending transactions that are overdraft fees
+
+    Returns:
+        list[dict[str, Any]]: Transactions ordered by date
+    """
+    rng = random.Random(seed)  # noqa: S311
+    first_month = 2024 * 12 + 11 - (months - 1)
+    spend_count = max(count - months, 0)
+    mean_spend = salary * spend_ratio * months / max(spend_count, 1)
+    transactions = []
+    for month in range(months):
+        year, month_index = divmod(first_month + month, 12)
+        if rng.random() >= income_skip_rate:
+            transactions.append(
+                make_transaction(
+                    f"income-{month}",
+                    -salary,
+                    dt.date(year, month_index + 1, 1),
+                    name="Payroll",
+                    category="INCOME_WAGES",
+                )
+            )
+    for i in range(spend_count):
+        year, month_index = divmod(first_month + i * months // spend_count, 12)
+        date = dt.date(year, month_index + 1, rng.randint(1, 28))
+        if rng.random() < overdraft_rate:
+            transactions.append(
+                make_transaction(
+                    f"t{i}",
+                    35.0,
+                    date,
+                    name="Overdraft fee",
+                    category="BANK_FEES_OVERDRAFT_FEES",
+                )
+            )
+        else:
+            transactions.append(
+                make_transaction(
+                    f"t{i}",
+                    round(rng.expovariate(1 / mean_spend), 2),
+                    date,
+                    category="GENERAL_MERCHANDISE_OTHER_GENERAL_MERCHANDISE",
+                )
+            )
+    transactions.sort(key=lambda tx: tx["date"])
+    return transactions
+
+
+class PlaidStub(StubServer):
+    """
+    Minimal Plaid API server.
+
+    Every call to `add`, `modify` or `remove` appends to a change log; a sync
+    cursor is simply the number of log entries already returned, so a client
+    paging with `next_cursor` sees each change exactly once. Setting
+    `mutate_during_pagination` fails that many upcoming requests that carry a
+    non-initial cursor, like Plaid does when data changes mid-pagination.
+    `sync_outages` fails that many upcoming `transactions/sync` requests with
+    a 500, like a transient Plaid outage. `public_tokens` maps each public
+    token the stub accepts to the item it links.
+    """
+
+    def __init__(self, latency: float = 0.0, handshake_latency: float = 0.0) -> None:
+        super().__init__(latency, handshake_latency)
+        self.calls: Counter[str] = Counter()
+        self.mutate_during_pagination = 0
+        self.sync_outages = 0
+        self.public_tokens = {PUBLIC_TOKEN: ITEM_ID}
+        self.transactions: dict[str, dict[str, Any]] = {}
+        self.changes: list[tuple[str, dict[str, Any]]] = []
+        self.liability_accounts: list[dict[str, Any]] = [
+            {
+                "account_id": ACCOUNT_ID,
+                "balances": {
+                    "available": None,
+                    "current": 410.0,
+                    "limit": 2000.0,
+                    "iso_currency_code": "USD",
+                    "unofficial_currency_code": None,
+                },
+                "mask": "0000",
+                "name": "Credit Card",
+                "official_name": None,
+                "type": "credit",
+                "subtype": "credit card",
+            }
+        ]
+
+    def routes(self, app: web.Application) -> None:
+        app.router.add_post(
+            "/item/public_token/exchange", self._item_public_token_exchange
+        )
+        app.router.add_post("/transactions/sync", self._transactions_sync)
+        app.router.add_post("/liabilities/get", self._liabilities_get)
+
+    def add(self, *transactions: dict[str, Any]) -> None:
+        """Record new transactions."""
+        for tx in transactions:
+            self.transactions[tx["transaction_id"]] = tx
+            self.changes.append(("added", tx))
+
+    def modify(self, transaction_id: str, **fields: Any) -> None:
+        """Update fields of an existing transaction."""
+        tx = {**self.transactions[transaction_id], **fields}
+        self.transactions[transaction_id] = tx
+        self.changes.append(("modified", tx))
+
+    def remove(self, transaction_id: str) -> None:
+        """Delete an existing transaction."""
+        tx = self.transactions.pop(transaction_id)
+        self.changes.append(("removed", tx))
+
+    async def _authorize(
+        self, request: web.Request, endpoint: str, *, needs_access_token: bool = True
+    ) -> dict[str, Any]:
+        await self.track(request)
+        self.calls[endpoint] += 1
+        if (
+            request.headers.get("PLAID-CLIENT-ID") != CLIENT_ID
+            or request.headers.get("PLAID-SECRET") != SECRET
+        ):
+            msg = "invalid client_id or secret"
+            raise self._error(msg, "INVALID_API_KEYS")
+        body = await request.json()
+        if needs_access_token and body.get("access_token") != ACCESS_TOKEN:
+            msg = "provided access token is invalid"
+            raise self._error(msg, "INVALID_ACCESS_TOKEN")
+        return body
+
+    @staticmethod
+    def _error(
+        message: str, error_code: str, error_type: str = "INVALID_INPUT"
+    ) -> web.HTTPException:
+        body = {
+            "error_type": error_type,
+            "error_code": error_code,
+            "error_message": message,
+            "display_message": None,
+            "request_id": "stub",
+        }
+        return web.HTTPBadRequest(
+            text=json.dumps(body), content_type="application/json"
+        )
+
+    async def _item_public_token_exchange(self, request: web.Request) -> web.Response:
+        body = await self._authorize(
+            request, "item_public_token_exchange", needs_access_token=False
+        )
+        item_id = self.public_tokens.get(body.get("public_token"))
+        if item_id is None:
+            msg = "provided public token is expired or invalid"
+            raise self._error(msg, "INVALID_PUBLIC_TOKEN")
+        return web.json_response(
+            {"access_token": ACCESS_TOKEN, "item_id": item_id, "request_id": "stub"}
+        )
+
+    async def _transactions_sync(self, request: web.Request) -> web.Response:
+        body = await self._authorize(request, "transactions_sync")
+        if self.sync_outages:
+            self.sync_outages -= 1
+            raise web.HTTPInternalServerError(
+                text=json.dumps({"error_code": "INTERNAL_SERVER_ERROR"}),
+                content_type="application/json",
+            )
+        start = int(body.get("cursor") or 0)
+        if start and self.mutate_during_pagination:
+            self.mutate_during_pagination -= 1
+            msg = "underlying transaction data changed since last page was fetched"
+            raise self._error(
+                msg,
+                "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION",
+                "TRANSACTIONS_ERROR",
+            )
+        end = min(start + body.get("count", 100), len(self.changes))
+        page: dict[str, list[dict[str, Any]]] = {
+            "added": [],
+            "modified": [],
+            "removed": [],
+        }
+        for kind, tx in self.changes[start:end]:
+            if kind == "removed":
+                page[kind].append(
+                    {
+                        "transaction_id": tx["transaction_id"],
+                        "account_id": tx["account_id"],
+                    }
+                )
+            else:
+                page[kind].append(tx)
+        return web.json_response(
+            {
+                **page,
+                "accounts": [],
+                "next_cursor": str(end),
+                "has_more": end < len(self.changes),
+                "transactions_update_status": "HISTORICAL_UPDATE_COMPLETE",
+                "request_id": "stub",
+            }
+        )
+
+    async def _liabilities_get(self, request: web.Request) -> web.Response:
+        await self._authorize(request, "liabilities_get")
+        return web.json_response(
+            {
+                "accounts": self.liability_accounts,
+                "item": {
+                    "item_id": ITEM_ID,
+                    "webhook": None,
+                    "error": None,
+                    "available_products": [],
+                    "billed_products": ["liabilities"],
+                    "consent_expiration_time": None,
+                    "update_type": "background",
+                },
+                "liabilities": {"credit": [], "mortgage": [], "student": []},
+                "request_id": "stub",
+            }
+        )
@@ -0,0 +1,190 @@
+"""
+In-process JSON-RPC node for exercising the Flare providers without a chain.
+
+Serves the subset of `eth_*` methods the providers use over real HTTP, counts
+round trips, method calls and client connections, and keeps just enough chain
+state (nonces, pending pool, receipts) to behave like a local dev chain.
+"""
+
+import asyncio
+from collections import Counter
+from typing import Any
+
+from aiohttp import web
+from eth_account import Account
+from eth_account.typed_transactions import TypedTransaction
+from eth_utils import keccak, to_checksum_address
+from hexbytes import HexBytes
+
+from .stub_server import StubServer
+
+CHAIN_ID = 114
+GAS_PRICE = 25 * 10**9
+PRIORITY_FEE = 10**9
+BALANCE = 100 * 10**18
+GAS_USED = 21000
+
+
+class RPCStubError(Exception):
+    """Raised by an RPC handler to return a JSON-RPC error."""
+
+
+class RPCStub(StubServer):
+    """
+    Minimal dev-chain JSON-RPC server.
+
+    With `block_time=None` every accepted transaction is mined immediately
+    (or only on explicit `mine()` calls when `automine` is False), otherwise
+    blocks are mined every `block_time` seconds. Transactions are only mined
+    in nonce order, so a nonce gap stalls the sender like a real node would.
+    Setting `fail_sends` rejects that many upcoming sends.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        block_time: float | None = None,
+        *,
+        automine: bool = True,
+    ) -> None:
+        super().__init__(latency)
+        self.block_time = block_time
+        self.automine = automine
+        self.fail_sends = 0
+        self.calls: Counter[str] = Counter()
+        self.block_number = 0
+        self.mined_nonces: dict[str, int] = {}
+        self.pending: dict[str, dict[int, dict[str, Any]]] = {}
+        self.receipts: dict[str, dict[str, Any]] = {}
+        self._miner: asyncio.Task[None] | None = None
+
+    def routes(self, app: web.Application) -> None:
+        app.router.add_post("/", self._handle)
+
+    async def start(self) -> str:
+        """Start serving and, with a block time, the periodic miner."""
+        url = await super().start()
+        if self.block_time is not None:
+            self._miner = asyncio.create_task(self._mine_periodically())
+        return url
+
+    async def close(self) -> None:
+        """Stop the miner and the server."""
+        if self._miner is not None:
+            self._miner.cancel()
+        await super().close()
+
+    async def _mine_periodically(self) -> None:
+        assert self.block_time is not None
+        while True:
+            await asyncio.sleep(self.block_time)
+            self.mine()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        await self.track(request)
+        payload = await request.json()
+        if isinstance(payload, list):
+            return web.json_response([self._dispatch(p) for p in payload])
+        return web.json_response(self._dispatch(payload))
+
+    def _dispatch(self, request: dict[str, Any]) -> dict[str, Any]:
+        method = request["method"]
+        self.calls[method] += 1
+        response: dict[str, Any] = {"jsonrpc": "2.0", "id": request["id"]}
+        handler = getattr(self, f"rpc_{method}", None)
+        if handler is None:
+            response["error"] = {"code": -32601, "message": f"{method} not found"}
+            return response
+        try:
+            response["result"] = handler(*request.get("params", []))
+        except RPCStubError as e:
+            response["error"] = {"code": -32000, "message": str(e)}
+        return response
+
+    def next_nonce(self, address: str) -> int:
+        """Next nonce the chain expects from `address`, ignoring the pool."""
+        return self.mined_nonces.get(address.lower(), 0)
+
+    def mine(self) -> int:
+        """Mine every pending transaction that is next in nonce order."""
+        self.block_number += 1
+        for sender, pool in self.pending.items():
+            nonce = self.mined_nonces.get(sender, 0)
+            index = 0
+            while nonce in pool:
+                tx = pool.pop(nonce)
+                self.receipts[tx["hash"]] = self._receipt(tx, index)
+                nonce += 1
+                index += 1
+            self.mined_nonces[sender] = nonce
+        return self.block_number
+
+    def _receipt(self, tx: dict[str, Any], index: int) -> dict[str, Any]:
+        return {
+            "transactionHash": tx["hash"],
+            "transactionIndex": hex(index),
+            "blockHash": "0x" + self.block_number.to_bytes(32).hex(),
+            "blockNumber": hex(self.block_number),
+            "from": tx["from"],
+            "to": tx["to"],
+            "cumulativeGasUsed": hex(GAS_USED * (index + 1)),
+            "gasUsed": hex(GAS_USED),
+            "effectiveGasPrice": hex(GAS_PRICE),
+            "contractAddress": None,
+            "logs": [],
+            "logsBloom": "0x" + "00" * 256,
+            "status": "0x1",
+            "type": "0x2",
+        }
+
+    def rpc_eth_chainId(self) -> str:  # noqa: N802
+        return hex(CHAIN_ID)
+
+    def rpc_eth_gasPrice(self) -> str:  # noqa: N802
+        return hex(GAS_PRICE)
+
+    def rpc_eth_maxPriorityFeePerGas(self) -> str:  # noqa: N802
+        return hex(PRIORITY_FEE)
+
+    def rpc_eth_blockNumber(self) -> str:  # noqa: N802
+        return hex(self.block_number)
+
+    def rpc_eth_getBalance(self, address: str, _block: str = "latest") -> str:  # noqa: N802
+        return hex(BALANCE)
+
+    def rpc_eth_getTransactionCount(self, address: str, block: str = "latest") -> str:  # noqa: N802
+        nonce = self.next_nonce(address)
+        if block == "pending":
+            pool = self.pending.get(address.lower(), {})
+            while nonce in pool:
+                nonce += 1
+        return hex(nonce)
+
+    def rpc_eth_sendRawTransaction(self, raw: str) -> str:  # noqa: N802
+        if self.fail_sends:
+            self.fail_sends -= 1
+            msg = "insufficient funds for gas * price + value"
+            raise RPCStubError(msg)
+        raw_bytes = HexBytes(raw)
+        fields = TypedTransaction.from_bytes(raw_bytes).as_dict()
+        sender = Account.recover_transaction(raw_bytes).lower()
+        nonce = fields["nonce"]
+        pool = self.pending.setdefault(sender, {})
+        if nonce < self.mined_nonces.get(sender, 0):
+            msg = "nonce too low"
+            raise RPCStubError(msg)
+        if nonce in pool:
+            msg = "already known"
+            raise RPCStubError(msg)
+        tx_hash = "0x" + keccak(raw_bytes).hex()
+        pool[nonce] = {
+            "hash": tx_hash,
+            "from": to_checksum_address(sender),
+            "to": to_checksum_address(fields["to"]),
+        }
+        if self.block_time is None and self.automine:
+            self.mine()
+        return tx_hash
+
+    def rpc_eth_getTransactionReceipt(self, tx_hash: str) -> dict[str, Any] | None:  # noqa: N802
+        return self.receipts.get(tx_hash)
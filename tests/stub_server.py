@@ -0,0 +1,93 @@
+"""
+Base class for the in-process HTTP stand-ins used by tests and benchmarks.
+
+Serves an aiohttp application on an ephemeral localhost port (or a Unix
+socket), either on the caller's event loop or from a background thread for
+blocking clients, and counts round trips and the client connections they
+arrived on.
+"""
+
+import asyncio
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from aiohttp import web
+
+
+class StubServer:
+    """
+    Local HTTP server counting requests and connections.
+
+    Subclasses register their handlers in `routes` and call `track` at the
+    start of each one. With `handshake_latency` set, the first request on each
+    new connection is delayed by that much extra, standing in for the TCP and
+    TLS setup a real remote API costs.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        handshake_latency: float = 0.0,
+        unix_path: str | None = None,
+    ) -> None:
+        self.latency = latency
+        self.handshake_latency = handshake_latency
+        self.unix_path = unix_path
+        self.round_trips = 0
+        self.peers: set[object] = set()
+        self.url = ""
+        self._runner: web.AppRunner | None = None
+
+    def routes(self, app: web.Application) -> None:
+        """Register the request handlers on `app`."""
+        raise NotImplementedError
+
+    async def start(self) -> str:
+        """Start serving on an ephemeral localhost port and return its URL."""
+        app = web.Application()
+        self.routes(app)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        if self.unix_path is not None:
+            await web.UnixSite(self._runner, self.unix_path).start()
+            self.url = "http://localhost"
+            return self.url
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def close(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    @contextmanager
+    def running_in_thread(self) -> Iterator[str]:
+        """Serve from a background event loop, for blocking clients."""
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        url = asyncio.run_coroutine_threadsafe(self.start(), loop).result()
+        try:
+            yield url
+        finally:
+            asyncio.run_coroutine_threadsafe(self.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+
+    async def track(self, request: web.Request) -> None:
+        """Count a request and apply the simulated latencies."""
+        self.round_trips += 1
+        delay = self.latency
+        if request.transport is not None:
+            # Unix socket peers have no address; tell connections apart by
+            # transport, kept referenced so it is not mistaken for a later one
+            peer = request.transport.get_extra_info("peername") or request.transport
+            if peer not in self.peers:
+                self.peers.add(peer)
+                delay += self.handshake_latency
+        if delay:
+            await asyncio.sleep(delay)
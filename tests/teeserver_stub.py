@@ -0,0 +1,64 @@
+"""
+In-process stand-in for the Confidential Space teeserver.
+
+Serves `POST /v1/token` on a Unix socket like the launcher's
+`teeserver.sock`, answering each request with a token naming its nonces, so
+tests can check which token went to which caller. Like the real teeserver it
+rejects requests carrying more nonces than one token may hold.
+"""
+
+import json
+import time
+
+import jwt
+from aiohttp import web
+
+from .stub_server import StubServer
+
+
+class TeeServerStub(StubServer):
+    """
+    Attestation token endpoint counting requests and connections.
+
+    Attributes:
+        requests: Request bodies received, in order
+        failures: Number of upcoming requests answered with a 500
+        max_nonces: Most nonces accepted in one request
+        token_ttl: If set, tokens are JWTs expiring after this many seconds
+    """
+
+    def __init__(
+        self, unix_path: str, latency: float = 0.0, max_nonces: int = 6
+    ) -> None:
+        super().__init__(latency=latency, unix_path=unix_path)
+        self.requests: list[dict] = []
+        self.failures = 0
+        self.max_nonces = max_nonces
+        self.token_ttl: float | None = None
+
+    def routes(self, app: web.Application) -> None:
+        app.router.add_post("/v1/token", self.token)
+
+    async def token(self, request: web.Request) -> web.Response:
+        await self.track(request)
+        body = await request.json()
+        self.requests.append(body)
+        if self.failures:
+            self.failures -= 1
+            return web.Response(status=500, reason="Internal Server Error")
+        if len(body["nonces"]) > self.max_nonces:
+            return web.Response(status=400, reason="Too many nonces")
+        if self.token_ttl is not None:
+            claims = {
+                "eat_nonce": body["nonces"],
+                "exp": int(time.time() + self.token_ttl),
+            }
+            return web.Response(
+                text=jwt.encode(claims, "teeserver-stub-signing-key-0123456789")
+            )
+        return web.Response(text=make_token(body["nonces"], body["token_type"]))
+
+
+def make_token(nonces: list[str], token_type: str = "OIDC") -> str:  # noqa: S107
+    """The token the stub issues for `nonces`."""
+    return f"{token_type}.{json.dumps(nonces, separators=(',', ':'))}"
@@ -0,0 +1,133 @@
+import asyncio
+
+from flare_ai_defai.ai import CoalescingProvider, create_http_client
+from flare_ai_defai.ai.openrouter import OpenRouterChatProvider
+from flare_ai_defai.exceptions import AIProviderError
+from flare_ai_defai.metrics import REGISTRY
+from flare_ai_defai.prompts import PromptService
+
+from .llm_stub import LLMStub
+
+CONCURRENCY = 50
+LATENCY = 0.1
+CACHE_TTL = 5.0
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_identical_concurrent_requests_share_one_upstream_call() -> None:
+    stub = LLMStub("llm", latency=LATENCY)
+
+    async def run() -> tuple[CoalescingProvider, list[str]]:
+        client = create_http_client()
+        upstream = OpenRouterChatProvider(
+            "key", "stub/model", base_url=await stub.start(), client=client
+        )
+        ai = CoalescingProvider(upstream, name="burst")
+        try:
+            responses = await asyncio.gather(
+                *(ai.agenerate("same prompt") for _ in range(CONCURRENCY)),
+                ai.agenerate("same prompt", response_mime_type="application/json"),
+                ai.agenerate("other prompt"),
+            )
+            # Nothing is cached without a TTL
+            await ai.agenerate("same prompt")
+
+            # Every waiter sees the failure of the shared call
+            stub.failures = 1
+            failures = await asyncio.gather(
+                ai.agenerate("failing"), ai.agenerate("failing"), return_exceptions=True
+            )
+            assert all(isinstance(f, AIProviderError) for f in failures)
+            return ai, [r.text for r in responses]
+        finally:
+            await client.aclose()
+            await stub.close()
+
+    ai, texts = asyncio.run(run())
+
+    assert set(texts[:CONCURRENCY]) == {"llm: same prompt"}
+    assert texts[-1] == "llm: other prompt"
+    # One call for the burst, one per distinct key, one after, one failure
+    assert len(stub.requests) == ai.issued == 5  # noqa: PLR2004
+    # The rest of the burst and the second failing request waited instead
+    assert ai.coalesced == CONCURRENCY
+    assert ai.cache.stats.hits == 0
+    # Both counts are exported on /metrics
+    text = REGISTRY.render()
+    assert 'llm_coalesced_requests_total{provider="burst",outcome="issued"} 5.0' in (
+        text
+    )
+    assert (
+        f'llm_coalesced_requests_total{{provider="burst",outcome="coalesced"}} '
+        f"{float(CONCURRENCY)}"
+    ) in text
+
+
+def test_deterministic_responses_are_cached_until_they_expire() -> None:
+    stub = LLMStub("llm")
+    clock = FakeClock()
+    prompts = PromptService()
+    routing, mime_type, schema = prompts.get_formatted_prompt(
+        "semantic_router", user_input="send 1 FLR to bob"
+    )
+    chat, _, _ = prompts.get_formatted_prompt("conversational", user_input="hi")
+
+    async def run() -> CoalescingProvider:
+        client = create_http_client()
+        upstream = OpenRouterChatProvider(
+            "key", "stub/model", base_url=await stub.start(), client=client
+        )
+        ai = CoalescingProvider(
+            upstream,
+            cache_ttl=CACHE_TTL,
+            cacheable=prompts.is_deterministic,
+            clock=clock,
+        )
+        try:
+            for _ in range(3):
+                await ai.agenerate(routing, mime_type, schema)
+                await ai.agenerate(chat)
+            clock.now = CACHE_TTL
+            await ai.agenerate(routing, mime_type, schema)
+            return ai
+        finally:
+            await client.aclose()
+            await stub.close()
+
+    ai = asyncio.run(run())
+
+    assert ai.cache.stats.hits == 2  # noqa: PLR2004
+    # Routing twice (before and after expiry), the conversational prompt each time
+    assert ai.issued == len(stub.requests) == 5  # noqa: PLR2004
+
+
+def test_cache_is_bounded() -> None:
+    stub = LLMStub("llm")
+
+    async def run() -> CoalescingProvider:
+        client = create_http_client()
+        upstream = OpenRouterChatProvider(
+            "key", "stub/model", base_url=await stub.start(), client=client
+        )
+        ai = CoalescingProvider(
+            upstream, cache_ttl=CACHE_TTL, cacheable=lambda _: True, cache_size=2
+        )
+        try:
+            for prompt in ("a", "b", "c", "a"):
+                await ai.agenerate(prompt)
+            return ai
+        finally:
+            await client.aclose()
+            await stub.close()
+
+    ai = asyncio.run(run())
+
+    # "a" was evicted by "c" and had to be generated again
+    assert ai.issued == 4  # noqa: PLR2004
@@ -0,0 +1,204 @@
+import asyncio
+import json
+import time
+from typing import Any, override
+
+import pytest
+
+from flare_ai_defai.ai import (
+    BreakerState,
+    OpenRouterChatProvider,
+    ProviderPool,
+    create_http_client,
+)
+from flare_ai_defai.exceptions import AIProviderError
+from flare_ai_defai.prompts import PromptService, SemanticRouterResponse
+
+from .llm_stub import LLMStub
+
+SLOW_LATENCY = 1.0
+HEDGE_AFTER = 0.05
+
+
+async def start(*stubs: LLMStub) -> list[OpenRouterChatProvider]:
+    client = create_http_client()
+    return [
+        OpenRouterChatProvider(
+            "key", "stub/model", base_url=await s.start(), client=client
+        )
+        for s in stubs
+    ]
+
+
+async def close(providers: list[OpenRouterChatProvider], *stubs: LLMStub) -> None:
+    await providers[0].client.aclose()
+    for stub in stubs:
+        await stub.close()
+
+
+def test_openrouter_provider_continues_gemini_history() -> None:
+    stub = LLMStub("router")
+    history: list[dict[str, Any]] = [{"parts": ["Hi, I'm Artemis"], "role": "model"}]
+
+    async def run() -> tuple[str, list[str]]:
+        [provider] = await start(stub)
+        try:
+            reply = await provider.asend_message("hello", history)
+            chunks = [c async for c in provider.astream_message("and again", history)]
+            await provider.agenerate("{}", response_mime_type="application/json")
+            stub.failures = 1
+            with pytest.raises(AIProviderError, match="503"):
+                await provider.agenerate("fail")
+            return reply.text, chunks
+        finally:
+            await close([provider], stub)
+
+    text, chunks = asyncio.run(run())
+
+    assert text == "router: hello"
+    assert chunks == ["router:", " and", " again"]
+    assert [(m["role"], m["content"]) for m in stub.requests[0]["messages"][1:]] == [
+        ("assistant", "Hi, I'm Artemis"),
+        ("user", "hello"),
+    ]
+    assert stub.requests[0]["messages"][0]["role"] == "system"
+    assert stub.requests[1]["stream"] is True
+    assert stub.requests[2]["response_format"] == {"type": "json_object"}
+    # Turns are recorded the way GeminiProvider records them
+    assert history[1:] == [
+        {"parts": ["hello"], "role": "user"},
+        {"parts": ["router: hello"], "role": "model"},
+        {"parts": ["and again"], "role": "user"},
+        {"parts": ["router: and again"], "role": "model"},
+    ]
+
+
+class RouteStub(LLMStub):
+    """Answers with a route, wrapped as its JSON schema asks unless `bare`."""
+
+    def __init__(self, name: str, *, bare: bool = False) -> None:
+        super().__init__(name)
+        self.bare = bare
+
+    @override
+    def reply(self, body: dict) -> str:
+        route = SemanticRouterResponse.SEND_TOKEN.value
+        return route if self.bare else json.dumps({"value": route})
+
+
+def test_openrouter_members_answer_schema_constrained_prompts() -> None:
+    structured, bare = RouteStub("structured"), RouteStub("bare", bare=True)
+    prompt, mime_type, schema = PromptService().get_formatted_prompt(
+        "semantic_router", user_input="send 1 FLR to 0xabc"
+    )
+
+    async def run() -> list[str]:
+        providers = await start(structured, bare)
+        pool = ProviderPool(dict(zip(["structured", "bare"], providers, strict=True)))
+        try:
+            responses = [
+                await pool.agenerate(prompt, mime_type, schema) for _ in range(4)
+            ]
+            return [response.text for response in responses]
+        finally:
+            await close(providers, structured, bare)
+
+    routes = asyncio.run(run())
+
+    assert {SemanticRouterResponse(route) for route in routes} == {
+        SemanticRouterResponse.SEND_TOKEN
+    }
+    assert bare.requests
+    response_format = structured.requests[0]["response_format"]
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["schema"]["properties"]["value"]["enum"] == [
+        route.value for route in SemanticRouterResponse
+    ]
+
+
+def test_pool_prefers_fastest_and_breaks_failing_circuit() -> None:
+    slow, fast = LLMStub("slow", latency=0.05), LLMStub("fast")
+
+    async def run() -> list[str]:
+        providers = await start(slow, fast)
+        pool = ProviderPool(
+            dict(zip(["slow", "fast"], providers, strict=True)),
+            failure_threshold=2,
+            reset_timeout=0.2,
+        )
+        try:
+            replies = [(await pool.agenerate(f"{i}")).text for i in range(6)]
+            fast.failures = 100
+            replies += [(await pool.agenerate(f"{i}")).text for i in range(6, 9)]
+            assert pool.members[1].breaker.state is BreakerState.OPEN
+            fast.failures = 0
+            await asyncio.sleep(0.2)
+            replies.append((await pool.agenerate("9")).text)
+            assert pool.members[1].breaker.state is BreakerState.CLOSED
+            return replies
+        finally:
+            await close(providers, slow, fast)
+
+    replies = asyncio.run(run())
+
+    # Each backend is measured once, then the faster one gets the traffic;
+    # while its circuit is open the slow one takes over, until a probe succeeds
+    assert [r.split(":")[0] for r in replies] == [
+        "slow",
+        *["fast"] * 5,
+        *["slow"] * 3,
+        "fast",
+    ]
+    assert len(fast.requests) == 5 + 2 + 1
+
+
+def test_hedged_request_bounds_tail_latency() -> None:
+    slow, fast = LLMStub("slow", latency=SLOW_LATENCY), LLMStub("fast")
+    history: list[dict[str, Any]] = []
+
+    async def run() -> list[float]:
+        providers = await start(slow, fast)
+        pool = ProviderPool(
+            dict(zip(["slow", "fast"], providers, strict=True)),
+            hedge_after=HEDGE_AFTER,
+        )
+        elapsed = []
+        try:
+            for msg in ("first", "second"):
+                started = time.perf_counter()
+                response = await pool.asend_message(msg, history)
+                elapsed.append(time.perf_counter() - started)
+                assert response.text == f"fast: {msg}"
+            assert pool.members[1].hedges == 1
+            return elapsed
+        finally:
+            await close(providers, slow, fast)
+
+    elapsed = asyncio.run(run())
+
+    assert all(e < SLOW_LATENCY / 2 for e in elapsed)
+    # The slow backend lost the race once and is not the primary any more
+    assert len(slow.requests) == 1
+    assert [len(b["messages"]) for b in fast.requests] == [2, 4]
+    # Only the winning reply is recorded
+    assert [entry["role"] for entry in history] == ["user", "model"] * 2
+
+
+def test_stream_fails_over_before_first_chunk() -> None:
+    broken, healthy = LLMStub("broken"), LLMStub("healthy")
+    broken.failures = 1
+    history: list[dict[str, Any]] = []
+
+    async def run() -> str:
+        providers = await start(broken, healthy)
+        pool = ProviderPool(dict(zip(["broken", "healthy"], providers, strict=True)))
+        try:
+            return "".join([c async for c in pool.astream_message("hi", history)])
+        finally:
+            await close(providers, broken, healthy)
+
+    assert asyncio.run(run()) == "healthy: hi"
+    assert history == [
+        {"parts": ["hi"], "role": "user"},
+        {"parts": ["healthy: hi"], "role": "model"},
+    ]
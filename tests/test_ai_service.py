@@ -1,7 +1,85 @@
-from flare_ai_defai.ai import GeminiProvider
+import asyncio
+import time
+from typing import Any, override
+
+from flare_ai_defai.ai import BaseAIProvider, GeminiProvider, ModelResponse
+
+CALL_LATENCY = 0.2
+PARALLEL_CHATS = 8
+
+
+class SlowSyncProvider(BaseAIProvider):
+    """Sync-only provider whose calls block for a fixed time."""
+
+    def __init__(self, api_key: str = "", model: str = "stub", **kwargs: str) -> None:
+        super().__init__(api_key, model, **kwargs)
+
+    @override
+    def reset(self) -> None:
+        self.chat_history = []
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        time.sleep(CALL_LATENCY)
+        return ModelResponse(text=prompt, raw_response=None, metadata={})
+
+    @override
+    def send_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        return self.generate(msg)
 
 
 async def test_generate() -> None:
     service = GeminiProvider("test_key", "gemini-1.5-flash")
     response = service.generate("Test prompt")
     assert response is not None
+
+
+def test_executor_fallback_runs_parallel_chats_concurrently() -> None:
+    provider = SlowSyncProvider()
+
+    async def run() -> list[ModelResponse]:
+        return await asyncio.gather(
+            *(provider.asend_message(f"msg {i}") for i in range(PARALLEL_CHATS))
+        )
+
+    start = time.perf_counter()
+    responses = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    assert [r.text for r in responses] == [f"msg {i}" for i in range(PARALLEL_CHATS)]
+    # N parallel chats should finish in about the time of one
+    assert elapsed < CALL_LATENCY * 2
+
+
+def test_gemini_agenerate_does_not_block_event_loop() -> None:
+    service = GeminiProvider("test_key", "gemini-1.5-flash")
+
+    class FakeResponse:
+        text = "ok"
+        candidates = ("ok",)
+        prompt_feedback = None
+
+    async def generate_content_async(*_: Any, **__: Any) -> FakeResponse:
+        await asyncio.sleep(CALL_LATENCY)
+        return FakeResponse()
+
+    service.model.generate_content_async = generate_content_async  # pyright: ignore [reportAttributeAccessIssue]
+
+    async def run() -> list[ModelResponse]:
+        return await asyncio.gather(
+            *(service.agenerate(f"prompt {i}") for i in range(PARALLEL_CHATS))
+        )
+
+    start = time.perf_counter()
+    responses = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    assert all(r.text == "ok" for r in responses)
+    assert elapsed < CALL_LATENCY * 2
@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+from flare_ai_defai.blockchain import AsyncFlareProvider, WalletState
+
+from .rpc_stub import BALANCE, CHAIN_ID, GAS_PRICE, RPCStub
+
+RPC_LATENCY = 0.1
+CONCURRENT_REQUESTS = 20
+SEQUENTIAL_REQUESTS = 10
+TX_BUILDS = 5
+RECIPIENT = "0x000000000000000000000000000000000000dEaD"
+
+
+def test_concurrent_balance_checks_overlap() -> None:
+    async def run() -> tuple[list[float], float]:
+        stub = RPCStub(latency=RPC_LATENCY)
+        provider = AsyncFlareProvider(await stub.start())
+        wallet = WalletState()
+        provider.generate_account(wallet)
+        try:
+            start = time.perf_counter()
+            balances = await asyncio.gather(
+                *(provider.check_balance(wallet) for _ in range(CONCURRENT_REQUESTS))
+            )
+            return balances, time.perf_counter() - start
+        finally:
+            await provider.close()
+            await stub.close()
+
+    balances, elapsed = asyncio.run(run())
+    assert balances == [BALANCE / 10**18] * CONCURRENT_REQUESTS
+    # N concurrent checks take a few round trips at most, not N
+    assert elapsed < RPC_LATENCY * CONCURRENT_REQUESTS / 4
+
+
+def test_sequential_calls_reuse_one_connection() -> None:
+    async def run() -> RPCStub:
+        stub = RPCStub()
+        provider = AsyncFlareProvider(await stub.start())
+        provider.generate_account()
+        try:
+            for _ in range(SEQUENTIAL_REQUESTS):
+                await provider.check_balance()
+        finally:
+            await provider.close()
+            await stub.close()
+        return stub
+
+    stub = asyncio.run(run())
+    assert stub.round_trips == SEQUENTIAL_REQUESTS
+    assert len(stub.peers) == 1
+
+
+def test_build_and_send_transaction() -> None:
+    async def run() -> tuple[dict, str, RPCStub]:
+        stub = RPCStub(latency=RPC_LATENCY)
+        provider = AsyncFlareProvider(await stub.start())
+        wallet = WalletState()
+        provider.generate_account(wallet)
+        try:
+            start = time.perf_counter()
+            tx = await provider.create_send_flr_tx(RECIPIENT, 1.5, wallet)
+            # The fee and chain id lookups share one round trip
+            assert time.perf_counter() - start < RPC_LATENCY * 2
+            provider.add_tx_to_queue("send", tx, wallet)
+            tx_hash = await provider.send_tx_in_queue(wallet)
+        finally:
+            await provider.close()
+            await stub.close()
+        return dict(tx), tx_hash, stub
+
+    tx, tx_hash, stub = asyncio.run(run())
+    assert tx["chainId"] == CHAIN_ID
+    assert tx["value"] == 15 * 10**17
+    assert tx_hash in stub.receipts
+
+
+def test_tx_fields_are_batched_and_cached() -> None:
+    async def run(fee_cache_ttl: float) -> RPCStub:
+        stub = RPCStub()
+        provider = AsyncFlareProvider(await stub.start(), fee_cache_ttl=fee_cache_ttl)
+        wallet = WalletState()
+        provider.generate_account(wallet)
+        try:
+            for _ in range(TX_BUILDS):
+                tx = await provider.create_send_flr_tx(RECIPIENT, 1.0, wallet)
+                assert tx["maxFeePerGas"] == GAS_PRICE
+        finally:
+            await provider.close()
+            await stub.close()
+        return stub
+
+    # With warm caches a preview needs no RPC at all; nonces come at send time
+    warm = asyncio.run(run(fee_cache_ttl=60.0))
+    assert warm.round_trips == 1
+    assert warm.calls["eth_getTransactionCount"] == 0
+    assert warm.calls["eth_gasPrice"] == 1
+    assert warm.calls["eth_chainId"] == 1
+
+    # Expired fees are refetched in the same batch; the chain id never is
+    cold = asyncio.run(run(fee_cache_ttl=0.0))
+    assert cold.round_trips == TX_BUILDS
+    assert cold.calls["eth_maxPriorityFeePerGas"] == TX_BUILDS
+    assert cold.calls["eth_chainId"] == 1
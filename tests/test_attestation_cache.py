@@ -0,0 +1,192 @@
+import time
+from collections.abc import Callable
+
+import jwt
+import pytest
+from requests.structures import CaseInsensitiveDict
+
+from flare_ai_defai.attestation import (
+    VtpmValidation,
+    VtpmValidationError,
+    WellKnownCache,
+)
+from flare_ai_defai.attestation.well_known_cache import cache_lifetime
+
+from .attestation_stub import (
+    JWKS_ENDPOINT,
+    OIDC_ENDPOINT,
+    PKI_ENDPOINT,
+    IssuerStub,
+    fingerprint,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            msg = "Condition not met in time"
+            raise TimeoutError(msg)
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize(
+    ("header", "age", "expected"),
+    [
+        ("public, max-age=3600", None, (3600.0, 0.0)),
+        ("max-age=600, stale-while-revalidate=60", "100", (500.0, 60.0)),
+        ('max-age="30"', None, (30.0, 0.0)),
+        ("no-store", None, (0.0, 0.0)),
+        ("public", None, (300.0, 0.0)),
+        ("max-age=999999", None, (86_400.0, 0.0)),
+    ],
+)
+def test_cache_lifetime(
+    header: str, age: str | None, expected: tuple[float, float]
+) -> None:
+    headers = CaseInsensitiveDict({"cache-control": header})
+    if age is not None:
+        headers["Age"] = age
+    assert cache_lifetime(headers, default_ttl=300.0, max_ttl=86_400.0) == expected
+
+
+def test_steady_state_validation_makes_no_network_calls() -> None:
+    stub = IssuerStub()
+    with stub.running_in_thread() as url:
+        validator = VtpmValidation(expected_issuer=url)
+        token = stub.sign("key-1", sub="enclave")
+        assert validator.validate_token(token)["sub"] == "enclave"
+        assert stub.round_trips == len([OIDC_ENDPOINT, JWKS_ENDPOINT])
+
+        for _ in range(50):
+            validator.validate_token(token)
+        # A second validator sharing the cache does not fetch either
+        VtpmValidation(
+            expected_issuer=url, well_known_cache=validator.well_known_cache
+        ).validate_token(token)
+
+    assert stub.round_trips == len([OIDC_ENDPOINT, JWKS_ENDPOINT])
+    assert validator.well_known_cache.stats.misses == len(
+        [OIDC_ENDPOINT, JWKS_ENDPOINT]
+    )
+
+
+def test_unknown_kid_refreshes_jwks_once() -> None:
+    stub = IssuerStub()
+    clock = FakeClock()
+    with stub.running_in_thread() as url:
+        validator = VtpmValidation(
+            expected_issuer=url,
+            well_known_cache=WellKnownCache(clock=clock),
+            min_jwks_refresh=30.0,
+        )
+        validator.validate_token(stub.sign("key-1"))
+
+        # Tokens with a bogus kid cannot make the validator hammer the issuer
+        clock.now += 60
+        token = forged(stub)
+        for _ in range(5):
+            with pytest.raises(VtpmValidationError, match="kid"):
+                validator.validate_token(token)
+        assert stub.requests[JWKS_ENDPOINT] == len(["first", "bogus kid"])
+
+        # The issuer rotates its key: the first token signed with it refreshes
+        clock.now += 60
+        stub.rotate("key-2")
+        for _ in range(5):
+            assert validator.validate_token(stub.sign("key-2", sub="rotated"))
+        assert validator.validate_token(stub.sign("key-1"))
+
+    assert stub.requests[JWKS_ENDPOINT] == len(["first", "bogus kid", "rotation"])
+    assert stub.requests[OIDC_ENDPOINT] == 1
+
+
+def forged(stub: IssuerStub) -> str:
+    """Sign a token with a key the issuer never published."""
+    stub.rotate("unpublished")
+    token = stub.sign("unpublished")
+    del stub.keys["unpublished"]
+    return token
+
+
+def test_stale_documents_are_served_while_revalidating() -> None:
+    stub = IssuerStub(cache_control="max-age=60, stale-while-revalidate=600")
+    clock = FakeClock()
+    with stub.running_in_thread() as url:
+        cache = WellKnownCache(clock=clock)
+        validator = VtpmValidation(expected_issuer=url, well_known_cache=cache)
+        token = stub.sign("key-1")
+        validator.validate_token(token)
+
+        # Stale: served from the cache, refreshed in the background
+        clock.now += 120
+        validator.validate_token(token)
+        wait_for(lambda: stub.round_trips == 2 * len([OIDC_ENDPOINT, JWKS_ENDPOINT]))
+        validator.validate_token(token)
+        assert stub.round_trips == 2 * len([OIDC_ENDPOINT, JWKS_ENDPOINT])
+
+        # Past the stale window the documents are fetched before validating
+        clock.now += 10_000
+        stub.cache_control = "no-store"
+        validator.validate_token(token)
+        validator.validate_token(token)
+
+    assert stub.round_trips == 4 * len([OIDC_ENDPOINT, JWKS_ENDPOINT])
+
+
+def test_verified_chains_skip_certificate_checks(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    verifications: list[object] = []
+    verify = VtpmValidation._verify_certificate_chain  # noqa: SLF001
+    monkeypatch.setattr(
+        VtpmValidation,
+        "_verify_certificate_chain",
+        staticmethod(lambda certs: verifications.append(certs) or verify(certs)),
+    )
+    stub = IssuerStub()
+    with stub.running_in_thread() as url:
+        validator = VtpmValidation(
+            expected_issuer=url, root_fingerprint=fingerprint(stub.root)
+        )
+        for i in range(10):
+            assert validator.validate_token(stub.sign_pki(sub=str(i)))["sub"] == str(i)
+        assert len(verifications) == 1
+        assert stub.requests[PKI_ENDPOINT] == 1
+
+        # A cached chain does not vouch for tokens its leaf did not sign
+        header = jwt.get_unverified_header(stub.sign_pki())
+        forged = jwt.encode({"sub": "mallory"}, stub.keys["key-1"], headers=header)
+        with pytest.raises(VtpmValidationError, match="signature"):
+            validator.validate_token(forged)
+
+        # Chains are only reused while the trusted root is unchanged
+        other = IssuerStub()
+        stub.root_pem = other.root_pem
+        validator.root_fingerprint = fingerprint(other.root)
+        validator.well_known_cache.invalidate(url, PKI_ENDPOINT)
+        with pytest.raises(VtpmValidationError, match="Root certificate"):
+            validator.validate_token(stub.sign_pki())
+        assert len(verifications) == 1
+
+    assert len(validator.verified_chains) == 1
+
+
+def test_untrusted_root_is_not_cached() -> None:
+    stub = IssuerStub()
+    with stub.running_in_thread() as url:
+        validator = VtpmValidation(expected_issuer=url)
+        for _ in range(2):
+            with pytest.raises(VtpmValidationError, match="fingerprint"):
+                validator.validate_token(stub.sign_pki())
+
+    assert stub.requests[PKI_ENDPOINT] == len(["first", "second"])
+    assert len(validator.verified_chains) == 0
@@ -0,0 +1,185 @@
+import asyncio
+import math
+from pathlib import Path
+
+import jwt
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from flare_ai_defai import AsyncFlareProvider, ChatRouter, PromptService
+from flare_ai_defai.attestation import (
+    AttestationBatcher,
+    IssuedToken,
+    Vtpm,
+    VtpmAttestationError,
+)
+from flare_ai_defai.attestation.batch import MAX_NONCES_PER_TOKEN
+
+from .teeserver_stub import TeeServerStub, make_token
+from .test_receipts import PromptEchoProvider
+
+POOL_SIZE = 4
+REQUESTS = 200
+
+
+def test_concurrent_requests_share_pooled_connections(tmp_path: Path) -> None:
+    stub = TeeServerStub(str(tmp_path / "tee.sock"), latency=0.01)
+    vtpm = Vtpm(unix_socket_path=stub.unix_path, pool_size=POOL_SIZE)  # pyright: ignore [reportArgumentType]
+    nonces = [f"nonce-{i:06d}" for i in range(REQUESTS)]
+
+    async def run() -> list[str]:
+        await stub.start()
+        try:
+            tokens = await asyncio.gather(
+                *(vtpm.aget_token([nonce]) for nonce in nonces)
+            )
+            # Later requests reuse the same connections
+            tokens.append(await vtpm.aget_token([nonces[0]], token_type="PKI"))  # noqa: S106
+            return tokens
+        finally:
+            await vtpm.close()
+            await stub.close()
+
+    tokens = asyncio.run(run())
+
+    assert tokens[:-1] == [make_token([nonce]) for nonce in nonces]
+    assert tokens[-1] == make_token([nonces[0]], "PKI")
+    assert stub.round_trips == REQUESTS + 1
+    assert len(stub.peers) == POOL_SIZE
+
+
+def test_errors_and_timeouts_release_connections(tmp_path: Path) -> None:
+    stub = TeeServerStub(str(tmp_path / "tee.sock"))
+    vtpm = Vtpm(unix_socket_path=stub.unix_path, pool_size=1, request_timeout=0.2)  # pyright: ignore [reportArgumentType]
+
+    async def run() -> str:
+        await stub.start()
+        try:
+            stub.failures = 3
+            for _ in range(3):
+                with pytest.raises(VtpmAttestationError, match="500"):
+                    await vtpm.aget_token(["nonce-0000001"])
+            stub.latency = 1.0
+            with pytest.raises(VtpmAttestationError, match="Timeout"):
+                await vtpm.aget_token(["nonce-0000002"])
+            stub.latency = 0.0
+            # The single pooled connection is still usable
+            token = await vtpm.aget_token(["nonce-0000003"])
+            await stub.close()
+            with pytest.raises(VtpmAttestationError, match="reach"):
+                await vtpm.aget_token(["nonce-0000004"])
+            with pytest.raises(VtpmAttestationError, match="between"):
+                await vtpm.aget_token(["short"])
+            return token
+        finally:
+            await vtpm.close()
+            await stub.close()
+
+    assert asyncio.run(run()) == make_token(["nonce-0000003"])
+
+
+def test_blocking_client_recovers_from_errors(tmp_path: Path) -> None:
+    stub = TeeServerStub(str(tmp_path / "tee.sock"))
+    vtpm = Vtpm(unix_socket_path=stub.unix_path)  # pyright: ignore [reportArgumentType]
+    with stub.running_in_thread():
+        stub.failures = 1
+        with pytest.raises(VtpmAttestationError, match="500"):
+            vtpm.get_token(["nonce-0000001"])
+        assert vtpm.get_token(["nonce-0000002"]) == make_token(["nonce-0000002"])
+
+    assert len(stub.peers) == len(["failed", "succeeded"])
+
+
+def test_batcher_packs_coalesces_and_caches_nonces(tmp_path: Path) -> None:
+    stub = TeeServerStub(str(tmp_path / "tee.sock"), latency=0.01)
+    stub.token_ttl = 3600
+    vtpm = Vtpm(unix_socket_path=stub.unix_path)  # pyright: ignore [reportArgumentType]
+    batcher = AttestationBatcher(vtpm)
+    nonces = [f"nonce-{i:06d}" for i in range(20)]
+
+    async def run() -> tuple[dict[str, IssuedToken], ...]:
+        await stub.start()
+        try:
+            # Overlapping concurrent requests share in-flight tokens
+            first, second = await asyncio.gather(
+                batcher.issue([*nonces, nonces[0]]), batcher.issue(nonces[10:])
+            )
+            assert len(stub.requests) == math.ceil(len(nonces) / MAX_NONCES_PER_TOKEN)
+            # Served from the cache
+            cached = await batcher.issue(nonces[::-1])
+            assert len(stub.requests) == math.ceil(len(nonces) / MAX_NONCES_PER_TOKEN)
+            return first, second, cached
+        finally:
+            await vtpm.close()
+            await stub.close()
+
+    first, second, cached = asyncio.run(run())
+
+    assert list(first) == nonces
+    assert list(cached) == nonces[::-1]
+    for nonce, issued in first.items():
+        claims = jwt.decode(issued.token, options={"verify_signature": False})
+        assert claims["eat_nonce"] == list(issued.nonces)
+        assert nonce in issued.nonces
+        assert issued.expires_at == claims["exp"]
+        assert second.get(nonce, issued) == issued == cached[nonce]
+    assert all(len(body["nonces"]) <= MAX_NONCES_PER_TOKEN for body in stub.requests)
+
+
+def test_cancelled_token_request_releases_its_waiters(tmp_path: Path) -> None:
+    stub = TeeServerStub(str(tmp_path / "tee.sock"), latency=1.0)
+    vtpm = Vtpm(unix_socket_path=stub.unix_path)  # pyright: ignore [reportArgumentType]
+    batcher = AttestationBatcher(vtpm)
+    nonce = "nonce-cancelled"
+
+    async def run() -> IssuedToken:
+        await stub.start()
+        try:
+            waiter = asyncio.create_task(batcher.issue([nonce]))
+            await asyncio.sleep(0.05)
+            # e.g. the application shutting down while a token is requested
+            for task in batcher._tasks:  # noqa: SLF001
+                task.cancel()
+            with pytest.raises(VtpmAttestationError, match="cancelled"):
+                await waiter
+            assert not batcher._inflight  # noqa: SLF001
+            stub.latency = 0.0
+            return (await batcher.issue([nonce]))[nonce]
+        finally:
+            await vtpm.close()
+            await stub.close()
+
+    assert asyncio.run(run()).nonces == (nonce,)
+
+
+def test_batch_attestation_endpoint(tmp_path: Path) -> None:
+    stub = TeeServerStub(str(tmp_path / "tee.sock"))
+    vtpm = Vtpm(unix_socket_path=stub.unix_path)  # pyright: ignore [reportArgumentType]
+    chat = ChatRouter(
+        ai=PromptEchoProvider(),  # pyright: ignore [reportArgumentType]
+        blockchain=AsyncFlareProvider("http://localhost:8545"),
+        attestation=vtpm,
+        prompts=PromptService(),
+    )
+    app = FastAPI()
+    app.include_router(chat.router, prefix="/chat")
+    nonces = [f"nonce-{i:06d}" for i in range(8)]
+    with stub.running_in_thread(), TestClient(app) as client:
+        response = client.post("/chat/attestation", json={"nonces": nonces})
+        overlapping = client.post(
+            "/chat/attestation", json={"nonces": [nonces[0], "nonce-other"]}
+        )
+        invalid = client.post("/chat/attestation", json={"nonces": ["short"]})
+        stub.failures = 1
+        failed = client.post("/chat/attestation", json={"nonces": ["nonce-failing"]})
+
+    tokens = response.json()["tokens"]
+    assert [entry["nonce"] for entry in tokens] == nonces
+    assert tokens[0]["token"] == make_token(nonces[:MAX_NONCES_PER_TOKEN])
+    assert tokens[-1]["nonces"] == nonces[MAX_NONCES_PER_TOKEN:]
+    assert not any(entry["shared"] for entry in tokens)
+    # A cached nonce is answered with the token of the first request
+    assert [entry["shared"] for entry in overlapping.json()["tokens"]] == [True, False]
+    assert invalid.status_code == 422  # noqa: PLR2004
+    assert failed.status_code == 502  # noqa: PLR2004
@@ -1,7 +1,29 @@
 from flare_ai_defai.blockchain import FlareProvider
 
+from .rpc_stub import CHAIN_ID, GAS_PRICE, RPCStub
+
+RECIPIENT = "0x000000000000000000000000000000000000dEaD"
+TX_BUILDS = 2
+
 
 def test_generate_account() -> None:
     service = FlareProvider("http://localhost:8545")
     address = service.generate_account()
     assert address.startswith("0x")
+
+
+def test_send_flr_tx_fields_are_batched_and_cached() -> None:
+    stub = RPCStub()
+    with stub.running_in_thread() as url:
+        service = FlareProvider(url, fee_cache_ttl=60.0)
+        service.generate_account()
+        txs = [service.create_send_flr_tx(RECIPIENT, 1.0) for _ in range(TX_BUILDS)]
+
+    # One batch per build: the nonce, plus the fields not cached yet
+    assert stub.round_trips == TX_BUILDS
+    assert stub.calls["eth_getTransactionCount"] == TX_BUILDS
+    assert stub.calls["eth_gasPrice"] == 1
+    assert stub.calls["eth_maxPriorityFeePerGas"] == 1
+    assert stub.calls["eth_chainId"] == 1
+    assert all(tx["maxFeePerGas"] == GAS_PRICE for tx in txs)
+    assert {tx["chainId"] for tx in txs} == {CHAIN_ID}
@@ -0,0 +1,85 @@
+import json
+from collections.abc import AsyncIterator
+from typing import Any, override
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from flare_ai_defai import AsyncFlareProvider, ChatRouter, PromptService, Vtpm
+from flare_ai_defai.ai import BaseAIProvider, ModelResponse
+from flare_ai_defai.api.dependencies import SESSION_HEADER
+from flare_ai_defai.api.sse import format_sse
+
+CHUNKS = ["Hello", ", ", "multi\nline", " world"]
+
+
+class StreamingProvider(BaseAIProvider):
+    """Routes everything to conversation and streams a fixed reply."""
+
+    def __init__(self, api_key: str = "", model: str = "stub", **kwargs: str) -> None:
+        super().__init__(api_key, model, **kwargs)
+
+    @override
+    def reset(self) -> None:
+        self.chat_history = []
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        return ModelResponse(text="Conversational", raw_response=None, metadata={})
+
+    @override
+    def send_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        return ModelResponse(text="".join(CHUNKS), raw_response=None, metadata={})
+
+    @override
+    async def astream_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> AsyncIterator[str]:
+        for chunk in CHUNKS:
+            yield chunk
+        if chat_history is not None:
+            chat_history.append({"role": "user", "parts": [msg]})
+
+
+def parse_sse(body: str) -> list[tuple[str, Any]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_format_sse_keeps_newlines_in_one_event() -> None:
+    assert format_sse("token", "a\nb") == 'event: token\ndata: "a\\nb"\n\n'
+
+
+def test_chat_stream_emits_tokens_then_done() -> None:
+    chat = ChatRouter(
+        ai=StreamingProvider(),  # pyright: ignore [reportArgumentType]
+        blockchain=AsyncFlareProvider("http://localhost:8545"),
+        attestation=Vtpm(simulate=True),
+        prompts=PromptService(),
+    )
+    app = FastAPI()
+    app.include_router(chat.router, prefix="/chat")
+    client = TestClient(app)
+
+    response = client.post(
+        "/chat/stream", json={"message": "hi"}, headers={SESSION_HEADER: "s1"}
+    )
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers[SESSION_HEADER] == "s1"
+    events = parse_sse(response.text)
+    assert [data for event, data in events if event == "token"] == CHUNKS
+    assert events[-1][0] == "done"
+    assert events[-1][1]["ttft_ms"] is not None
+    # The streamed turn is recorded in the caller's session
+    assert chat.sessions.get("s1").chat_history
@@ -0,0 +1,67 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from flare_ai_defai.blockchain import AbiCache, AsyncFlareExplorer, FlareExplorer
+
+from .explorer_stub import ExplorerStub, make_abi
+
+ADDRESSES = [f"0x{i:040x}" for i in range(1, 31)]
+MAX_CONCURRENCY = 4
+
+
+def test_abis_are_cached_in_memory_and_on_disk(tmp_path: Path) -> None:
+    stub = ExplorerStub()
+    stub.abis[ADDRESSES[0]] = make_abi("totalSupply")
+    with stub.running_in_thread() as url:
+        explorer = FlareExplorer(f"{url}/api", abi_cache=AbiCache(tmp_path))
+        for address in (ADDRESSES[0], ADDRESSES[0].upper().replace("0X", "0x")):
+            assert explorer.get_contract_abi(address) == make_abi("totalSupply")
+        # Unverified contracts are not cached
+        for _ in range(2):
+            with pytest.raises(ValueError, match="Expecting value"):
+                explorer.get_contract_abi(ADDRESSES[1])
+        with pytest.raises(ValueError, match="Invalid contract address"):
+            explorer.get_contract_abi("../../etc/passwd")
+        explorer.close()
+
+        # A new process reads the ABI from disk
+        restarted = FlareExplorer(f"{url}/api", abi_cache=AbiCache(tmp_path))
+        assert restarted.get_contract_abi(ADDRESSES[0]) == make_abi("totalSupply")
+        restarted.close()
+
+    assert stub.requests == {ADDRESSES[0]: 1, ADDRESSES[1]: 2}
+    # Every request reused the session's keep-alive connection
+    assert len(stub.peers) == 1
+    assert sorted(p.name for p in tmp_path.rglob("*.json")) == [f"{ADDRESSES[0]}.json"]
+
+
+def test_bulk_fetch_is_concurrent_but_bounded(tmp_path: Path) -> None:
+    stub = ExplorerStub(latency=0.02)
+    for address in ADDRESSES:
+        stub.abis[address] = make_abi(address)
+
+    async def run() -> list[dict]:
+        url = await stub.start()
+        explorer = AsyncFlareExplorer(
+            f"{url}/api",
+            abi_cache=AbiCache(tmp_path),
+            max_concurrency=MAX_CONCURRENCY,
+        )
+        try:
+            first = await explorer.get_contract_abis([*ADDRESSES, ADDRESSES[0]])
+            again = await explorer.get_contract_abis(ADDRESSES[::-1])
+            return [first, again]
+        finally:
+            await explorer.aclose()
+            await stub.close()
+
+    first, again = asyncio.run(run())
+
+    assert list(first) == ADDRESSES
+    assert all(first[address] == make_abi(address) for address in ADDRESSES)
+    assert list(again) == ADDRESSES[::-1]
+    assert stub.requests == dict.fromkeys(ADDRESSES, 1)
+    assert stub.max_in_flight == MAX_CONCURRENCY
+    assert len(stub.peers) <= MAX_CONCURRENCY
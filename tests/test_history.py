@@ -0,0 +1,188 @@
+import asyncio
+from pathlib import Path
+from typing import Any, override
+
+from flare_ai_defai import AsyncFlareProvider, ChatRouter, PromptService, Vtpm
+from flare_ai_defai.ai import ModelResponse
+from flare_ai_defai.session import (
+    HistoryManager,
+    SessionStore,
+    SQLiteSessionStore,
+    estimate_tokens,
+)
+from flare_ai_defai.session.history import SUMMARY_PREFIX
+
+from .test_receipts import PromptEchoProvider
+
+KEEP_TURNS = 2
+TOKEN_BUDGET = 100
+MESSAGE = "Tell me something about the Flare network, in a few words " * 2
+
+
+class RecordingProvider(PromptEchoProvider):
+    """Records chat turns like Gemini and the context each message was sent with."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.contexts: list[list[Any]] = []
+        self.summary_prompts: list[str] = []
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        self.summary_prompts.append(prompt)
+        text = f"summary {len(self.summary_prompts)}"
+        return ModelResponse(text=text, raw_response=None, metadata={})
+
+    @override
+    def send_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        assert chat_history is not None
+        self.contexts.append(list(chat_history))
+        chat_history.append({"parts": [msg], "role": "user"})
+        chat_history.append({"parts": [f"reply to {msg}"], "role": "model"})
+        return ModelResponse(text=f"reply to {msg}", raw_response=None, metadata={})
+
+
+def make_router(
+    sessions: SessionStore | None = None,
+) -> tuple[ChatRouter, RecordingProvider]:
+    ai = RecordingProvider()
+    prompts = PromptService()
+    chat = ChatRouter(
+        ai=ai,
+        blockchain=AsyncFlareProvider("http://127.0.0.1:1"),
+        attestation=Vtpm(simulate=True),
+        prompts=prompts,
+        sessions=sessions,
+        history=HistoryManager(
+            ai, prompts, token_budget=TOKEN_BUDGET, keep_turns=KEEP_TURNS
+        ),
+    )
+    return chat, ai
+
+
+def test_long_conversations_are_folded_into_a_summary() -> None:
+    chat, ai = make_router()
+    session = chat.sessions.get("s1")
+
+    async def run() -> None:
+        for i in range(50):
+            await chat.handle_conversation(session, f"{i}: {MESSAGE}")
+            await chat.history.join()
+
+    asyncio.run(run())
+    # The last summary is applied when the next message is sent
+    chat.history.context(session)
+
+    # The context stays bounded however long the conversation gets
+    assert chat.history.summaries > 1
+    assert len(session.chat_history) == 2 * KEEP_TURNS
+    assert max(len(context) for context in ai.contexts) <= 2 * (KEEP_TURNS + 2) + 2
+    assert session.history_summary == f"summary {chat.history.summaries}"
+
+    # Each summary extends the previous one with the turns folded since
+    assert "summary 1" in ai.summary_prompts[1]
+    assert f"user: 0: {MESSAGE}" in ai.summary_prompts[0]
+
+    # The summary opens the context, followed by the latest turns verbatim
+    last = ai.contexts[-1]
+    assert last[0]["parts"][0].startswith(SUMMARY_PREFIX)
+    assert last[-1]["parts"][0] == f"reply to 48: {MESSAGE}"
+    assert session.chat_history[-1]["parts"][0] == f"reply to 49: {MESSAGE}"
+
+    tokens = chat.history.tokens(session)
+    assert tokens.turns == len(session.chat_history)
+    assert tokens.to_dict()["total"] == tokens.summary + tokens.history
+
+
+def test_fold_is_dropped_when_the_history_changed() -> None:
+    chat, _ = make_router()
+    session = chat.sessions.get("s1")
+
+    async def run() -> None:
+        for i in range(KEEP_TURNS + 2):
+            await chat.handle_conversation(session, f"{i}: {MESSAGE}")
+        await chat.history.join()
+        session.reset()
+        await chat.handle_conversation(session, "hello")
+
+    asyncio.run(run())
+
+    assert chat.history.summaries == 1
+    assert session.history_summary == ""
+    assert [entry["parts"][0] for entry in session.chat_history] == [
+        "hello",
+        "reply to hello",
+    ]
+
+
+def test_summaries_apply_when_the_store_trimmed_folded_turns(tmp_path: Path) -> None:
+    # The store keeps fewer entries than the history holds when a fold starts,
+    # so every save trims turns that are being folded
+    max_history = 2 * KEEP_TURNS + 2
+    chat, ai = make_router(
+        SQLiteSessionStore(str(tmp_path / "sessions.db"), max_history=max_history)
+    )
+
+    async def run() -> None:
+        for i in range(20):
+            session = chat.sessions.get("s1")
+            await chat.handle_conversation(session, f"{i}: {MESSAGE}")
+            chat.sessions.save(session)
+            await chat.history.join()
+
+    asyncio.run(run())
+    session = chat.sessions.get("s1")
+    chat.history.context(session)
+
+    assert chat.history.summaries > 1
+    assert session.history_summary == f"summary {chat.history.summaries}"
+    assert session.history_offset + len(session.chat_history) == 2 * 20
+    assert f"summary {chat.history.summaries - 1}" in ai.summary_prompts[-1]
+    assert len(session.chat_history) == 2 * KEEP_TURNS
+
+
+def test_folds_of_sessions_that_never_return_are_bounded() -> None:
+    ai = RecordingProvider()
+    history = HistoryManager(
+        ai,
+        PromptService(),
+        token_budget=TOKEN_BUDGET,
+        keep_turns=KEEP_TURNS,
+        max_sessions=1,
+    )
+    chat = ChatRouter(
+        ai=ai,
+        blockchain=AsyncFlareProvider("http://127.0.0.1:1"),
+        attestation=Vtpm(simulate=True),
+        prompts=PromptService(),
+        history=history,
+    )
+
+    async def run() -> None:
+        for session_id in ("gone", "stays"):
+            session = chat.sessions.get(session_id)
+            for i in range(KEEP_TURNS + 2):
+                await chat.handle_conversation(session, f"{i}: {MESSAGE}")
+        await history.join()
+
+    asyncio.run(run())
+
+    assert history.summaries == len(["gone", "stays"])
+    assert "gone" not in history._folds  # noqa: SLF001
+    assert len(history._folds) == 1  # noqa: SLF001
+    assert history.context(chat.sessions.get("stays"))[0]["parts"][0] == (
+        SUMMARY_PREFIX + "summary 2"
+    )
+
+
+def test_estimate_tokens() -> None:
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2  # noqa: PLR2004
@@ -0,0 +1,216 @@
+import asyncio
+import datetime as dt
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from flare_ai_defai import AsyncFlareProvider, PlaidRouter, PromptService, Vtpm
+from flare_ai_defai.banking import PlaidClientRegistry
+from flare_ai_defai.jobs import (
+    InMemoryJobStore,
+    Job,
+    JobQueue,
+    JobStatus,
+    PermanentJobError,
+    Progress,
+    SQLiteJobStore,
+)
+from flare_ai_defai.settings import settings
+
+from .plaid_stub import CLIENT_ID, PUBLIC_TOKEN, SECRET, PlaidStub, make_transaction
+from .test_chat_stream import parse_sse
+from .test_receipts import PromptEchoProvider
+
+WORKERS = 2
+JOBS = 6
+
+
+def test_pool_is_bounded_and_failed_attempts_are_retried() -> None:
+    running = 0
+    peak = 0
+    failures = {"flaky": 2, "broken": 99}
+
+    async def handler(job: Job, progress: Progress) -> dict[str, Any]:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            await asyncio.sleep(0.01)
+            progress("slept")
+            name = job.payload["name"]
+            if name == "invalid":
+                msg = "bad input"
+                raise PermanentJobError(msg)
+            if failures.get(name, 0) > 0:
+                failures[name] -= 1
+                msg = f"{name} failed"
+                raise RuntimeError(msg)
+            return {"name": name}
+        finally:
+            running -= 1
+
+    async def run() -> dict[str, Job]:
+        queue = JobQueue(workers=WORKERS, max_attempts=3, backoff_base=0.01)
+        queue.register("test", handler)
+        names = [f"job-{i}" for i in range(JOBS)] + ["flaky", "broken", "invalid"]
+        jobs = {name: queue.submit("test", {"name": name}) for name in names}
+        await asyncio.gather(*(queue.wait(job.job_id, 5) for job in jobs.values()))
+        assert queue.pending_count == 0
+        await queue.close()
+        return {name: queue.get(job.job_id) for name, job in jobs.items()}  # pyright: ignore [reportReturnType]
+
+    jobs = asyncio.run(run())
+
+    assert peak == WORKERS
+    assert jobs["job-0"].status is JobStatus.SUCCEEDED
+    assert jobs["job-0"].result == {"name": "job-0"}
+    assert jobs["job-0"].step == "slept"
+    assert (jobs["flaky"].status, jobs["flaky"].attempts) == (JobStatus.SUCCEEDED, 3)
+    assert jobs["flaky"].error is None
+    assert (jobs["broken"].status, jobs["broken"].attempts) == (JobStatus.FAILED, 3)
+    assert jobs["broken"].error == "broken failed"
+    assert (jobs["invalid"].status, jobs["invalid"].attempts) == (JobStatus.FAILED, 1)
+    with pytest.raises(ValueError, match="No handler"):
+        JobQueue().submit("unknown")
+
+
+def test_sqlite_store_resumes_unfinished_jobs(tmp_path: Path) -> None:
+    path = str(tmp_path / "jobs.db")
+
+    async def interrupted() -> str:
+        started = asyncio.Event()
+
+        async def hang(_job: Job, _progress: Progress) -> dict[str, Any]:
+            started.set()
+            await asyncio.Event().wait()
+            return {}
+
+        queue = JobQueue(SQLiteJobStore(path))
+        queue.register("test", hang)
+        job = queue.submit("test", {"n": 1})
+        await started.wait()
+        await queue.close()
+        return job.job_id
+
+    async def restarted(job_id: str) -> Job | None:
+        async def finish(job: Job, _progress: Progress) -> dict[str, Any]:
+            return {"n": job.payload["n"]}
+
+        queue = JobQueue(SQLiteJobStore(path))
+        queue.register("test", finish)
+        assert await queue.start() == 1
+        return await queue.wait(job_id, 5)
+
+    job_id = asyncio.run(interrupted())
+    assert SQLiteJobStore(path).get(job_id).status is JobStatus.RUNNING  # pyright: ignore [reportOptionalMemberAccess]
+    job = asyncio.run(restarted(job_id))
+
+    assert job is not None
+    assert job.status is JobStatus.SUCCEEDED
+    assert job.attempts == len(["interrupted", "resumed"])
+    assert job.result == {"n": 1}
+    assert SQLiteJobStore(path).unfinished() == []
+
+
+class FlakyStore(InMemoryJobStore):
+    """Fails to save the first job that finishes."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.failures = 1
+
+    def save(self, job: Job) -> None:
+        if job.finished and self.failures:
+            self.failures -= 1
+            msg = "disk full"
+            raise OSError(msg)
+        super().save(job)
+
+
+def test_finished_jobs_drop_secrets_and_are_pruned(tmp_path: Path) -> None:
+    async def checkpointed(job: Job, progress: Progress) -> dict[str, Any]:
+        job.checkpoint["access_token"] = "access-secret"
+        progress("exchanged")
+        return {"ok": True}
+
+    async def run(store: SQLiteJobStore | FlakyStore) -> list[Job | None]:
+        queue = JobQueue(store, workers=1, retention=3600.0)
+        queue.register("test", checkpointed)
+        jobs = [queue.submit("test", {"public_token": "public-secret"}) for _ in "ab"]
+        done = [await queue.wait(job.job_id, 5) for job in jobs]
+        await queue.close()
+        return done
+
+    store = SQLiteJobStore(str(tmp_path / "jobs.db"))
+    first, second = asyncio.run(run(store))
+    assert first is not None
+    assert second is not None
+    assert (first.payload, first.checkpoint) == ({}, {})
+    rows = store._conn.execute("SELECT data FROM jobs").fetchall()  # noqa: SLF001
+    assert not any("secret" in row[0] for row in rows)
+    assert store.prune(second.created_at) == 1
+    assert store.get(first.job_id) is None
+    assert store.get(second.job_id) is not None
+
+    # A store failure fails that job, and the worker keeps serving the next
+    crashed, served = asyncio.run(run(FlakyStore()))
+    assert crashed is not None
+    assert served is not None
+    assert (crashed.status, crashed.error) == (JobStatus.FAILED, "disk full")
+    assert served.status is JobStatus.SUCCEEDED
+
+
+def test_link_job_retries_sync_without_repeating_exchange(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "PLAID_CLIENT_ID", CLIENT_ID)
+    monkeypatch.setattr(settings, "PLAID_SECRET", SECRET)
+    stub = PlaidStub()
+    stub.add(
+        *(make_transaction(f"t{i}", 10.0, dt.date(2024, 1, i + 1)) for i in range(20))
+    )
+    stub.sync_outages = 1
+    with stub.running_in_thread() as url:
+        plaid_router = PlaidRouter(
+            ai=PromptEchoProvider(),  # pyright: ignore [reportArgumentType]
+            blockchain=AsyncFlareProvider("http://localhost:8545"),
+            attestation=Vtpm(simulate=True),
+            prompts=PromptService(),
+            plaid_clients=PlaidClientRegistry(default_environment=url),
+            jobs=JobQueue(backoff_base=0.2),
+        )
+        app = FastAPI()
+        app.include_router(plaid_router.router, prefix="/plaid")
+        with TestClient(app) as client:
+            queued = client.post(
+                "/plaid/set_access_token", json={"public_token": PUBLIC_TOKEN}
+            )
+            events = parse_sse(
+                client.get(f"/plaid/jobs/{queued.json()['job_id']}/stream").text
+            )
+            rejected = client.post(
+                "/plaid/set_access_token", json={"public_token": "public-expired"}
+            ).json()
+            failed = parse_sse(
+                client.get(f"/plaid/jobs/{rejected['job_id']}/stream").text
+            )[-1][1]
+            status = client.get(f"/plaid/jobs/{queued.json()['job_id']}").json()
+            missing = client.get("/plaid/jobs/unknown")
+
+    assert queued.status_code == 202  # noqa: PLR2004
+    assert queued.json()["status"] == JobStatus.QUEUED.value
+    assert "public_token" not in queued.text
+    statuses = [data["status"] for _, data in events]
+    assert JobStatus.RETRYING.value in statuses
+    assert statuses[-1] == JobStatus.SUCCEEDED.value
+    assert status == events[-1][1]
+    assert status["attempts"] == len(["sync outage", "retry"])
+    assert status["result"]["transactions"]["total"] == 20  # noqa: PLR2004
+    assert stub.calls["item_public_token_exchange"] == len(["once", "rejected"])
+    # Invalid tokens are not retried
+    assert (failed["status"], failed["attempts"]) == (JobStatus.FAILED.value, 1)
+    assert "INVALID_PUBLIC_TOKEN" in failed["error"]
+    assert missing.status_code == 404  # noqa: PLR2004
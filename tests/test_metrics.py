@@ -0,0 +1,175 @@
+import asyncio
+from typing import Any, override
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from flare_ai_defai import AsyncFlareProvider, PlaidRouter, PromptService, Vtpm
+from flare_ai_defai.ai import MeteredProvider, ModelResponse, estimate_tokens
+from flare_ai_defai.api.middleware import MetricsMiddleware
+from flare_ai_defai.api.middleware.metrics import route_template
+from flare_ai_defai.banking import PlaidClientRegistry
+from flare_ai_defai.blockchain import WalletState
+from flare_ai_defai.cache import CacheStats
+from flare_ai_defai.metrics import (
+    HTTP_REQUEST_SECONDS,
+    LLM_REQUEST_SECONDS,
+    LLM_TOKENS,
+    PLAID_REQUEST_SECONDS,
+    REGISTRY,
+    WEB3_RPC_SECONDS,
+    Counter,
+    Gauge,
+    Histogram,
+    HistogramChild,
+    MetricsRegistry,
+)
+
+from .plaid_stub import ACCESS_TOKEN, CLIENT_ID, SECRET, PlaidStub
+from .rpc_stub import RPCStub
+from .test_receipts import PromptEchoProvider
+
+REQUESTS = 3
+
+
+def observations(series: HistogramChild) -> int:
+    return sum(series.counts)
+
+
+def test_registry_renders_prometheus_text() -> None:
+    registry = MetricsRegistry()
+    latency = Histogram(
+        "op_seconds", "Op latency", ("op",), buckets=(0.1, 1.0), registry=registry
+    )
+    calls = Counter("calls_total", "Calls", ("path",), registry=registry)
+    in_flight = Gauge("in_flight", "In flight", registry=registry)
+    registry.register_cache("routes", CacheStats(hits=3, misses=1))
+
+    for value in (0.05, 0.5, 5.0):
+        latency.labels("read").observe(value)
+    calls.labels('say "hi"\n').inc(2)
+    with in_flight.labels().track_inprogress():
+        assert in_flight.labels().value == 1
+    text = registry.render()
+
+    assert text.splitlines()[:8] == [
+        "# HELP op_seconds Op latency",
+        "# TYPE op_seconds histogram",
+        'op_seconds_bucket{op="read",le="0.1"} 1',
+        'op_seconds_bucket{op="read",le="1.0"} 2',
+        'op_seconds_bucket{op="read",le="+Inf"} 3',
+        'op_seconds_sum{op="read"} 5.55',
+        'op_seconds_count{op="read"} 3',
+        "# HELP calls_total Calls",
+    ]
+    assert 'calls_total{path="say \\"hi\\"\\n"} 2.0' in text
+    assert "in_flight 0.0" in text
+    assert 'cache_hit_ratio{cache="routes"} 0.75' in text
+    with pytest.raises(ValueError, match="expects labels"):
+        calls.labels()
+    with pytest.raises(ValueError, match="already registered"):
+        Counter("calls_total", "Calls", registry=registry)
+
+
+def test_requests_plaid_and_rpc_calls_are_timed() -> None:
+    sync = HTTP_REQUEST_SECONDS.labels("POST", "/plaid/transactions/sync", "200")
+    unmatched = HTTP_REQUEST_SECONDS.labels("GET", "unmatched", "404")
+    # Methods outside the standard set share one label value
+    other = HTTP_REQUEST_SECONDS.labels("other", "unmatched", "404")
+    plaid_sync = PLAID_REQUEST_SECONDS.labels("/transactions/sync")
+    balance = WEB3_RPC_SECONDS.labels("eth_getBalance")
+    series = (sync, unmatched, other, plaid_sync, balance)
+    before = [observations(s) for s in series]
+
+    stub = PlaidStub()
+    with stub.running_in_thread() as url:
+        registry = PlaidClientRegistry(default_environment=url)
+        plaid_router = PlaidRouter(
+            ai=PromptEchoProvider(),  # pyright: ignore [reportArgumentType]
+            blockchain=AsyncFlareProvider("http://localhost:8545"),
+            attestation=Vtpm(simulate=True),
+            prompts=PromptService(),
+            plaid_clients=registry,
+        )
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(plaid_router.router, prefix="/plaid")
+        credentials = {
+            "client_id": CLIENT_ID,
+            "secret": SECRET,
+            "access_token": ACCESS_TOKEN,
+            "cursor": "",
+        }
+        with TestClient(app) as client:
+            for _ in range(REQUESTS):
+                client.post("/plaid/transactions/sync", json=credentials)
+            assert client.get("/missing").status_code == 404  # noqa: PLR2004
+            for method in ("FOO", "BAR"):
+                client.request(method, "/missing")
+        registry.close()
+
+    async def check_balance() -> None:
+        rpc = RPCStub()
+        provider = AsyncFlareProvider(await rpc.start())
+        wallet = WalletState()
+        provider.generate_account(wallet)
+        try:
+            await provider.check_balance(wallet)
+        finally:
+            await provider.close()
+            await rpc.close()
+
+    asyncio.run(check_balance())
+
+    after = [observations(s) for s in series]
+    assert [b - a for a, b in zip(before, after, strict=True)] == [
+        REQUESTS,
+        1,
+        2,
+        REQUESTS,
+        1,
+    ]
+    # Path parameters are reported by name, keeping label values bounded
+    scope = {"route": object(), "path": "/tx/0xab", "path_params": {"tx": "0xab"}}
+    assert route_template(scope) == "/tx/{tx}"
+    text = REGISTRY.render()
+    assert 'web3_rpc_duration_seconds_count{method="eth_getBalance"}' in text
+    assert 'plaid_request_duration_seconds_count{endpoint="/transactions/sync"}' in (
+        text
+    )
+
+
+def test_llm_calls_are_metered_by_prompt() -> None:
+    prompts = PromptService()
+    ai = MeteredProvider(PromptEchoProvider(), identify=prompts.identify)
+    routing, mime_type, schema = prompts.get_formatted_prompt(
+        "semantic_router", user_input="hello"
+    )
+    routing_tokens = LLM_TOKENS.labels("semantic_router", "prompt")
+    chat_calls = LLM_REQUEST_SECONDS.labels("chat", "send")
+    before = routing_tokens.value, observations(chat_calls)
+
+    async def run() -> None:
+        await ai.agenerate(routing, mime_type, schema)
+        await ai.asend_message("hi", [{"parts": ["hello"], "role": "user"}])
+
+    asyncio.run(run())
+
+    assert routing_tokens.value - before[0] == estimate_tokens(routing)
+    assert observations(chat_calls) - before[1] == 1
+    assert LLM_TOKENS.labels("chat", "prompt").value >= estimate_tokens("hellohi")
+
+    # Usage reported by the provider is counted as is, without estimating
+    class UsageProvider(PromptEchoProvider):
+        @override
+        def send_message(
+            self, msg: str, chat_history: list[Any] | None = None
+        ) -> ModelResponse:
+            usage = {"prompt_tokens": 7, "completion_tokens": 3}
+            return ModelResponse(text=msg, raw_response=None, metadata={"usage": usage})
+
+    chat_tokens = LLM_TOKENS.labels("chat", "prompt")
+    before_usage = chat_tokens.value
+    MeteredProvider(UsageProvider()).send_message("hi", [{"parts": ["x" * 4000]}])
+    assert chat_tokens.value - before_usage == 7  # noqa: PLR2004
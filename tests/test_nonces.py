@@ -0,0 +1,125 @@
+import asyncio
+from typing import override
+
+import pytest
+from aiohttp import web
+from eth_account import Account
+from web3.exceptions import Web3RPCError
+
+from flare_ai_defai.blockchain import AsyncFlareProvider, WalletState
+
+from .rpc_stub import RPCStub
+from .test_receipts import transfer
+
+PIPELINED_SENDS = 100
+
+
+def test_pipelined_sends_from_one_account_get_distinct_nonces() -> None:
+    async def run() -> tuple[list[str], RPCStub, str]:
+        stub = RPCStub()
+        provider = AsyncFlareProvider(await stub.start())
+        wallet = WalletState()
+        address = provider.generate_account(wallet)
+        try:
+            hashes = await asyncio.gather(
+                *(
+                    provider.sign_and_send_transaction(transfer(), wallet)  # pyright: ignore [reportArgumentType]
+                    for _ in range(PIPELINED_SENDS)
+                )
+            )
+        finally:
+            await provider.close()
+            await stub.close()
+        return hashes, stub, address
+
+    hashes, stub, address = asyncio.run(run())
+    assert len(set(hashes)) == PIPELINED_SENDS
+    # Every nonce was used once and in order, so the whole pipeline was mined
+    assert stub.next_nonce(address) == PIPELINED_SENDS
+    assert stub.calls["eth_getTransactionCount"] == 1
+
+
+def test_nonce_conflict_resyncs_and_retries() -> None:
+    async def run() -> tuple[RPCStub, str]:
+        stub = RPCStub()
+        provider = AsyncFlareProvider(await stub.start())
+        wallet = WalletState()
+        address = provider.generate_account(wallet)
+        try:
+            await provider.sign_and_send_transaction(transfer(), wallet)  # pyright: ignore [reportArgumentType]
+            # Another client spends the nonce the manager would use next
+            external = Account.sign_transaction(
+                {**transfer(nonce=1), "from": address}, wallet.private_key
+            )
+            await provider.w3.eth.send_raw_transaction(external.raw_transaction)
+            await provider.sign_and_send_transaction(transfer(), wallet)  # pyright: ignore [reportArgumentType]
+        finally:
+            await provider.close()
+            await stub.close()
+        return stub, address
+
+    stub, address = asyncio.run(run())
+    assert stub.next_nonce(address) == len(["ours", "external", "retried"])
+    assert stub.calls["eth_getTransactionCount"] == len(["sync", "resync"])
+
+
+def test_rejected_send_releases_its_nonce() -> None:
+    async def run() -> tuple[RPCStub, str]:
+        stub = RPCStub()
+        provider = AsyncFlareProvider(await stub.start())
+        wallet = WalletState()
+        address = provider.generate_account(wallet)
+        try:
+            await provider.sign_and_send_transaction(transfer(), wallet)  # pyright: ignore [reportArgumentType]
+            stub.fail_sends = 1
+            with pytest.raises(Web3RPCError, match="insufficient funds"):
+                await provider.sign_and_send_transaction(transfer(), wallet)  # pyright: ignore [reportArgumentType]
+            await provider.sign_and_send_transaction(transfer(), wallet)  # pyright: ignore [reportArgumentType]
+        finally:
+            await provider.close()
+            await stub.close()
+        return stub, address
+
+    stub, address = asyncio.run(run())
+    # The rejected nonce was reused, so no gap stalls later transactions
+    assert stub.next_nonce(address) == len(["first", "reused"])
+    assert not stub.pending[address.lower()]
+
+
+class DroppingRPCStub(RPCStub):
+    """Accepts the next `drop_sends` transactions but never answers."""
+
+    drop_sends = 0
+
+    @override
+    async def _handle(self, request: web.Request) -> web.Response:
+        sends = self.calls["eth_sendRawTransaction"]
+        response = await super()._handle(request)
+        if self.drop_sends and self.calls["eth_sendRawTransaction"] > sends:
+            self.drop_sends -= 1
+            await asyncio.sleep(1.0)
+        return response
+
+
+def test_unanswered_send_resyncs_instead_of_reusing_its_nonce() -> None:
+    async def run() -> tuple[RPCStub, str]:
+        stub = DroppingRPCStub()
+        provider = AsyncFlareProvider(await stub.start(), request_timeout=0.2)
+        wallet = WalletState()
+        address = provider.generate_account(wallet)
+        try:
+            await provider.sign_and_send_transaction(transfer(), wallet)  # pyright: ignore [reportArgumentType]
+            stub.drop_sends = 1
+            with pytest.raises(TimeoutError):
+                await provider.sign_and_send_transaction(transfer(), wallet)  # pyright: ignore [reportArgumentType]
+            await provider.sign_and_send_transaction(transfer(), wallet)  # pyright: ignore [reportArgumentType]
+        finally:
+            await provider.close()
+            await stub.close()
+        return stub, address
+
+    stub, address = asyncio.run(run())
+    # The unanswered transaction was accepted, so its nonce was not sent again
+    assert stub.next_nonce(address) == len(["first", "unanswered", "third"])
+    assert stub.calls["eth_sendRawTransaction"] == len(["first", "unanswered", "third"])
+    assert stub.calls["eth_getTransactionCount"] == len(["sync", "resync"])
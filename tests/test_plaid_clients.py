@@ -0,0 +1,81 @@
+import datetime as dt
+
+import plaid
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from flare_ai_defai import AsyncFlareProvider, PlaidRouter, PromptService, Vtpm
+from flare_ai_defai.banking import PlaidClientRegistry, resolve_plaid_host
+
+from .plaid_stub import ACCESS_TOKEN, CLIENT_ID, SECRET, PlaidStub, make_transaction
+from .test_receipts import PromptEchoProvider
+
+REQUESTS = 10
+MAX_CLIENTS = 2
+
+
+def test_resolve_plaid_host() -> None:
+    assert resolve_plaid_host("sandbox") == plaid.Environment.Sandbox
+    assert resolve_plaid_host("Production") == plaid.Environment.Production
+    assert resolve_plaid_host("http://127.0.0.1:9000/") == "http://127.0.0.1:9000"
+    with pytest.raises(ValueError, match="Unknown Plaid environment"):
+        resolve_plaid_host("staging")
+
+
+def test_registry_reuses_and_bounds_clients() -> None:
+    registry = PlaidClientRegistry(max_clients=MAX_CLIENTS, max_connections=4)
+    first = registry.get("a", "secret")
+    assert registry.get("a", "secret") is first
+    assert first.api_client.configuration.connection_pool_maxsize == 4  # noqa: PLR2004
+    # Same client id in another environment, and a rotated secret, get new clients
+    assert registry.get("a", "secret", "production") is not first
+    rotated = registry.get("a", "rotated")
+    assert rotated is not first
+    assert registry.get("a", "rotated") is rotated
+
+    registry.get("b", "secret")
+    assert len(registry) == MAX_CLIENTS
+    assert registry.stats.evictions == 1
+    registry.close()
+    assert len(registry) == 0
+
+
+def test_endpoints_share_one_keep_alive_connection() -> None:
+    stub = PlaidStub()
+    stub.add(make_transaction("t1", 12.5, dt.date(2024, 1, 2)))
+    with stub.running_in_thread() as url:
+        registry = PlaidClientRegistry(default_environment=url)
+        plaid_router = PlaidRouter(
+            ai=PromptEchoProvider(),  # pyright: ignore [reportArgumentType]
+            blockchain=AsyncFlareProvider("http://localhost:8545"),
+            attestation=Vtpm(simulate=True),
+            prompts=PromptService(),
+            plaid_clients=registry,
+        )
+        app = FastAPI()
+        app.include_router(plaid_router.router, prefix="/plaid")
+        credentials = {
+            "client_id": CLIENT_ID,
+            "secret": SECRET,
+            "access_token": ACCESS_TOKEN,
+        }
+        with TestClient(app) as client:
+            for _ in range(REQUESTS):
+                synced = client.post(
+                    "/plaid/transactions/sync", json={**credentials, "cursor": ""}
+                )
+                assert synced.json()["added"][0]["transaction_id"] == "t1"
+                liabilities = client.post("/plaid/liabilities/get", json=credentials)
+                assert liabilities.json()["accounts"][0]["type"] == "credit"
+            rejected = client.post(
+                "/plaid/liabilities/get", json={**credentials, "secret": "wrong"}
+            )
+            assert "invalid client_id or secret" in rejected.json()["detail"]
+        registry.close()
+
+    assert stub.round_trips == REQUESTS * 2 + 1
+    # One pooled client and connection served every request with valid
+    # credentials; the rejected secret rebuilt the client on a new connection
+    assert registry.stats.misses == 1
+    assert len(stub.peers) == len(["valid", "rotated"])
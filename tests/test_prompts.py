@@ -1,6 +1,9 @@
+from dataclasses import replace
+
 import pytest
 
-from flare_ai_defai.prompts import PromptLibrary
+from flare_ai_defai.prompts import PromptLibrary, PromptService, shared_library
+from flare_ai_defai.prompts.schemas import Prompt
 
 
 def test_prompt_library_initialization() -> None:
@@ -21,3 +24,60 @@ def test_prompt_missing_inputs() -> None:
     prompt = library.get_prompt("generate_account")
     with pytest.raises(ValueError, match="Missing required inputs: address"):
         prompt.format(wrong_input="test")
+
+
+def test_required_inputs_are_checked_against_template() -> None:
+    with pytest.raises(ValueError, match="not in its template: amount"):
+        Prompt(
+            name="broken",
+            description="Requires an input its template never uses",
+            template="Send to ${address}",
+            required_inputs=["address", "amount"],
+            response_schema=None,
+            response_mime_type=None,
+        )
+    prompt = PromptLibrary().get_prompt("tx_confirmation")
+    assert prompt.placeholders == {"tx_hash", "block_explorer"}
+    with pytest.raises(ValueError, match="Missing required inputs: block_explorer"):
+        prompt.format(tx_hash="0xabc")
+
+
+def test_category_index_follows_replaced_prompts() -> None:
+    library = PromptLibrary()
+    assert [p.name for p in library.get_prompts_by_category("account")] == [
+        "generate_account",
+        "tx_confirmation",
+    ]
+    moved = replace(library.get_prompt("tx_confirmation"), category="receipts")
+    library.add_prompt(moved)
+    assert [p.name for p in library.get_prompts_by_category("account")] == [
+        "generate_account"
+    ]
+    assert library.get_prompts_by_category("receipts") == [moved]
+    assert "receipts" in library.list_categories()
+    assert library.get_prompts_by_category("missing") == []
+
+
+def test_services_share_a_frozen_library() -> None:
+    assert PromptService().library is PromptService().library is shared_library()
+    library = shared_library()
+    with pytest.raises(TypeError, match="frozen"):
+        library.add_prompt(library.get_prompt("conversational"))
+    with pytest.raises(TypeError):
+        library.prompts["conversational"] = library.get_prompt("semantic_router")  # pyright: ignore [reportIndexIssue]
+
+    custom = PromptLibrary()
+    assert PromptService(custom).library is custom
+
+
+def test_formatted_prompts_are_matched_to_their_prompt() -> None:
+    service = PromptService()
+    routing, _, _ = service.get_formatted_prompt("semantic_router", user_input="hi")
+    narrative, _, _ = service.get_formatted_prompt(
+        "credit_score_narrative", credit_score="700", features="{}"
+    )
+
+    assert service.library.match(routing).name == "semantic_router"  # pyright: ignore [reportOptionalMemberAccess]
+    assert service.library.match("Hello there") is None
+    assert service.is_deterministic(routing)
+    assert not service.is_deterministic(narrative)
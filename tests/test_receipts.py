@@ -0,0 +1,131 @@
+import asyncio
+import re
+from typing import Any, override
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from flare_ai_defai import AsyncFlareProvider, ChatRouter, PromptService, Vtpm
+from flare_ai_defai.ai import BaseAIProvider, ModelResponse
+from flare_ai_defai.api.dependencies import SESSION_HEADER
+from flare_ai_defai.blockchain import TxStatus, WalletState
+
+from .rpc_stub import CHAIN_ID, GAS_PRICE, PRIORITY_FEE, RPCStub
+from .test_chat_stream import parse_sse
+
+BLOCK_TIME = 1.0
+POLL_INTERVAL = 0.05
+IN_FLIGHT = 25
+RECIPIENT = "0x000000000000000000000000000000000000dEaD"
+
+
+class PromptEchoProvider(BaseAIProvider):
+    """Replies with the prompt it was given."""
+
+    def __init__(self, api_key: str = "", model: str = "stub", **kwargs: str) -> None:
+        super().__init__(api_key, model, **kwargs)
+
+    @override
+    def reset(self) -> None:
+        self.chat_history = []
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        return ModelResponse(text=prompt, raw_response=None, metadata={})
+
+    @override
+    def send_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        return self.generate(msg)
+
+
+def transfer(nonce: int = 0) -> dict[str, Any]:
+    return {
+        "nonce": nonce,
+        "to": RECIPIENT,
+        "value": 1,
+        "gas": 21000,
+        "maxFeePerGas": GAS_PRICE,
+        "maxPriorityFeePerGas": PRIORITY_FEE,
+        "chainId": CHAIN_ID,
+        "type": 2,
+    }
+
+
+def test_one_watcher_confirms_many_in_flight_txs() -> None:
+    async def run() -> list[Any]:
+        stub = RPCStub(automine=False)
+        provider = AsyncFlareProvider(
+            await stub.start(), receipt_poll_interval=POLL_INTERVAL
+        )
+        wallets = [WalletState() for _ in range(IN_FLIGHT)]
+        for wallet in wallets:
+            provider.generate_account(wallet)
+        try:
+            hashes = await asyncio.gather(
+                *(
+                    provider.sign_and_send_transaction(transfer(), wallet)  # pyright: ignore [reportArgumentType]
+                    for wallet in wallets
+                )
+            )
+            # Submission returned before any block was mined
+            assert provider.receipts.pending_count == IN_FLIGHT
+            watchers = [
+                task
+                for task in asyncio.all_tasks()
+                if task.get_coro().__qualname__ == "ReceiptWatcher._run"  # pyright: ignore [reportOptionalMemberAccess]
+            ]
+            assert len(watchers) == 1
+
+            stub.mine()
+            states = await asyncio.gather(
+                *(provider.receipts.wait(tx_hash) for tx_hash in hashes)
+            )
+            await asyncio.sleep(POLL_INTERVAL * 2)
+            # The watcher exits once nothing is pending
+            assert watchers[0].done()
+        finally:
+            await provider.close()
+            await stub.close()
+        return states
+
+    states = asyncio.run(run())
+    assert all(state.status is TxStatus.CONFIRMED for state in states)
+    assert {state.block_number for state in states} == {1}
+
+
+def test_chat_reports_tx_status() -> None:
+    stub = RPCStub(block_time=BLOCK_TIME)
+    with stub.running_in_thread() as url:
+        chat = ChatRouter(
+            ai=PromptEchoProvider(),  # pyright: ignore [reportArgumentType]
+            blockchain=AsyncFlareProvider(url, receipt_poll_interval=POLL_INTERVAL),
+            attestation=Vtpm(simulate=True),
+            prompts=PromptService(),
+        )
+        session = chat.sessions.get("s1")
+        chat.blockchain.generate_account(session.wallet)
+        chat.blockchain.add_tx_to_queue("CONFIRM", transfer(), session.wallet)  # pyright: ignore [reportArgumentType]
+        app = FastAPI()
+        app.include_router(chat.router, prefix="/chat")
+
+        with TestClient(app) as client:
+            reply = client.post(
+                "/chat/", json={"message": "CONFIRM"}, headers={SESSION_HEADER: "s1"}
+            ).json()["response"]
+            match = re.search(r"0x[0-9a-f]{64}", reply)
+            assert match is not None
+            tx_hash = match.group()
+
+            status = client.get(f"/chat/tx/{tx_hash}").json()
+            assert status["status"] == TxStatus.PENDING.value
+
+            events = parse_sse(client.get(f"/chat/tx/{tx_hash}/stream").text)
+            assert [data["status"] for _, data in events] == ["pending", "confirmed"]
+            assert client.get("/chat/tx/0xunknown").status_code == 404  # noqa: PLR2004
@@ -0,0 +1,100 @@
+import asyncio
+import random
+from typing import Any, override
+
+import pytest
+
+from flare_ai_defai import AsyncFlareProvider, ChatRouter, PromptService, Vtpm
+from flare_ai_defai.ai import ModelResponse
+from flare_ai_defai.prompts import ReplyMode, ReplyRenderer, ReplyTemplates
+
+from .test_receipts import PromptEchoProvider
+
+EXPLORER = "https://explorer.example"
+TX_HASH = "0x" + "ab" * 32
+
+
+class CountingEchoProvider(PromptEchoProvider):
+    """Echoes prompts and counts the generate calls made."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        self.calls += 1
+        return super().generate(prompt, response_mime_type, response_schema)
+
+
+def test_templates_pick_variants_and_check_placeholders() -> None:
+    templates = ReplyTemplates(
+        {"greet": ["Hello ${name}!", "Hi ${name}."]},
+        rng=random.Random(0),  # noqa: S311
+    )
+    assert {templates.render("greet", name="Ada") for _ in range(20)} == {
+        "Hello Ada!",
+        "Hi Ada.",
+    }
+    with pytest.raises(ValueError, match="Missing required inputs: name"):
+        templates.render("greet")
+    with pytest.raises(ValueError, match="different placeholders"):
+        templates.add("bad", ["Sent ${tx_hash}", "Sent!"])
+
+    # Every default phrasing shows the details it reports, unmodified
+    defaults = ReplyTemplates()
+    for _ in range(10):
+        reply = defaults.render(
+            "tx_confirmation", tx_hash=TX_HASH, block_explorer=EXPLORER
+        )
+        assert f"[See transaction on Explorer]({EXPLORER}/tx/{TX_HASH})" in reply
+
+
+def test_deterministic_replies_skip_the_llm() -> None:
+    ai = CountingEchoProvider()
+    chat = ChatRouter(
+        ai=ai,
+        blockchain=AsyncFlareProvider("http://127.0.0.1:1"),
+        attestation=Vtpm(simulate=True),
+        prompts=PromptService(),
+    )
+    session = chat.sessions.get("s1")
+
+    async def run() -> list[str]:
+        account = await chat.handle_generate_account(session, "create account")
+        attestation = await chat.handle_attestation(session, "attest")
+        follow_up = await chat.replies.render("follow_up_token_send")
+        return [account["response"], attestation["response"], follow_up]
+
+    account, attestation, follow_up = asyncio.run(run())
+
+    assert session.wallet.address is not None
+    assert f"`{session.wallet.address}`" in account
+    assert "10 to 74" in attestation or "10-74" in attestation
+    assert session.attestation_requested
+    assert "0x" in follow_up
+    assert ai.calls == 0
+    assert (chat.replies.template_replies, chat.replies.llm_calls) == (3, 0)
+
+
+def test_llm_mode_phrases_replies_with_the_prompt() -> None:
+    ai = CountingEchoProvider()
+    replies = ReplyRenderer(ai, PromptService(), mode=ReplyMode.LLM)
+
+    async def run() -> list[str]:
+        return [
+            await replies.render("generate_account", address="0xabc"),
+            await replies.render("follow_up_token_send"),
+        ]
+
+    account, follow_up = asyncio.run(run())
+
+    # The echo provider returns the prompt the LLM would have been sent
+    assert "EXACTLY as provided, make no changes: 0xabc" in account
+    assert "missing details" in follow_up
+    assert ai.calls == replies.llm_calls == 2  # noqa: PLR2004
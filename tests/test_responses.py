@@ -0,0 +1,52 @@
+import datetime as dt
+import json
+from decimal import Decimal
+
+import plaid
+import pytest
+from fastapi.encoders import jsonable_encoder
+from plaid.model.transactions_sync_response import TransactionsSyncResponse
+
+from flare_ai_defai.api.responses import PlaidJSONResponse, dumps
+
+from .plaid_stub import synthetic_history
+
+
+class RawResponse:
+    def __init__(self, data: str) -> None:
+        self.data = data
+
+    def getheader(self, _name: str, _default: str | None = None) -> str:
+        return "application/json"
+
+
+def test_plaid_models_encode_like_to_dict() -> None:
+    body = {
+        "added": synthetic_history(50, seed=3),
+        "modified": [],
+        "removed": [{"transaction_id": "gone", "account_id": "acc"}],
+        "accounts": [],
+        "next_cursor": "cursor",
+        "has_more": False,
+        "transactions_update_status": "HISTORICAL_UPDATE_COMPLETE",
+        "request_id": "test",
+    }
+    response = plaid.ApiClient(plaid.Configuration()).deserialize(
+        RawResponse(json.dumps(body)), (TransactionsSyncResponse,), _check_type=True
+    )
+
+    encoded = json.loads(PlaidJSONResponse(response).body)
+
+    assert encoded == jsonable_encoder(response.to_dict())
+    assert encoded["added"][0]["date"] == body["added"][0]["date"]
+
+
+def test_dumps_handles_dates_decimals_and_rejects_unknown_types() -> None:
+    content = {"when": dt.date(2024, 5, 1), "amount": Decimal("12.50"), 1: {"a"}}
+    assert json.loads(dumps(content)) == {
+        "when": "2024-05-01",
+        "amount": 12.5,
+        "1": ["a"],
+    }
+    with pytest.raises(TypeError, match="not JSON serializable"):
+        dumps(object())
@@ -0,0 +1,88 @@
+import asyncio
+import zlib
+from typing import Any, override
+
+from flare_ai_defai.ai import BaseAIProvider, ModelResponse
+from flare_ai_defai.prompts import PromptService, SemanticRouterResponse
+from flare_ai_defai.routing import (
+    LABELLED_EXAMPLES,
+    EmbeddingClassifier,
+    SemanticRouteResolver,
+    normalize_message,
+)
+
+LABELS = dict(LABELLED_EXAMPLES)
+
+
+class OracleRouterProvider(BaseAIProvider):
+    """Answers the semantic router prompt with the labelled route."""
+
+    def __init__(self, api_key: str = "", model: str = "stub", **kwargs: str) -> None:
+        super().__init__(api_key, model, **kwargs)
+        self.calls = 0
+
+    @override
+    def reset(self) -> None:
+        self.chat_history = []
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        self.calls += 1
+        route = next(
+            (route for text, route in LABELS.items() if f"Input: {text}\n" in prompt),
+            SemanticRouterResponse.CONVERSATIONAL,
+        )
+        return ModelResponse(text=route.value, raw_response=None, metadata={})
+
+    @override
+    def send_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        raise NotImplementedError
+
+
+def test_normalize_message_masks_amounts_and_addresses() -> None:
+    assert normalize_message(
+        "Send 10.5 FLR to 0x5d3f2e8b1c4a6d7e9f0a1b2c3d4e5f6a7b8c9d0e!"
+    ) == normalize_message("send 3 flr to 0x1111111111111111111111111111111111111111")
+
+
+def test_resolver_skips_llm_and_keeps_accuracy() -> None:
+    ai = OracleRouterProvider()
+    resolver = SemanticRouteResolver(ai, PromptService())
+
+    async def run() -> list[SemanticRouterResponse]:
+        return [await resolver.resolve(text) for text, _ in LABELLED_EXAMPLES]
+
+    routes = asyncio.run(run())
+    assert routes == [route for _, route in LABELLED_EXAMPLES]
+    assert ai.calls == resolver.metrics.llm_calls
+    assert ai.calls < len(LABELLED_EXAMPLES) // 4
+
+    # A second pass is served entirely from the cache
+    asyncio.run(run())
+    assert resolver.metrics.cache_hits == len(LABELLED_EXAMPLES)
+    assert ai.calls == resolver.metrics.llm_calls
+
+
+def test_embedding_classifier_finds_nearest_example() -> None:
+    dimensions = 64
+
+    async def embed(texts: list[str]) -> list[list[float]]:
+        vectors = []
+        for text in texts:
+            vector = [0.0] * dimensions
+            for word in text.split():
+                vector[zlib.crc32(word.encode()) % dimensions] += 1.0
+            vectors.append(vector)
+        return vectors
+
+    classifier = EmbeddingClassifier(embed, LABELLED_EXAMPLES, k=1)
+    match = asyncio.run(classifier.classify(normalize_message("swap my tokens now")))
+    assert match is not None
+    assert match.route is SemanticRouterResponse.SWAP_TOKEN
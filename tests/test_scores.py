@@ -0,0 +1,218 @@
+import datetime as dt
+import sqlite3
+from pathlib import Path
+from typing import override
+
+import pytest
+from cryptography.fernet import Fernet
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from flare_ai_defai import AsyncFlareProvider, PlaidRouter, PromptService, Vtpm
+from flare_ai_defai.api.dependencies import SESSION_HEADER
+from flare_ai_defai.banking import (
+    CachedCreditScoreStore,
+    CreditFeatures,
+    CreditScore,
+    CreditScoreStore,
+    InMemoryCreditScoreStore,
+    LinkedItem,
+    PlaidClientRegistry,
+    SQLiteCreditScoreStore,
+)
+from flare_ai_defai.settings import settings
+
+from .plaid_stub import (
+    ACCESS_TOKEN,
+    CLIENT_ID,
+    PUBLIC_TOKEN,
+    SECRET,
+    PlaidStub,
+    make_transaction,
+)
+from .test_chat_stream import parse_sse
+from .test_receipts import PromptEchoProvider
+
+MAX_HISTORY = 3
+
+
+def make_score(value: int, computed_at: float) -> CreditScore:
+    return CreditScore(
+        score=value,
+        features=CreditFeatures(months=12, utilization=0.25),
+        components={"history": 0.5},
+        transaction_count=value,
+        computed_at=computed_at,
+    )
+
+
+class CountingStore(SQLiteCreditScoreStore):
+    """Counts reads reaching the backend."""
+
+    reads = 0
+
+    @override
+    def history(self, item_id: str, limit: int = 10) -> list[CreditScore]:
+        self.reads += 1
+        return super().history(item_id, limit)
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_store_keeps_bounded_history_per_item(backend: str, tmp_path: Path) -> None:
+    store: CreditScoreStore = (
+        InMemoryCreditScoreStore(max_history=MAX_HISTORY)
+        if backend == "memory"
+        else SQLiteCreditScoreStore(str(tmp_path / "plaid.db"), max_history=MAX_HISTORY)
+    )
+    store.link_item(LinkedItem("item-a", "token-a", user_id="alice", linked_at=1.0))
+    store.link_item(LinkedItem("item-b", "token-b", user_id="alice", linked_at=2.0))
+    store.link_item(LinkedItem("item-c", "token-c", user_id="bob", linked_at=3.0))
+    for i in range(5):
+        store.add_score("item-a", make_score(600 + i, computed_at=float(i)))
+    store.add_score("item-b", make_score(700, computed_at=9.0))
+
+    assert store.items_for_user("alice") == ["item-b", "item-a"]
+    assert store.get_item("item-c") == LinkedItem("item-c", "token-c", "bob", 3.0)
+    assert store.latest("item-a") == make_score(604, computed_at=4.0)
+    assert [s.score for s in store.history("item-a")] == [604, 603, 602]
+    assert [s.score for s in store.history("item-a", limit=1)] == [604]
+    assert store.latest("item-c") is None
+    assert store.get_item("missing") is None
+    # Relinking moves an item to the front, or over to another user
+    store.link_item(LinkedItem("item-a", "token-a", user_id="alice", linked_at=4.0))
+    assert store.items_for_user("alice") == ["item-a", "item-b"]
+    store.link_item(LinkedItem("item-b", "token-b", user_id="bob", linked_at=5.0))
+    assert store.items_for_user("alice") == ["item-a"]
+    assert store.items_for_user("bob") == ["item-b", "item-c"]
+
+
+def test_sqlite_store_encrypts_access_tokens(tmp_path: Path) -> None:
+    path = str(tmp_path / "plaid.db")
+    key = Fernet.generate_key().decode()
+    SQLiteCreditScoreStore(path, encryption_key=key).link_item(
+        LinkedItem("item-a", "access-sandbox-secret", user_id="alice", linked_at=1.0)
+    )
+
+    with sqlite3.connect(path) as conn:
+        (stored,) = conn.execute("SELECT access_token FROM plaid_items").fetchone()
+    assert "access-sandbox-secret" not in stored
+    assert SQLiteCreditScoreStore(path, encryption_key=key).get_item(
+        "item-a"
+    ) == LinkedItem("item-a", "access-sandbox-secret", "alice", 1.0)
+    # Tokens encrypted with another key read as unlinked items
+    assert SQLiteCreditScoreStore(path).get_item("item-a") is None
+
+
+def test_cache_reads_through_once_and_invalidates(tmp_path: Path) -> None:
+    path = str(tmp_path / "plaid.db")
+    SQLiteCreditScoreStore(path).add_score("item-a", make_score(650, 1.0))
+
+    backend = CountingStore(path)
+    cached = CachedCreditScoreStore(backend)
+    for _ in range(100):
+        assert cached.latest("item-a") == make_score(650, 1.0)
+    assert backend.reads == 1
+
+    cached.add_score("item-a", make_score(660, 2.0))
+    assert cached.latest("item-a").score == 660  # noqa: PLR2004  # pyright: ignore [reportOptionalMemberAccess]
+    assert backend.reads == 1
+
+    cached.invalidate("item-a")
+    assert cached.latest("item-a").score == 660  # noqa: PLR2004  # pyright: ignore [reportOptionalMemberAccess]
+    assert backend.reads == len(["first read", "after invalidation"])
+
+    cached.link_item(LinkedItem("item-a", "token", user_id="alice"))
+    assert cached.items_for_user("alice") == ["item-a"]
+    cached.link_item(LinkedItem("item-a", "token", user_id="bob"))
+    assert cached.items_for_user("alice") == []
+    assert cached.items_for_user("bob") == ["item-a"]
+
+
+def test_scores_are_kept_per_item_and_user(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "PLAID_CLIENT_ID", CLIENT_ID)
+    monkeypatch.setattr(settings, "PLAID_SECRET", SECRET)
+    stub = PlaidStub()
+    stub.public_tokens["public-bob"] = "item-bob"
+    stub.add(make_transaction("rent", 900.0, dt.date(2024, 1, 3)))
+    with stub.running_in_thread() as url:
+        plaid_router = PlaidRouter(
+            ai=PromptEchoProvider(),  # pyright: ignore [reportArgumentType]
+            blockchain=AsyncFlareProvider("http://localhost:8545"),
+            attestation=Vtpm(simulate=True),
+            prompts=PromptService(),
+            plaid_clients=PlaidClientRegistry(default_environment=url),
+        )
+        app = FastAPI()
+        app.include_router(plaid_router.router, prefix="/plaid")
+        with TestClient(app) as client:
+
+            def link(session_id: str, public_token: str) -> None:
+                job = client.post(
+                    "/plaid/set_access_token",
+                    json={"public_token": public_token},
+                    headers={SESSION_HEADER: session_id},
+                ).json()
+                client.get(f"/plaid/jobs/{job['job_id']}/stream")
+
+            def score(session_id: str) -> dict:
+                return client.get(
+                    "/plaid/credit_score", headers={SESSION_HEADER: session_id}
+                ).json()
+
+            assert client.get("/plaid/credit_score").status_code == 404  # noqa: PLR2004
+            link("alice", PUBLIC_TOKEN)
+            link("bob", "public-bob")
+            alice, bob = score("alice"), score("bob")
+
+            # A re-sync with changes queues a rescore of the item
+            stub.add(make_transaction("pay", -3000.0, dt.date(2024, 1, 1)))
+            synced = client.post(
+                "/plaid/transactions/sync",
+                json={
+                    "client_id": CLIENT_ID,
+                    "secret": SECRET,
+                    "access_token": ACCESS_TOKEN,
+                    "item_id": "item-bob",
+                },
+            ).json()
+            assert synced["added"]
+            rescored = parse_sse(
+                client.get(
+                    f"/plaid/jobs/{plaid_router.jobs.store.unfinished()[0].job_id}"
+                    "/stream"
+                ).text
+            )[-1][1]
+            history = client.get(
+                "/plaid/credit_score/history",
+                params={"item_id": "item-bob"},
+                headers={SESSION_HEADER: "bob"},
+            ).json()
+
+            # Scores of another user's item, or of an unknown one, are refused
+            for path in ("/plaid/credit_score", "/plaid/credit_score/history"):
+                for item_id, status in (("item-bob", 403), ("item-eve", 404)):
+                    response = client.get(
+                        path,
+                        params={"item_id": item_id},
+                        headers={SESSION_HEADER: "alice"},
+                    )
+                    assert response.status_code == status
+            for limit in (0, 101):
+                response = client.get(
+                    "/plaid/credit_score/history",
+                    params={"limit": limit},
+                    headers={SESSION_HEADER: "bob"},
+                )
+                assert response.status_code == 422  # noqa: PLR2004
+            alice_after = score("alice")
+
+    assert alice["item_id"] == "stub-item"
+    assert bob["item_id"] == "item-bob"
+    assert rescored["result"]["transaction_count"] == len(["rent", "pay"])
+    assert [s["computed_at"] for s in history["scores"]] == [
+        rescored["result"]["computed_at"],
+        bob["computed_at"],
+    ]
+    assert history["scores"][0]["credit_score"] > bob["credit_score"]
+    # Alice's item was not re-synced, so her score is unchanged
+    assert alice_after == alice
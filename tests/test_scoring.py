@@ -0,0 +1,166 @@
+import datetime as dt
+from typing import Any, override
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from flare_ai_defai import AsyncFlareProvider, PlaidRouter, PromptService, Vtpm
+from flare_ai_defai.ai import ModelResponse
+from flare_ai_defai.banking import (
+    CreditScorer,
+    PlaidClientRegistry,
+    TransactionArrays,
+    utilization_from_accounts,
+)
+from flare_ai_defai.banking.scoring import MAX_SCORE, MIN_SCORE
+from flare_ai_defai.settings import settings
+
+from .plaid_stub import (
+    CLIENT_ID,
+    PUBLIC_TOKEN,
+    SECRET,
+    PlaidStub,
+    make_transaction,
+    synthetic_history,
+)
+from .test_chat_stream import parse_sse
+from .test_receipts import PromptEchoProvider
+
+HISTORY = 2000
+
+
+class CountingProvider(PromptEchoProvider):
+    """Echoes prompts and counts generate calls."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.generate_calls = 0
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        self.generate_calls += 1
+        return super().generate(prompt, response_mime_type, response_schema)
+
+
+def test_monthly_features_are_computed_from_the_whole_history() -> None:
+    transactions = [
+        make_transaction(
+            "pay-1", -1000.0, dt.date(2024, 1, 1), category="INCOME_WAGES"
+        ),
+        make_transaction("rent-1", 600.0, dt.date(2024, 1, 3)),
+        make_transaction(
+            "pay-2", -1000.0, dt.date(2024, 2, 1), category="INCOME_WAGES"
+        ),
+        make_transaction("rent-2", 600.0, dt.date(2024, 2, 3)),
+        make_transaction(
+            "fee", 35.0, dt.date(2024, 3, 9), category="BANK_FEES_OVERDRAFT_FEES"
+        ),
+    ]
+    features = CreditScorer.features(TransactionArrays.from_transactions(transactions))
+
+    assert features.months == len(["Jan", "Feb", "Mar"])
+    assert features.monthly_inflow == pytest.approx(2000 / 3)
+    assert features.monthly_outflow == pytest.approx(1235 / 3)
+    assert features.overdrafts_per_month == pytest.approx(1 / 3)
+    assert features.savings_rate == pytest.approx(765 / 2000)
+    # Income arrived in two of three months, with the same amount each time
+    assert features.income_regularity == pytest.approx(2 / 3 * (1 - 0.5**0.5))
+
+
+def test_score_ranks_healthy_history_above_risky_one() -> None:
+    scorer = CreditScorer()
+    healthy = synthetic_history(HISTORY, seed=1)
+    risky = synthetic_history(
+        HISTORY, seed=1, spend_ratio=1.2, income_skip_rate=0.5, overdraft_rate=0.05
+    )
+
+    healthy_score = scorer.score(healthy, utilization=0.1)
+    risky_score = scorer.score(risky, utilization=0.9)
+
+    assert MIN_SCORE <= risky_score.score < healthy_score.score <= MAX_SCORE
+    assert healthy_score.transaction_count == len(healthy)
+    # Deterministic: the same history always gets the same score
+    assert scorer.score(healthy, utilization=0.1).score == healthy_score.score
+    assert scorer.score(healthy, utilization=0.9).score < healthy_score.score
+    # No history is not evidence of good behaviour
+    empty = scorer.score([])
+    assert empty.insufficient_data
+    assert empty.score == (MIN_SCORE + MAX_SCORE) // 2
+    assert not healthy_score.insufficient_data
+
+
+def test_transfers_are_not_overdrafts() -> None:
+    healthy = synthetic_history(HISTORY, seed=1)
+    transfers = [
+        make_transaction(
+            f"transfer-{month}",
+            200.0,
+            dt.date(2024, month, 15),
+            category=category,
+        )
+        for month in range(1, 13)
+        for category in ("TRANSFER_OUT_SAVINGS", "TRANSFER_IN_ACCOUNT_TRANSFER")
+    ]
+    arrays = TransactionArrays.from_transactions(transfers)
+
+    assert CreditScorer.features(arrays).overdrafts_per_month == 0.0
+    assert CreditScorer().score(healthy + transfers).components["overdrafts"] == 1.0
+
+
+def test_utilization_and_weights() -> None:
+    accounts = [
+        {"type": "credit", "balances": {"current": 300.0, "limit": 1000.0}},
+        {"type": "credit", "balances": {"current": 100.0, "limit": 1000.0}},
+        {"type": "depository", "balances": {"current": 5000.0, "limit": None}},
+    ]
+    assert utilization_from_accounts(accounts) == pytest.approx(0.2)
+    assert utilization_from_accounts(accounts[2:]) is None
+    with pytest.raises(ValueError, match="sum to 1"):
+        CreditScorer({"overdrafts": 1.0})
+
+
+def test_set_access_token_scores_locally(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "PLAID_CLIENT_ID", CLIENT_ID)
+    monkeypatch.setattr(settings, "PLAID_SECRET", SECRET)
+    stub = PlaidStub()
+    history = synthetic_history(HISTORY, seed=2)
+    stub.add(*history)
+    ai = CountingProvider()
+    with stub.running_in_thread() as url:
+        plaid_router = PlaidRouter(
+            ai=ai,  # pyright: ignore [reportArgumentType]
+            blockchain=AsyncFlareProvider("http://localhost:8545"),
+            attestation=Vtpm(simulate=True),
+            prompts=PromptService(),
+            plaid_clients=PlaidClientRegistry(default_environment=url),
+        )
+        app = FastAPI()
+        app.include_router(plaid_router.router, prefix="/plaid")
+        with TestClient(app) as client:
+            linked = link_item(client)
+            plaid_router.score_narrative = True
+            explained = link_item(client)
+
+    expected = CreditScorer().score(
+        history, utilization=utilization_from_accounts(stub.liability_accounts)
+    )
+    assert linked["credit_score"] == expected.score
+    assert linked["transaction_count"] == len(history)
+    assert "ai_response" not in linked
+    # The AI only narrates a score it did not compute
+    assert ai.generate_calls == 1
+    assert f"Score: {expected.score}" in explained["ai_response"]
+
+
+def link_item(client: TestClient) -> dict[str, Any]:
+    job = client.post(
+        "/plaid/set_access_token", json={"public_token": PUBLIC_TOKEN}
+    ).json()
+    events = parse_sse(client.get(f"/plaid/jobs/{job['job_id']}/stream").text)
+    return events[-1][1]["result"]
@@ -0,0 +1,134 @@
+import time
+from pathlib import Path
+from typing import Any, override
+
+from cryptography.fernet import Fernet
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from flare_ai_defai import AsyncFlareProvider, ChatRouter, PromptService, Vtpm
+from flare_ai_defai.ai import BaseAIProvider, ModelResponse
+from flare_ai_defai.api.dependencies import SESSION_HEADER
+from flare_ai_defai.session import InMemorySessionStore, Session, SQLiteSessionStore
+
+MAX_SESSIONS = 2
+
+
+class EchoProvider(BaseAIProvider):
+    """Routes everything to conversation and reports the history length."""
+
+    def __init__(self, api_key: str = "", model: str = "stub", **kwargs: str) -> None:
+        super().__init__(api_key, model, **kwargs)
+
+    @override
+    def reset(self) -> None:
+        self.chat_history = []
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        return ModelResponse(text="Conversational", raw_response=None, metadata={})
+
+    @override
+    def send_message(
+        self, msg: str, chat_history: list[Any] | None = None
+    ) -> ModelResponse:
+        history = self.chat_history if chat_history is None else chat_history
+        history.append({"role": "user", "parts": [msg]})
+        history.append({"role": "model", "parts": ["ok"]})
+        return ModelResponse(text=str(len(history)), raw_response=None, metadata={})
+
+
+def test_memory_store_evicts_least_recently_used() -> None:
+    store = InMemorySessionStore(max_sessions=MAX_SESSIONS)
+    store.get("a")
+    store.get("b")
+    store.get("a")
+    store.get("c")
+    assert len(store) == MAX_SESSIONS
+    assert store.metrics.evictions_lru == 1
+    store.get("b")
+    assert store.metrics.misses == len(["a", "b", "c", "b"])
+
+
+def test_memory_store_expires_idle_sessions() -> None:
+    store = InMemorySessionStore(ttl_seconds=60)
+    session = store.get("a")
+    session.attestation_requested = True
+    session.last_seen = time.time() - 120
+    assert store.get("a").attestation_requested is False
+    assert store.metrics.evictions_ttl == 1
+
+
+def test_save_bounds_session_memory() -> None:
+    store = InMemorySessionStore(max_history=4)
+    session = store.get("a")
+    session.chat_history.extend({"role": "user", "parts": [str(i)]} for i in range(10))
+    store.save(session)
+    assert [h["parts"][0] for h in session.chat_history] == ["6", "7", "8", "9"]
+
+
+def test_sqlite_store_round_trips_and_evicts() -> None:
+    store = SQLiteSessionStore(path=":memory:", max_sessions=MAX_SESSIONS)
+    session = store.get("a")
+    session.wallet.address = "0xabc"  # pyright: ignore [reportAttributeAccessIssue]
+    session.chat_history.append({"role": "user", "parts": ["hi"]})
+    store.save(session)
+
+    loaded = store.get("a")
+    assert loaded.chat_history == session.chat_history
+    assert loaded.wallet == Session.from_dict(session.to_dict()).wallet
+
+    store.save(store.get("b"))
+    store.save(store.get("c"))
+    assert len(store) == MAX_SESSIONS
+    assert store.metrics.evictions_lru == 1
+
+
+def test_sqlite_store_encrypts_wallet_keys(tmp_path: Path) -> None:
+    path = str(tmp_path / "sessions.db")
+    key = Fernet.generate_key().decode()
+    store = SQLiteSessionStore(path=path, encryption_key=key)
+    session = store.get("a")
+    AsyncFlareProvider("http://localhost:8545").generate_account(session.wallet)
+    private_key = session.wallet.private_key
+    assert private_key is not None
+    store.save(session)
+
+    rows = store._conn.execute("SELECT data FROM sessions").fetchall()  # noqa: SLF001
+    assert private_key not in rows[0][0]
+    assert private_key.removeprefix("0x") not in rows[0][0]
+    assert "private_key" not in session.to_dict()["wallet"]
+    assert SQLiteSessionStore(path=path, encryption_key=key).get("a").wallet == (
+        session.wallet
+    )
+    # Under another key the wallet is dropped, never handed out half-restored
+    assert SQLiteSessionStore(path=path).get("a").wallet.private_key is None
+
+
+def test_chat_sessions_are_isolated() -> None:
+    chat = ChatRouter(
+        ai=EchoProvider(),  # pyright: ignore [reportArgumentType]
+        blockchain=AsyncFlareProvider("http://localhost:8545"),
+        attestation=Vtpm(simulate=True),
+        prompts=PromptService(),
+    )
+    app = FastAPI()
+    app.include_router(chat.router, prefix="/chat")
+    client = TestClient(app)
+
+    def send(session_id: str) -> str:
+        response = client.post(
+            "/chat/", json={"message": "hello"}, headers={SESSION_HEADER: session_id}
+        )
+        assert response.headers[SESSION_HEADER] == session_id
+        return response.json()["response"]
+
+    assert send("alice") == "2"
+    assert send("alice") == "4"
+    assert send("bob") == "2"
+    assert len(chat.sessions) == len(["alice", "bob"])
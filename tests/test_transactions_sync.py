@@ -0,0 +1,153 @@
+import datetime as dt
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from flare_ai_defai import AsyncFlareProvider, PlaidRouter, PromptService, Vtpm
+from flare_ai_defai.banking import (
+    InMemoryTransactionStore,
+    LinkedItem,
+    PlaidClientRegistry,
+    SQLiteTransactionStore,
+    TransactionSyncEngine,
+)
+
+from .plaid_stub import ACCESS_TOKEN, CLIENT_ID, SECRET, PlaidStub, make_transaction
+from .test_receipts import PromptEchoProvider
+
+HISTORY = 3000
+PAGE_SIZE = 500
+ITEM_ID = "item-1"
+
+
+def seeded_stub(count: int = HISTORY) -> PlaidStub:
+    stub = PlaidStub()
+    first_day = dt.date(2023, 1, 1)
+    stub.add(
+        *(
+            make_transaction(f"t{i}", 5.0 + i % 90, first_day + dt.timedelta(i % 365))
+            for i in range(count)
+        )
+    )
+    return stub
+
+
+def test_sync_pages_fully_then_fetches_only_deltas() -> None:
+    stub = seeded_stub()
+    store = InMemoryTransactionStore()
+    engine = TransactionSyncEngine(store, page_size=PAGE_SIZE)
+    with stub.running_in_thread() as url:
+        client = PlaidClientRegistry(default_environment=url).get(CLIENT_ID, SECRET)
+
+        first = engine.sync(client, ACCESS_TOKEN, ITEM_ID)
+        assert first.pages == HISTORY // PAGE_SIZE
+        assert len(first.added) == first.total == store.count(ITEM_ID) == HISTORY
+
+        unchanged = engine.sync(client, ACCESS_TOKEN, ITEM_ID)
+        assert unchanged.pages == 1
+        assert unchanged.added == unchanged.modified == unchanged.removed == []
+
+        stub.modify("t7", amount=999.0)
+        stub.remove("t8")
+        stub.add(make_transaction("new", 1.0, dt.date(2024, 6, 1)))
+        delta = engine.sync(client, ACCESS_TOKEN, ITEM_ID)
+
+    assert [tx["transaction_id"] for tx in delta.added] == ["new"]
+    assert [tx["transaction_id"] for tx in delta.modified] == ["t7"]
+    assert delta.removed == ["t8"]
+    stored = {tx["transaction_id"]: tx for tx in store.transactions(ITEM_ID)}
+    assert len(stored) == HISTORY
+    assert stored["t7"]["amount"] == 999.0  # noqa: PLR2004
+    assert "t8" not in stored
+    assert len(stub.peers) == 1
+
+
+def test_sync_restarts_when_data_changes_mid_pagination() -> None:
+    stub = seeded_stub(PAGE_SIZE * 3)
+    stub.mutate_during_pagination = 1
+    store = InMemoryTransactionStore()
+    with stub.running_in_thread() as url:
+        client = PlaidClientRegistry(default_environment=url).get(CLIENT_ID, SECRET)
+        result = TransactionSyncEngine(store, page_size=PAGE_SIZE).sync(
+            client, ACCESS_TOKEN, ITEM_ID
+        )
+
+    # The failed pass is discarded rather than stored twice
+    assert len(result.added) == store.count(ITEM_ID) == PAGE_SIZE * 3
+    assert stub.calls["transactions_sync"] == len(["page 1", "failed page 2"]) + 3
+
+
+def test_sqlite_store_resumes_from_persisted_cursor(tmp_path: Path) -> None:
+    path = str(tmp_path / "plaid.db")
+    stub = seeded_stub()
+    with stub.running_in_thread() as url:
+        client = PlaidClientRegistry(default_environment=url).get(CLIENT_ID, SECRET)
+        store = SQLiteTransactionStore(path)
+        TransactionSyncEngine(store, page_size=PAGE_SIZE).sync(
+            client, ACCESS_TOKEN, ITEM_ID
+        )
+        store.close()
+
+        stub.remove("t0")
+        reopened = SQLiteTransactionStore(path)
+        resumed = TransactionSyncEngine(reopened, page_size=PAGE_SIZE).sync(
+            client, ACCESS_TOKEN, ITEM_ID
+        )
+
+    assert resumed.pages == 1
+    assert resumed.removed == ["t0"]
+    assert reopened.count(ITEM_ID) == HISTORY - 1
+    dates = [tx["date"] for tx in reopened.transactions(ITEM_ID)]
+    assert dates == sorted(dates)
+    reopened.delete_item(ITEM_ID)
+    assert reopened.get_cursor(ITEM_ID) is None
+    assert reopened.count(ITEM_ID) == 0
+
+
+def test_sync_endpoint_manages_cursor_by_item_id() -> None:
+    stub = seeded_stub()
+    with stub.running_in_thread() as url:
+        plaid_router = PlaidRouter(
+            ai=PromptEchoProvider(),  # pyright: ignore [reportArgumentType]
+            blockchain=AsyncFlareProvider("http://localhost:8545"),
+            attestation=Vtpm(simulate=True),
+            prompts=PromptService(),
+            plaid_clients=PlaidClientRegistry(default_environment=url),
+        )
+        app = FastAPI()
+        app.include_router(plaid_router.router, prefix="/plaid")
+        plaid_router.scores.link_item(
+            LinkedItem(ITEM_ID, ACCESS_TOKEN, user_id="alice")
+        )
+        body = {
+            "client_id": CLIENT_ID,
+            "secret": SECRET,
+            "access_token": ACCESS_TOKEN,
+            "item_id": ITEM_ID,
+        }
+        with TestClient(app, headers={"X-Session-Id": "alice"}) as client:
+            first = client.post("/plaid/transactions/sync", json=body).json()
+            stub.modify("t1", name="Refund")
+            second = client.post("/plaid/transactions/sync", json=body).json()
+            # Only the session that linked the item, with its token, may sync it
+            other_user = client.post(
+                "/plaid/transactions/sync",
+                json=body,
+                headers={"X-Session-Id": "mallory"},
+            )
+            other_token = client.post(
+                "/plaid/transactions/sync",
+                json={**body, "access_token": "access-other"},
+            )
+            unknown = client.post(
+                "/plaid/transactions/sync", json={**body, "item_id": "item-2"}
+            )
+
+    assert len(first["added"]) == first["total"] == HISTORY
+    assert first["has_more"] is False
+    assert second["added"] == []
+    assert [tx["name"] for tx in second["modified"]] == ["Refund"]
+    assert second["next_cursor"] == str(HISTORY + 1)
+    assert other_user.status_code == other_token.status_code == 403  # noqa: PLR2004
+    assert unknown.status_code == 404  # noqa: PLR2004